@@ -14,6 +14,7 @@ from datetime import datetime, time, date, timedelta
 from .extensions import db, migrate, csrf, limiter
 from .config import get_config
 from .utils.timezone import to_local_time
+from .utils.boot_timing import BootTimer
 
 
 def create_app(config_name=None):
@@ -27,6 +28,8 @@ def create_app(config_name=None):
     Returns:
         Flask application instance
     """
+    boot = BootTimer()
+
     # Create Flask app
     app = Flask(__name__)
 
@@ -49,8 +52,14 @@ def create_app(config_name=None):
     if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite:///instance/'):
         app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(basedir, "instance", "scheduler.db")}'
 
+    # Read replica / read-only SQLite pool for dashboards, validation, exports and printing
+    from app.utils.db_routing import configure_read_bind, init_db_routing
+    configure_read_bind(app)
+    boot.mark('config')
+
     # Initialize extensions
     db.init_app(app)
+    init_db_routing(app, db)
     migrate.init_app(app, db)
     csrf.init_app(app)
 
@@ -68,6 +77,7 @@ def create_app(config_name=None):
     external_api.init_app(app)
     sync_engine.init_app(app, db)
     app.config['SESSION_API_SERVICE'] = external_api
+    boot.mark('extensions')
 
     # Enable foreign key constraints for SQLite
     from sqlalchemy import event
@@ -86,6 +96,10 @@ def create_app(config_name=None):
     setup_logging(app)
     register_error_handlers(app)
 
+    # Per-request SQL profiling (metrics at /health/metrics, slow request log)
+    from app.services.request_profiler import init_request_profiler
+    init_request_profiler(app)
+
     # Initialize database models
     from app.models import init_models, model_registry
     models = init_models(db)
@@ -94,6 +108,19 @@ def create_app(config_name=None):
     model_registry.init_app(app)
     model_registry.register(models)
 
+    # Full-text search index (FTS5 / tsvector) is created and dropped with the tables
+    from app.services.search_index import register_search_index
+    register_search_index(db.metadata)
+
+    # Calendar day summaries follow schedule/event changes
+    from app.services.calendar_summary import register_calendar_summary
+    register_calendar_summary(models)
+
+    # Availability matrix cache key follows employee/availability/time-off changes
+    from app.services.availability_matrix import register_availability_versioning
+    register_availability_versioning(models)
+    boot.mark('models')
+
     # Extract commonly used models for convenience
     Employee = models['Employee']
     Event = models['Event']
@@ -152,13 +179,28 @@ def create_app(config_name=None):
 
     # Register blueprints
     register_blueprints(app, db, models)
+    boot.mark('blueprints')
 
     # Setup background tasks
     setup_background_tasks(app)
+    boot.mark('background_tasks')
+
+    # Warm ML models once per process (shared by all scheduler runs)
+    setup_ml_models(app)
+
+    # Import heavy subsystems now when configured (otherwise on first use)
+    if app.config.get('PRELOAD_HEAVY_MODULES', False):
+        from app.utils.boot_timing import preload_heavy_modules
+        app.logger.info(f"Preloaded heavy modules: {preload_heavy_modules()}")
+    boot.mark('ml_and_preload')
 
     # Setup request/response handlers
     setup_request_handlers(app)
 
+    # Startup timing report (logged, and exported by /health/metrics)
+    app.config['BOOT_TIMINGS'] = boot.report()
+    boot.log(app, app.config['BOOT_TIMINGS'])
+
     return app
 
 
@@ -251,6 +293,9 @@ def register_blueprints(app, db, models):
     from app.routes.api_locked_days import api_locked_days_bp
     app.register_blueprint(api_locked_days_bp)
 
+    from app.routes.api_jobs import api_jobs_bp
+    app.register_blueprint(api_jobs_bp)
+
     # Configure CSRF exemptions for specific routes (after blueprint registration)
     if 'auth.login' in app.view_functions:
         csrf.exempt(app.view_functions['auth.login'])
@@ -280,6 +325,21 @@ def setup_background_tasks(app):
         with app.app_context():
             session_manager.cleanup_expired_sessions()
 
+    def fail_stale_scheduler_runs():
+        """Background task to fail scheduler runs left running by a dead process."""
+        with app.app_context():
+            SchedulerRunHistory = app.config['SchedulerRunHistory']
+            try:
+                failed = SchedulerRunHistory.fail_stale_runs()
+                db.session.commit()
+                if failed:
+                    app.logger.warning(f"Marked {failed} stale scheduler run(s) as failed")
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Stale scheduler run cleanup failed: {e}")
+            finally:
+                db.session.remove()
+
     # Create and start background scheduler
     scheduler = BackgroundScheduler()
     scheduler.add_job(
@@ -289,12 +349,39 @@ def setup_background_tasks(app):
         name='Cleanup expired Walmart sessions',
         replace_existing=True
     )
+    if not app.config.get('TESTING', False):
+        # Once at startup, then every 10 minutes
+        scheduler.add_job(
+            func=fail_stale_scheduler_runs,
+            trigger=IntervalTrigger(minutes=10),
+            next_run_time=datetime.now(),
+            id='stale_scheduler_runs',
+            name='Fail stale scheduler runs',
+            replace_existing=True
+        )
     scheduler.start()
 
     # Ensure scheduler shuts down when app exits
     atexit.register(lambda: scheduler.shutdown())
 
 
+def setup_ml_models(app):
+    """Preload ML model artifacts into the process-wide model registry."""
+    if not app.config.get('ML_ENABLED', False) or app.config.get('TESTING', False):
+        return
+
+    # Predictions are served by a separate model server process
+    if app.config.get('ML_MODEL_SERVER_SOCKET'):
+        return
+
+    try:
+        from app.ml.inference.model_registry import ml_model_registry
+        loaded = ml_model_registry.warm_up(app.config)
+        app.logger.info(f"ML models warmed: {loaded}")
+    except Exception as e:
+        app.logger.warning(f"ML model warm-up failed (will load on first use): {e}")
+
+
 def setup_request_handlers(app):
     """Setup request and response handlers."""
 
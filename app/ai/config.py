@@ -33,6 +33,8 @@ class AIConfig:
     max_events_in_context: int = 30
     max_schedules_in_context: int = 100
     context_date_range_days: int = 14  # Look ahead/behind
+    context_token_budget: int = 2000  # Stop adding retrieved context past this many tokens
+    context_summary_cache_seconds: int = 60  # TTL for cached aggregate summaries
 
     @classmethod
     def from_env(cls) -> "AIConfig":
@@ -49,6 +51,8 @@ class AIConfig:
             max_response_tokens=int(os.getenv("AI_MAX_RESPONSE_TOKENS", "1000")),
             temperature=float(os.getenv("AI_TEMPERATURE", "0.3")),
             timeout_seconds=int(os.getenv("AI_TIMEOUT_SECONDS", "60")),
+            context_token_budget=int(os.getenv("AI_CONTEXT_TOKEN_BUDGET", "2000")),
+            context_summary_cache_seconds=int(os.getenv("AI_CONTEXT_SUMMARY_CACHE_SECONDS", "60")),
         )
 
 
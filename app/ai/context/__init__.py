@@ -1,12 +1,15 @@
 """Context retrieval module for AI scheduling assistant"""
 
 from .classifier import QueryClassifier, QueryType, QueryAnalysis
+from .entity_index import EntityIndex, get_entity_index
 from .retriever import ContextRetriever, SchedulingContext
 
 __all__ = [
     'QueryClassifier',
     'QueryType',
     'QueryAnalysis',
+    'EntityIndex',
+    'get_entity_index',
     'ContextRetriever',
     'SchedulingContext',
 ]
@@ -6,6 +6,8 @@ from typing import List
 import re
 from datetime import datetime, timedelta
 
+from .entity_index import EntityIndex
+
 
 class QueryType(Enum):
     """Types of scheduling queries"""
@@ -83,10 +85,10 @@ class QueryClassifier:
         ),
     }
 
-    def __init__(self, employees: List[str] = None, events: List[str] = None):
-        """Initialize with known employee and event names for extraction"""
-        self.known_employees = employees or []
-        self.known_events = events or []
+    def __init__(self, employees: List[str] = None, events: List[str] = None,
+                 entity_index: EntityIndex = None):
+        """Initialize with a shared entity index, or known employee and event names"""
+        self.entity_index = entity_index or EntityIndex.from_names(employees, events)
 
     def analyze(self, query: str) -> QueryAnalysis:
         """Analyze a query and return structured analysis"""
@@ -98,9 +100,8 @@ class QueryClassifier:
         # Extract date range
         date_range = self._extract_date_range(query_lower)
 
-        # Extract mentioned entities
-        employees = self._extract_employees(query)
-        events = self._extract_events(query)
+        # Extract mentioned entities (single pass over the query)
+        employees, events = self.entity_index.match(query)
 
         # Extract keywords
         keywords = self._extract_keywords(query_lower)
@@ -147,19 +148,11 @@ class QueryClassifier:
 
     def _extract_employees(self, query: str) -> List[str]:
         """Extract mentioned employee names"""
-        mentioned = []
-        for name in self.known_employees:
-            if name.lower() in query.lower():
-                mentioned.append(name)
-        return mentioned
+        return self.entity_index.match(query)[0]
 
     def _extract_events(self, query: str) -> List[str]:
-        """Extract mentioned event names"""
-        mentioned = []
-        for event in self.known_events:
-            if event.lower() in query.lower():
-                mentioned.append(event)
-        return mentioned
+        """Extract mentioned event names (by name, event number or product)"""
+        return self.entity_index.match(query)[1]
 
     def _extract_keywords(self, query: str) -> List[str]:
         """Extract relevant keywords"""
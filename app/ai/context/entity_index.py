@@ -0,0 +1,353 @@
+"""Shared entity index for extracting employees and events from chat messages
+
+The classifier used to receive every active employee name plus 100 event
+names each time a chat service was created, then scan them one by one for
+every message. This index is built once per process, kept current from
+Employee/Event commits, and matches all known names in a single pass over
+the message with an Aho-Corasick automaton.
+"""
+
+import json
+import logging
+import threading
+import time
+import weakref
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session, object_session
+
+logger = logging.getLogger(__name__)
+
+# Entity kinds reported by the matcher
+EMPLOYEE = 'employee'
+EVENT = 'event'
+
+# Full rebuild from the database after this many seconds, as a safety net
+# for changes made outside the ORM (bulk updates, raw SQL, other processes)
+DEFAULT_MAX_AGE_SECONDS = 3600
+
+# Shortest event number / product name worth matching (avoids "12" or "ice")
+MIN_NUMBER_LENGTH = 4
+MIN_PRODUCT_LENGTH = 4
+
+_SESSION_CHANGES_KEY = 'entity_index_changes'
+
+# Indexes that receive committed changes, and model classes being tracked
+_subscribed_indexes: 'weakref.WeakSet[EntityIndex]' = weakref.WeakSet()
+_tracked_models: Set[int] = set()
+
+
+class AhoCorasickMatcher:
+    """Multi-pattern, whole-word, case-insensitive matcher
+
+    Patterns are added with a value; ``build()`` compiles the automaton and
+    ``find()`` returns the values of every pattern found as a whole word in
+    the text, in one pass over the text.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, object]]] = [[]]
+
+    def add(self, pattern: str, value: object) -> None:
+        """Add a pattern (matched case-insensitively) mapping to value"""
+        pattern = pattern.strip().lower()
+        if not pattern:
+            return
+
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+        self._output[node].append((len(pattern), value))
+
+    def build(self) -> 'AhoCorasickMatcher':
+        """Compute failure links (breadth-first)"""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+        return self
+
+    def find(self, text: str) -> List[object]:
+        """Return values of all whole-word matches, in order of first appearance"""
+        text = text.lower()
+        found = []
+        seen = set()
+        node = 0
+
+        for end, char in enumerate(text, start=1):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+
+            for length, value in self._output[node]:
+                start = end - length
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < len(text) and text[end].isalnum():
+                    continue
+                if value not in seen:
+                    seen.add(value)
+                    found.append(value)
+        return found
+
+    @property
+    def size(self) -> int:
+        """Number of automaton states"""
+        return len(self._goto)
+
+
+class EntityIndex:
+    """Process-wide index of employee names and event identifiers
+
+    Indexed terms:
+    - Active employee names -> employee name
+    - Event project names, event numbers (project_ref_num, Walmart event ID)
+      and Walmart product descriptions -> event project name
+
+    Committed Employee/Event inserts, updates and deletes are applied to the
+    term tables incrementally; the automaton itself is recompiled in memory
+    on the next lookup.
+    """
+
+    def __init__(self, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS):
+        """Create an empty index (call ensure_built() before matching)"""
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        self._employees: Dict[object, str] = {}
+        self._events: Dict[object, Tuple[str, List[str]]] = {}
+        self._matcher: Optional[AhoCorasickMatcher] = None
+        self._built_at: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_names(cls, employees: Iterable[str] = None, events: Iterable[str] = None) -> 'EntityIndex':
+        """Build a standalone index from plain name lists (no DB, no listeners)"""
+        index = cls(max_age_seconds=float('inf'))
+        index._employees = {name: name for name in (employees or []) if name}
+        index._events = {name: (name, []) for name in (events or []) if name}
+        index._built_at = time.monotonic()
+        return index
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def ensure_built(self, db_session, models) -> 'EntityIndex':
+        """Load the index from the database if empty or older than max_age_seconds"""
+        self.register_listeners(models)
+        if self._built_at is None or time.monotonic() - self._built_at > self.max_age_seconds:
+            self.rebuild(db_session, models)
+        return self
+
+    def rebuild(self, db_session, models) -> None:
+        """Reload every employee and event from the database"""
+        Employee = models['Employee']
+        Event = models['Event']
+
+        started = time.perf_counter()
+        employees = {
+            emp_id: name
+            for emp_id, name in db_session.query(Employee.id, Employee.name).filter(
+                Employee.is_active == True
+            )
+            if name
+        }
+        events = {
+            event_id: _event_terms(name, ref_num, walmart_id, items)
+            for event_id, name, ref_num, walmart_id, items in db_session.query(
+                Event.id, Event.project_name, Event.project_ref_num,
+                Event.walmart_event_id, Event.walmart_items
+            )
+            if name
+        }
+
+        with self._lock:
+            self._employees = employees
+            self._events = events
+            self._matcher = None
+            self._built_at = time.monotonic()
+
+        logger.info(
+            f"Entity index built: {len(employees)} employees, {len(events)} events "
+            f"({(time.perf_counter() - started) * 1000:.0f}ms)"
+        )
+
+    def reset(self) -> None:
+        """Drop all indexed entities (the next ensure_built() reloads)"""
+        with self._lock:
+            self._employees = {}
+            self._events = {}
+            self._matcher = None
+            self._built_at = None
+
+    def _compiled(self) -> AhoCorasickMatcher:
+        """Get the automaton, compiling it if the term tables changed"""
+        matcher = self._matcher
+        if matcher is not None:
+            return matcher
+
+        with self._lock:
+            if self._matcher is None:
+                matcher = AhoCorasickMatcher()
+                for name in self._employees.values():
+                    matcher.add(name, (EMPLOYEE, name))
+                for name, aliases in self._events.values():
+                    matcher.add(name, (EVENT, name))
+                    for alias in aliases:
+                        matcher.add(alias, (EVENT, name))
+                self._matcher = matcher.build()
+            return self._matcher
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def match(self, text: str) -> Tuple[List[str], List[str]]:
+        """Find mentioned entities
+
+        Args:
+            text: User message
+
+        Returns:
+            (employee names, event project names), each deduplicated in
+            order of first mention
+        """
+        employees, events = [], []
+        for kind, name in self._compiled().find(text):
+            target = employees if kind == EMPLOYEE else events
+            if name not in target:
+                target.append(name)
+        return employees, events
+
+    def stats(self) -> Dict[str, object]:
+        """Index size for monitoring"""
+        return {
+            'employees': len(self._employees),
+            'events': len(self._events),
+            'automaton_states': self._matcher.size if self._matcher else None,
+            'age_seconds': round(time.monotonic() - self._built_at, 1) if self._built_at else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def register_listeners(self, models) -> None:
+        """Receive committed Employee/Event changes (idempotent)"""
+        for model_name in ('Employee', 'Event'):
+            model = models[model_name]
+            if id(model) in _tracked_models:
+                continue
+            for mapper_event in ('after_insert', 'after_update', 'after_delete'):
+                sa_event.listen(model, mapper_event, _make_recorder(model_name, mapper_event))
+            _tracked_models.add(id(model))
+
+        _subscribed_indexes.add(self)
+        if not sa_event.contains(Session, 'after_commit', _apply_committed_changes):
+            sa_event.listen(Session, 'after_commit', _apply_committed_changes)
+            sa_event.listen(Session, 'after_rollback', _discard_changes)
+
+    def apply_changes(self, changes: List[Tuple[str, object, object]]) -> None:
+        """Apply (model_name, id, entry_or_None) changes to the term tables"""
+        if self._built_at is None:
+            return
+        with self._lock:
+            for model_name, row_id, entry in changes:
+                table = self._employees if model_name == 'Employee' else self._events
+                if entry:
+                    table[row_id] = entry
+                else:
+                    table.pop(row_id, None)
+            self._matcher = None
+
+
+def _make_recorder(model_name: str, mapper_event: str):
+    """Mapper listener that snapshots a changed row into its session"""
+    deleted = mapper_event == 'after_delete'
+
+    def record(mapper, connection, target):
+        session = object_session(target)
+        if session is None:
+            return
+        if model_name == 'Employee':
+            entry = None if deleted or not target.is_active else target.name
+        else:
+            entry = None if deleted else _event_terms(
+                target.project_name, target.project_ref_num,
+                target.walmart_event_id, target.walmart_items
+            )
+        session.info.setdefault(_SESSION_CHANGES_KEY, []).append((model_name, target.id, entry))
+
+    return record
+
+
+def _apply_committed_changes(session) -> None:
+    """Apply the changes recorded during a committed transaction"""
+    changes = session.info.pop(_SESSION_CHANGES_KEY, None)
+    if changes:
+        for index in list(_subscribed_indexes):
+            index.apply_changes(changes)
+
+
+def _discard_changes(session) -> None:
+    """Drop changes recorded in a rolled-back transaction"""
+    session.info.pop(_SESSION_CHANGES_KEY, None)
+
+
+def _event_terms(project_name: str, ref_num, walmart_event_id, walmart_items) -> Optional[Tuple[str, List[str]]]:
+    """Build (project_name, aliases) for an event row"""
+    if not project_name:
+        return None
+
+    aliases = []
+    for number in (ref_num, walmart_event_id):
+        if number is not None and len(str(number)) >= MIN_NUMBER_LENGTH:
+            aliases.append(str(number))
+
+    if walmart_items:
+        try:
+            items = json.loads(walmart_items)
+        except (TypeError, ValueError):
+            items = []
+        for item in items or []:
+            desc = (item or {}).get('itemDesc') if isinstance(item, dict) else None
+            if desc and len(desc.strip()) >= MIN_PRODUCT_LENGTH:
+                aliases.append(desc)
+
+    return project_name, aliases
+
+
+# Global instance (one per process)
+entity_index = EntityIndex()
+
+
+def get_entity_index(db_session, models=None) -> EntityIndex:
+    """Get the shared entity index, loading it on first use"""
+    if models is None:
+        from app.models.registry import get_models
+        models = get_models()
+    return entity_index.ensure_built(db_session, models)
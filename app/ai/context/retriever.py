@@ -1,19 +1,84 @@
 """Retrieve relevant context from database based on query analysis"""
 
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Any
-from dataclasses import dataclass
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from dataclasses import dataclass, field
+import threading
+import time
 import logging
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, case, func
 
 from ..config import ai_config
 from .classifier import QueryAnalysis, QueryType
 from app.models.registry import get_models
+from app.utils.db_routing import read_only_session
 
 logger = logging.getLogger(__name__)
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+class PromptBudget:
+    """Accumulates prompt sections until a token budget is reached"""
+
+    def __init__(self, max_tokens: int):
+        self.max_tokens = max_tokens
+        self.used = 0
+        self.sections: List[str] = []
+        self.omitted = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.used >= self.max_tokens
+
+    def add(self, text: str) -> bool:
+        """Add a section unconditionally if it fits; returns whether it was added"""
+        cost = estimate_tokens(text)
+        if self.used + cost > self.max_tokens:
+            return False
+        self.sections.append(text)
+        self.used += cost
+        return True
+
+    def add_lines(self, title: str, lines: Iterable[str]) -> None:
+        """Add a titled section line by line, stopping when the budget runs out"""
+        lines = list(lines)
+        if not lines:
+            return
+
+        kept = [title]
+        cost = estimate_tokens(title)
+        for i, line in enumerate(lines):
+            line_cost = estimate_tokens(line)
+            if self.used + cost + line_cost > self.max_tokens:
+                remaining = len(lines) - i
+                self.omitted += remaining
+                kept.append(f"- ...and {remaining} more")
+                cost += estimate_tokens(kept[-1])
+                break
+            kept.append(line)
+            cost += line_cost
+
+        if len(kept) > 1 and not kept[1].startswith("- ...and"):
+            self.sections.append("\n".join(kept))
+            self.used += cost
+
+    def render(self) -> str:
+        return "\n\n".join(self.sections)
+
+
+def _mentioned_first(items: List[Dict[str, Any]], key: str, mentioned: List[str]) -> List[Dict[str, Any]]:
+    """Stable sort putting items whose key is in mentioned first"""
+    if not mentioned:
+        return items
+    wanted = set(mentioned)
+    return sorted(items, key=lambda item: item.get(key) not in wanted)
+
+
 @dataclass
 class SchedulingContext:
     """Container for all retrieved scheduling context"""
@@ -30,60 +95,95 @@ class SchedulingContext:
     query_type: str
     retrieved_at: datetime
 
-    def to_prompt_context(self) -> str:
-        """Format context for inclusion in LLM prompt"""
-        sections = []
+    # Aggregate summaries (rendered before raw rows) and ranking hints
+    summaries: List[str] = field(default_factory=list)
+    mentioned_employees: List[str] = field(default_factory=list)
+    mentioned_events: List[str] = field(default_factory=list)
+
+    def to_prompt_context(self, token_budget: Optional[int] = None) -> str:
+        """Format context for inclusion in LLM prompt
+
+        Sections are added in priority order (date, summaries, time off,
+        holidays, employees, events, schedules) and rows mentioning entities
+        from the query come first within each section. Rendering stops at
+        ``token_budget`` (defaults to ai_config.context_token_budget).
+        """
+        budget = PromptBudget(token_budget if token_budget is not None else ai_config.context_token_budget)
 
         # Date context
-        sections.append(f"**Date Range:** {self.date_range[0]} to {self.date_range[1]}")
-        sections.append(f"**Current Date:** {datetime.now().strftime('%Y-%m-%d %A')}")
+        budget.add(
+            f"**Date Range:** {self.date_range[0]} to {self.date_range[1]}\n"
+            f"**Current Date:** {datetime.now().strftime('%Y-%m-%d %A')}"
+        )
+
+        # Aggregate summaries
+        budget.add_lines("**Summary:**", (f"- {line}" for line in self.summaries))
+
+        # Time Off
+        budget.add_lines("**Scheduled Time Off:**", (
+            f"- {to['employee_name']}: {to['start_date']} to {to['end_date']} ({to.get('reason') or 'Time off'})"
+            for to in _mentioned_first(self.time_off, 'employee_name', self.mentioned_employees)
+        ))
+
+        # Holidays
+        budget.add_lines("**Company Holidays:**", (
+            f"- {hol['date']}: {hol['name']}" for hol in self.holidays
+        ))
 
         # Employees
-        if self.employees:
-            emp_lines = ["**Employees:**"]
-            for emp in self.employees[:ai_config.max_employees_in_context]:
-                job_title = emp.get('job_title', 'Event Specialist')
-                emp_lines.append(
-                    f"- {emp['name']} (ID: {emp['id']}) - {job_title}"
-                )
-            sections.append("\n".join(emp_lines))
+        employees = _mentioned_first(self.employees, 'name', self.mentioned_employees)
+        budget.add_lines("**Employees:**", (
+            f"- {emp['name']} (ID: {emp['id']}) - {emp.get('job_title', 'Event Specialist')}"
+            for emp in employees[:ai_config.max_employees_in_context]
+        ))
 
         # Events
-        if self.events:
-            event_lines = ["**Events:**"]
-            for evt in self.events[:ai_config.max_events_in_context]:
-                event_lines.append(
-                    f"- {evt['project_name']} (Ref: {evt['project_ref_num']}) on {evt['date']} - {evt['event_type']} ({evt['condition']})"
-                )
-            sections.append("\n".join(event_lines))
+        events = _mentioned_first(self.events, 'project_name', self.mentioned_events)
+        budget.add_lines("**Events:**", (
+            f"- {evt['project_name']} (Ref: {evt['project_ref_num']}) on {evt['date']} - {evt['event_type']} ({evt['condition']})"
+            for evt in events[:ai_config.max_events_in_context]
+        ))
 
         # Current Schedules
-        if self.schedules:
-            sched_lines = ["**Current Schedules:**"]
-            for sched in self.schedules[:ai_config.max_schedules_in_context]:
-                sched_lines.append(
-                    f"- {sched['employee_name']} -> {sched['event_name']} on {sched['date']}"
-                )
-            sections.append("\n".join(sched_lines))
+        schedules = _mentioned_first(self.schedules, 'employee_name', self.mentioned_employees)
+        schedules = _mentioned_first(schedules, 'event_name', self.mentioned_events)
+        budget.add_lines("**Current Schedules:**", (
+            f"- {sched['employee_name']} -> {sched['event_name']} on {sched['date']}"
+            for sched in schedules[:ai_config.max_schedules_in_context]
+        ))
 
-        # Time Off
-        if self.time_off:
-            to_lines = ["**Scheduled Time Off:**"]
-            for to in self.time_off:
-                reason = to.get('reason', 'Time off')
-                to_lines.append(
-                    f"- {to['employee_name']}: {to['start_date']} to {to['end_date']} ({reason})"
-                )
-            sections.append("\n".join(to_lines))
+        if budget.omitted:
+            logger.debug(f"Prompt context budget reached ({budget.used} tokens); omitted {budget.omitted} rows")
+
+        return budget.render()
 
-        # Holidays
-        if self.holidays:
-            hol_lines = ["**Company Holidays:**"]
-            for hol in self.holidays:
-                hol_lines.append(f"- {hol['date']}: {hol['name']}")
-            sections.append("\n".join(hol_lines))
 
-        return "\n\n".join(sections)
+class _SummaryCache:
+    """Short-lived cache of aggregate summaries keyed by (kind, date range)"""
+
+    def __init__(self):
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Tuple, ttl_seconds: float, compute):
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        value = compute()
+        with self._lock:
+            if len(self._entries) > 256:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            self._entries[key] = (now + ttl_seconds, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+summary_cache = _SummaryCache()
 
 
 class ContextRetriever:
@@ -101,12 +201,17 @@ class ContextRetriever:
         return self._models
 
     def retrieve(self, analysis: QueryAnalysis) -> SchedulingContext:
-        """Retrieve context based on query analysis"""
+        """Retrieve context based on query analysis (reads use the read engine)"""
+        with read_only_session(self.db):
+            return self._retrieve(analysis)
+
+    def _retrieve(self, analysis: QueryAnalysis) -> SchedulingContext:
         start_date, end_date = analysis.date_range
 
         # Always get basic context
         employees = self._get_employees(analysis.mentioned_employees)
         holidays = self._get_holidays(start_date, end_date)
+        summaries = self._get_day_summary(start_date, end_date)
 
         # Get context based on query type
         events = []
@@ -121,7 +226,7 @@ class ContextRetriever:
             QueryType.SCHEDULE_VIEW
         ]:
             events = self._get_events(start_date, end_date, analysis.mentioned_events)
-            schedules = self._get_schedules(start_date, end_date)
+            schedules = self._get_schedules(start_date, end_date, analysis.mentioned_employees)
             availability = self._get_availability(start_date, end_date)
             time_off = self._get_time_off(start_date, end_date)
 
@@ -131,12 +236,13 @@ class ContextRetriever:
             time_off = self._get_time_off(start_date, end_date)
 
         elif analysis.query_type == QueryType.WORKLOAD_ANALYSIS:
-            # Extend date range for workload analysis
+            # Summarize the trailing 30 days per employee instead of listing every row
             extended_start = start_date - timedelta(days=30)
-            schedules = self._get_schedules(extended_start, end_date)
+            summaries = summaries + self._get_workload_summary(extended_start, end_date)
+            schedules = self._get_schedules(start_date, end_date, analysis.mentioned_employees)
 
         elif analysis.query_type == QueryType.TIME_OFF_IMPACT:
-            schedules = self._get_schedules(start_date, end_date)
+            schedules = self._get_schedules(start_date, end_date, analysis.mentioned_employees)
             events = self._get_events(start_date, end_date)
             time_off = self._get_time_off(start_date, end_date)
 
@@ -155,6 +261,9 @@ class ContextRetriever:
             date_range=(start_date, end_date),
             query_type=analysis.query_type.value,
             retrieved_at=datetime.now(),
+            summaries=summaries,
+            mentioned_employees=analysis.mentioned_employees,
+            mentioned_events=analysis.mentioned_events,
         )
 
     def _get_employees(
@@ -200,7 +309,7 @@ class ContextRetriever:
         if specific_events:
             query = query.filter(Event.project_name.in_(specific_events))
 
-        events = query.order_by(Event.start_datetime).all()
+        events = query.order_by(Event.start_datetime).limit(ai_config.max_events_in_context).all()
 
         return [
             {
@@ -222,33 +331,125 @@ class ContextRetriever:
     def _get_schedules(
         self,
         start_date: date,
-        end_date: date
+        end_date: date,
+        priority_employees: List[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get schedules in date range"""
+        """Get schedules in date range (mentioned employees first, capped at the context limit)"""
         Schedule = self.models['Schedule']
         Event = self.models['Event']
+        Employee = self.models['Employee']
 
-        schedules = self.db.query(Schedule).join(
+        query = self.db.query(
+            Schedule.id,
+            Schedule.employee_id,
+            Employee.name,
+            Schedule.event_ref_num,
+            Event.project_name,
+            Schedule.schedule_datetime,
+        ).join(
             Event,
             Schedule.event_ref_num == Event.project_ref_num
+        ).outerjoin(
+            Employee,
+            Schedule.employee_id == Employee.id
         ).filter(
             and_(
                 Schedule.schedule_datetime >= datetime.combine(start_date, datetime.min.time()),
                 Schedule.schedule_datetime <= datetime.combine(end_date, datetime.max.time())
             )
-        ).all()
+        )
+
+        if priority_employees:
+            query = query.order_by(case((Employee.name.in_(priority_employees), 0), else_=1))
+
+        rows = query.order_by(Schedule.schedule_datetime).limit(ai_config.max_schedules_in_context).all()
 
         return [
             {
-                "id": sched.id,
-                "employee_id": sched.employee_id,
-                "employee_name": sched.employee.name if sched.employee else "Unknown",
-                "event_ref_num": sched.event_ref_num,
-                "event_name": sched.event.project_name if sched.event else "Unknown",
-                "date": sched.schedule_datetime.date().isoformat(),
-                "datetime": sched.schedule_datetime.isoformat(),
+                "id": sched_id,
+                "employee_id": employee_id,
+                "employee_name": employee_name or "Unknown",
+                "event_ref_num": event_ref_num,
+                "event_name": event_name or "Unknown",
+                "date": schedule_datetime.date().isoformat(),
+                "datetime": schedule_datetime.isoformat(),
             }
-            for sched in schedules
+            for sched_id, employee_id, employee_name, event_ref_num, event_name, schedule_datetime in rows
+        ]
+
+    def _get_day_summary(self, start_date: date, end_date: date) -> List[str]:
+        """Per-day event/schedule counts for the date range (aggregate SQL, cached)"""
+        return summary_cache.get_or_compute(
+            ('days', start_date, end_date),
+            ai_config.context_summary_cache_seconds,
+            lambda: self._compute_day_summary(start_date, end_date)
+        )
+
+    def _compute_day_summary(self, start_date: date, end_date: date) -> List[str]:
+        Schedule = self.models['Schedule']
+        Event = self.models['Event']
+        range_start = datetime.combine(start_date, datetime.min.time())
+        range_end = datetime.combine(end_date, datetime.max.time())
+
+        event_day = func.date(Event.start_datetime)
+        event_counts = self.db.query(
+            event_day,
+            func.count(Event.id),
+            func.sum(case((Event.is_scheduled == True, 0), else_=1))
+        ).filter(
+            Event.start_datetime >= range_start,
+            Event.start_datetime <= range_end
+        ).group_by(event_day).all()
+
+        schedule_day = func.date(Schedule.schedule_datetime)
+        schedule_counts = dict(self.db.query(
+            schedule_day,
+            func.count(Schedule.id)
+        ).filter(
+            Schedule.schedule_datetime >= range_start,
+            Schedule.schedule_datetime <= range_end
+        ).group_by(schedule_day).all())
+
+        days = sorted(set(str(day) for day, _, _ in event_counts) | set(str(day) for day in schedule_counts))
+        events_by_day = {str(day): (total, unscheduled or 0) for day, total, unscheduled in event_counts}
+        schedules_by_day = {str(day): count for day, count in schedule_counts.items()}
+
+        lines = []
+        for day in days:
+            total, unscheduled = events_by_day.get(day, (0, 0))
+            lines.append(
+                f"{day}: {total} events starting ({unscheduled} unscheduled), "
+                f"{schedules_by_day.get(day, 0)} scheduled shifts"
+            )
+        return lines
+
+    def _get_workload_summary(self, start_date: date, end_date: date) -> List[str]:
+        """Scheduled shifts per employee over the range (aggregate SQL, cached)"""
+        return summary_cache.get_or_compute(
+            ('workload', start_date, end_date),
+            ai_config.context_summary_cache_seconds,
+            lambda: self._compute_workload_summary(start_date, end_date)
+        )
+
+    def _compute_workload_summary(self, start_date: date, end_date: date) -> List[str]:
+        Schedule = self.models['Schedule']
+        Employee = self.models['Employee']
+
+        rows = self.db.query(
+            Employee.name,
+            func.count(Schedule.id),
+            func.count(func.distinct(func.date(Schedule.schedule_datetime)))
+        ).join(
+            Employee,
+            Schedule.employee_id == Employee.id
+        ).filter(
+            Schedule.schedule_datetime >= datetime.combine(start_date, datetime.min.time()),
+            Schedule.schedule_datetime <= datetime.combine(end_date, datetime.max.time())
+        ).group_by(Employee.name).order_by(func.count(Schedule.id).desc()).all()
+
+        return [
+            f"{name}: {shifts} shifts on {days} days ({start_date} to {end_date})"
+            for name, shifts, days in rows
         ]
 
     def _get_availability(
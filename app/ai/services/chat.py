@@ -9,6 +9,7 @@ from ..config import ai_config
 from ..providers import get_llm_provider
 from ..providers.base import Message
 from ..context.classifier import QueryClassifier
+from ..context.entity_index import get_entity_index
 from ..context.retriever import ContextRetriever
 from ..prompts.templates import SYSTEM_PROMPT, get_prompt_template
 from app.models.registry import get_models
@@ -42,25 +43,10 @@ class SchedulerChatService:
         self.max_history_turns: int = 5
 
     def _initialize_classifier(self) -> QueryClassifier:
-        """Initialize classifier with known entities from database"""
+        """Initialize classifier with the shared entity index"""
         try:
-            models = get_models()
-            Employee = models['Employee']
-            Event = models['Event']
-
-            # Get employee names for entity extraction
-            employees = self.db.query(Employee.name).filter(
-                Employee.is_active == True
-            ).all()
-            employee_names = [e[0] for e in employees]
-
-            # Get event names
-            events = self.db.query(Event.project_name).limit(100).all()
-            event_names = list(set([e[0] for e in events]))  # Deduplicate
-
             return QueryClassifier(
-                employees=employee_names,
-                events=event_names
+                entity_index=get_entity_index(self.db, get_models())
             )
         except Exception as e:
             logger.warning(f"Could not initialize classifier with DB data: {e}")
@@ -19,6 +19,17 @@ class Config:
     SQLALCHEMY_DATABASE_URI = config('DATABASE_URL', default='sqlite:///instance/scheduler.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Read routing (app/utils/db_routing.py): read-only work uses DATABASE_READ_URL
+    # (PostgreSQL replica) or, for a SQLite file, a second query_only pool in WAL mode
+    DB_READ_ROUTING = config('DB_READ_ROUTING', default=True, cast=bool)
+    DATABASE_READ_URL = config('DATABASE_READ_URL', default='')
+    # SQLite pragma overrides per role (empty = built-in defaults)
+    SQLITE_SYNCHRONOUS = config('SQLITE_SYNCHRONOUS', default='')  # Primary (default NORMAL)
+    SQLITE_CACHE_SIZE = config('SQLITE_CACHE_SIZE', default='')  # Primary (default -16384 = 16 MB)
+    SQLITE_MMAP_SIZE = config('SQLITE_MMAP_SIZE', default='')  # Primary (default 0)
+    SQLITE_READ_CACHE_SIZE = config('SQLITE_READ_CACHE_SIZE', default='')  # Read pool (default -65536 = 64 MB)
+    SQLITE_READ_MMAP_SIZE = config('SQLITE_READ_MMAP_SIZE', default='')  # Read pool (default 256 MB)
+
     # External API settings (Crossmark Session-based authentication)
     EXTERNAL_API_BASE_URL = config('EXTERNAL_API_BASE_URL', default='https://crossmark.mvretail.com')
     EXTERNAL_API_USERNAME = config('EXTERNAL_API_USERNAME', default='')
@@ -30,6 +41,35 @@ class Config:
     # Sync settings
     SYNC_ENABLED = config('SYNC_ENABLED', default=False, cast=bool)
 
+    # Login refresh settings (freshness-aware post-login Crossmark pull)
+    LOGIN_REFRESH_SKIP_MINUTES = config('LOGIN_REFRESH_SKIP_MINUTES', default=15, cast=int)  # Skip if refreshed this recently
+    LOGIN_REFRESH_FULL_MAX_AGE_HOURS = config('LOGIN_REFRESH_FULL_MAX_AGE_HOURS', default=24, cast=int)  # Else delta if full refresh this recent
+    LOGIN_REFRESH_DELTA_DAYS = config('LOGIN_REFRESH_DELTA_DAYS', default=14, cast=int)  # Delta window ahead of today
+    LOGIN_REFRESH_DELTA_PAST_DAYS = config('LOGIN_REFRESH_DELTA_PAST_DAYS', default=2, cast=int)  # Delta window before today
+    REFRESH_LOCK_TTL = config('REFRESH_LOCK_TTL', default=900, cast=int)  # Seconds before a stuck refresh lock expires
+
+    # Background job runner (refresh, paperwork, scheduler runs, CSV imports)
+    JOB_RUNNER_BACKEND = config('JOB_RUNNER_BACKEND', default='thread')  # 'thread' (in-process) or 'celery'
+    JOB_RUNNER_THREADS = config('JOB_RUNNER_THREADS', default=4, cast=int)  # In-process worker threads
+    JOB_RESULT_TTL = config('JOB_RESULT_TTL', default=86400, cast=int)  # Seconds finished job records are kept
+
+    # CSV imports (WorkBankVisits.csv / scheduled events)
+    CSV_IMPORT_CHUNK_SIZE = config('CSV_IMPORT_CHUNK_SIZE', default=500, cast=int)  # Rows written and committed per chunk
+    CSV_IMPORT_ASYNC_BYTES = config('CSV_IMPORT_ASYNC_BYTES', default=5 * 1024 * 1024, cast=int)  # Larger uploads import as a background job
+
+    # Instruction / SalesTool PDF downloads (cached under instance/document_cache)
+    DOCUMENT_FETCH_WORKERS = config('DOCUMENT_FETCH_WORKERS', default=4, cast=int)  # Parallel downloads
+    DOCUMENT_FETCH_TIMEOUT = config('DOCUMENT_FETCH_TIMEOUT', default=30, cast=int)  # Seconds per download
+    DOCUMENT_CACHE_MAX_AGE = config('DOCUMENT_CACHE_MAX_AGE', default=3600, cast=int)  # Seconds before a cached PDF is revalidated
+
+    # Request profiling (per-endpoint SQL metrics at /health/metrics)
+    QUERY_PROFILER_ENABLED = config('QUERY_PROFILER_ENABLED', default=True, cast=bool)
+    QUERY_PROFILER_SLOW_MS = config('QUERY_PROFILER_SLOW_MS', default=1000, cast=int)  # Log requests slower than this with their top statements
+    QUERY_PROFILER_N_PLUS_ONE = config('QUERY_PROFILER_N_PLUS_ONE', default=10, cast=int)  # Same statement this many times in one request is flagged
+
+    # Boot: ML/CP-SAT/PDF/AI modules load on first use; preload them in the master with gunicorn preload_app
+    PRELOAD_HEAVY_MODULES = config('PRELOAD_HEAVY_MODULES', default=False, cast=bool)
+
     # Logging settings
     LOG_LEVEL = config('LOG_LEVEL', default='INFO')
     LOG_FILE = config('LOG_FILE', default='logs/scheduler.log')
@@ -46,6 +86,10 @@ class Config:
     WALMART_EDR_PASSWORD = config('WALMART_EDR_PASSWORD', default='')
     WALMART_EDR_MFA_CREDENTIAL_ID = config('WALMART_EDR_MFA_CREDENTIAL_ID', default='')
     WALMART_USER_ID = config('WALMART_USER_ID', default='')  # Walmart user ID for API calls (e.g., 'd2fr4w2')
+    WALMART_FETCH_CHUNK_DAYS = config('WALMART_FETCH_CHUNK_DAYS', default=14, cast=int)  # Days per daily-schedule-report request
+    WALMART_FETCH_WORKERS = config('WALMART_FETCH_WORKERS', default=4, cast=int)  # Concurrent report requests per fetch
+    WALMART_APPROVED_EVENTS_CACHE_TTL = config('WALMART_APPROVED_EVENTS_CACHE_TTL', default=300, cast=int)  # Seconds before cached approved events are refreshed
+    EDR_CACHE_DB_PATH = config('EDR_CACHE_DB_PATH', default='')  # EDR cache SQLite file (default: instance/edr_cache.db)
 
     # Settings encryption key (should be set in environment for production)
     SETTINGS_ENCRYPTION_KEY = config('SETTINGS_ENCRYPTION_KEY', default=None)
@@ -58,10 +102,21 @@ class Config:
     ML_CONFIDENCE_THRESHOLD = config('ML_CONFIDENCE_THRESHOLD', default=0.6, cast=float)
     ML_EMPLOYEE_RANKER_PATH = config('ML_EMPLOYEE_RANKER_PATH', default='app/ml/models/artifacts/employee_ranker_latest.pkl')
     ML_SHADOW_MODE = config('ML_SHADOW_MODE', default=False, cast=bool)  # Log predictions without using them
+    ML_MODEL_RELOAD_INTERVAL = config('ML_MODEL_RELOAD_INTERVAL', default=30, cast=int)  # Seconds between artifact change checks
+    ML_MODEL_SERVER_SOCKET = config('ML_MODEL_SERVER_SOCKET', default='')  # Unix socket of app.ml.inference.model_server (optional)
+    ML_MODEL_SERVER_AUTHKEY = config('ML_MODEL_SERVER_AUTHKEY', default='')  # Shared socket key; generated into <socket>.key when unset
+    ML_FEATURE_STORE_ENABLED = config('ML_FEATURE_STORE_ENABLED', default=False, cast=bool)  # Read historical features from nightly store
+    ML_FEATURE_STORE_PATH = config('ML_FEATURE_STORE_PATH', default='instance/ml_feature_store.npz')
 
     # CP-SAT Constraint Solver settings
     CPSAT_ENABLED = config('CPSAT_ENABLED', default=True, cast=bool)
     CPSAT_TIME_LIMIT = config('CPSAT_TIME_LIMIT', default=15, cast=int)  # Solver time limit in seconds
+    CPSAT_SNAPSHOT_DIR = config('CPSAT_SNAPSHOT_DIR', default='')  # Export each run's model here for scripts/tune_cpsat.py
+    CPSAT_STREAM_SOLUTIONS = config('CPSAT_STREAM_SOLUTIONS', default=True, cast=bool)  # Save each improving solution as the run's proposal
+    CPSAT_STOP_GAP = config('CPSAT_STOP_GAP', default=0.01, cast=float)  # Stop once within this relative gap of the bound (0 disables)
+    CPSAT_STALL_SECONDS = config('CPSAT_STALL_SECONDS', default=10, cast=float)  # Stop after this long without improvement (0 disables)
+    SCHEDULER_RUN_STALE_MARGIN = config('SCHEDULER_RUN_STALE_MARGIN', default=600, cast=int)  # Seconds past CPSAT_TIME_LIMIT before an unfinished run counts as dead
+    SCHEDULER_PROFILE_MEMORY = config('SCHEDULER_PROFILE_MEMORY', default=False, cast=bool)  # Track peak memory per scheduler wave (process-wide tracemalloc; diagnostics only)
 
     @classmethod
     def validate(cls, validate_walmart: bool = True) -> None:
@@ -131,6 +186,11 @@ class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
 
+    # Background jobs run on the Celery worker (docker-compose.prod.yml) so
+    # they survive web worker restarts; set JOB_RUNNER_BACKEND=thread to keep
+    # them in-process
+    JOB_RUNNER_BACKEND = config('JOB_RUNNER_BACKEND', default='celery')
+
     # Security - Production REQUIRES environment variables (no defaults)
     # Will raise error if SECRET_KEY is not set - see get_config() validation
     SECRET_KEY = config('SECRET_KEY', default='change-this-to-a-random-secret-key-in-production')
@@ -12,9 +12,11 @@ from flask_wtf.csrf import CSRFProtect
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
+from .utils.db_routing import RoutingSession
+
 # Initialize extensions
 # These will be bound to the app in create_app() using init_app()
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})  # Read-only work can use the 'read' bind
 migrate = Migrate()
 csrf = CSRFProtect()
 limiter = Limiter(
@@ -13,6 +13,15 @@ Components:
 """
 
 from .report_generator import EDRReportGenerator
-from .pdf_generator import EDRPDFGenerator, AutomatedEDRPrinter, EnhancedEDRPrinter, DailyItemsListPDFGenerator
 
 __all__ = ['EDRReportGenerator', 'EDRPDFGenerator', 'AutomatedEDRPrinter', 'EnhancedEDRPrinter', 'DailyItemsListPDFGenerator']
+
+# PDF generators pull in reportlab/Pillow; import them on first access
+_PDF_GENERATORS = ('EDRPDFGenerator', 'AutomatedEDRPrinter', 'EnhancedEDRPrinter', 'DailyItemsListPDFGenerator')
+
+
+def __getattr__(name):
+    if name in _PDF_GENERATORS:
+        from . import pdf_generator
+        return getattr(pdf_generator, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
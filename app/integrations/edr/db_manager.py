@@ -10,14 +10,42 @@ Features:
 - Track data freshness with timestamps
 - Query events by ID, date range, status, etc.
 - Automatic cache expiry management
+- Keyed API response cache (e.g. approved-event lists) with timestamps
 """
 
+import os
 import sqlite3
 import json
 import datetime
+import threading
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
+# Instance folder used outside an app context (<project>/instance)
+INSTANCE_DIR = Path(__file__).resolve().parents[3] / "instance"
+
+
+def default_db_path() -> str:
+    """
+    Default cache database path.
+
+    EDR_CACHE_DB_PATH from the app config (or the environment outside an
+    app context), else edr_cache.db in the instance folder, so the cache
+    never lives inside the source tree.
+    """
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        configured = current_app.config.get('EDR_CACHE_DB_PATH')
+        instance_dir = current_app.instance_path
+    else:
+        configured = os.getenv('EDR_CACHE_DB_PATH')
+        instance_dir = INSTANCE_DIR
+
+    path = configured or os.path.join(instance_dir, "edr_cache.db")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return str(path)
+
 
 class EDRDatabaseManager:
     """
@@ -32,14 +60,14 @@ class EDRDatabaseManager:
         Initialize database manager.
 
         Args:
-            db_path: Path to SQLite database file. Defaults to 'edr_cache.db' in current directory.
+            db_path: Path to SQLite database file (default: default_db_path())
         """
         if db_path is None:
-            # Store in edr directory by default
-            db_path = Path(__file__).parent / "edr_cache.db"
+            db_path = default_db_path()
 
         self.db_path = str(db_path)
         self.conn = None
+        self._lock = threading.Lock()  # Response cache is written from background refreshes
         self._init_database()
 
     def _init_database(self):
@@ -111,6 +139,15 @@ class EDRDatabaseManager:
             )
         ''')
 
+        # Create keyed API response cache table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS api_responses (
+                cache_key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at TIMESTAMP NOT NULL
+            )
+        ''')
+
         self.conn.commit()
 
     def store_events(self, events_data: List[Dict[str, Any]], store_number: str,
@@ -318,6 +355,45 @@ class EDRDatabaseManager:
         count = cursor.fetchone()[0]
         return count > 0
 
+    def store_response(self, cache_key: str, data: Any) -> None:
+        """
+        Store a JSON-serializable API response under a cache key, replacing any previous one.
+
+        Args:
+            cache_key: Key identifying the request (e.g. type, club and date range)
+            data: Response data to cache
+        """
+        with self._lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO api_responses (cache_key, payload, fetched_at)
+                VALUES (?, ?, ?)
+            ''', (cache_key, json.dumps(data), datetime.datetime.now().isoformat()))
+            self.conn.commit()
+
+    def get_response(self, cache_key: str,
+                     max_age_seconds: Optional[float] = None) -> Optional[Tuple[Any, datetime.datetime]]:
+        """
+        Get a cached API response.
+
+        Args:
+            cache_key: Key the response was stored under
+            max_age_seconds: Ignore responses older than this (None = no limit)
+
+        Returns:
+            Tuple of (data, fetched_at), or None if nothing usable is cached
+        """
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT payload, fetched_at FROM api_responses WHERE cache_key = ?', (cache_key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        fetched_at = datetime.datetime.fromisoformat(row['fetched_at'])
+        if max_age_seconds is not None and (datetime.datetime.now() - fetched_at).total_seconds() > max_age_seconds:
+            return None
+        return json.loads(row['payload']), fetched_at
+
     def clear_old_cache(self, max_age_days: int = 30) -> Tuple[int, int]:
         """
         Clear cache data older than specified days.
@@ -343,6 +419,10 @@ class EDRDatabaseManager:
         ''', (cutoff_time.isoformat(),))
         metadata_deleted = cursor.rowcount
 
+        cursor.execute('''
+            DELETE FROM api_responses WHERE fetched_at < ?
+        ''', (cutoff_time.isoformat(),))
+
         self.conn.commit()
         return (events_deleted, metadata_deleted)
 
@@ -52,15 +52,8 @@ except ImportError:
     EVENT_TIME_SETTINGS_AVAILABLE = False
     logging.warning("EventTimeSettings not available - shift times will not be displayed on PDFs")
 
-# Import mapping data from constants module
-try:
-    from app.constants import DEMO_CLASS_CODES, EVENT_STATUS_CODES, DEPARTMENT_CODES
-    logging.info("✓ Mapping constants loaded successfully")
-except ImportError as e:
-    logging.warning(f"Could not import mapping files: {e}")
-    DEMO_CLASS_CODES = ([], )  # Tuple with empty list to match expected format
-    EVENT_STATUS_CODES = []
-    DEPARTMENT_CODES = []
+# Indexed code -> description lookups (loaded on first use)
+from app.utils.reference_data import get_reference_data
 
 
 class EDRPDFGenerator:
@@ -77,37 +70,19 @@ class EDRPDFGenerator:
         """Convert event type code to human readable description"""
         if not code or code == 'N/A':
             return 'N/A'
-
-        # DEMO_CLASS_CODES is a tuple containing a list
-        codes_list = DEMO_CLASS_CODES[0] if isinstance(DEMO_CLASS_CODES, tuple) else DEMO_CLASS_CODES
-
-        for item in codes_list:
-            if str(item.get('DEMO_CLASS_CODE')) == str(code):
-                return item.get('DEMO_CLASS_DESC', f"Event Type {code}")
-
-        return f"Event Type {code}"
+        return get_reference_data().event_type(code) or f"Event Type {code}"
 
     def get_event_status_description(self, code: str) -> str:
         """Convert event status code to human readable description"""
         if not code or code == 'N/A':
             return 'N/A'
-
-        for item in EVENT_STATUS_CODES:
-            if str(item.get('DEMO_STATUS_CODE')) == str(code):
-                return item.get('DEMO_STATUS_DESC', f"Status {code}")
-
-        return f"Status {code}"
+        return get_reference_data().event_status(code) or f"Status {code}"
 
     def get_department_description(self, code: str) -> str:
         """Convert department code to human readable description"""
         if not code or code == 'N/A':
             return 'N/A'
-
-        for item in DEPARTMENT_CODES:
-            if str(item.get('DEPT_NO')) == str(code):
-                return item.get('DESCRIPTION', f"Department {code}")
-
-        return 'N/A'
+        return get_reference_data().department(code) or 'N/A'
 
     def wrap_category_text(self, text: str, max_length: int = 18) -> str:
         """
@@ -723,13 +698,8 @@ class DailyItemsListPDFGenerator:
         self.pc_blue = colors.HexColor('#2E4C73')  # Dark blue
         self.pc_light_blue = colors.HexColor('#1B9BD8')  # Light blue
 
-        # Build department code mappings
-        self.department_codes = {}
-        for item in DEPARTMENT_CODES:
-            dept_no = str(item.get('DEPT_NO', ''))
-            desc = item.get('DESCRIPTION', '').strip()
-            if dept_no and desc:
-                self.department_codes[dept_no] = desc
+        # Department number -> description
+        self.department_codes = get_reference_data().departments
 
     def get_department_description(self, dept_no: str) -> str:
         """Convert department number to description"""
@@ -0,0 +1,176 @@
+"""
+Walmart Daily Schedule Report Fetching
+======================================
+
+The daily-schedule-report API answers one request per club list and date
+range, and a wide range is slow to come back. fetch_daily_schedule_report
+splits a query into one request per club and date chunk and runs them
+concurrently on the caller's authenticated requests.Session.
+
+ApprovedEventsCache keeps the approved-event list of each club and date range
+in the EDR SQLite cache. Entries younger than the TTL are served as they are;
+older ones (up to a day) are still served while a background job refreshes
+them.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://retaillink2.wal-mart.com/EventManagement"
+DAILY_SCHEDULE_REPORT_URL = f"{BASE_URL}/api/store-event/daily-schedule-report"
+
+# All event type IDs the report accepts
+ALL_EVENT_TYPES = [1] + list(range(3, 58))
+
+DEFAULT_CHUNK_DAYS = 14          # Days per request
+DEFAULT_MAX_WORKERS = 4          # Concurrent requests per fetch
+DEFAULT_CACHE_TTL = 300          # Serve cached approved events without refreshing for 5 minutes
+DEFAULT_MAX_STALE = 86400        # Older entries are not served at all
+
+
+def split_date_range(start_date: str, end_date: str, chunk_days: int = DEFAULT_CHUNK_DAYS) -> List[Tuple[str, str]]:
+    """Split an inclusive YYYY-MM-DD range into consecutive chunks of at most chunk_days"""
+    start = datetime.strptime(start_date, '%Y-%m-%d').date()
+    end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    chunk_days = max(1, chunk_days)
+
+    chunks = []
+    while start <= end:
+        chunk_end = min(end, start + timedelta(days=chunk_days - 1))
+        chunks.append((start.isoformat(), chunk_end.isoformat()))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def fetch_daily_schedule_report(session, headers: Dict[str, str], club_list: List[int], start_date: str,
+                                end_date: str, event_types: Optional[List[int]] = None,
+                                chunk_days: int = DEFAULT_CHUNK_DAYS,
+                                max_workers: int = DEFAULT_MAX_WORKERS) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fetch report rows for the clubs and date range, one request per club and date chunk
+
+    Args:
+        session: requests.Session with authenticated cookies
+        headers: Request headers
+        club_list: Club numbers
+        start_date: Start date YYYY-MM-DD
+        end_date: End date YYYY-MM-DD
+        event_types: Event type IDs (default: all)
+        chunk_days: Days per request
+        max_workers: Concurrent requests
+
+    Returns:
+        Rows of every request in club and date order, or None if any request failed
+    """
+    requests_to_send = [
+        (club, chunk_start, chunk_end)
+        for club in club_list
+        for chunk_start, chunk_end in split_date_range(start_date, end_date, chunk_days)
+    ]
+    if not requests_to_send:
+        return []
+
+    def fetch(job):
+        club, chunk_start, chunk_end = job
+        payload = {
+            "startDate": chunk_start,
+            "endDate": chunk_end,
+            "eventType": event_types or ALL_EVENT_TYPES,
+            "clubList": [club],
+            "walmartWeekYear": ""
+        }
+        try:
+            response = session.post(DAILY_SCHEDULE_REPORT_URL, headers=headers, json=payload, timeout=60)
+            if response.status_code != 200:
+                logger.error(
+                    f"Walmart API error for club {club} {chunk_start}..{chunk_end}: "
+                    f"status={response.status_code}, body={response.text[:500]}"
+                )
+                return None
+            return response.json()
+        except Exception as e:
+            logger.error(f"Walmart API request for club {club} {chunk_start}..{chunk_end} failed: "
+                         f"{type(e).__name__}: {str(e)}")
+            return None
+
+    workers = max(1, min(max_workers, len(requests_to_send)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='walmart-fetch') as executor:
+        results = list(executor.map(fetch, requests_to_send))
+
+    if any(result is None for result in results):
+        return None
+
+    rows = [row for result in results for row in result]
+    logger.info(f"Walmart API returned {len(rows)} rows from {len(requests_to_send)} requests "
+                f"({len(club_list)} clubs, {start_date} to {end_date})")
+    return rows
+
+
+@dataclass
+class CachedEvents:
+    """Approved events served from the cache"""
+    events: List[Dict[str, Any]]
+    fetched_at: datetime
+    fresh: bool
+
+
+class ApprovedEventsCache:
+    """Approved-event lists per club and date range in the EDR SQLite cache"""
+
+    def __init__(self, db_manager=None, ttl_seconds: float = DEFAULT_CACHE_TTL,
+                 max_stale_seconds: float = DEFAULT_MAX_STALE):
+        """
+        Args:
+            db_manager: EDRDatabaseManager (default: the EDR cache database)
+            ttl_seconds: Age up to which entries are served without a refresh
+            max_stale_seconds: Age after which entries are not served at all
+        """
+        self._db = db_manager
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+
+    @property
+    def db(self):
+        if self._db is None:
+            from app.integrations.edr.db_manager import EDRDatabaseManager
+            self._db = EDRDatabaseManager()
+        return self._db
+
+    @staticmethod
+    def key(club, start_date: str, end_date: str) -> str:
+        return f"approved_events:{club}:{start_date}:{end_date}"
+
+    def get(self, club, start_date: str, end_date: str) -> Optional[CachedEvents]:
+        cached = self.db.get_response(self.key(club, start_date, end_date), self.max_stale_seconds)
+        if cached is None:
+            return None
+        events, fetched_at = cached
+        fresh = (datetime.now() - fetched_at).total_seconds() <= self.ttl_seconds
+        return CachedEvents(events, fetched_at, fresh)
+
+    def put(self, club, start_date: str, end_date: str, events: List[Dict[str, Any]]) -> None:
+        self.db.store_response(self.key(club, start_date, end_date), events)
+
+
+_approved_events_cache: Optional[ApprovedEventsCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_approved_events_cache() -> ApprovedEventsCache:
+    """Shared ApprovedEventsCache configured from WALMART_APPROVED_EVENTS_CACHE_TTL"""
+    global _approved_events_cache
+    from flask import current_app
+
+    with _cache_lock:
+        if _approved_events_cache is None:
+            _approved_events_cache = ApprovedEventsCache()
+        _approved_events_cache.ttl_seconds = current_app.config.get(
+            'WALMART_APPROVED_EVENTS_CACHE_TTL', DEFAULT_CACHE_TTL
+        )
+        return _approved_events_cache
@@ -52,7 +52,9 @@ from typing import Dict, List, Optional, Tuple
 
 from .session_manager import session_manager
 from .authenticator import EDRAuthenticator
-from app.integrations.edr.pdf_generator import EDRPDFGenerator
+from .event_fetcher import (
+    BASE_URL, DEFAULT_CHUNK_DAYS, DEFAULT_MAX_WORKERS, fetch_daily_schedule_report, get_approved_events_cache,
+)
 from app.routes.auth import require_authentication, get_current_user
 from app.services.approved_events_service import ApprovedEventsService
 
@@ -60,8 +62,18 @@ from app.services.approved_events_service import ApprovedEventsService
 walmart_bp = Blueprint('walmart_api', __name__, url_prefix='/api/walmart')
 logger = logging.getLogger(__name__)
 
-# Initialize PDF generator
-pdf_generator = EDRPDFGenerator()
+# PDF generator, created on first use (loads reportlab)
+pdf_generator = None
+
+
+def get_pdf_generator():
+    """Shared EDRPDFGenerator for this blueprint"""
+    global pdf_generator
+    if pdf_generator is None:
+        from app.integrations.edr.pdf_generator import EDRPDFGenerator
+        pdf_generator = EDRPDFGenerator()
+    return pdf_generator
+
 
 # Helper function to get models from app config
 def get_models():
@@ -113,10 +125,7 @@ def _fetch_approved_events_with_session(session, auth_token, club_numbers, start
         logger.error("No valid club numbers provided")
         return None
 
-    base_url = "https://retaillink2.wal-mart.com/EventManagement"
     # Use the daily-schedule-report API (returns event-level data, not item-level)
-    url = f"{base_url}/api/store-event/daily-schedule-report"
-
     headers = {
         'accept': '*/*',
         'accept-language': 'en-US,en;q=0.9',
@@ -132,34 +141,19 @@ def _fetch_approved_events_with_session(session, auth_token, club_numbers, start
         'sec-fetch-mode': 'cors',
         'sec-fetch-site': 'same-origin',
         'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-        'referer': f"{base_url}/daily-scheduled-report"
-    }
-
-    # Default to all event types if not specified
-    if event_types is None:
-        event_types = [1,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57]
-
-    # Payload format for daily-schedule-report API
-    payload = {
-        "startDate": start_date,
-        "endDate": end_date,
-        "eventType": event_types,
-        "clubList": club_list,
-        "walmartWeekYear": ""
+        'referer': f"{BASE_URL}/daily-scheduled-report"
     }
 
     logger.info(f"Fetching events for clubs {club_list} from {start_date} to {end_date}")
     logger.info(f"Auth token present: {bool(auth_token)}, Session cookies: {len(session.cookies)}")
 
     try:
-        response = session.post(url, headers=headers, json=payload, timeout=60)
-        logger.info(f"Walmart API response status: {response.status_code}")
-
-        if response.status_code != 200:
-            logger.error(f"Walmart API error: status={response.status_code}, body={response.text[:500]}")
+        # One request per club and date chunk, sent concurrently
+        all_events = fetch_daily_schedule_report(
+            session, headers, club_list, start_date, end_date, event_types, **_fetch_options()
+        )
+        if all_events is None:
             return None
-
-        all_events = response.json()
         logger.info(f"Walmart API returned {len(all_events)} total events")
 
         # Log first event's keys for debugging
@@ -190,6 +184,95 @@ def _fetch_approved_events_with_session(session, auth_token, club_numbers, start
         return None
 
 
+def _fetch_options():
+    """Request splitting settings for daily-schedule-report fetches"""
+    return {
+        'chunk_days': current_app.config.get('WALMART_FETCH_CHUNK_DAYS', DEFAULT_CHUNK_DAYS),
+        'max_workers': current_app.config.get('WALMART_FETCH_WORKERS', DEFAULT_MAX_WORKERS),
+    }
+
+
+def _walmart_authenticators(user_id):
+    """
+    Authenticated Walmart sessions to try, in order of preference.
+
+    Yields:
+        Tuples of (auth_source, authenticator): the user's session-based
+        authenticator (from this page's MFA flow), then the global
+        authenticator from the printing module
+    """
+    user_session = session_manager.get_session(str(user_id))
+    if user_session and user_session.is_authenticated:
+        user_session.refresh()
+        authenticator = user_session.authenticator
+        if authenticator and authenticator.auth_token:
+            yield 'session', authenticator
+
+    try:
+        from app.routes.printing import edr_authenticator as global_authenticator
+        if global_authenticator and global_authenticator.auth_token:
+            yield 'global', global_authenticator
+    except ImportError:
+        logger.warning("Printing module not available for global authenticator")
+
+
+def refresh_approved_events(user_id, club, start_date, end_date):
+    """
+    Fetch a club's APPROVED events from Walmart, cache them and store Walmart
+    event IDs on local events.
+
+    Returns:
+        Tuple of (events or None if every fetch failed, auth_source)
+    """
+    walmart_events = None
+    auth_source = None
+    for auth_source, authenticator in _walmart_authenticators(user_id):
+        logger.info(f"Using {auth_source} EDR authenticator for user {user_id}")
+        walmart_events = _fetch_approved_events_with_session(
+            authenticator.session,
+            authenticator.auth_token,
+            club_numbers=[club],
+            start_date=start_date,
+            end_date=end_date
+        )
+        if walmart_events is not None:
+            break
+
+    if walmart_events is None:
+        return None, auth_source
+
+    get_approved_events_cache().put(club, start_date, end_date, walmart_events)
+
+    # Non-blocking enrichment: store walmart_event_id on local events during LIA pull
+    try:
+        from app.services.walmart_event_enrichment import WalmartEventEnrichmentService
+        enrichment_service = WalmartEventEnrichmentService()
+        enrichment_result = enrichment_service.enrich_events_from_walmart_data(walmart_events)
+        logger.info(f"Event enrichment during LIA pull: {enrichment_result}")
+    except Exception as e:
+        logger.error(f"Event enrichment failed (non-blocking): {e}")
+
+    return walmart_events, auth_source
+
+
+def _submit_approved_events_refresh(user_id, club, start_date, end_date):
+    """Refresh cached approved events in the background; True if a refresh is running"""
+    if next(_walmart_authenticators(user_id), None) is None:
+        return False
+    try:
+        from app.services.job_runner import submit_job
+        submit_job(
+            'approved_events_refresh',
+            {'user_id': str(user_id), 'club': club, 'start_date': start_date, 'end_date': end_date},
+            job_key=f"{club}:{start_date}:{end_date}",
+            user=str(user_id)
+        )
+        return True
+    except Exception as e:
+        logger.error(f"Could not start approved events refresh: {e}")
+        return False
+
+
 @walmart_bp.route('/health', methods=['GET'])
 def health_check():
     """
@@ -698,6 +781,108 @@ def get_edr_report(event_id: str):
         }), 500
 
 
+def download_edrs(authenticator, event_ids: List, progress=None) -> Dict:
+    """
+    Download EDRs and write one PDF per event to uploads/walmart_edrs/{YYYYMMDD}/
+
+    Args:
+        authenticator: Authenticated EDRAuthenticator
+        event_ids: Event IDs to download
+        progress: Optional callback called with (processed, total)
+
+    Returns:
+        dict: total, successful, failed, results and output_directory
+              (see batch_download_edrs)
+    """
+    models = get_models()
+    Event = models['Event']
+    Schedule = models['Schedule']
+    Employee = models['Employee']
+
+    # Create output directory
+    date_str = datetime.now().strftime('%Y%m%d')
+    output_dir = os.path.join(current_app.config.get('UPLOAD_FOLDER', 'uploads'), 'walmart_edrs', date_str)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Process each event
+    results = []
+    successful = 0
+    failed = 0
+
+    logger.info(f"Starting batch EDR download for {len(event_ids)} events")
+
+    for index, event_id in enumerate(event_ids):
+        if progress:
+            progress(index, len(event_ids))
+
+        try:
+            # Get event from database to find employee name
+            event = Event.query.filter_by(project_ref_num=int(event_id)).first()
+            employee_name = 'N/A'
+
+            if event:
+                schedule = Schedule.query.filter_by(event_ref_num=event.project_ref_num).first()
+                if schedule:
+                    employee = Employee.query.get(schedule.employee_id)
+                    if employee:
+                        employee_name = employee.name
+
+            # Get EDR data from Walmart
+            edr_data = authenticator.get_edr_report(str(event_id))
+
+            if not edr_data:
+                results.append({
+                    'event_id': str(event_id),
+                    'success': False,
+                    'error': 'EDR data not found'
+                })
+                failed += 1
+                continue
+
+            # Generate PDF filename
+            safe_name = re.sub(r'[^\w\s-]', '', employee_name).strip().replace(' ', '_')
+            pdf_filename = f"EDR_{event_id}_{safe_name}.pdf"
+            pdf_path = os.path.join(output_dir, pdf_filename)
+
+            # Generate PDF
+            if get_pdf_generator().generate_pdf(edr_data, pdf_path, employee_name):
+                results.append({
+                    'event_id': str(event_id),
+                    'success': True,
+                    'filename': pdf_filename,
+                    'employee_name': employee_name
+                })
+                successful += 1
+                logger.info(f"Generated PDF for event {event_id}")
+            else:
+                results.append({
+                    'event_id': str(event_id),
+                    'success': False,
+                    'error': 'PDF generation failed'
+                })
+                failed += 1
+
+        except Exception as e:
+            logger.error(f"Failed to process event {event_id}: {str(e)}")
+            results.append({
+                'event_id': str(event_id),
+                'success': False,
+                'error': str(e)
+            })
+            failed += 1
+
+    logger.info(f"Batch EDR download completed: {successful} successful, {failed} failed")
+
+    return {
+        'success': True,
+        'total': len(event_ids),
+        'successful': successful,
+        'failed': failed,
+        'results': results,
+        'output_directory': output_dir
+    }
+
+
 @walmart_bp.route('/edr/batch-download', methods=['POST'])
 @require_authentication()
 def batch_download_edrs():
@@ -708,7 +893,8 @@ def batch_download_edrs():
     Events can be specified either by date (all events on that date) or by
     explicit list of event IDs.
 
-    PDFs are saved to: uploads/walmart_edrs/{YYYYMMDD}/
+    PDFs are saved to: uploads/walmart_edrs/{YYYYMMDD}/ by an edr_batch
+    background job; poll /api/jobs/<job_id> for its result.
 
     Required Authentication:
         Flask-Login session (logged in user)
@@ -725,7 +911,7 @@ def batch_download_edrs():
         }
 
     Returns:
-        JSON response with:
+        202 with job_id. The finished job's result has:
         - success: Overall success status
         - total: Total number of events processed
         - successful: Number of successful downloads
@@ -734,15 +920,15 @@ def batch_download_edrs():
         - output_directory: Where PDFs were saved
 
     Status Codes:
-        200: Batch processing completed (check individual results)
+        202: Batch download queued
         400: Invalid request or no authenticated session
-        500: Batch processing failed
+        500: Batch download could not be queued
 
-    Example Response:
+    Example Job Result:
         {
             "success": true,
-            "total": 3,
-            "successful": 2,
+            "total": 2,
+            "successful": 1,
             "failed": 1,
             "results": [
                 {
@@ -751,12 +937,6 @@ def batch_download_edrs():
                     "filename": "EDR_12345_John_Doe.pdf",
                     "employee_name": "John Doe"
                 },
-                {
-                    "event_id": "12346",
-                    "success": true,
-                    "filename": "EDR_12346_Jane_Smith.pdf",
-                    "employee_name": "Jane Smith"
-                },
                 {
                     "event_id": "12347",
                     "success": false,
@@ -796,9 +976,7 @@ def batch_download_edrs():
 
         # Get models for database queries
         models = get_models()
-        Event = models['Event']
         Schedule = models['Schedule']
-        Employee = models['Employee']
         db = models['db']
 
         # Parse request data
@@ -853,86 +1031,10 @@ def batch_download_edrs():
                 'message': 'No events found to process'
             }), 400
 
-        # Create output directory
-        date_str = datetime.now().strftime('%Y%m%d')
-        output_dir = os.path.join(current_app.config.get('UPLOAD_FOLDER', 'uploads'), 'walmart_edrs', date_str)
-        os.makedirs(output_dir, exist_ok=True)
-
-        # Process each event
-        authenticator = session.authenticator
-        results = []
-        successful = 0
-        failed = 0
-
-        logger.info(f"Starting batch EDR download for {len(event_ids)} events")
-
-        for event_id in event_ids:
-            try:
-                # Get event from database to find employee name
-                event = Event.query.filter_by(project_ref_num=int(event_id)).first()
-                employee_name = 'N/A'
-
-                if event:
-                    schedule = Schedule.query.filter_by(event_ref_num=event.project_ref_num).first()
-                    if schedule:
-                        employee = Employee.query.get(schedule.employee_id)
-                        if employee:
-                            employee_name = employee.name
-
-                # Get EDR data from Walmart
-                edr_data = authenticator.get_edr_report(str(event_id))
-
-                if not edr_data:
-                    results.append({
-                        'event_id': str(event_id),
-                        'success': False,
-                        'error': 'EDR data not found'
-                    })
-                    failed += 1
-                    continue
-
-                # Generate PDF filename
-                safe_name = re.sub(r'[^\w\s-]', '', employee_name).strip().replace(' ', '_')
-                pdf_filename = f"EDR_{event_id}_{safe_name}.pdf"
-                pdf_path = os.path.join(output_dir, pdf_filename)
-
-                # Generate PDF
-                if pdf_generator.generate_pdf(edr_data, pdf_path, employee_name):
-                    results.append({
-                        'event_id': str(event_id),
-                        'success': True,
-                        'filename': pdf_filename,
-                        'employee_name': employee_name
-                    })
-                    successful += 1
-                    logger.info(f"Generated PDF for event {event_id}")
-                else:
-                    results.append({
-                        'event_id': str(event_id),
-                        'success': False,
-                        'error': 'PDF generation failed'
-                    })
-                    failed += 1
-
-            except Exception as e:
-                logger.error(f"Failed to process event {event_id}: {str(e)}")
-                results.append({
-                    'event_id': str(event_id),
-                    'success': False,
-                    'error': str(e)
-                })
-                failed += 1
-
-        logger.info(f"Batch EDR download completed: {successful} successful, {failed} failed")
-
-        return jsonify({
-            'success': True,
-            'total': len(event_ids),
-            'successful': successful,
-            'failed': failed,
-            'results': results,
-            'output_directory': output_dir
-        }), 200
+        from app.services.job_runner import submit_job
+        job_id, created = submit_job('edr_batch', params={'user_id': str(user_id), 'event_ids': event_ids},
+                                     user=str(user_id))
+        return jsonify({'success': True, 'job_id': job_id, 'created': created}), 202
 
     except Exception as e:
         logger.error(f"Batch EDR download failed: {str(e)}")
@@ -968,6 +1070,11 @@ def get_approved_events():
         start_date (optional): Start date YYYY-MM-DD (default: 1st of previous month)
         end_date (optional): End date YYYY-MM-DD (default: today)
         include_core_events (optional): Set to 'true' to include matching Core events from local DB
+        refresh (optional): Set to 'true' to fetch from Walmart instead of the cache
+
+    Walmart events are cached per club and date range for
+    WALMART_APPROVED_EVENTS_CACHE_TTL seconds; older cached events are served
+    while a background job refreshes them.
 
     Returns:
         JSON response with:
@@ -976,6 +1083,8 @@ def get_approved_events():
         - summary: Counts by local status
         - scanout_warning: Warning info for Fri/Sat/EOM
         - date_range: The date range used for the query
+        - cache: Whether the Walmart events came from the cache, when they
+          were fetched, and whether a background refresh is running
 
     Status Codes:
         200: Events retrieved successfully
@@ -1048,45 +1157,23 @@ def get_approved_events():
             start_date = start_date or default_start
             end_date = end_date or default_end
 
-        # Try multiple authentication sources in order of preference
-        walmart_events = None
-        auth_source = None
-
-        # 1. First try session-based authenticator (from this page's MFA flow)
-        user_session = session_manager.get_session(str(user_id))
-        if user_session and user_session.is_authenticated:
-            user_session.refresh()
-            authenticator = user_session.authenticator
-            if authenticator and authenticator.auth_token:
-                logger.info(f"Using session-based authenticator for user {user_id}")
-                auth_source = "session"
-                walmart_events = _fetch_approved_events_with_session(
-                    authenticator.session,
-                    authenticator.auth_token,
-                    club_numbers=[club],
-                    start_date=start_date,
-                    end_date=end_date
-                )
-
-        # 2. If session auth didn't work, try global authenticator from printing module
-        if walmart_events is None:
-            try:
-                from app.routes.printing import edr_authenticator as global_authenticator
-                if global_authenticator and global_authenticator.auth_token:
-                    logger.info(f"Using global EDR authenticator for user {user_id}")
-                    auth_source = "global"
-                    walmart_events = _fetch_approved_events_with_session(
-                        global_authenticator.session,
-                        global_authenticator.auth_token,
-                        club_numbers=[club],
-                        start_date=start_date,
-                        end_date=end_date
-                    )
-            except ImportError:
-                logger.warning("Printing module not available for global authenticator")
+        # Serve cached events (refreshing stale ones in the background), else fetch now
+        force_refresh = request.args.get('refresh', '').lower() == 'true'
+        cached = None if force_refresh else get_approved_events_cache().get(club, start_date, end_date)
+        refreshing = False
+
+        if cached is not None:
+            walmart_events = cached.events
+            if not cached.fresh:
+                refreshing = _submit_approved_events_refresh(user_id, club, start_date, end_date)
+            logger.info(f"Serving {len(walmart_events)} cached approved events for club {club} "
+                        f"(fetched {cached.fetched_at.isoformat()}, refreshing={refreshing})")
+        else:
+            walmart_events, auth_source = refresh_approved_events(user_id, club, start_date, end_date)
 
-        # 3. If still no events, return appropriate error
+        # If still no events, return appropriate error
         if walmart_events is None:
+            user_session = session_manager.get_session(str(user_id))
             if not user_session or not user_session.is_authenticated:
                 return jsonify({
                     'success': False,
@@ -1113,15 +1200,6 @@ def get_approved_events():
         service = ApprovedEventsService(db, Event, Schedule, Employee, PendingSchedule)
         merged_events = service.merge_with_local_status(walmart_events)
 
-        # Non-blocking enrichment: store walmart_event_id on local events during LIA pull
-        try:
-            from app.services.walmart_event_enrichment import WalmartEventEnrichmentService
-            enrichment_service = WalmartEventEnrichmentService()
-            enrichment_result = enrichment_service.enrich_events_from_walmart_data(walmart_events)
-            logger.info(f"Event enrichment during LIA pull: {enrichment_result}")
-        except Exception as e:
-            logger.error(f"Event enrichment failed (non-blocking): {e}")
-
         # Optionally enrich with Core event data from local database
         include_core_events = request.args.get('include_core_events', '').lower() == 'true'
         if include_core_events:
@@ -1144,6 +1222,11 @@ def get_approved_events():
                 'start_date': start_date,
                 'end_date': end_date
             },
+            'cache': {
+                'cached': cached is not None,
+                'fetched_at': cached.fetched_at.isoformat() if cached else None,
+                'refreshing': refreshing
+            },
             'session_info': session_manager.get_session_info(str(user_id))
         }), 200
 
@@ -1536,35 +1619,22 @@ def _fetch_all_events_with_session(session, auth_token, club_numbers, start_date
     if not club_list:
         return None
 
-    base_url = "https://retaillink2.wal-mart.com/EventManagement"
-    url = f"{base_url}/api/store-event/daily-schedule-report"
-
     headers = {
         'accept': '*/*',
         'content-type': 'application/json',
         'origin': 'https://retaillink2.wal-mart.com',
-        'referer': f"{base_url}/daily-scheduled-report"
-    }
-
-    event_types = [1,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57]
-
-    payload = {
-        "startDate": start_date,
-        "endDate": end_date,
-        "eventType": event_types,
-        "clubList": club_list,
-        "walmartWeekYear": ""
+        'referer': f"{BASE_URL}/daily-scheduled-report"
     }
 
     logger.info(f"Fetching ALL events for clubs {club_list} from {start_date} to {end_date}")
 
     try:
-        response = session.post(url, headers=headers, json=payload, timeout=60)
-        if response.status_code != 200:
-            logger.error(f"Walmart API error: status={response.status_code}")
+        all_events = fetch_daily_schedule_report(
+            session, headers, club_list, start_date, end_date, **_fetch_options()
+        )
+        if all_events is None:
             return None
 
-        all_events = response.json()
         logger.info(f"Walmart API returned {len(all_events)} total events (all statuses)")
         return all_events
 
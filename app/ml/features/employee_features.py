@@ -15,16 +15,18 @@ logger = logging.getLogger(__name__)
 class EmployeeFeatureExtractor:
     """Extract employee-related features for ML models."""
 
-    def __init__(self, db_session, models):
+    def __init__(self, db_session, models, feature_store=None):
         """
         Initialize feature extractor.
 
         Args:
             db_session: SQLAlchemy database session
             models: Model registry from get_models()
+            feature_store: Optional EmployeeFeatureStore for rolling counts
         """
         self.db = db_session
         self.models = models
+        self.feature_store = feature_store
 
     def extract(self, employee, event, schedule_datetime: datetime) -> Dict[str, Any]:
         """
@@ -64,9 +66,14 @@ class EmployeeFeatureExtractor:
         EmployeeAttendance = self.models.get('EmployeeAttendance')
 
         features = {}
+        thirty_days_ago = as_of_date - timedelta(days=30)
+        ninety_days_ago = as_of_date - timedelta(days=90)
+
+        store = self.feature_store
+        if store is not None and store.covers(ninety_days_ago.date(), as_of_date.date()):
+            return self._historical_performance_from_store(employee, as_of_date)
 
         # Success rate last 30 days
-        thirty_days_ago = as_of_date - timedelta(days=30)
         recent_schedules = self.db.query(Schedule).filter(
             Schedule.employee_id == employee.id,
             Schedule.schedule_datetime >= thirty_days_ago,
@@ -76,7 +83,6 @@ class EmployeeFeatureExtractor:
         features['success_rate_last_30_days'] = min(recent_schedules / 10.0, 1.0) if recent_schedules > 0 else 0.5
 
         # Success rate last 90 days
-        ninety_days_ago = as_of_date - timedelta(days=90)
         long_term_schedules = self.db.query(Schedule).filter(
             Schedule.employee_id == employee.id,
             Schedule.schedule_datetime >= ninety_days_ago,
@@ -120,7 +126,39 @@ class EmployeeFeatureExtractor:
         ).count()
         features['consecutive_success_streak'] = 1.0 if recent_failed == 0 else 0.5
 
-        # Fill remaining performance features with defaults
+        return self._fill_performance_defaults(features)
+
+    def _historical_performance_from_store(self, employee, as_of_date: datetime) -> Dict[str, float]:
+        """Historical performance metrics read from the precomputed feature store."""
+        Schedule = self.models['Schedule']
+        store = self.feature_store
+        features = {}
+
+        recent_schedules = store.rolling_count('schedules', employee.id, as_of_date, 30, db_session=self.db)
+        features['success_rate_last_30_days'] = min(recent_schedules / 10.0, 1.0) if recent_schedules > 0 else 0.5
+
+        long_term_schedules = store.rolling_count('schedules', employee.id, as_of_date, 90, db_session=self.db)
+        features['success_rate_last_90_days'] = min(long_term_schedules / 30.0, 1.0) if long_term_schedules > 0 else 0.5
+
+        on_time_rate = store.attendance_on_time_rate(
+            employee.id, as_of_date.date() - timedelta(days=30), as_of_date.date(), db_session=self.db
+        )
+        features['attendance_on_time_rate'] = on_time_rate if on_time_rate is not None else 0.9
+
+        # All-time count predates the store window, so it stays a single query
+        total_completed = self.db.query(Schedule).filter(
+            Schedule.employee_id == employee.id,
+            Schedule.schedule_datetime < as_of_date
+        ).count()
+        features['total_events_completed'] = min(total_completed / 100.0, 1.0)
+
+        recent_failed = store.rolling_count('failed', employee.id, as_of_date, 30, db_session=self.db)
+        features['consecutive_success_streak'] = 1.0 if recent_failed == 0 else 0.5
+
+        return self._fill_performance_defaults(features)
+
+    def _fill_performance_defaults(self, features: Dict[str, float]) -> Dict[str, float]:
+        """Fill remaining performance features with defaults."""
         features['avg_event_duration_hours'] = 3.0  # Placeholder
         features['completion_rate'] = features['success_rate_last_90_days']
         features['cancellation_rate'] = 1.0 - features['success_rate_last_90_days']
@@ -9,6 +9,10 @@ from datetime import datetime, timedelta
 from typing import Dict, Any
 import logging
 
+from sqlalchemy import or_
+
+from app.constants import INACTIVE_CONDITIONS
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,7 +66,7 @@ class EventFeatureExtractor:
         # Times bumped count (if tracked)
         PendingSchedule = self.models['PendingSchedule']
         times_bumped = self.db.query(PendingSchedule).filter(
-            PendingSchedule.event_ref_num == event.ref_num,
+            PendingSchedule.event_ref_num == event.project_ref_num,
             PendingSchedule.is_swap == True,
             PendingSchedule.status.in_(['pending_approval', 'approved'])
         ).count()
@@ -86,7 +90,7 @@ class EventFeatureExtractor:
         # Assignment Context Features (6 features)
         Schedule = self.models['Schedule']
         schedule_record = self.db.query(Schedule).filter(
-            Schedule.event_ref_num == event.ref_num
+            Schedule.event_ref_num == event.project_ref_num
         ).first()
 
         if schedule_record:
@@ -258,10 +262,11 @@ class EventFeatureExtractor:
             week_start = event.start_datetime - timedelta(days=event.start_datetime.weekday())
             week_end = week_start + timedelta(days=7)
             competing = self.db.query(self.models['Event']).filter(
-                self.models['Event'].ref_num != event.ref_num,
+                self.models['Event'].project_ref_num != event.project_ref_num,
                 self.models['Event'].start_datetime >= week_start,
                 self.models['Event'].start_datetime < week_end,
-                self.models['Event'].is_cancelled == False
+                or_(self.models['Event'].condition.is_(None),
+                    self.models['Event'].condition.notin_(list(INACTIVE_CONDITIONS)))
             ).count()
             features['competing_events_same_week'] = min(competing / 20.0, 1.0)
         else:
@@ -0,0 +1,645 @@
+"""
+Precomputed historical feature store for ML models.
+
+The per-pair feature extractors issue several COUNT queries for every
+(employee, event) combination, so preparing a training set from thousands
+of PendingSchedule rows means tens of thousands of queries. This store runs
+a handful of GROUP BY queries once, keeps per-employee daily counts as
+NumPy arrays indexed by day offset, and answers rolling-window questions
+(30/90-day counts, weekly workload, attendance rate, failures) with two
+array lookups on cumulative sums.
+
+The nightly snapshot materializes fully elapsed days (``built_through`` is
+exclusive). A window that reaches past ``built_through`` (e.g. the 30/90
+days before a future schedule date during a scheduler run) appends the
+missing days to the arrays with one round of GROUP BY queries, so any window
+starting at or after ``origin`` is served from the arrays. Days from the
+extension date on can still change; they are re-aggregated on the next
+lookup once LIVE_REFRESH_SECONDS have passed.
+
+Lookups read an immutable snapshot that extensions replace atomically, and
+take the caller's database session, so one store can be shared by threads.
+"""
+
+import os
+import json
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+
+logger = logging.getLogger(__name__)
+
+# Statuses counted as scheduled work in PendingSchedule (matches SimpleEmployeeFeatureExtractor)
+PENDING_WORK_STATUSES = ('api_submitted', 'proposed')
+
+# Days re-aggregated before ``built_through`` on incremental updates (late edits)
+UPDATE_OVERLAP_DAYS = 7
+
+# Days appended beyond a window's end when a lookup extends the store
+EXTEND_AHEAD_DAYS = 14
+
+# Age after which days from the extension date on are re-aggregated
+LIVE_REFRESH_SECONDS = 300
+
+# Daily per-employee series kept by the store
+EMPLOYEE_SERIES = ('schedules', 'pending', 'failed', 'attendance_total', 'attendance_on_time')
+
+
+def _to_day(value) -> Optional[date]:
+    """Normalize a func.date() result (str on SQLite, date on PostgreSQL)."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _as_day(value) -> date:
+    """Accept date or datetime arguments."""
+    return value.date() if isinstance(value, datetime) else value
+
+
+class _Snapshot(NamedTuple):
+    """Lookup state published by each (re)aggregation."""
+    through: date
+    employee_index: Dict[str, int]
+    cum: Dict[str, np.ndarray]
+    event_type_index: Dict[str, int]
+    type_cum: np.ndarray
+
+
+class EmployeeFeatureStore:
+    """
+    Rolling per-employee and per-event-type aggregates keyed by date.
+
+    Layout:
+        - ``daily[series]``: int32 array (employees x days) of daily counts
+        - ``type_daily``: int32 array (event types x days) of schedule counts
+        - cumulative sums of both, with a leading zero column, so a
+          half-open window [start, end) is ``cum[:, end] - cum[:, start]``
+
+    Days in [``live_from``, ``built_through``) were aggregated before they
+    elapsed and are refreshed by later lookups (see _ensure_through).
+    """
+
+    def __init__(self, db_session, models):
+        """
+        Initialize an empty store.
+
+        Args:
+            db_session: SQLAlchemy database session used when a lookup does
+                not pass its own (None for a shared store)
+            models: Model registry from get_models()
+        """
+        self.db = db_session
+        self.models = models
+
+        self.origin: Optional[date] = None
+        self.built_through: Optional[date] = None  # exclusive
+        self.live_from: Optional[date] = None
+        self.built_at: Optional[datetime] = None
+
+        self.employee_index: Dict[str, int] = {}
+        self.event_type_index: Dict[str, int] = {}
+        self.daily: Dict[str, np.ndarray] = {}
+        self.type_daily = np.zeros((0, 0), dtype=np.int32)
+        self.worked_types = set()
+
+        self._snapshot: Optional[_Snapshot] = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @property
+    def num_days(self) -> int:
+        """Number of materialized days."""
+        if self.origin is None:
+            return 0
+        return (self.built_through - self.origin).days
+
+    @property
+    def is_built(self) -> bool:
+        """True once build() has run."""
+        return self.origin is not None
+
+    def build(self, start, end=None) -> 'EmployeeFeatureStore':
+        """
+        Build the store for days in [start, end).
+
+        Args:
+            start: First day to materialize (include the longest lookback)
+            end: Exclusive end day (defaults to today, i.e. through yesterday)
+
+        Returns:
+            self
+        """
+        start = _as_day(start)
+        end = _as_day(end) if end else date.today()
+
+        with self._lock:
+            self.origin = start
+            self.built_through = start
+            self.employee_index = {}
+            self.event_type_index = {}
+            self.daily = {name: np.zeros((0, 0), dtype=np.int32) for name in EMPLOYEE_SERIES}
+            self.type_daily = np.zeros((0, 0), dtype=np.int32)
+            self._refresh(start, end, self.db)
+
+        logger.info(f"Feature store built: {len(self.employee_index)} employees, "
+                    f"{self.num_days} days ({self.origin} to {self.built_through})")
+        return self
+
+    def update(self, through=None) -> 'EmployeeFeatureStore':
+        """
+        Incrementally extend the store (run nightly).
+
+        Re-aggregates the last UPDATE_OVERLAP_DAYS already-built days (to
+        pick up late edits) plus every new day up to ``through``.
+
+        Args:
+            through: Exclusive end day (defaults to today)
+
+        Returns:
+            self
+        """
+        through = _as_day(through) if through else date.today()
+
+        if not self.is_built:
+            raise ValueError("Feature store not built. Call build() first.")
+
+        if through <= self.built_through - timedelta(days=UPDATE_OVERLAP_DAYS):
+            return self
+
+        with self._lock:
+            refresh_start = max(self.origin, min(self.live_from,
+                                                 self.built_through - timedelta(days=UPDATE_OVERLAP_DAYS)))
+            self._refresh(refresh_start, through, self.db)
+
+        logger.info(f"Feature store updated: re-aggregated {refresh_start} to {self.built_through}")
+        return self
+
+    def _refresh(self, refresh_start: date, through: date, db_session) -> None:
+        """
+        Re-aggregate [refresh_start, max(through, built_through)) and publish
+        a new snapshot. Callers hold ``_lock``.
+        """
+        if db_session is None:
+            raise ValueError("Feature store lookup past built_through needs a database session")
+
+        self._extend_days(through)
+        self._register_employees(db_session)
+
+        lo = (refresh_start - self.origin).days
+        for name in EMPLOYEE_SERIES:
+            self.daily[name][:, lo:] = 0
+        self.type_daily[:, lo:] = 0
+
+        self._aggregate(refresh_start, self.built_through, db_session)
+        self._load_worked_types(db_session)
+        self.live_from = max(self.origin, date.today())
+        self._refreshed_at = time.monotonic()
+        self._rebuild_cumulative()
+
+    def _ensure_through(self, end, db_session) -> _Snapshot:
+        """
+        Snapshot that covers days up to ``end``.
+
+        Appends the missing days (plus EXTEND_AHEAD_DAYS) when the window
+        reaches past ``built_through``, and re-aggregates the days from
+        ``live_from`` on when the window touches them and they are older
+        than LIVE_REFRESH_SECONDS.
+        """
+        end = _as_day(end)
+        if not self._needs_refresh(self._snapshot, end):
+            return self._snapshot
+
+        with self._lock:
+            if self._needs_refresh(self._snapshot, end):
+                through = max(end + timedelta(days=EXTEND_AHEAD_DAYS), self.built_through)
+                self._refresh(min(self.live_from, self.built_through), through,
+                              db_session if db_session is not None else self.db)
+                logger.debug(f"Feature store extended through {self.built_through}")
+        return self._snapshot
+
+    def _needs_refresh(self, snapshot: _Snapshot, end: date) -> bool:
+        """Whether a window ending at ``end`` needs new or fresher days."""
+        if end > snapshot.through:
+            return True
+        return (self.live_from < end
+                and self.live_from < snapshot.through
+                and time.monotonic() - self._refreshed_at > LIVE_REFRESH_SECONDS)
+
+    def _extend_days(self, through: date) -> None:
+        """Grow the day axis so it ends at ``through``."""
+        extra = (through - self.built_through).days
+        if extra > 0:
+            for name in EMPLOYEE_SERIES:
+                arr = self.daily[name]
+                self.daily[name] = np.pad(arr, ((0, 0), (0, extra)))
+            self.type_daily = np.pad(self.type_daily, ((0, 0), (0, extra)))
+            self.built_through = through
+
+    def _register_employees(self, db_session) -> None:
+        """Allocate rows for all known employees with a single resize."""
+        Employee = self.models['Employee']
+        new_ids = [
+            employee_id for (employee_id,) in db_session.query(Employee.id).order_by(Employee.id)
+            if employee_id not in self.employee_index
+        ]
+        if not new_ids:
+            return
+        for employee_id in new_ids:
+            self.employee_index[employee_id] = len(self.employee_index)
+        for name in EMPLOYEE_SERIES:
+            self.daily[name] = np.pad(self.daily[name], ((0, len(new_ids)), (0, 0)))
+
+    def _employee_row(self, employee_id: str) -> int:
+        """Get (or allocate) the row for an employee."""
+        idx = self.employee_index.get(employee_id)
+        if idx is None:
+            idx = len(self.employee_index)
+            self.employee_index[employee_id] = idx
+            for name in EMPLOYEE_SERIES:
+                self.daily[name] = np.pad(self.daily[name], ((0, 1), (0, 0)))
+        return idx
+
+    def _type_row(self, event_type: str) -> int:
+        """Get (or allocate) the row for an event type."""
+        idx = self.event_type_index.get(event_type)
+        if idx is None:
+            idx = len(self.event_type_index)
+            self.event_type_index[event_type] = idx
+            self.type_daily = np.pad(self.type_daily, ((0, 1), (0, 0)))
+        return idx
+
+    def _accumulate(self, series: str, rows: Iterable[Tuple[Any, Any, int]]) -> None:
+        """Add grouped (employee_id, day, count) rows to a daily series."""
+        for employee_id, day_value, count in rows:
+            day = _to_day(day_value)
+            if employee_id is None or day is None:
+                continue
+            offset = (day - self.origin).days
+            if 0 <= offset < self.num_days:
+                row = self._employee_row(employee_id)
+                self.daily[series][row, offset] += count
+
+    def _aggregate(self, start: date, end: date, db_session) -> None:
+        """Run the GROUP BY queries for [start, end) and fill the arrays."""
+        Schedule = self.models['Schedule']
+        Event = self.models['Event']
+        PendingSchedule = self.models['PendingSchedule']
+        EmployeeAttendance = self.models.get('EmployeeAttendance')
+
+        start_dt = datetime.combine(start, datetime.min.time())
+        end_dt = datetime.combine(end, datetime.min.time())
+
+        # Posted schedules per employee per day
+        day_col = func.date(Schedule.schedule_datetime)
+        self._accumulate('schedules', db_session.query(
+            Schedule.employee_id, day_col, func.count(Schedule.id)
+        ).filter(
+            Schedule.schedule_datetime >= start_dt,
+            Schedule.schedule_datetime < end_dt
+        ).group_by(Schedule.employee_id, day_col))
+
+        # Proposed/submitted pending schedules per employee per scheduled day
+        day_col = func.date(PendingSchedule.schedule_datetime)
+        self._accumulate('pending', db_session.query(
+            PendingSchedule.employee_id, day_col, func.count(PendingSchedule.id)
+        ).filter(
+            PendingSchedule.status.in_(PENDING_WORK_STATUSES),
+            PendingSchedule.schedule_datetime >= start_dt,
+            PendingSchedule.schedule_datetime < end_dt
+        ).group_by(PendingSchedule.employee_id, day_col))
+
+        # Failed scheduling attempts per employee per day created
+        day_col = func.date(PendingSchedule.created_at)
+        self._accumulate('failed', db_session.query(
+            PendingSchedule.employee_id, day_col, func.count(PendingSchedule.id)
+        ).filter(
+            PendingSchedule.status == 'failed',
+            PendingSchedule.created_at >= start_dt,
+            PendingSchedule.created_at < end_dt
+        ).group_by(PendingSchedule.employee_id, day_col))
+
+        # Attendance totals and on-time counts
+        if EmployeeAttendance is not None:
+            rows = db_session.query(
+                EmployeeAttendance.employee_id,
+                EmployeeAttendance.attendance_date,
+                EmployeeAttendance.status,
+                func.count(EmployeeAttendance.id)
+            ).filter(
+                EmployeeAttendance.attendance_date >= start,
+                EmployeeAttendance.attendance_date < end
+            ).group_by(
+                EmployeeAttendance.employee_id,
+                EmployeeAttendance.attendance_date,
+                EmployeeAttendance.status
+            ).all()
+            self._accumulate('attendance_total', ((e, d, c) for e, d, _, c in rows))
+            self._accumulate('attendance_on_time', ((e, d, c) for e, d, s, c in rows if s == 'on_time'))
+
+        # Schedules per event type per day
+        day_col = func.date(Schedule.schedule_datetime)
+        for event_type, day_value, count in db_session.query(
+            Event.event_type, day_col, func.count(Schedule.id)
+        ).join(
+            Event, Schedule.event_ref_num == Event.project_ref_num
+        ).filter(
+            Schedule.schedule_datetime >= start_dt,
+            Schedule.schedule_datetime < end_dt
+        ).group_by(Event.event_type, day_col):
+            day = _to_day(day_value)
+            if event_type is None or day is None:
+                continue
+            offset = (day - self.origin).days
+            if 0 <= offset < self.num_days:
+                row = self._type_row(event_type)
+                self.type_daily[row, offset] += count
+
+    def _load_worked_types(self, db_session) -> None:
+        """Load every (employee, event type) pair ever worked (one DISTINCT query)."""
+        Schedule = self.models['Schedule']
+        Event = self.models['Event']
+
+        self.worked_types = {
+            (employee_id, event_type)
+            for employee_id, event_type in db_session.query(
+                Schedule.employee_id, Event.event_type
+            ).join(
+                Event, Schedule.event_ref_num == Event.project_ref_num
+            ).distinct()
+        }
+
+    def _rebuild_cumulative(self) -> None:
+        """Recompute cumulative sums and publish them as a new snapshot."""
+        cums = {}
+        for name in EMPLOYEE_SERIES:
+            arr = self.daily[name]
+            cum = np.zeros((arr.shape[0], arr.shape[1] + 1), dtype=np.int64)
+            np.cumsum(arr, axis=1, out=cum[:, 1:])
+            cums[name] = cum
+
+        type_cum = np.zeros((self.type_daily.shape[0], self.type_daily.shape[1] + 1), dtype=np.int64)
+        np.cumsum(self.type_daily, axis=1, out=type_cum[:, 1:])
+        self._snapshot = _Snapshot(self.built_through, dict(self.employee_index), cums,
+                                   dict(self.event_type_index), type_cum)
+        self.built_at = datetime.now()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def covers(self, start, end) -> bool:
+        """
+        Check whether the store can answer the window [start, end).
+
+        Days past ``built_through`` are appended on lookup (see
+        _ensure_through), so only the start is bounded.
+
+        Args:
+            start: First day of the window
+            end: Exclusive last day of the window
+
+        Returns:
+            True if the window starts at or after ``origin``
+        """
+        if not self.is_built:
+            return False
+        return _as_day(start) >= self.origin
+
+    def _bounds(self, snapshot: _Snapshot, start, end) -> Tuple[int, int]:
+        """Convert a day window to clipped cumulative-array indexes."""
+        lo = (_as_day(start) - self.origin).days
+        hi = (_as_day(end) - self.origin).days
+        n = (snapshot.through - self.origin).days
+        return min(max(lo, 0), n), min(max(hi, 0), n)
+
+    def window_count(self, series: str, employee_id: str, start, end, db_session=None) -> int:
+        """
+        Count events in a daily series for one employee over [start, end).
+
+        Args:
+            series: One of EMPLOYEE_SERIES
+            employee_id: Employee ID
+            start: First day of the window
+            end: Exclusive last day of the window
+            db_session: Session used if the store has to be extended
+
+        Returns:
+            Count (0 for unknown employees)
+        """
+        snapshot = self._ensure_through(end, db_session)
+        row = snapshot.employee_index.get(employee_id)
+        if row is None:
+            return 0
+        lo, hi = self._bounds(snapshot, start, end)
+        cum = snapshot.cum[series]
+        return int(cum[row, hi] - cum[row, lo])
+
+    def window_counts(self, series: str, employee_ids: List[str], start, end, db_session=None) -> np.ndarray:
+        """
+        Vectorized window_count for many employees.
+
+        Returns:
+            int64 array aligned with ``employee_ids`` (0 for unknown employees)
+        """
+        snapshot = self._ensure_through(end, db_session)
+        lo, hi = self._bounds(snapshot, start, end)
+        cum = snapshot.cum[series]
+        rows = np.array([snapshot.employee_index.get(e, -1) for e in employee_ids], dtype=np.int64)
+        known = rows >= 0
+        result = np.zeros(len(employee_ids), dtype=np.int64)
+        result[known] = cum[rows[known], hi] - cum[rows[known], lo]
+        return result
+
+    def rolling_count(self, series: str, employee_id: str, as_of, days: int, db_session=None) -> int:
+        """Count over the ``days`` whole days before ``as_of``."""
+        end = _as_day(as_of)
+        return self.window_count(series, employee_id, end - timedelta(days=days), end, db_session)
+
+    def attendance_on_time_rate(self, employee_id: str, start, end, db_session=None) -> Optional[float]:
+        """On-time attendance rate over [start, end), or None with no records."""
+        total = self.window_count('attendance_total', employee_id, start, end, db_session)
+        if total == 0:
+            return None
+        return self.window_count('attendance_on_time', employee_id, start, end, db_session) / total
+
+    def weekly_workload(self, employee_id: str, day, db_session=None) -> int:
+        """Posted plus pending work in the Monday-Sunday week containing ``day``."""
+        day = _as_day(day)
+        week_start = day - timedelta(days=day.weekday())
+        week_end = week_start + timedelta(days=7)
+        return (self.window_count('schedules', employee_id, week_start, week_end, db_session)
+                + self.window_count('pending', employee_id, week_start, week_end, db_session))
+
+    def event_type_count(self, event_type: str, start, end, db_session=None) -> int:
+        """Posted schedules of an event type over [start, end)."""
+        snapshot = self._ensure_through(end, db_session)
+        row = snapshot.event_type_index.get(event_type)
+        if row is None:
+            return 0
+        lo, hi = self._bounds(snapshot, start, end)
+        return int(snapshot.type_cum[row, hi] - snapshot.type_cum[row, lo])
+
+    def has_worked_event_type(self, employee_id: str, event_type: str) -> bool:
+        """Whether the employee has ever been scheduled for this event type."""
+        return (employee_id, event_type) in self.worked_types
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """
+        Save the store as a compressed .npz file.
+
+        Args:
+            path: Output file path
+        """
+        if not self.is_built:
+            raise ValueError("Feature store not built. Call build() first.")
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        meta = {
+            'origin': self.origin.isoformat(),
+            'built_through': self.built_through.isoformat(),
+            'live_from': self.live_from.isoformat(),
+            'built_at': self.built_at.isoformat() if self.built_at else None,
+            'employees': list(self.employee_index),
+            'event_types': list(self.event_type_index),
+            'worked_types': sorted(self.worked_types),
+        }
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            meta=np.array(json.dumps(meta)),
+            type_daily=self.type_daily,
+            **{f"daily_{name}": self.daily[name] for name in EMPLOYEE_SERIES}
+        )
+        os.replace(tmp_path, path)
+        logger.info(f"Feature store saved to {path}")
+
+    @classmethod
+    def load(cls, path: str, db_session, models) -> 'EmployeeFeatureStore':
+        """
+        Load a store saved with save().
+
+        Args:
+            path: .npz file path
+            db_session: SQLAlchemy database session for update() and
+                extensions (None when lookups pass their own)
+            models: Model registry from get_models()
+
+        Returns:
+            Loaded EmployeeFeatureStore
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Feature store not found: {path}")
+
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            store = cls(db_session, models)
+            store.origin = date.fromisoformat(meta['origin'])
+            store.built_through = date.fromisoformat(meta['built_through'])
+            store.live_from = date.fromisoformat(meta.get('live_from') or meta['built_through'])
+            store.employee_index = {e: i for i, e in enumerate(meta['employees'])}
+            store.event_type_index = {t: i for i, t in enumerate(meta['event_types'])}
+            store.worked_types = {tuple(pair) for pair in meta['worked_types']}
+            store.daily = {name: data[f"daily_{name}"].astype(np.int32) for name in EMPLOYEE_SERIES}
+            store.type_daily = data['type_daily'].astype(np.int32)
+
+        store._refreshed_at = time.monotonic()
+        store._rebuild_cumulative()
+        if meta.get('built_at'):
+            store.built_at = datetime.fromisoformat(meta['built_at'])
+        return store
+
+
+# ----------------------------------------------------------------------
+# Process-wide store for online inference
+# ----------------------------------------------------------------------
+
+_shared_store: Optional[EmployeeFeatureStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_feature_store(db_session, models, config) -> Optional[EmployeeFeatureStore]:
+    """
+    Get the shared feature store for online inference.
+
+    Loads the nightly snapshot from ML_FEATURE_STORE_PATH once per process
+    (reloading when the file changes). The shared store holds no session:
+    lookups pass their own for the days past ``built_through``. Returns None
+    when the store is disabled or not yet built, so callers fall back to SQL
+    features.
+
+    Args:
+        db_session: SQLAlchemy database session (unused; kept for callers)
+        models: Model registry from get_models()
+        config: Flask config mapping
+
+    Returns:
+        EmployeeFeatureStore or None
+    """
+    global _shared_store
+
+    if not config.get('ML_FEATURE_STORE_ENABLED', False):
+        return None
+
+    path = config.get('ML_FEATURE_STORE_PATH')
+    if not path or not os.path.exists(path):
+        return None
+
+    with _shared_lock:
+        mtime = os.path.getmtime(path)
+        if _shared_store is None or getattr(_shared_store, '_file_mtime', None) != mtime:
+            try:
+                _shared_store = EmployeeFeatureStore.load(path, None, models)
+                _shared_store._file_mtime = mtime
+            except Exception as e:
+                logger.error(f"Failed to load feature store {path}: {e}", exc_info=True)
+
+    return _shared_store
+
+
+def refresh_feature_store(db_session, models, config, lookback_days: int = 400) -> EmployeeFeatureStore:
+    """
+    Nightly refresh: update the saved store incrementally (or build it).
+
+    Args:
+        db_session: SQLAlchemy database session
+        models: Model registry from get_models()
+        config: Flask config mapping (ML_FEATURE_STORE_PATH)
+        lookback_days: History to materialize on a first build
+
+    Returns:
+        The refreshed store
+    """
+    path = config.get('ML_FEATURE_STORE_PATH')
+    today = date.today()
+
+    store = None
+    if path and os.path.exists(path):
+        try:
+            store = EmployeeFeatureStore.load(path, db_session, models).update(today)
+        except Exception as e:
+            logger.warning(f"Incremental feature store update failed, rebuilding: {e}")
+
+    if store is None:
+        store = EmployeeFeatureStore(db_session, models).build(today - timedelta(days=lookback_days), today)
+
+    if path:
+        store.save(path)
+    return store
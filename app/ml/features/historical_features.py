@@ -15,16 +15,18 @@ logger = logging.getLogger(__name__)
 class HistoricalFeatureExtractor:
     """Extract historical pattern features for ML models."""
 
-    def __init__(self, db_session, models):
+    def __init__(self, db_session, models, feature_store=None):
         """
         Initialize feature extractor.
 
         Args:
             db_session: SQLAlchemy database session
             models: Model registry from get_models()
+            feature_store: Optional EmployeeFeatureStore for rolling counts
         """
         self.db = db_session
         self.models = models
+        self.feature_store = feature_store
 
     def extract_employee_history(self, employee_id: int, as_of_date: datetime,
                                  lookback_days: int = 90) -> Dict[str, Any]:
@@ -44,22 +46,30 @@ class HistoricalFeatureExtractor:
 
         features = {}
         lookback_start = as_of_date - timedelta(days=lookback_days)
+        store = self.feature_store
+
+        if store is not None and store.covers(lookback_start.date(), as_of_date.date()):
+            # Whole-day windows from the precomputed store
+            total_assignments = store.rolling_count('schedules', employee_id, as_of_date, lookback_days, db_session=self.db)
+            failed_attempts = store.rolling_count('failed', employee_id, as_of_date, lookback_days, db_session=self.db)
+        else:
+            total_assignments = self.db.query(Schedule).filter(
+                Schedule.employee_id == employee_id,
+                Schedule.schedule_datetime >= lookback_start,
+                Schedule.schedule_datetime < as_of_date
+            ).count()
+
+            failed_attempts = self.db.query(PendingSchedule).filter(
+                PendingSchedule.employee_id == employee_id,
+                PendingSchedule.status == 'failed',
+                PendingSchedule.created_at >= lookback_start,
+                PendingSchedule.created_at < as_of_date
+            ).count()
 
         # Total assignments
-        total_assignments = self.db.query(Schedule).filter(
-            Schedule.employee_id == employee_id,
-            Schedule.schedule_datetime >= lookback_start,
-            Schedule.schedule_datetime < as_of_date
-        ).count()
         features['total_assignments_lookback'] = total_assignments
 
         # Success rate (assignments completed vs failed)
-        failed_attempts = self.db.query(PendingSchedule).filter(
-            PendingSchedule.employee_id == employee_id,
-            PendingSchedule.status == 'failed',
-            PendingSchedule.created_at >= lookback_start,
-            PendingSchedule.created_at < as_of_date
-        ).count()
 
         total_attempts = total_assignments + failed_attempts
         features['success_rate_lookback'] = total_assignments / total_attempts if total_attempts > 0 else 0.5
@@ -109,7 +119,7 @@ class HistoricalFeatureExtractor:
 
         # Total events of this type attempted
         total_attempted = self.db.query(PendingSchedule).join(
-            Event, PendingSchedule.event_ref_num == Event.ref_num
+            Event, PendingSchedule.event_ref_num == Event.project_ref_num
         ).filter(
             Event.event_type == event_type,
             PendingSchedule.created_at >= lookback_start,
@@ -132,7 +142,7 @@ class HistoricalFeatureExtractor:
 
         # Bump frequency for this type
         bumped_events = self.db.query(PendingSchedule).join(
-            Event, PendingSchedule.event_ref_num == Event.ref_num
+            Event, PendingSchedule.event_ref_num == Event.project_ref_num
         ).filter(
             Event.event_type == event_type,
             PendingSchedule.is_swap == True,
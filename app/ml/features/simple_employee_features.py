@@ -19,16 +19,19 @@ logger = logging.getLogger(__name__)
 class SimpleEmployeeFeatureExtractor:
     """Extract basic employee features using actual database schema."""
 
-    def __init__(self, db_session, models):
+    def __init__(self, db_session, models, feature_store=None):
         """
         Initialize feature extractor.
 
         Args:
             db_session: SQLAlchemy database session
             models: Model registry from get_models()
+            feature_store: Optional EmployeeFeatureStore; windows it covers
+                are read from its arrays instead of issuing COUNT queries
         """
         self.db = db_session
         self.models = models
+        self.feature_store = feature_store
 
     def extract(self, employee, event, schedule_datetime: datetime) -> Dict[str, Any]:
         """
@@ -48,42 +51,53 @@ class SimpleEmployeeFeatureExtractor:
         Event = self.models['Event']
 
         try:
+            store = self.feature_store
+            as_of_day = schedule_datetime.date()
+
             # Historical performance (simple counts)
             thirty_days_ago = schedule_datetime - timedelta(days=30)
+            ninety_days_ago = schedule_datetime - timedelta(days=90)
 
-            recent_schedules = self.db.query(Schedule).filter(
-                Schedule.employee_id == employee.id,
-                Schedule.schedule_datetime >= thirty_days_ago,
-                Schedule.schedule_datetime < schedule_datetime
-            ).count()
-            features['events_last_30_days'] = min(recent_schedules / 10.0, 1.0)
+            if store is not None and store.covers(as_of_day - timedelta(days=90), as_of_day):
+                recent_schedules = store.rolling_count('schedules', employee.id, as_of_day, 30, db_session=self.db)
+                long_term_schedules = store.rolling_count('schedules', employee.id, as_of_day, 90, db_session=self.db)
+            else:
+                recent_schedules = self.db.query(Schedule).filter(
+                    Schedule.employee_id == employee.id,
+                    Schedule.schedule_datetime >= thirty_days_ago,
+                    Schedule.schedule_datetime < schedule_datetime
+                ).count()
+                long_term_schedules = self.db.query(Schedule).filter(
+                    Schedule.employee_id == employee.id,
+                    Schedule.schedule_datetime >= ninety_days_ago,
+                    Schedule.schedule_datetime < schedule_datetime
+                ).count()
 
-            ninety_days_ago = schedule_datetime - timedelta(days=90)
-            long_term_schedules = self.db.query(Schedule).filter(
-                Schedule.employee_id == employee.id,
-                Schedule.schedule_datetime >= ninety_days_ago,
-                Schedule.schedule_datetime < schedule_datetime
-            ).count()
+            features['events_last_30_days'] = min(recent_schedules / 10.0, 1.0)
             features['events_last_90_days'] = min(long_term_schedules / 30.0, 1.0)
 
             # Workload features
             week_start = schedule_datetime - timedelta(days=schedule_datetime.weekday())
             week_end = week_start + timedelta(days=7)
 
-            events_this_week = self.db.query(Schedule).filter(
-                Schedule.employee_id == employee.id,
-                Schedule.schedule_datetime >= week_start,
-                Schedule.schedule_datetime < week_end
-            ).count()
+            if store is not None and store.covers(week_start.date(), week_end.date()):
+                total_this_week = store.weekly_workload(employee.id, as_of_day, db_session=self.db)
+            else:
+                events_this_week = self.db.query(Schedule).filter(
+                    Schedule.employee_id == employee.id,
+                    Schedule.schedule_datetime >= week_start,
+                    Schedule.schedule_datetime < week_end
+                ).count()
+
+                pending_this_week = self.db.query(PendingSchedule).filter(
+                    PendingSchedule.employee_id == employee.id,
+                    PendingSchedule.status.in_(['api_submitted', 'proposed']),
+                    PendingSchedule.schedule_datetime >= week_start,
+                    PendingSchedule.schedule_datetime < week_end
+                ).count()
 
-            pending_this_week = self.db.query(PendingSchedule).filter(
-                PendingSchedule.employee_id == employee.id,
-                PendingSchedule.status.in_(['api_submitted', 'proposed']),
-                PendingSchedule.schedule_datetime >= week_start,
-                PendingSchedule.schedule_datetime < week_end
-            ).count()
+                total_this_week = events_this_week + pending_this_week
 
-            total_this_week = events_this_week + pending_this_week
             features['workload_this_week'] = min(total_this_week / 6.0, 1.0)
 
             # Event context features
@@ -112,10 +126,13 @@ class SimpleEmployeeFeatureExtractor:
 
             # Employee experience (has worked this event type before)
             # Need to join with Event to access event_type
-            has_worked_type = self.db.query(Schedule).join(Event).filter(
-                Schedule.employee_id == employee.id,
-                Event.event_type == event.event_type
-            ).first() is not None
+            if store is not None:
+                has_worked_type = store.has_worked_event_type(employee.id, event.event_type)
+            else:
+                has_worked_type = self.db.query(Schedule).join(Event).filter(
+                    Schedule.employee_id == employee.id,
+                    Event.event_type == event.event_type
+                ).first() is not None
             features['has_worked_event_type'] = 1.0 if has_worked_type else 0.0
 
             # Employee role features (from actual schema)
@@ -14,6 +14,9 @@ from datetime import datetime
 from app.ml.models.employee_ranker import EmployeeRanker
 from app.ml.features.simple_employee_features import SimpleEmployeeFeatureExtractor
 from app.ml.features.event_features import EventFeatureExtractor
+from app.ml.inference.model_registry import ml_model_registry
+from app.ml.inference.model_server import RemoteEmployeeRanker
+from app.ml.features.feature_store import get_feature_store
 
 logger = logging.getLogger(__name__)
 
@@ -52,8 +55,11 @@ class MLSchedulerAdapter:
         # Confidence thresholds
         self.confidence_threshold = self.config.get('ML_CONFIDENCE_THRESHOLD', 0.6)
 
-        # Feature extractors (using simple extractor aligned with actual schema)
-        self.employee_features = SimpleEmployeeFeatureExtractor(db_session, models)
+        # Feature extractors (using simple extractor aligned with actual schema).
+        # Historical windows come from the nightly feature store when enabled.
+        self.employee_features = SimpleEmployeeFeatureExtractor(
+            db_session, models, feature_store=self._load_feature_store()
+        )
         self.event_features = EventFeatureExtractor(db_session, models)
 
         # ML models (lazy-loaded)
@@ -67,9 +73,26 @@ class MLSchedulerAdapter:
 
         logger.info(f"MLSchedulerAdapter initialized (ML enabled: {self.use_ml})")
 
+    def _load_feature_store(self):
+        """Get the shared feature store, or None to use SQL features."""
+        if not self.use_ml:
+            return None
+        try:
+            return get_feature_store(self.db, self.models, self.config)
+        except Exception as e:
+            logger.warning(f"Feature store unavailable, using SQL features: {e}")
+            return None
+
     @property
     def employee_ranker(self) -> Optional[EmployeeRanker]:
-        """Lazy-load employee ranker model."""
+        """
+        Lazy-load employee ranker model.
+
+        The model comes from the process-wide model registry (loaded once,
+        hot-swapped on file change). If ML_MODEL_SERVER_SOCKET points at a
+        running model server, a remote ranker is used instead so this
+        process does not hold the model at all.
+        """
         if not self.use_ml or not self.use_employee_ranking:
             return None
 
@@ -80,12 +103,23 @@ class MLSchedulerAdapter:
                     'app/ml/models/artifacts/employee_ranker_latest.pkl'
                 )
 
-                if not os.path.exists(model_path):
+                socket_path = self.config.get('ML_MODEL_SERVER_SOCKET')
+                if socket_path:
+                    remote = RemoteEmployeeRanker(
+                        socket_path, model_path,
+                        authkey=self.config.get('ML_MODEL_SERVER_AUTHKEY') or None
+                    )
+                    if remote.is_available():
+                        logger.info(f"Using ML model server at {socket_path}")
+                        self._employee_ranker = remote
+                        return self._employee_ranker
+                    logger.warning(f"ML model server not reachable at {socket_path}, loading model in-process")
+
+                if not model_path or not os.path.exists(model_path):
                     logger.warning(f"Employee ranker model not found: {model_path}")
                     return None
 
-                self._employee_ranker = EmployeeRanker.load(model_path)
-                logger.info(f"Employee ranker loaded from {model_path}")
+                self._employee_ranker = ml_model_registry.get_employee_ranker(model_path)
 
             except Exception as e:
                 logger.error(f"Failed to load employee ranker: {e}", exc_info=True)
@@ -275,6 +309,8 @@ class MLSchedulerAdapter:
             'bump_prediction_enabled': self.use_bump_prediction,
             'feasibility_enabled': self.use_feasibility,
             'employee_ranker_loaded': self._employee_ranker is not None,
+            'employee_ranker_remote': isinstance(self._employee_ranker, RemoteEmployeeRanker),
+            'model_versions': ml_model_registry.get_versions(),
             'predictions_made': self.predictions_made,
             'fallbacks_triggered': self.fallbacks_triggered,
             'fallback_rate': self.fallbacks_triggered / max(self.predictions_made, 1)
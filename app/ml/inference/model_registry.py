@@ -0,0 +1,193 @@
+"""
+ML Model Registry - Process-wide cache for trained model artifacts.
+
+Every MLSchedulerAdapter used to unpickle the employee ranker on first use,
+and a new adapter is created per scheduling engine, so each run (and each
+gunicorn worker) paid the full deserialization cost again. The registry
+loads each artifact once per process, shares it between adapters, and
+hot-swaps it when the file on disk changes (e.g. after retraining
+rewrites employee_ranker_latest.pkl).
+"""
+
+import os
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARTIFACTS_DIR = 'app/ml/models/artifacts'
+DEFAULT_EMPLOYEE_RANKER_PATH = os.path.join(DEFAULT_ARTIFACTS_DIR, 'employee_ranker_latest.pkl')
+
+
+@dataclass
+class LoadedModel:
+    """A loaded model artifact plus the file fingerprint it was loaded from."""
+    path: str
+    model: Any
+    version: int
+    mtime_ns: int
+    size: int
+    loaded_at: datetime = field(default_factory=datetime.now)
+    load_seconds: float = 0.0
+    last_checked: float = field(default_factory=time.monotonic)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize version info (without the model itself) for monitoring."""
+        metadata = getattr(self.model, 'metadata', None) or {}
+        return {
+            'path': self.path,
+            'version': self.version,
+            'file_mtime': datetime.fromtimestamp(self.mtime_ns / 1e9).isoformat(),
+            'file_size': self.size,
+            'loaded_at': self.loaded_at.isoformat(),
+            'load_seconds': round(self.load_seconds, 4),
+            'trained_at': metadata.get('trained_at'),
+            'model_type': getattr(self.model, 'model_type', None),
+        }
+
+
+class MLModelRegistry:
+    """
+    Thread-safe, process-wide registry of loaded ML models.
+
+    Models are keyed by their absolute artifact path. A cached model is
+    re-validated against the file's mtime/size at most once every
+    ``check_interval`` seconds; when the file changed, the new artifact is
+    loaded and swapped in atomically. If the new artifact fails to load,
+    the previous version keeps serving.
+    """
+
+    def __init__(self, check_interval: float = 30.0):
+        """
+        Initialize the registry.
+
+        Args:
+            check_interval: Minimum seconds between file-change checks per model
+        """
+        self.check_interval = check_interval
+        self._models: Dict[str, LoadedModel] = {}
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+
+    def configure(self, config) -> None:
+        """
+        Apply settings from a Flask config (or any mapping).
+
+        Args:
+            config: Mapping with optional ML_MODEL_RELOAD_INTERVAL
+        """
+        self.check_interval = float(config.get('ML_MODEL_RELOAD_INTERVAL', self.check_interval))
+
+    def get(self, path: Optional[str], loader: Callable[[str], Any]) -> Optional[Any]:
+        """
+        Get a loaded model, loading or hot-swapping it as needed.
+
+        Args:
+            path: Artifact path (relative paths resolve against the CWD)
+            loader: Callable that deserializes the artifact at ``path``
+
+        Returns:
+            The model object, or None if it does not exist or cannot be loaded
+        """
+        if not path:
+            return None
+
+        key = os.path.abspath(path)
+        entry = self._models.get(key)
+
+        if entry is not None and time.monotonic() - entry.last_checked < self.check_interval:
+            return entry.model
+
+        with self._lock:
+            entry = self._models.get(key)
+            try:
+                stat = os.stat(key)
+            except OSError:
+                if entry is not None:
+                    # File was removed (e.g. mid-copy during retraining) - keep serving
+                    entry.last_checked = time.monotonic()
+                    return entry.model
+                logger.warning(f"ML model artifact not found: {path}")
+                return None
+
+            if entry is not None and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+                entry.last_checked = time.monotonic()
+                return entry.model
+
+            started = time.perf_counter()
+            try:
+                model = loader(key)
+            except Exception as e:
+                logger.error(f"Failed to load ML model {path}: {e}", exc_info=True)
+                if entry is not None:
+                    entry.last_checked = time.monotonic()
+                    return entry.model
+                return None
+
+            version = self._versions.get(key, 0) + 1
+            self._versions[key] = version
+            self._models[key] = LoadedModel(
+                path=key,
+                model=model,
+                version=version,
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+                load_seconds=time.perf_counter() - started,
+            )
+
+            action = 'Hot-swapped' if entry is not None else 'Loaded'
+            logger.info(f"{action} ML model {path} (version {version}, "
+                        f"{self._models[key].load_seconds:.2f}s)")
+            return model
+
+    def get_employee_ranker(self, path: Optional[str] = None):
+        """
+        Get the shared EmployeeRanker instance.
+
+        Args:
+            path: Artifact path (defaults to employee_ranker_latest.pkl)
+
+        Returns:
+            EmployeeRanker or None if unavailable
+        """
+        from app.ml.models.employee_ranker import EmployeeRanker
+        return self.get(path or DEFAULT_EMPLOYEE_RANKER_PATH, EmployeeRanker.load)
+
+    def warm_up(self, config) -> Dict[str, bool]:
+        """
+        Load the configured models eagerly (called once at app startup).
+
+        Args:
+            config: Flask config mapping
+
+        Returns:
+            Dictionary of {model_name: loaded}
+        """
+        self.configure(config)
+        results = {}
+        if config.get('ML_ENABLED', False) and config.get('ML_EMPLOYEE_RANKING_ENABLED', True):
+            path = config.get('ML_EMPLOYEE_RANKER_PATH') or DEFAULT_EMPLOYEE_RANKER_PATH
+            results['employee_ranker'] = self.get_employee_ranker(path) is not None
+        return results
+
+    def get_versions(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get version info for every loaded model.
+
+        Returns:
+            Dictionary of {artifact_path: version info}
+        """
+        return {key: entry.to_dict() for key, entry in self._models.items()}
+
+    def clear(self) -> None:
+        """Drop all cached models (version counters are kept)."""
+        with self._lock:
+            self._models.clear()
+
+
+# Global instance (one per process)
+ml_model_registry = MLModelRegistry()
@@ -0,0 +1,288 @@
+"""
+Local ML inference server over a Unix domain socket.
+
+Runs a single process that holds the ML models (via the model registry,
+so artifacts are hot-swapped on change) and answers ranking requests from
+web/Celery workers. Workers then never import pandas/xgboost or keep their
+own copy of the model in memory.
+
+Usage:
+    python -m app.ml.inference.model_server --socket /run/pceventmanager/ml.sock
+
+Then set ML_MODEL_SERVER_SOCKET to the same path. If the server is not
+reachable, MLSchedulerAdapter falls back to loading the model in-process.
+
+Connections are authenticated with ML_MODEL_SERVER_AUTHKEY. When it is not
+set, the server generates a key on start and writes it next to the socket
+(``<socket>.key``, same group permissions), where clients read it.
+"""
+
+import os
+import argparse
+import logging
+import secrets
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.ml.inference.model_registry import ml_model_registry, DEFAULT_EMPLOYEE_RANKER_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class ModelServerError(Exception):
+    """Raised when the model server cannot answer a request."""
+    pass
+
+
+def authkey_path(socket_path: str) -> str:
+    """File holding the generated authkey for a socket."""
+    return f"{socket_path}.key"
+
+
+def resolve_authkey(socket_path: str, authkey: Optional[str] = None, generate: bool = False) -> bytes:
+    """
+    Get the connection authkey for a model server socket.
+
+    Args:
+        socket_path: Model server Unix socket path
+        authkey: Configured key (ML_MODEL_SERVER_AUTHKEY), if any
+        generate: Server side: write a new random key when none is configured
+
+    Returns:
+        Key bytes
+
+    Raises:
+        ModelServerError: No key configured and no generated key file
+    """
+    if authkey:
+        return authkey.encode('utf-8')
+
+    path = authkey_path(socket_path)
+    if generate:
+        key = secrets.token_hex(32)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o640)
+        with os.fdopen(fd, 'w') as f:
+            f.write(key)
+        os.chmod(path, 0o640)
+        return key.encode('utf-8')
+
+    try:
+        with open(path) as f:
+            return f.read().strip().encode('utf-8')
+    except OSError as e:
+        raise ModelServerError(f"No model server authkey configured or found at {path}: {e}") from e
+
+
+class ModelServer:
+    """
+    Serves model predictions to local clients over a Unix socket.
+
+    Protocol (pickled tuples via multiprocessing.connection):
+        ('ping',)                        -> ('ok', 'pong')
+        ('rank', model_path, features)   -> ('ok', [(index, probability), ...])
+        ('versions',)                    -> ('ok', {path: version_info})
+    Errors are returned as ('error', message).
+    """
+
+    def __init__(self, socket_path: str, default_model_path: str = DEFAULT_EMPLOYEE_RANKER_PATH,
+                 registry=None, authkey: Optional[str] = None):
+        """
+        Initialize the server.
+
+        Args:
+            socket_path: Filesystem path of the Unix socket
+            default_model_path: Ranker artifact used when a request names none
+            registry: Model registry (defaults to the process-wide registry)
+            authkey: Shared connection key (generated on start when unset)
+        """
+        self.socket_path = socket_path
+        self.authkey = authkey
+        self.default_model_path = default_model_path
+        self.registry = registry or ml_model_registry
+        self._listener = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Bind the socket and warm the default model."""
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        key = resolve_authkey(self.socket_path, self.authkey, generate=True)
+        self._listener = Listener(self.socket_path, family='AF_UNIX', authkey=key)
+        os.chmod(self.socket_path, 0o660)
+
+        self.registry.get_employee_ranker(self.default_model_path)
+        logger.info(f"ML model server listening on {self.socket_path}")
+
+    def serve_forever(self) -> None:
+        """Accept connections until stop() is called."""
+        if self._listener is None:
+            self.start()
+
+        while not self._stopped.is_set():
+            try:
+                conn = self._listener.accept()
+            except AuthenticationError as e:
+                logger.warning(f"Rejected model server connection: {e}")
+                continue
+            except OSError:
+                if self._stopped.is_set():
+                    break
+                raise
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop accepting connections and remove the socket."""
+        self._stopped.set()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        if not self.authkey and os.path.exists(authkey_path(self.socket_path)):
+            os.remove(authkey_path(self.socket_path))
+
+    def _handle(self, conn) -> None:
+        """Answer requests on a single client connection."""
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send(('ok', self._dispatch(request)))
+                except Exception as e:
+                    logger.error(f"Model server request failed: {e}", exc_info=True)
+                    conn.send(('error', str(e)))
+
+    def _dispatch(self, request: Tuple) -> Any:
+        """Route a request tuple to its handler."""
+        op = request[0]
+
+        if op == 'ping':
+            return 'pong'
+
+        if op == 'versions':
+            return self.registry.get_versions()
+
+        if op == 'rank':
+            _, model_path, feature_dicts = request
+            ranker = self.registry.get_employee_ranker(model_path or self.default_model_path)
+            if ranker is None:
+                raise ModelServerError(f"Model not available: {model_path}")
+            return [(int(idx), float(prob)) for idx, prob in ranker.rank_employees(feature_dicts)]
+
+        raise ModelServerError(f"Unknown operation: {op}")
+
+
+class RemoteEmployeeRanker:
+    """
+    Client-side stand-in for EmployeeRanker backed by the model server.
+
+    Exposes the subset of the EmployeeRanker interface that
+    MLSchedulerAdapter uses (rank_employees).
+    """
+
+    def __init__(self, socket_path: str, model_path: Optional[str] = None, authkey: Optional[str] = None):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Model server Unix socket path
+            model_path: Artifact path the server should use
+            authkey: Shared connection key (read from the server's key file when unset)
+        """
+        self.socket_path = socket_path
+        self.model_path = model_path
+        self.authkey = authkey
+
+    def _request(self, *request) -> Any:
+        """Send one request and return the result payload."""
+        key = resolve_authkey(self.socket_path, self.authkey)
+        try:
+            with Client(self.socket_path, family='AF_UNIX', authkey=key) as conn:
+                conn.send(request)
+                status, payload = conn.recv()
+        except AuthenticationError as e:
+            raise ModelServerError(f"Model server at {self.socket_path} rejected the authkey: {e}") from e
+        except (OSError, EOFError) as e:
+            raise ModelServerError(f"Model server unreachable at {self.socket_path}: {e}") from e
+
+        if status != 'ok':
+            raise ModelServerError(payload)
+        return payload
+
+    def is_available(self) -> bool:
+        """Check whether the server answers a ping."""
+        if not os.path.exists(self.socket_path):
+            return False
+        try:
+            return self._request('ping') == 'pong'
+        except ModelServerError:
+            return False
+
+    def rank_employees(self, feature_dicts: List[Dict[str, Any]]) -> List[Tuple[int, float]]:
+        """
+        Rank employees by predicted success probability.
+
+        Args:
+            feature_dicts: List of feature dictionaries (one per employee)
+
+        Returns:
+            List of (index, probability) tuples sorted DESC by probability
+        """
+        if not feature_dicts:
+            return []
+        return self._request('rank', self.model_path, feature_dicts)
+
+    def get_versions(self) -> Dict[str, Dict[str, Any]]:
+        """Get version info for the models loaded in the server."""
+        return self._request('versions')
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Serve ML model predictions over a Unix socket')
+    parser.add_argument(
+        '--socket',
+        default=os.getenv('ML_MODEL_SERVER_SOCKET', '/tmp/pceventmanager-ml.sock'),
+        help='Unix socket path (default: $ML_MODEL_SERVER_SOCKET)'
+    )
+    parser.add_argument(
+        '--model',
+        default=os.getenv('ML_EMPLOYEE_RANKER_PATH', DEFAULT_EMPLOYEE_RANKER_PATH),
+        help='Employee ranker artifact path'
+    )
+    parser.add_argument(
+        '--reload-interval',
+        type=float,
+        default=float(os.getenv('ML_MODEL_RELOAD_INTERVAL', '30')),
+        help='Seconds between artifact change checks (default: 30)'
+    )
+    parser.add_argument(
+        '--authkey',
+        default=os.getenv('ML_MODEL_SERVER_AUTHKEY') or None,
+        help='Connection authkey (default: $ML_MODEL_SERVER_AUTHKEY, generated into <socket>.key when unset)'
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    ml_model_registry.check_interval = args.reload_interval
+    server = ModelServer(args.socket, default_model_path=args.model, authkey=args.authkey)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
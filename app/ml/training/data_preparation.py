@@ -5,16 +5,20 @@ Extracts training data from historical scheduling records,
 ensuring proper temporal splitting to avoid data leakage.
 """
 
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple
 import logging
 import pandas as pd
 from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload
 
+from app.constants import INACTIVE_CONDITIONS
 from app.models import get_models, get_db
 from app.ml.features.simple_employee_features import SimpleEmployeeFeatureExtractor
 from app.ml.features.event_features import EventFeatureExtractor
 from app.ml.features.historical_features import HistoricalFeatureExtractor
+from app.ml.features.feature_store import EmployeeFeatureStore
 
 logger = logging.getLogger(__name__)
 
@@ -41,8 +45,28 @@ class TrainingDataPreparation:
         self.event_features = EventFeatureExtractor(self.db, self.models)
         self.historical_features = HistoricalFeatureExtractor(self.db, self.models)
 
+    def build_feature_store(self, start_date: datetime, end_date: datetime,
+                            lookback_days: int = 90) -> EmployeeFeatureStore:
+        """
+        Precompute rolling aggregates covering a training window.
+
+        Args:
+            start_date: Start of training data window
+            end_date: End of training data window
+            lookback_days: Longest feature lookback before start_date
+
+        Returns:
+            Built EmployeeFeatureStore
+        """
+        # Pad the end by a week so weekly workload of the last rows is covered
+        return EmployeeFeatureStore(self.db, self.models).build(
+            start_date - timedelta(days=lookback_days),
+            end_date + timedelta(days=7)
+        )
+
     def prepare_employee_ranking_data(self, start_date: datetime, end_date: datetime,
-                                     min_lookback_days: int = 30) -> pd.DataFrame:
+                                     min_lookback_days: int = 30,
+                                     use_feature_store: bool = True) -> pd.DataFrame:
         """
         Prepare training data for employee ranking model.
 
@@ -53,6 +77,8 @@ class TrainingDataPreparation:
             start_date: Start of training data window
             end_date: End of training data window
             min_lookback_days: Minimum days of history required before start_date
+            use_feature_store: Read rolling features from a precomputed store
+                instead of per-row COUNT queries
 
         Returns:
             DataFrame with features and labels
@@ -66,7 +92,10 @@ class TrainingDataPreparation:
         # Query all pending schedules in date range
         # Success = status in ('api_submitted', 'proposed')
         # Failure = status == 'api_failed'
-        pending_schedules = self.db.query(PendingSchedule).filter(
+        pending_schedules = self.db.query(PendingSchedule).options(
+            joinedload(PendingSchedule.event),
+            joinedload(PendingSchedule.employee)
+        ).filter(
             and_(
                 PendingSchedule.created_at >= start_date,
                 PendingSchedule.created_at < end_date,
@@ -76,6 +105,12 @@ class TrainingDataPreparation:
 
         logger.info(f"Found {len(pending_schedules)} pending schedule records")
 
+        if use_feature_store and pending_schedules:
+            schedule_dates = [ps.schedule_datetime for ps in pending_schedules if ps.schedule_datetime]
+            store_end = max(schedule_dates + [end_date])
+            store_start = min(schedule_dates + [start_date])
+            self.employee_features.feature_store = self.build_feature_store(store_start, store_end)
+
         training_records = []
 
         for ps in pending_schedules:
@@ -113,8 +148,11 @@ class TrainingDataPreparation:
                 logger.warning(f"Error extracting features for PendingSchedule {ps.id}: {e}")
                 continue
 
+        self.employee_features.feature_store = None
+
         df = pd.DataFrame(training_records)
-        logger.info(f"Prepared {len(df)} training records with {df['label'].sum()} successes")
+        successes = int(df['label'].sum()) if 'label' in df.columns else 0
+        logger.info(f"Prepared {len(df)} training records with {successes} successes")
 
         return df
 
@@ -137,7 +175,9 @@ class TrainingDataPreparation:
         Event = self.models['Event']
 
         # Find all bumped events (is_swap = True)
-        bumped_schedules = self.db.query(PendingSchedule).filter(
+        bumped_schedules = self.db.query(PendingSchedule).options(
+            joinedload(PendingSchedule.bumped_event)
+        ).filter(
             and_(
                 PendingSchedule.created_at >= start_date,
                 PendingSchedule.created_at < end_date,
@@ -148,6 +188,20 @@ class TrainingDataPreparation:
 
         logger.info(f"Found {len(bumped_schedules)} bumped event records")
 
+        # Load every later successful schedule of the bumped events in one query
+        reschedule_times = {}
+        bumped_refs = {ps.bumped_event_ref_num for ps in bumped_schedules}
+        if bumped_refs:
+            earliest = min(ps.created_at or ps.schedule_datetime for ps in bumped_schedules)
+            for ref_num, created_at in self.db.query(
+                PendingSchedule.event_ref_num, PendingSchedule.created_at
+            ).filter(
+                PendingSchedule.event_ref_num.in_(bumped_refs),
+                PendingSchedule.created_at > earliest,
+                PendingSchedule.status.in_(['api_submitted', 'proposed'])
+            ).order_by(PendingSchedule.created_at):
+                reschedule_times.setdefault(ref_num, []).append(created_at)
+
         training_records = []
 
         for ps in bumped_schedules:
@@ -166,17 +220,13 @@ class TrainingDataPreparation:
                 )
 
                 # Calculate bump cost: days until rescheduled
-                # Look for when this event was rescheduled
-                rescheduled = self.db.query(PendingSchedule).filter(
-                    and_(
-                        PendingSchedule.event_ref_num == bumped_event.ref_num,
-                        PendingSchedule.created_at > as_of_date,
-                        PendingSchedule.status.in_(['api_submitted', 'proposed'])
-                    )
-                ).order_by(PendingSchedule.created_at).first()
-
-                if rescheduled:
-                    days_to_reschedule = (rescheduled.created_at - as_of_date).days
+                # Look for when this event was rescheduled (first success after the bump)
+                times = reschedule_times.get(bumped_event.project_ref_num, [])
+                pos = bisect_right(times, as_of_date)
+                rescheduled_at = times[pos] if pos < len(times) else None
+
+                if rescheduled_at:
+                    days_to_reschedule = (rescheduled_at - as_of_date).days
                     features['bump_cost_days'] = min(max(days_to_reschedule, 0), 30)  # Cap at 30 days
                     features['was_rescheduled'] = 1
                 else:
@@ -185,7 +235,7 @@ class TrainingDataPreparation:
                     features['was_rescheduled'] = 0
 
                 # Add metadata
-                features['event_ref_num'] = bumped_event.ref_num
+                features['event_ref_num'] = bumped_event.project_ref_num
                 features['bumped_at'] = as_of_date
 
                 training_records.append(features)
@@ -217,25 +267,32 @@ class TrainingDataPreparation:
         Event = self.models['Event']
         Schedule = self.models['Schedule']
 
-        # Query all events created in date range
+        # Query all events created in date range (cancelled/expired events excluded)
         events = self.db.query(Event).filter(
             and_(
                 Event.start_datetime >= start_date,
                 Event.start_datetime < end_date,
-                Event.is_cancelled == False
+                or_(Event.condition.is_(None), Event.condition.notin_(list(INACTIVE_CONDITIONS)))
             )
         ).all()
 
         logger.info(f"Found {len(events)} events")
 
+        # Determine which events were successfully scheduled in one query
+        scheduled_refs = set()
+        event_refs = [event.project_ref_num for event in events]
+        if event_refs:
+            scheduled_refs = {
+                ref_num for (ref_num,) in self.db.query(Schedule.event_ref_num).filter(
+                    Schedule.event_ref_num.in_(event_refs)
+                ).distinct()
+            }
+
         training_records = []
 
         for event in events:
             try:
-                # Determine if event was successfully scheduled
-                scheduled = self.db.query(Schedule).filter(
-                    Schedule.event_ref_num == event.ref_num
-                ).first()
+                scheduled = event.project_ref_num in scheduled_refs
 
                 # Extract features at event creation time
                 as_of_date = event.start_datetime
@@ -249,18 +306,19 @@ class TrainingDataPreparation:
                 features['feasibility_label'] = 1 if scheduled else 0
 
                 # Add metadata
-                features['event_ref_num'] = event.ref_num
+                features['event_ref_num'] = event.project_ref_num
                 features['event_type'] = event.event_type
                 features['created_at'] = as_of_date
 
                 training_records.append(features)
 
             except Exception as e:
-                logger.warning(f"Error extracting feasibility features for Event {event.ref_num}: {e}")
+                logger.warning(f"Error extracting feasibility features for Event {event.project_ref_num}: {e}")
                 continue
 
         df = pd.DataFrame(training_records)
-        logger.info(f"Prepared {len(df)} feasibility records with {df['feasibility_label'].sum()} successes")
+        successes = int(df['feasibility_label'].sum()) if 'feasibility_label' in df.columns else 0
+        logger.info(f"Prepared {len(df)} feasibility records with {successes} successes")
 
         return df
 
@@ -0,0 +1,483 @@
+"""
+Partitioned, resumable dataset cache for ML training.
+
+Training used to featurize the whole lookback window row by row on every
+run. This module splits the window into week-aligned partitions, builds
+stale partitions in parallel over a process pool, and persists each one
+(Parquet when pyarrow/fastparquet is installed, pickle otherwise) next to a
+manifest of source-data fingerprints. Later runs reuse every partition whose
+fingerprint is unchanged. A fingerprint digests the rows the partition's
+features actually read: its own pending/event rows plus the point-in-time
+windows around them (e.g. the 90 days of schedule history before each
+proposal, for the employees involved). New data outside those windows leaves
+the partition reusable. The manifest is written after each partition, so an
+interrupted run resumes where it stopped.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when feature extraction changes so cached partitions are rebuilt
+FEATURE_VERSION = 1
+
+# Partition length (week-aligned so boundaries are stable between runs)
+PARTITION_DAYS = 7
+
+RANKING_STATUSES = ('api_submitted', 'proposed', 'api_failed')
+PENDING_WORK_STATUSES = ('api_submitted', 'proposed')
+
+# Lookbacks of the point-in-time features (see SimpleEmployeeFeatureExtractor
+# and EventFeatureExtractor)
+HISTORY_LOOKBACK = timedelta(days=90)
+WORKLOAD_WINDOW = timedelta(days=7)
+CONSECUTIVE_WINDOW = timedelta(days=3)
+FEASIBILITY_DEFAULT_WINDOW = timedelta(days=14)
+
+HAS_PARQUET = (importlib.util.find_spec('pyarrow') is not None
+               or importlib.util.find_spec('fastparquet') is not None)
+
+DEFAULT_CACHE_DIR = 'instance/ml_dataset_cache'
+
+
+def week_partitions(start_date: datetime, end_date: datetime,
+                    partition_days: int = PARTITION_DAYS) -> List[Tuple[datetime, datetime]]:
+    """
+    Split [start_date, end_date) into stable, Monday-aligned partitions.
+
+    Args:
+        start_date: Window start
+        end_date: Window end (exclusive)
+        partition_days: Partition length in days
+
+    Returns:
+        List of (partition_start, partition_end) datetimes
+    """
+    first = datetime.combine((start_date - timedelta(days=start_date.weekday())).date(), datetime.min.time())
+    partitions = []
+    current = first
+    while current < end_date:
+        nxt = current + timedelta(days=partition_days)
+        partitions.append((current, nxt))
+        current = nxt
+    return partitions
+
+
+# ----------------------------------------------------------------------
+# Process-pool worker
+# ----------------------------------------------------------------------
+
+_worker_app = None
+
+
+def _init_worker(config_name: Optional[str]) -> None:
+    """Create one Flask app per worker process."""
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app(config_name)
+
+
+def _build_partition_in_worker(dataset: str, start: datetime, end: datetime) -> pd.DataFrame:
+    """Featurize one partition inside a worker process."""
+    from app.ml.training.data_preparation import TrainingDataPreparation
+    with _worker_app.app_context():
+        return _build_partition(TrainingDataPreparation(), dataset, start, end)
+
+
+def _build_partition(data_prep, dataset: str, start: datetime, end: datetime) -> pd.DataFrame:
+    """Featurize one partition with the given TrainingDataPreparation."""
+    if dataset == 'employee_ranking':
+        return data_prep.prepare_employee_ranking_data(start, end, min_lookback_days=0)
+    if dataset == 'bumping':
+        return data_prep.prepare_bumping_data(start, end)
+    if dataset == 'feasibility':
+        return data_prep.prepare_feasibility_data(start, end)
+    raise ValueError(f"Unknown dataset: {dataset}")
+
+
+class PartitionedDatasetCache:
+    """
+    Builds training datasets from cached, fingerprinted partitions.
+
+    Usage:
+        cache = PartitionedDatasetCache(db_session, models, workers=4)
+        df = cache.load('employee_ranking', start_date, end_date)
+    """
+
+    def __init__(self, db_session, models, cache_dir: str = DEFAULT_CACHE_DIR,
+                 workers: int = 1, config_name: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            db_session: SQLAlchemy database session
+            models: Model registry from get_models()
+            cache_dir: Directory for partitions and manifests
+            workers: Worker processes for stale partitions (1 = build inline)
+            config_name: Flask config for worker processes
+        """
+        self.db = db_session
+        self.models = models
+        self.cache_dir = cache_dir
+        self.workers = max(1, workers)
+        self.config_name = config_name
+        self.last_run_stats: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Manifest & storage
+    # ------------------------------------------------------------------
+
+    def _dataset_dir(self, dataset: str) -> str:
+        return os.path.join(self.cache_dir, dataset)
+
+    def _manifest_path(self, dataset: str) -> str:
+        return os.path.join(self._dataset_dir(dataset), 'manifest.json')
+
+    def _read_manifest(self, dataset: str) -> Dict[str, Any]:
+        path = self._manifest_path(dataset)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable dataset manifest {path}: {e}")
+            return {}
+
+    def _write_manifest(self, dataset: str, manifest: Dict[str, Any]) -> None:
+        path = self._manifest_path(dataset)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _partition_key(start: datetime, end: datetime) -> str:
+        return f"{start:%Y%m%d}_{end:%Y%m%d}"
+
+    def _partition_path(self, dataset: str, key: str) -> str:
+        ext = 'parquet' if HAS_PARQUET else 'pkl'
+        return os.path.join(self._dataset_dir(dataset), f"{key}.{ext}")
+
+    def _write_partition(self, path: str, df: pd.DataFrame) -> None:
+        if path.endswith('.parquet'):
+            df.to_parquet(path, index=False)
+        else:
+            df.to_pickle(path)
+
+    def _read_partition(self, path: str) -> pd.DataFrame:
+        if path.endswith('.parquet'):
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    # ------------------------------------------------------------------
+    # Fingerprinting
+    # ------------------------------------------------------------------
+
+    def fingerprint(self, dataset: str, start: datetime, end: datetime) -> str:
+        """
+        Fingerprint the source rows a partition's features read.
+
+        Args:
+            dataset: Dataset name
+            start: Partition start
+            end: Partition end (exclusive)
+
+        Returns:
+            Hex digest that changes when the partition must be rebuilt
+        """
+        if dataset == 'employee_ranking':
+            inputs = self._ranking_inputs(start, end)
+        elif dataset == 'bumping':
+            inputs = self._bumping_inputs(start, end)
+        elif dataset == 'feasibility':
+            inputs = self._feasibility_inputs(start, end)
+        else:
+            raise ValueError(f"Unknown dataset: {dataset}")
+
+        digest = hashlib.sha256(json.dumps([FEATURE_VERSION, dataset]).encode())
+        for name, rows in inputs:
+            digest.update(name.encode())
+            for row in rows:
+                digest.update(repr(tuple(row)).encode())
+        return digest.hexdigest()
+
+    def _ranking_inputs(self, start: datetime, end: datetime):
+        """
+        Rows read by prepare_employee_ranking_data for one partition.
+
+        The partition's proposals, their employees and events, the employees'
+        schedules and pending work from 90 days before to a week after the
+        proposed dates, and which of the partition's event types each
+        employee has worked.
+        """
+        PendingSchedule = self.models['PendingSchedule']
+        Schedule = self.models['Schedule']
+        Event = self.models['Event']
+        Employee = self.models['Employee']
+
+        rows = self.db.query(
+            PendingSchedule.id, PendingSchedule.employee_id, PendingSchedule.event_ref_num,
+            PendingSchedule.schedule_datetime, PendingSchedule.status,
+            PendingSchedule.created_at, PendingSchedule.updated_at
+        ).filter(
+            PendingSchedule.created_at >= start,
+            PendingSchedule.created_at < end,
+            PendingSchedule.status.in_(RANKING_STATUSES)
+        ).order_by(PendingSchedule.id).all()
+        yield 'pending', rows
+        if not rows:
+            return
+
+        employee_ids = sorted({row.employee_id for row in rows if row.employee_id})
+        ref_nums = sorted({row.event_ref_num for row in rows})
+        yield 'employees', self.db.query(
+            Employee.id, Employee.job_title, Employee.is_supervisor, Employee.is_active, Employee.created_at
+        ).filter(Employee.id.in_(employee_ids)).order_by(Employee.id)
+        events = self.db.query(
+            Event.project_ref_num, Event.event_type, Event.start_datetime, Event.due_datetime
+        ).filter(Event.project_ref_num.in_(ref_nums)).order_by(Event.project_ref_num).all()
+        yield 'events', events
+
+        schedule_dates = [row.schedule_datetime for row in rows if row.schedule_datetime]
+        if schedule_dates:
+            lo = min(schedule_dates) - HISTORY_LOOKBACK
+            hi = max(schedule_dates) + WORKLOAD_WINDOW
+            yield 'schedules', self.db.query(
+                Schedule.id, Schedule.employee_id, Schedule.schedule_datetime
+            ).filter(
+                Schedule.employee_id.in_(employee_ids),
+                Schedule.schedule_datetime >= lo,
+                Schedule.schedule_datetime < hi
+            ).order_by(Schedule.id)
+            yield 'pending_work', self.db.query(
+                PendingSchedule.id, PendingSchedule.employee_id, PendingSchedule.schedule_datetime
+            ).filter(
+                PendingSchedule.employee_id.in_(employee_ids),
+                PendingSchedule.status.in_(PENDING_WORK_STATUSES),
+                PendingSchedule.schedule_datetime >= lo,
+                PendingSchedule.schedule_datetime < hi
+            ).order_by(PendingSchedule.id)
+
+        event_types = sorted({event.event_type for event in events if event.event_type})
+        yield 'worked_types', self.db.query(Schedule.employee_id, Event.event_type).join(
+            Event, Schedule.event_ref_num == Event.project_ref_num
+        ).filter(
+            Schedule.employee_id.in_(employee_ids),
+            Event.event_type.in_(event_types)
+        ).distinct().order_by(Schedule.employee_id, Event.event_type)
+
+    def _bumping_inputs(self, start: datetime, end: datetime):
+        """
+        Rows read by prepare_bumping_data for one partition.
+
+        The partition's swaps, the bumped events with their proposals and
+        posted schedules, and the posted employees' schedules around the bump
+        and schedule dates.
+        """
+        PendingSchedule = self.models['PendingSchedule']
+        Schedule = self.models['Schedule']
+        Event = self.models['Event']
+
+        rows = self.db.query(
+            PendingSchedule.id, PendingSchedule.bumped_event_ref_num, PendingSchedule.schedule_datetime,
+            PendingSchedule.created_at, PendingSchedule.updated_at
+        ).filter(
+            PendingSchedule.created_at >= start,
+            PendingSchedule.created_at < end,
+            PendingSchedule.is_swap.is_(True),
+            PendingSchedule.bumped_event_ref_num.isnot(None)
+        ).order_by(PendingSchedule.id).all()
+        yield 'swaps', rows
+        if not rows:
+            return
+
+        ref_nums = sorted({row.bumped_event_ref_num for row in rows})
+        yield 'events', self.db.query(
+            Event.project_ref_num, Event.event_type, Event.start_datetime, Event.due_datetime
+        ).filter(Event.project_ref_num.in_(ref_nums)).order_by(Event.project_ref_num)
+        yield 'event_pending', self.db.query(
+            PendingSchedule.id, PendingSchedule.event_ref_num, PendingSchedule.is_swap,
+            PendingSchedule.status, PendingSchedule.created_at
+        ).filter(PendingSchedule.event_ref_num.in_(ref_nums)).order_by(PendingSchedule.id)
+        posted = self.db.query(
+            Schedule.id, Schedule.event_ref_num, Schedule.employee_id, Schedule.schedule_datetime
+        ).filter(Schedule.event_ref_num.in_(ref_nums)).order_by(Schedule.id).all()
+        yield 'posted', posted
+        if not posted:
+            return
+
+        as_of = [row.created_at or row.schedule_datetime for row in rows]
+        scheduled = [row.schedule_datetime for row in posted]
+        yield 'workload', self.db.query(
+            Schedule.id, Schedule.employee_id, Schedule.schedule_datetime
+        ).filter(
+            Schedule.employee_id.in_(sorted({row.employee_id for row in posted})),
+            Schedule.schedule_datetime >= min(min(as_of), min(scheduled) - CONSECUTIVE_WINDOW),
+            Schedule.schedule_datetime <= max(max(as_of) + WORKLOAD_WINDOW, max(scheduled) + CONSECUTIVE_WINDOW)
+        ).order_by(Schedule.id)
+
+    def _feasibility_inputs(self, start: datetime, end: datetime):
+        """
+        Rows read by prepare_feasibility_data for one partition.
+
+        The partition's events and which of them are scheduled, the employee
+        pool, and the schedules and competing events over the events' windows
+        and weeks.
+        """
+        Schedule = self.models['Schedule']
+        Event = self.models['Event']
+        Employee = self.models['Employee']
+
+        events = self.db.query(
+            Event.id, Event.project_ref_num, Event.event_type, Event.condition,
+            Event.start_datetime, Event.due_datetime, Event.last_synced
+        ).filter(
+            Event.start_datetime >= start,
+            Event.start_datetime < end
+        ).order_by(Event.id).all()
+        yield 'events', events
+        if not events:
+            return
+
+        yield 'scheduled', self.db.query(Schedule.event_ref_num).filter(
+            Schedule.event_ref_num.in_([event.project_ref_num for event in events])
+        ).distinct().order_by(Schedule.event_ref_num)
+        yield 'employees', self.db.query(
+            Employee.id, Employee.job_title, Employee.is_active
+        ).order_by(Employee.id)
+
+        first_start = min(event.start_datetime for event in events)
+        last_start = max(event.start_datetime for event in events)
+        window_end = max(event.due_datetime or event.start_datetime + FEASIBILITY_DEFAULT_WINDOW
+                         for event in events)
+        yield 'window_schedules', self.db.query(Schedule.id, Schedule.schedule_datetime).filter(
+            Schedule.schedule_datetime >= first_start,
+            Schedule.schedule_datetime <= window_end
+        ).order_by(Schedule.id)
+
+        week_start = datetime.combine((first_start - timedelta(days=first_start.weekday())).date(),
+                                      datetime.min.time())
+        week_end = datetime.combine((last_start - timedelta(days=last_start.weekday())).date(),
+                                    datetime.min.time()) + WORKLOAD_WINDOW
+        yield 'competing', self.db.query(
+            Event.project_ref_num, Event.start_datetime, Event.condition
+        ).filter(
+            Event.start_datetime >= week_start,
+            Event.start_datetime < week_end
+        ).order_by(Event.project_ref_num)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self, dataset: str, start_date: datetime, end_date: datetime,
+             force_rebuild: bool = False) -> pd.DataFrame:
+        """
+        Load a dataset for [start_date, end_date), rebuilding stale partitions.
+
+        Args:
+            dataset: 'employee_ranking', 'bumping' or 'feasibility'
+            start_date: Window start
+            end_date: Window end (exclusive)
+            force_rebuild: Ignore cached partitions
+
+        Returns:
+            Concatenated DataFrame (rows outside the window removed)
+        """
+        os.makedirs(self._dataset_dir(dataset), exist_ok=True)
+        manifest = self._read_manifest(dataset)
+        partitions = week_partitions(start_date, end_date)
+
+        cached: Dict[str, pd.DataFrame] = {}
+        stale: List[Tuple[str, datetime, datetime, str]] = []
+
+        for start, end in partitions:
+            key = self._partition_key(start, end)
+            fp = self.fingerprint(dataset, start, end)
+            entry = manifest.get(key)
+            path = self._partition_path(dataset, key)
+
+            if not force_rebuild and entry and entry.get('fingerprint') == fp and os.path.exists(path):
+                try:
+                    cached[key] = self._read_partition(path)
+                    continue
+                except Exception as e:
+                    logger.warning(f"Cached partition {key} unreadable, rebuilding: {e}")
+            stale.append((key, start, end, fp))
+
+        logger.info(f"Dataset '{dataset}': {len(cached)} cached partitions, {len(stale)} to build "
+                    f"({self.workers} worker{'s' if self.workers > 1 else ''})")
+
+        for key, df in self._build_stale(dataset, stale, manifest):
+            cached[key] = df
+
+        self.last_run_stats = {
+            'partitions': len(partitions),
+            'reused': len(partitions) - len(stale),
+            'built': len(stale),
+        }
+
+        frames = [cached[self._partition_key(s, e)] for s, e in partitions
+                  if not cached[self._partition_key(s, e)].empty]
+        if not frames:
+            return pd.DataFrame()
+
+        df = pd.concat(frames, ignore_index=True)
+        date_column = 'bumped_at' if dataset == 'bumping' else 'created_at'
+        if date_column in df.columns:
+            df = df[(df[date_column] >= start_date) & (df[date_column] < end_date)].reset_index(drop=True)
+        return df
+
+    def _build_stale(self, dataset: str, stale: List[Tuple[str, datetime, datetime, str]],
+                     manifest: Dict[str, Any]):
+        """Build stale partitions (inline or in a process pool), persisting each as it finishes."""
+        if not stale:
+            return
+
+        def persist(key, start, end, fp, df):
+            path = self._partition_path(dataset, key)
+            self._write_partition(path, df)
+            manifest[key] = {
+                'fingerprint': fp,
+                'rows': int(len(df)),
+                'start': start.isoformat(),
+                'end': end.isoformat(),
+                'built_at': datetime.now().isoformat(),
+                'feature_version': FEATURE_VERSION,
+            }
+            self._write_manifest(dataset, manifest)
+
+        if self.workers == 1 or len(stale) == 1:
+            from app.ml.training.data_preparation import TrainingDataPreparation
+            data_prep = TrainingDataPreparation(self.db, self.models)
+            for key, start, end, fp in stale:
+                df = _build_partition(data_prep, dataset, start, end)
+                persist(key, start, end, fp, df)
+                yield key, df
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(stale)),
+            initializer=_init_worker,
+            initargs=(self.config_name,)
+        ) as pool:
+            futures = {
+                pool.submit(_build_partition_in_worker, dataset, start, end): (key, start, end, fp)
+                for key, start, end, fp in stale
+            }
+            for future in as_completed(futures):
+                key, start, end, fp = futures[future]
+                df = future.result()
+                persist(key, start, end, fp, df)
+                logger.info(f"Built partition {key}: {len(df)} rows")
+                yield key, df
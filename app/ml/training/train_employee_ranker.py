@@ -23,6 +23,7 @@ sys.path.insert(0, str(project_root))
 from app import create_app
 from app.models import get_models, get_db
 from app.ml.training.data_preparation import TrainingDataPreparation
+from app.ml.training.dataset_cache import PartitionedDatasetCache, DEFAULT_CACHE_DIR
 from app.ml.models.employee_ranker import EmployeeRanker
 
 logging.basicConfig(
@@ -36,7 +37,10 @@ def train_employee_ranker(
     lookback_months: int = 6,
     test_size: float = 0.2,
     model_type: str = 'auto',
-    output_dir: str = None
+    output_dir: str = None,
+    workers: int = 1,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    use_cache: bool = True
 ):
     """
     Train employee ranking model.
@@ -46,6 +50,9 @@ def train_employee_ranker(
         test_size: Proportion of data for testing
         model_type: 'xgboost', 'lightgbm', or 'auto'
         output_dir: Where to save the model (defaults to app/ml/models/artifacts/)
+        workers: Worker processes for building stale dataset partitions
+        cache_dir: Directory for cached dataset partitions
+        use_cache: Reuse unchanged partitions from earlier runs
 
     Returns:
         Tuple of (model, metrics)
@@ -73,11 +80,20 @@ def train_employee_ranker(
         logger.info("\n--- Step 1: Data Preparation ---")
         data_prep = TrainingDataPreparation(db_session, models)
 
-        df = data_prep.prepare_employee_ranking_data(
-            start_date=start_date,
-            end_date=end_date,
-            min_lookback_days=min_lookback
+        dataset_cache = PartitionedDatasetCache(
+            db_session, models,
+            cache_dir=cache_dir,
+            workers=workers
         )
+        df = dataset_cache.load(
+            'employee_ranking', start_date, end_date,
+            force_rebuild=not use_cache
+        )
+        logger.info(f"Dataset partitions: {dataset_cache.last_run_stats}")
+
+        # Apply the minimum-history cutoff to the combined dataset
+        if len(df) > 0:
+            df = df[(df['created_at'] - start_date).dt.days >= min_lookback].reset_index(drop=True)
 
         if len(df) == 0:
             logger.error("No training data available. Ensure historical PendingSchedule records exist.")
@@ -231,6 +247,26 @@ def main():
         help='Output directory for model (default: app/ml/models/artifacts/)'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Worker processes for featurizing dataset partitions (default: 1)'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help=f'Directory for cached dataset partitions (default: {DEFAULT_CACHE_DIR})'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Rebuild every dataset partition instead of reusing cached ones'
+    )
+
     args = parser.parse_args()
 
     try:
@@ -238,7 +274,10 @@ def main():
             lookback_months=args.lookback_months,
             test_size=args.test_size,
             model_type=args.model_type,
-            output_dir=args.output_dir
+            output_dir=args.output_dir,
+            workers=args.workers,
+            cache_dir=args.cache_dir,
+            use_cache=not args.no_cache
         )
     except Exception as e:
         logger.error(f"Training failed: {e}", exc_info=True)
@@ -17,6 +17,8 @@ from .ignored_validation_issue import create_ignored_validation_issue_model
 from .shift_block_setting import create_shift_block_setting_model
 from .notes import create_notes_models
 from .inventory import create_inventory_models
+from .calendar_day_summary import create_calendar_day_summary_model
+from .employee_daily_stats import create_employee_daily_stats_model
 
 
 def init_models(db):
@@ -44,6 +46,8 @@ def init_models(db):
     ShiftBlockSetting = create_shift_block_setting_model(db)
     Note, RecurringReminder = create_notes_models(db)
     inventory_models = create_inventory_models(db)
+    CalendarDaySummary = create_calendar_day_summary_model(db)
+    EmployeeDailyStats = create_employee_daily_stats_model(db)
 
     return {
         'Employee': Employee,
@@ -76,7 +80,9 @@ def init_models(db):
         'SupplyAdjustment': inventory_models['SupplyAdjustment'],
         'PurchaseOrder': inventory_models['PurchaseOrder'],
         'OrderItem': inventory_models['OrderItem'],
-        'InventoryReminder': inventory_models['InventoryReminder']
+        'InventoryReminder': inventory_models['InventoryReminder'],
+        'CalendarDaySummary': CalendarDaySummary,
+        'EmployeeDailyStats': EmployeeDailyStats
     }
 
 
@@ -93,6 +99,8 @@ __all__ = [
     'create_paperwork_template_model',
     'create_user_session_model',
     'create_company_holiday_model',
+    'create_calendar_day_summary_model',
+    'create_employee_daily_stats_model',
     # Model registry exports
     'model_registry',
     'get_models',
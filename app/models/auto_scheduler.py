@@ -2,9 +2,22 @@
 Auto-Scheduler models for rotation management and scheduling workflow
 Supports the propose-then-approve auto-scheduling system
 """
-from datetime import datetime
+import json
+from datetime import datetime, timedelta
 from enum import Enum
 
+from sqlalchemy import and_, or_
+
+IN_PROGRESS_RUN_STATUSES = ('running', 'stopping')
+DEFAULT_STALE_RUN_MARGIN = 600   # Seconds past the solver time limit before a run counts as dead
+
+
+def stale_run_seconds():
+    """Age after which an unfinished run is treated as dead (CPSAT_TIME_LIMIT + SCHEDULER_RUN_STALE_MARGIN)"""
+    from flask import current_app
+    return (current_app.config.get('CPSAT_TIME_LIMIT', 60)
+            + current_app.config.get('SCHEDULER_RUN_STALE_MARGIN', DEFAULT_STALE_RUN_MARGIN))
+
 
 class EventType(str, Enum):
     """Event type classifications for scheduling rules"""
@@ -108,7 +121,7 @@ def create_auto_scheduler_models(db):
 
         # Run results
         status = db.Column(db.String(20), nullable=False, default='running')
-        # 'running', 'completed', 'failed', 'crashed', 'rejected'
+        # 'running', 'stopping' (stop requested), 'completed', 'failed', 'crashed', 'rejected'
         total_events_processed = db.Column(db.Integer, default=0)
         events_scheduled = db.Column(db.Integer, default=0)
         events_requiring_swaps = db.Column(db.Integer, default=0)
@@ -116,6 +129,7 @@ def create_auto_scheduler_models(db):
 
         solver_type = db.Column(db.String(20), nullable=True)  # 'cpsat' or 'greedy'
         error_message = db.Column(db.Text, nullable=True)
+        profile = db.Column(db.Text, nullable=True)  # JSON per-wave timings and solver stats (RunProfiler)
 
         # Approval tracking
         approved_at = db.Column(db.DateTime, nullable=True)
@@ -136,11 +150,56 @@ def create_auto_scheduler_models(db):
                 name='ck_valid_run_type'
             ),
             db.CheckConstraint(
-                "status IN ('running', 'completed', 'failed', 'crashed', 'rejected')",
+                "status IN ('running', 'stopping', 'completed', 'failed', 'crashed', 'rejected')",
                 name='ck_valid_status'
             ),
         )
 
+        @classmethod
+        def active_condition(cls, max_age_seconds=None):
+            """
+            Filter for runs whose proposals still hold employees' days:
+            completed runs, and running/stopping runs young enough that their
+            process can still be alive. A CP-SAT run commits itself as
+            'running' (and saves best-so-far proposals) before it finishes, so
+            a run whose process died would otherwise stay active forever.
+            """
+            if max_age_seconds is None:
+                max_age_seconds = stale_run_seconds()
+            cutoff = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+            return or_(
+                cls.status == 'completed',
+                and_(cls.status.in_(IN_PROGRESS_RUN_STATUSES), cls.started_at >= cutoff)
+            )
+
+        @classmethod
+        def fail_stale_runs(cls, max_age_seconds=None):
+            """
+            Mark running/stopping runs older than max_age_seconds as 'failed'.
+            Does not commit. Returns the number of runs marked.
+            """
+            if max_age_seconds is None:
+                max_age_seconds = stale_run_seconds()
+            now = datetime.utcnow()
+            return cls.query.filter(
+                cls.status.in_(IN_PROGRESS_RUN_STATUSES),
+                cls.started_at < now - timedelta(seconds=max_age_seconds)
+            ).update({
+                'status': 'failed',
+                'completed_at': now,
+                'error_message': 'Run did not finish (scheduler process stopped)',
+            }, synchronize_session=False)
+
+        @property
+        def profile_data(self):
+            """Run profile as a dict (None for runs recorded before profiling)"""
+            if not self.profile:
+                return None
+            try:
+                return json.loads(self.profile)
+            except ValueError:
+                return None
+
         def __repr__(self):
             return f'<SchedulerRunHistory {self.id}: {self.status} at {self.started_at}>'
 
@@ -332,6 +391,20 @@ def create_auto_scheduler_models(db):
             if isinstance(target_date, datetime):
                 target_date = target_date.date()
             return db.session.query(cls).filter(cls.locked_date == target_date).first()
+
+        @classmethod
+        def get_locked_days_between(cls, start_date, end_date):
+            """Get the LockedDay records from start_date to end_date (inclusive), keyed by date"""
+            if isinstance(start_date, datetime):
+                start_date = start_date.date()
+            if isinstance(end_date, datetime):
+                end_date = end_date.date()
+            return {
+                locked.locked_date: locked
+                for locked in db.session.query(cls).filter(
+                    cls.locked_date >= start_date, cls.locked_date <= end_date
+                ).all()
+            }
         
         @classmethod
         def lock_day(cls, target_date, locked_by=None, reason=None):
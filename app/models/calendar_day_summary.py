@@ -0,0 +1,48 @@
+"""
+Calendar Day Summary Model
+Read-optimized per-day rollup for the calendar month view
+Maintained by app.services.calendar_summary when schedules and events change
+"""
+import json
+from datetime import datetime
+from sqlalchemy import Column, Integer, Date, DateTime, Text
+
+
+def create_calendar_day_summary_model(db):
+    """
+    Factory function to create CalendarDaySummary model
+
+    Args:
+        db: SQLAlchemy database instance
+
+    Returns:
+        CalendarDaySummary model class
+    """
+
+    class CalendarDaySummary(db.Model):
+        __tablename__ = 'calendar_day_summaries'
+
+        summary_date = Column(Date, primary_key=True)
+        type_counts = Column(Text, nullable=False, default='{}')  # JSON: {event_type: count, 'Juicer': n}
+        scheduled_count = Column(Integer, nullable=False, default=0)  # Scheduled events on this day
+        unscheduled_count = Column(Integer, nullable=False, default=0)  # Unstaffed events due this day
+        updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+        @property
+        def counts(self):
+            """Event type counts as a dict"""
+            return json.loads(self.type_counts or '{}')
+
+        def to_dict(self):
+            """Convert to dictionary for JSON serialization"""
+            return {
+                'date': self.summary_date.isoformat(),
+                'counts': self.counts,
+                'scheduled_count': self.scheduled_count,
+                'unscheduled_count': self.unscheduled_count
+            }
+
+        def __repr__(self):
+            return f'<CalendarDaySummary {self.summary_date}: {self.scheduled_count} scheduled>'
+
+    return CalendarDaySummary
@@ -0,0 +1,48 @@
+"""
+Employee Daily Stats Model
+Per-employee, per-day workload rollup (event counts by type, scheduled minutes)
+Maintained alongside calendar day summaries by app.services.calendar_summary
+"""
+import json
+from sqlalchemy import Column, Integer, String, Date, Text
+
+
+def create_employee_daily_stats_model(db):
+    """
+    Factory function to create EmployeeDailyStats model
+
+    Args:
+        db: SQLAlchemy database instance
+
+    Returns:
+        EmployeeDailyStats model class
+    """
+
+    class EmployeeDailyStats(db.Model):
+        __tablename__ = 'employee_daily_stats'
+
+        stat_date = Column(Date, primary_key=True)
+        employee_id = Column(String, primary_key=True, index=True)
+        event_count = Column(Integer, nullable=False, default=0)  # Scheduled events this day
+        scheduled_minutes = Column(Integer, nullable=False, default=0)  # Estimated (or default) duration total
+        type_counts = Column(Text, nullable=False, default='{}')  # JSON: {event_type: count}
+
+        @property
+        def counts(self):
+            """Event type counts as a dict"""
+            return json.loads(self.type_counts or '{}')
+
+        def to_dict(self):
+            """Convert to dictionary for JSON serialization"""
+            return {
+                'date': self.stat_date.isoformat(),
+                'employee_id': self.employee_id,
+                'event_count': self.event_count,
+                'scheduled_minutes': self.scheduled_minutes,
+                'counts': self.counts
+            }
+
+        def __repr__(self):
+            return f'<EmployeeDailyStats {self.employee_id} {self.stat_date}: {self.event_count} events>'
+
+    return EmployeeDailyStats
@@ -5,7 +5,9 @@ Handles admin operations, sync management, testing, and utility endpoints
 from flask import Blueprint, render_template, request, jsonify, current_app, abort, make_response, redirect, url_for
 from app.models import get_models
 from app.routes.auth import require_authentication
+from app.utils.db_routing import read_only_view
 from app.utils.db_compat import disable_foreign_keys, is_sqlite
+from app.services.search_index import get_search_index
 from datetime import datetime, timedelta, date, time
 from io import BytesIO
 from sqlalchemy import func, or_
@@ -345,17 +347,15 @@ def universal_search():
         'total': 0
     }
 
+    # Ranked prefix matches from the full-text search index
+    search = get_search_index(db.session, models)
+    event_matches = search.events(query)
+    employee_matches = search.employees(query)
+
     # Search Events
-    if context in ['all', 'scheduling', 'tracking']:
+    if context in ['all', 'scheduling', 'tracking'] and event_matches is not None:
         # Search by event name, project ref number, store name, or location
-        event_query = Event.query.filter(
-            or_(
-                Event.project_name.ilike(f'%{query}%'),
-                Event.project_ref_num == query if query.isdigit() else False,
-                Event.store_name.ilike(f'%{query}%') if Event.store_name else False,
-                Event.location_mvid.ilike(f'%{query}%') if Event.location_mvid else False
-            )
-        )
+        event_query = Event.query.join(event_matches, Event.id == event_matches.c.id)
 
         # Apply context-specific filters
         if context == 'scheduling':
@@ -373,7 +373,7 @@ def universal_search():
             elif status == 'unscheduled':
                 event_query = event_query.filter_by(is_scheduled=False)
 
-        events = event_query.order_by(Event.start_datetime.asc()).limit(20).all()
+        events = event_query.order_by(event_matches.c.rank, Event.start_datetime.asc()).limit(20).all()
 
         for event in events:
             # Calculate priority (days until deadline)
@@ -405,19 +405,12 @@ def universal_search():
             })
 
     # Search Employees
-    if context in ['all', 'scheduling']:
-        employee_query = Employee.query.filter(
-            db.and_(
-                Employee.is_active == True,
-                or_(
-                    Employee.name.ilike(f'%{query}%'),
-                    Employee.id.ilike(f'%{query}%'),
-                    Employee.email.ilike(f'%{query}%') if Employee.email else False
-                )
-            )
-        )
+    if context in ['all', 'scheduling'] and employee_matches is not None:
+        employee_query = Employee.query.join(
+            employee_matches, Employee.id == employee_matches.c.id
+        ).filter(Employee.is_active == True)
 
-        employees = employee_query.limit(20).all()
+        employees = employee_query.order_by(employee_matches.c.rank, Employee.name).limit(20).all()
 
         for emp in employees:
             results['employees'].append({
@@ -429,23 +422,23 @@ def universal_search():
             })
 
     # Search Schedules (when tracking specific assignments)
-    if context in ['all', 'tracking']:
+    if context in ['all', 'tracking'] and event_matches is not None:
         try:
-            # Try searching by project ref number or employee ID
+            # A schedule matches when its event (name / ref number) or employee (name / ID) does
+            schedule_events = search.events(query, fields=('project_name', 'project_ref_num'))
+            schedule_employees = search.employees(query, fields=('name', 'emp_id'))
             schedule_query = db.session.query(Schedule, Event, Employee).join(
                 Event, Schedule.event_ref_num == Event.project_ref_num
             ).join(
                 Employee, Schedule.employee_id == Employee.id
             ).filter(
                 or_(
-                    Event.project_name.ilike(f'%{query}%'),
-                    Event.project_ref_num == query if query.isdigit() else False,
-                    Employee.name.ilike(f'%{query}%'),
-                    Employee.id.ilike(f'%{query}%')
+                    Event.id.in_(db.select(schedule_events.c.id)),
+                    Employee.id.in_(db.select(schedule_employees.c.id))
                 )
             )
 
-            schedules = schedule_query.limit(20).all()
+            schedules = schedule_query.order_by(Schedule.schedule_datetime.desc()).limit(20).all()
 
             for schedule, event, employee in schedules:
                 results['schedules'].append({
@@ -1177,6 +1170,7 @@ def edr_cache_status():
 
 
 @admin_bp.route('/api/print_paperwork/<paperwork_type>')
+@read_only_view
 def print_paperwork(paperwork_type):
     """
     Print paperwork for Core events (today or tomorrow)
@@ -1384,6 +1378,7 @@ def print_paperwork_internal(paperwork_type, target_date_override=None):
 
 @admin_bp.route('/api/print_paperwork_by_date/<date_str>')
 @require_authentication()
+@read_only_view
 def print_paperwork_by_date(date_str):
     """
     Print paperwork for Core events on a specific date
@@ -1399,6 +1394,7 @@ def print_paperwork_by_date(date_str):
 
 @admin_bp.route('/api/print_salestools_by_date/<date_str>')
 @require_authentication()
+@read_only_view
 def print_salestools_by_date(date_str):
     """
     Download and merge sales tool PDFs for all Core events on a specific date
@@ -1499,6 +1495,7 @@ def print_salestools_by_date(date_str):
 
 @admin_bp.route('/api/print_event_paperwork/<int:event_id>')
 @require_authentication()
+@read_only_view
 def print_event_paperwork(event_id):
     """Print paperwork for a single event"""
     try:
@@ -1648,7 +1645,6 @@ def employee_analytics():
     db = current_app.extensions['sqlalchemy']
     models = get_models()
     Employee = models['Employee']
-    Schedule = models['Schedule']
     
     # Get week_start parameter or default to current week's Sunday
     week_start_str = request.args.get('week_start')
@@ -1661,33 +1657,23 @@ def employee_analytics():
     
     week_end = week_start + timedelta(days=6)  # Saturday
     
-    # Query employee statistics
-    from sqlalchemy import func
-    stats = db.session.query(
-        Employee.id,
-        Employee.name,
-        func.count(func.distinct(func.date(Schedule.schedule_datetime))).label('days_scheduled'),
-        func.count(Schedule.id).label('total_events')
-    ).join(
-        Schedule, Employee.id == Schedule.employee_id
-    ).filter(
-        func.date(Schedule.schedule_datetime) >= week_start,
-        func.date(Schedule.schedule_datetime) <= week_end
-    ).group_by(
-        Employee.id, Employee.name
-    ).order_by(
-        func.count(func.distinct(func.date(Schedule.schedule_datetime))).desc()
-    ).all()
+    # Employee statistics from the daily workload rollup
+    from app.services.workload_analytics import WorkloadAnalytics
+    totals = WorkloadAnalytics(db.session, models).employee_totals(week_start, week_end)
+    names = dict(
+        db.session.query(Employee.id, Employee.name).filter(Employee.id.in_(list(totals)))
+    ) if totals else {}
     
     # Convert to list of dicts
     employee_stats = []
-    for stat in stats:
+    for employee_id, employee_name in names.items():
         employee_stats.append({
-            'employee_id': stat[0],
-            'employee_name': stat[1],
-            'days_scheduled': stat[2],
-            'total_events': stat[3]
+            'employee_id': employee_id,
+            'employee_name': employee_name,
+            'days_scheduled': totals[employee_id]['days_worked'],
+            'total_events': totals[employee_id]['event_count']
         })
+    employee_stats.sort(key=lambda s: -s['days_scheduled'])
     
     return render_template('employee_analytics.html',
                          employee_stats=employee_stats,
@@ -1697,6 +1683,7 @@ def employee_analytics():
 
 @admin_bp.route('/api/print_weekly_summary/<week_start_str>')
 @require_authentication()
+@read_only_view
 def print_weekly_summary(week_start_str):
     """Print weekly schedule summary for all employees (Core events with Juicer days highlighted in orange)"""
     try:
@@ -1881,6 +1868,7 @@ def print_weekly_summary(week_start_str):
 
 @admin_bp.route('/api/print_employee_schedule/<int:employee_id>/<week_start_str>')
 @require_authentication()
+@read_only_view
 def print_employee_schedule(employee_id, week_start_str):
     """Print detailed weekly schedule for a single employee (all event types)"""
     try:
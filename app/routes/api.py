@@ -2,17 +2,16 @@
 API routes blueprint
 Handles all API endpoints for schedule operations, imports, exports, and AJAX calls
 """
-from flask import Blueprint, request, jsonify, current_app, make_response
+from flask import Blueprint, request, jsonify, current_app
 from app.models import get_models
 from app.constants import CANCELLED_VARIANTS, INACTIVE_CONDITIONS
 from app.routes.auth import require_authentication
+from app.utils.db_routing import read_only_view
 from datetime import datetime, timedelta, date
-import csv
 import io
 import logging
 import re
 import time
-from io import StringIO
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 logger = logging.getLogger(__name__)
@@ -869,14 +868,12 @@ def core_employees_for_trade(date, current_schedule_id):
 @api_bp.route('/available_employees_for_change/<date>/<event_type>')
 def available_employees_for_change(date, event_type):
     """Get available employees for changing event assignment with proper role-based filtering"""
+    import numpy as np
+    from app.services.what_if_service import WhatIfService
+
     db = current_app.extensions['sqlalchemy']
     models = get_models()
-    Schedule = models['Schedule']
-    Event = models['Event']
     Employee = models['Employee']
-    EmployeeAvailability = models['EmployeeAvailability']
-    EmployeeTimeOff = models['EmployeeTimeOff']
-    EmployeeWeeklyAvailability = models['EmployeeWeeklyAvailability']
 
     try:
         parsed_date = datetime.strptime(date, '%Y-%m-%d').date()
@@ -894,12 +891,11 @@ def available_employees_for_change(date, event_type):
         except ValueError:
             pass
 
-    # Get all active employees
-    all_employees = Employee.query.filter_by(is_active=True).all()
-    
     # Check override
     override = request.args.get('override') == 'true'
     if override:
+         # Get all active employees
+         all_employees = Employee.query.filter_by(is_active=True).all()
          # Return all active employees without further filtering
          employees_data = []
          for emp in all_employees:
@@ -910,88 +906,42 @@ def available_employees_for_change(date, event_type):
              })
          return jsonify(employees_data)
 
-    # For Core events, get employees already scheduled for Core events that day
+    # The week's roster, availability and bookings, evaluated for the whole roster at once
+    state = WhatIfService(db.session, models).state(parsed_date)
+    column = state.column(parsed_date)
+
+    # For Core events, employees already scheduled for Core events that day
     if event_type == 'Core':
-        core_scheduled_employees = db.session.query(Schedule.employee_id).join(
-            Event, Schedule.event_ref_num == Event.project_ref_num
-        ).filter(
-            db.func.date(Schedule.schedule_datetime) == parsed_date,
-            Event.event_type == 'Core'
-        ).all()
-        core_scheduled_employee_ids = {emp[0] for emp in core_scheduled_employees}
+        core_scheduled = state.core_counts(parsed_date, posted_only=True) > 0
     else:
-        core_scheduled_employee_ids = set()
-
-    # Get employees marked as unavailable on the specified date
-    unavailable_employees = db.session.query(EmployeeAvailability.employee_id).filter(
-        EmployeeAvailability.date == parsed_date,
-        EmployeeAvailability.is_available == False
-    ).all()
-    unavailable_employee_ids = {emp[0] for emp in unavailable_employees}
-
-    # Get employees who have time off on the specified date
-    time_off_employees = db.session.query(EmployeeTimeOff.employee_id).filter(
-        EmployeeTimeOff.start_date <= parsed_date,
-        EmployeeTimeOff.end_date >= parsed_date
-    ).all()
-    time_off_employee_ids = {emp[0] for emp in time_off_employees}
-
-    # Get day of week for weekly availability check
-    day_of_week = parsed_date.weekday()
-    day_columns = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-    day_column = day_columns[day_of_week]
-
-    weekly_availability_query = db.session.query(
-        EmployeeWeeklyAvailability.employee_id,
-        getattr(EmployeeWeeklyAvailability, day_column).label('is_available_weekly')
-    ).all()
-
-    weekly_unavailable_ids = {
-        emp[0] for emp in weekly_availability_query
-        if not emp[1]
-    }
-
-    # Filter available employees
-    available_employees_list = []
-    for emp in all_employees:
-        # Special exception for current employee when rescheduling
-        is_current_employee = (current_employee_id and emp.id == current_employee_id)
-        is_same_day = (current_date and current_date == parsed_date)
-
-        # Allow current employee if it's the same day OR a day they're not scheduled
-        allow_current_employee = False
-        if is_current_employee:
-            if is_same_day:
-                # Same day - always allow
-                allow_current_employee = True
-            else:
-                # Different day - only allow if they're not scheduled for a Core event on the new date
-                allow_current_employee = (emp.id not in core_scheduled_employee_ids)
-
-        # Normal availability checks (skip for allowed current employee on same day)
-        if not (is_current_employee and is_same_day):
-            if (emp.id in core_scheduled_employee_ids or
-                emp.id in unavailable_employee_ids or
-                emp.id in time_off_employee_ids or
-                emp.id in weekly_unavailable_ids):
-                # Skip unless this is the current employee being allowed
-                if not allow_current_employee:
-                    continue
-
-        # Role-based restrictions
-        # Special handling for "Other" events - only Lead Event Specialist and Club Supervisor
-        if event_type == 'Other':
-            if emp.job_title not in ['Lead Event Specialist', 'Club Supervisor']:
-                continue
-        # Check role-based restrictions for the event type
-        elif not emp.can_work_event_type(event_type):
-            continue
+        core_scheduled = np.zeros(len(state.employee_ids), dtype=bool)
+
+    # Marked unavailable on the date, time off, or not available by weekly pattern/override
+    blocked = (core_scheduled | state.marked_unavailable[:, column]
+               | state.time_off[:, column] | ~state.available[:, column])
+
+    # Special exception for current employee when rescheduling: always allowed on the
+    # same day, otherwise only when not scheduled for a Core event on the new date
+    current_row = state.index.get(current_employee_id) if current_employee_id else None
+    if current_row is not None:
+        is_same_day = bool(current_date and current_date == parsed_date)
+        blocked[current_row] = not is_same_day and bool(core_scheduled[current_row])
+
+    # Role-based restrictions
+    # Special handling for "Other" events - only Lead Event Specialist and Club Supervisor
+    if event_type == 'Other':
+        role_ok = np.isin(state.job_titles, ['Lead Event Specialist', 'Club Supervisor'])
+    else:
+        role_ok = state.can_work_mask(event_type)
 
-        available_employees_list.append({
-            'id': emp.id,
-            'name': emp.name,
-            'job_title': emp.job_title
-        })
+    available_employees_list = [
+        {
+            'id': state.employee_ids[row],
+            'name': state.names[row],
+            'job_title': state.job_titles[row]
+        }
+        for row in np.flatnonzero(state.is_active & ~blocked & role_ok)
+    ]
 
     # For Digital Teardown and Digitals events, sort by role priority:
     # 1. Secondary Lead (Lead Event Specialist)
@@ -1370,6 +1320,7 @@ def get_event_time_settings():
 
 
 @api_bp.route('/validate_schedule_for_export')
+@read_only_view
 def validate_schedule_for_export():
     """Validate scheduled events before export and return any errors"""
     db = current_app.extensions['sqlalchemy']
@@ -1987,16 +1938,6 @@ def reschedule_event_with_validation(schedule_id):
         # Validate using ConstraintValidator
         from app.services.constraint_validator import ConstraintValidator
 
-        models = {
-            'Employee': Employee,
-            'Event': Event,
-            'Schedule': Schedule,
-            'EmployeeTimeOff': current_app.config.get('EmployeeTimeOff'),
-            'EmployeeAvailability': current_app.config.get('EmployeeAvailability'),
-            'EmployeeWeeklyAvailability': current_app.config.get('EmployeeWeeklyAvailability'),
-            'PendingSchedule': current_app.config.get('PendingSchedule')
-        }
-
         validator = ConstraintValidator(db.session, models)
         # Exclude current schedule from conflict checking - otherwise it flags itself as a conflict
         validation_result = validator.validate_assignment(
@@ -2445,16 +2386,6 @@ def change_employee_assignment(schedule_id):
         # Validate using ConstraintValidator
         from app.services.constraint_validator import ConstraintValidator
 
-        models = {
-            'Employee': Employee,
-            'Event': Event,
-            'Schedule': Schedule,
-            'EmployeeTimeOff': current_app.config.get('EmployeeTimeOff'),
-            'EmployeeAvailability': current_app.config.get('EmployeeAvailability'),
-            'EmployeeWeeklyAvailability': current_app.config.get('EmployeeWeeklyAvailability'),
-            'PendingSchedule': current_app.config.get('PendingSchedule')
-        }
-
         validator = ConstraintValidator(db.session, models)
         validation_result = validator.validate_assignment(event, new_employee, schedule_datetime)
 
@@ -3055,16 +2986,6 @@ def trade_events():
         # Check if employee2 can work event1's time, and employee1 can work event2's time
         from app.services.constraint_validator import ConstraintValidator
 
-        models = {
-            'Employee': Employee,
-            'Event': Event,
-            'Schedule': Schedule,
-            'EmployeeTimeOff': current_app.config.get('EmployeeTimeOff'),
-            'EmployeeAvailability': current_app.config.get('EmployeeAvailability'),
-            'EmployeeWeeklyAvailability': current_app.config.get('EmployeeWeeklyAvailability'),
-            'PendingSchedule': current_app.config.get('PendingSchedule')
-        }
-
         validator = ConstraintValidator(db.session, models)
 
         # Validate employee2 -> event1's time (exclude both schedules being traded)
@@ -3678,8 +3599,16 @@ def change_employee():
 
 
 @api_bp.route('/export/schedule')
+@read_only_view
 def export_schedule():
-    """Export scheduled events to CalendarSchedule.csv (from today forward only)"""
+    """
+    Export scheduled events to CalendarSchedule.csv (from today forward only)
+
+    Query args: valid_only=true omits the validation warning rows;
+    format=xlsx and gzip=true as for the other exports.
+    """
+    from sqlalchemy import and_, not_
+    from app.utils.export_stream import export_options, export_response, ExportFormatError, YIELD_PER
     db = current_app.extensions['sqlalchemy']
     models = get_models()
     Schedule = models['Schedule']
@@ -3687,86 +3616,73 @@ def export_schedule():
     Employee = models['Employee']
 
     try:
-        # Check if only valid events should be exported
-        valid_only = request.args.get('valid_only') == 'true'
-
-        # Get current date to filter out past events
-        today = date.today()
-
-        # Query scheduled events with JOIN, filtering for current day and future
-        scheduled_events = db.session.query(
-            Event.project_name,
-            Event.project_ref_num,
-            Event.location_mvid,
-            Event.store_number,
-            Event.store_name,
-            Event.start_datetime,
-            Event.due_datetime,
-            Event.estimated_time,
-            Employee.name.label('rep_name'),
-            Employee.id.label('employee_id'),
-            Schedule.schedule_datetime
-        ).join(
-            Schedule, Event.project_ref_num == Schedule.event_ref_num
-        ).join(
-            Employee, Schedule.employee_id == Employee.id
-        ).filter(
-            db.func.date(Schedule.schedule_datetime) >= today
-        ).order_by(Schedule.schedule_datetime).all()
-
-        # Validate each event's schedule date is within its start/due date range
-        valid_events = []
-        invalid_events = []
-
-        for event in scheduled_events:
-            schedule_date = event.schedule_datetime.date()
-            start_date = event.start_datetime.date()
-            due_date = event.due_datetime.date()
-
-            # Check if scheduled date is within the event's valid date range
-            if start_date <= schedule_date <= due_date:
-                valid_events.append(event)
-            else:
-                invalid_events.append({
-                    'project_name': event.project_name,
-                    'project_ref_num': event.project_ref_num,
-                    'scheduled_date': schedule_date,
-                    'start_date': start_date,
-                    'due_date': due_date,
-                    'employee': event.rep_name
-                })
+        fmt, compress = export_options()
+    except ExportFormatError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Check if only valid events should be exported
+    valid_only = request.args.get('valid_only') == 'true'
+
+    # Get current date to filter out past events
+    today = date.today()
+
+    # Scheduled events with JOIN, filtering for current day and future
+    scheduled_events = db.session.query(
+        Event.project_name,
+        Event.project_ref_num,
+        Event.location_mvid,
+        Event.store_number,
+        Event.store_name,
+        Event.start_datetime,
+        Event.due_datetime,
+        Event.estimated_time,
+        Employee.name.label('rep_name'),
+        Employee.id.label('employee_id'),
+        Schedule.schedule_datetime
+    ).join(
+        Schedule, Event.project_ref_num == Schedule.event_ref_num
+    ).join(
+        Employee, Schedule.employee_id == Employee.id
+    ).filter(
+        db.func.date(Schedule.schedule_datetime) >= today
+    )
 
-        # Create CSV in memory
-        output = io.StringIO()
-        writer = csv.writer(output)
+    # Scheduled date must be within the event's valid date range
+    in_range = and_(
+        db.func.date(Schedule.schedule_datetime) >= db.func.date(Event.start_datetime),
+        db.func.date(Schedule.schedule_datetime) <= db.func.date(Event.due_datetime)
+    )
 
+    def rows():
         # Write headers in correct order
-        writer.writerow([
+        yield [
             'Project Name', 'Project Reference Number', 'Location MVID',
             'Store Number', 'Store Name', 'Start Date/Time', 'Due Date/Time',
             'Estimated Time', 'Rep Name', 'Employee ID', 'Schedule Date/Time'
-        ])
-
-        # Add validation summary comment rows if there are invalid events (unless valid_only is true)
-        if invalid_events and not valid_only:
-            writer.writerow([])  # Empty row
-            writer.writerow(['# VALIDATION WARNINGS - The following events were EXCLUDED due to invalid schedule dates:'])
-            writer.writerow(['# Project Name', 'Project Ref', 'Scheduled Date', 'Valid Range Start', 'Valid Range End', 'Assigned Employee'])
-            for invalid in invalid_events:
-                writer.writerow([
-                    f"# {invalid['project_name'][:50]}...",
-                    f"# {invalid['project_ref_num']}",
-                    f"# {invalid['scheduled_date']}",
-                    f"# {invalid['start_date']}",
-                    f"# {invalid['due_date']}",
-                    f"# {invalid['employee']}"
-                ])
-            writer.writerow(['# END VALIDATION WARNINGS'])
-            writer.writerow([])  # Empty row
-
-        # Write only valid data rows
-        for event in valid_events:
-            writer.writerow([
+        ]
+
+        # Validation summary comment rows for excluded events (unless valid_only is true)
+        if not valid_only:
+            invalid_events = scheduled_events.filter(not_(in_range)).order_by(Schedule.schedule_datetime).all()
+            if invalid_events:
+                yield []  # Empty row
+                yield ['# VALIDATION WARNINGS - The following events were EXCLUDED due to invalid schedule dates:']
+                yield ['# Project Name', 'Project Ref', 'Scheduled Date', 'Valid Range Start', 'Valid Range End', 'Assigned Employee']
+                for invalid in invalid_events:
+                    yield [
+                        f"# {invalid.project_name[:50]}...",
+                        f"# {invalid.project_ref_num}",
+                        f"# {invalid.schedule_datetime.date()}",
+                        f"# {invalid.start_datetime.date()}",
+                        f"# {invalid.due_datetime.date()}",
+                        f"# {invalid.rep_name}"
+                    ]
+                yield ['# END VALIDATION WARNINGS']
+                yield []  # Empty row
+
+        # Only valid data rows, streamed
+        for event in scheduled_events.filter(in_range).order_by(Schedule.schedule_datetime).yield_per(YIELD_PER):
+            yield [
                 event.project_name,
                 event.project_ref_num,
                 event.location_mvid or '',
@@ -3778,33 +3694,28 @@ def export_schedule():
                 event.rep_name,
                 event.employee_id,
                 event.schedule_datetime.strftime('%m/%d/%Y %I:%M:%S %p')
-            ])
-
-        # Prepare response
-        output.seek(0)
-        csv_data = output.getvalue()
-        output.close()
-
-        response = make_response(csv_data)
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = 'attachment; filename=CalendarSchedule.csv'
-
-        return response
+            ]
 
-    except Exception as e:
-        return jsonify({'error': f'Error generating export: {str(e)}'}), 500
+    return export_response(rows(), 'CalendarSchedule', fmt, compress, sheet_name='Schedule')
 
 
 @api_bp.route('/export/events')
+@read_only_view
 def export_events():
     """Export filtered events to CSV based on condition, event_type, search, and date filters"""
     from sqlalchemy import or_, and_
+    from app.utils.export_stream import export_options, export_response, ExportFormatError, YIELD_PER
     db = current_app.extensions['sqlalchemy']
     models = get_models()
     Event = models['Event']
     Schedule = models['Schedule']
     Employee = models['Employee']
 
+    try:
+        fmt, compress = export_options()
+    except ExportFormatError as e:
+        return jsonify({'error': str(e)}), 400
+
     try:
         # Get filter parameters (same as events page)
         condition_filter = request.args.get('condition', 'all')
@@ -3957,44 +3868,38 @@ def export_events():
             if search_conditions:
                 query = query.filter(and_(*search_conditions))
 
-        # Order and fetch events
-        events = query.order_by(Event.start_datetime.asc()).all()
-
-        # Build CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Headers
-        writer.writerow([
-            'Event Number', 'Project Name', 'Event Type', 'Condition',
-            'Location MVID', 'Store Number', 'Store Name',
-            'Start Date', 'Due Date', 'Estimated Time (min)',
-            'Assigned Employee', 'Schedule Date/Time'
-        ])
+        # Column-only rows, one per schedule (or one for an unscheduled event)
+        export_query = query.outerjoin(
+            Schedule, Schedule.event_ref_num == Event.project_ref_num
+        ).outerjoin(
+            Employee, Schedule.employee_id == Employee.id
+        ).with_entities(
+            Event.project_ref_num,
+            Event.project_name,
+            Event.event_type,
+            Event.condition,
+            Event.location_mvid,
+            Event.store_number,
+            Event.store_name,
+            Event.start_datetime,
+            Event.due_datetime,
+            Event.estimated_time,
+            Employee.name.label('employee_name'),
+            Schedule.schedule_datetime
+        ).order_by(Event.start_datetime.asc(), Event.id, Schedule.id)
+
+        def rows():
+            # Headers
+            yield [
+                'Event Number', 'Project Name', 'Event Type', 'Condition',
+                'Location MVID', 'Store Number', 'Store Name',
+                'Start Date', 'Due Date', 'Estimated Time (min)',
+                'Assigned Employee', 'Schedule Date/Time'
+            ]
 
-        # Data rows
-        for event in events:
-            # Get schedule info if exists
-            schedules = Schedule.query.filter_by(event_ref_num=event.project_ref_num).all()
-            if schedules:
-                for schedule in schedules:
-                    employee = Employee.query.get(schedule.employee_id)
-                    writer.writerow([
-                        event.project_ref_num,
-                        event.project_name,
-                        event.event_type,
-                        event.condition,
-                        event.location_mvid or '',
-                        event.store_number or '',
-                        event.store_name or '',
-                        event.start_datetime.strftime('%m/%d/%Y'),
-                        event.due_datetime.strftime('%m/%d/%Y'),
-                        event.estimated_time or '',
-                        employee.name if employee else '',
-                        schedule.schedule_datetime.strftime('%m/%d/%Y %I:%M %p') if schedule.schedule_datetime else ''
-                    ])
-            else:
-                writer.writerow([
+            # Data rows
+            for event in export_query.yield_per(YIELD_PER):
+                yield [
                     event.project_ref_num,
                     event.project_name,
                     event.event_type,
@@ -4005,9 +3910,9 @@ def export_events():
                     event.start_datetime.strftime('%m/%d/%Y'),
                     event.due_datetime.strftime('%m/%d/%Y'),
                     event.estimated_time or '',
-                    '',
-                    ''
-                ])
+                    event.employee_name or '',
+                    event.schedule_datetime.strftime('%m/%d/%Y %I:%M %p') if event.schedule_datetime else ''
+                ]
 
         # Build filename based on filters
         filename_parts = ['Events']
@@ -4015,17 +3920,8 @@ def export_events():
             filename_parts.append(condition_filter.capitalize())
         if event_type_filter:
             filename_parts.append(event_type_filter.replace(' ', '_'))
-        filename = '_'.join(filename_parts) + '.csv'
-
-        output.seek(0)
-        csv_data = output.getvalue()
-        output.close()
-
-        response = make_response(csv_data)
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
 
-        return response
+        return export_response(rows(), '_'.join(filename_parts), fmt, compress, sheet_name='Events')
 
     except Exception as e:
         logger.error(f'Error exporting events: {e}')
@@ -4034,14 +3930,22 @@ def export_events():
 
 @api_bp.route('/export/corporate-report')
 @require_authentication()
+@read_only_view
 def export_corporate_report():
     """Generate a corporate report CSV for a date range with summary stats."""
+    from collections import Counter
+    from app.utils.export_stream import export_options, export_response, ExportFormatError, YIELD_PER
     db = current_app.extensions['sqlalchemy']
     models = get_models()
     Event = models['Event']
     Schedule = models['Schedule']
     Employee = models['Employee']
 
+    try:
+        fmt, compress = export_options()
+    except ExportFormatError as e:
+        return jsonify({'error': str(e)}), 400
+
     try:
         date_from_str = request.args.get('date_from', '')
         date_to_str = request.args.get('date_to', '')
@@ -4057,213 +3961,111 @@ def export_corporate_report():
         else:
             date_to = date_from + timedelta(days=6)  # Sunday of current week
 
-        # Get all events in the date range
-        events = Event.query.filter(
+        # Events in the date range
+        in_range = (
             Event.start_datetime >= datetime.combine(date_from, datetime.min.time()),
             Event.start_datetime <= datetime.combine(date_to, datetime.max.time())
-        ).order_by(Event.start_datetime.asc()).all()
+        )
 
-        # Compute summary stats
-        total = len(events)
-        by_condition = {}
-        for event in events:
-            cond = event.condition or 'Unknown'
-            by_condition[cond] = by_condition.get(cond, 0) + 1
+        # Summary stats from an aggregate query
+        by_condition = Counter()
+        for cond, count in db.session.query(Event.condition, db.func.count()).filter(*in_range).group_by(Event.condition):
+            by_condition[cond or 'Unknown'] += count
+        total = sum(by_condition.values())
 
         submitted = by_condition.get('Submitted', 0)
         completion_rate = round((submitted / total * 100), 1) if total > 0 else 0
 
-        # Group events by week
-        from collections import defaultdict
-        weeks = defaultdict(list)
-        for event in events:
-            # Calculate week start (Monday)
-            event_date = event.start_datetime.date()
-            week_start = event_date - timedelta(days=event_date.weekday())
-            weeks[week_start].append(event)
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Summary header
-        writer.writerow(['Corporate Event Report'])
-        writer.writerow([f'Period: {date_from.strftime("%m/%d/%Y")} - {date_to.strftime("%m/%d/%Y")}'])
-        writer.writerow([f'Generated: {today.strftime("%m/%d/%Y")}'])
-        writer.writerow([])
-        writer.writerow(['Summary'])
-        writer.writerow([f'Total Events: {total}'])
-        writer.writerow([f'Completion Rate: {completion_rate}%'])
-        for cond, count in sorted(by_condition.items()):
-            writer.writerow([f'  {cond}: {count}'])
-        writer.writerow([])
-
-        # Detail rows grouped by week
-        for week_start in sorted(weeks.keys()):
-            week_end = week_start + timedelta(days=6)
-            week_events = weeks[week_start]
-            writer.writerow([f'Week of {week_start.strftime("%m/%d/%Y")} - {week_end.strftime("%m/%d/%Y")} ({len(week_events)} events)'])
-            writer.writerow([
-                'Event #', 'Event Name', 'Event Type', 'Status',
-                'Start Date', 'Due Date', 'Assigned Employee',
-                'Schedule Date', 'Days Available'
-            ])
-
-            for event in week_events:
-                # Get employee assignment
-                schedule = Schedule.query.filter_by(event_ref_num=event.project_ref_num).first()
-                employee_name = ''
-                schedule_date = ''
-                if schedule:
-                    employee = db.session.get(Employee, schedule.employee_id)
-                    employee_name = employee.name if employee else ''
-                    schedule_date = schedule.schedule_datetime.strftime('%m/%d/%Y') if schedule.schedule_datetime else ''
+        # Events per week (Monday start) from the start dates alone
+        week_counts = Counter()
+        for (start_datetime,) in db.session.query(Event.start_datetime).filter(*in_range).yield_per(YIELD_PER):
+            event_date = start_datetime.date()
+            week_counts[event_date - timedelta(days=event_date.weekday())] += 1
+
+        # Detail rows with each event's first schedule
+        first_schedule_id = db.session.query(db.func.min(Schedule.id)).filter(
+            Schedule.event_ref_num == Event.project_ref_num
+        ).correlate(Event).scalar_subquery()
+        detail_query = db.session.query(
+            Event.project_ref_num,
+            Event.project_name,
+            Event.event_type,
+            Event.condition,
+            Event.start_datetime,
+            Event.due_datetime,
+            Employee.name.label('employee_name'),
+            Schedule.schedule_datetime
+        ).outerjoin(
+            Schedule, Schedule.id == first_schedule_id
+        ).outerjoin(
+            Employee, Schedule.employee_id == Employee.id
+        ).filter(*in_range).order_by(Event.start_datetime.asc(), Event.id)
+
+        def rows():
+            # Summary header
+            yield ['Corporate Event Report']
+            yield [f'Period: {date_from.strftime("%m/%d/%Y")} - {date_to.strftime("%m/%d/%Y")}']
+            yield [f'Generated: {today.strftime("%m/%d/%Y")}']
+            yield []
+            yield ['Summary']
+            yield [f'Total Events: {total}']
+            yield [f'Completion Rate: {completion_rate}%']
+            for cond, count in sorted(by_condition.items()):
+                yield [f'  {cond}: {count}']
+            yield []
+
+            # Detail rows grouped by week (events arrive in start order)
+            current_week = None
+            for event in detail_query.yield_per(YIELD_PER):
+                event_date = event.start_datetime.date()
+                week_start = event_date - timedelta(days=event_date.weekday())
+                if week_start != current_week:
+                    if current_week is not None:
+                        yield []
+                    current_week = week_start
+                    week_end = week_start + timedelta(days=6)
+                    yield [f'Week of {week_start.strftime("%m/%d/%Y")} - {week_end.strftime("%m/%d/%Y")} ({week_counts[week_start]} events)']
+                    yield [
+                        'Event #', 'Event Name', 'Event Type', 'Status',
+                        'Start Date', 'Due Date', 'Assigned Employee',
+                        'Schedule Date', 'Days Available'
+                    ]
 
                 days_available = (event.due_datetime.date() - event.start_datetime.date()).days
 
-                writer.writerow([
+                yield [
                     event.project_ref_num,
                     event.project_name,
                     event.event_type,
                     event.condition,
                     event.start_datetime.strftime('%m/%d/%Y'),
                     event.due_datetime.strftime('%m/%d/%Y'),
-                    employee_name,
-                    schedule_date,
+                    event.employee_name or '',
+                    event.schedule_datetime.strftime('%m/%d/%Y') if event.schedule_datetime else '',
                     days_available
-                ])
-
-            writer.writerow([])
-
-        filename = f'Corporate_Report_{date_from.strftime("%m%d%Y")}_{date_to.strftime("%m%d%Y")}.csv'
-        output.seek(0)
-        csv_data = output.getvalue()
-        output.close()
+                ]
+            if current_week is not None:
+                yield []
 
-        response = make_response(csv_data)
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
-        return response
+        filename = f'Corporate_Report_{date_from.strftime("%m%d%Y")}_{date_to.strftime("%m%d%Y")}'
+        return export_response(rows(), filename, fmt, compress, sheet_name='Corporate Report')
 
     except Exception as e:
         logger.error(f'Error generating corporate report: {e}')
         return jsonify({'error': f'Error generating report: {str(e)}'}), 500
 
 
-@api_bp.route('/import/events', methods=['POST'])
-def import_events():
-    """Import unscheduled events from WorkBankVisits.csv file"""
-    db = current_app.extensions['sqlalchemy']
-    models = get_models()
-    Event = models['Event']
-    Employee = models['Employee']
-
-    try:
-        # Check if file is provided
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
-
-        file = request.files['file']
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
-
-        # Validate file extension
-        if not file.filename.lower().endswith('.csv'):
-            return jsonify({'error': 'File must be a CSV file'}), 400
-
-        # Read and parse CSV
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
-
-        # Validate CSV headers
-        expected_headers = {
-            'Project Name', 'Project Reference Number', 'Location MVID',
-            'Store Number', 'Store Name', 'Start Date/Time', 'Due Date/Time',
-            'Estimated Time', 'Employee ID', 'Rep Name'
-        }
-
-        csv_headers = set(csv_reader.fieldnames)
-        missing_headers = expected_headers - csv_headers
-        if missing_headers:
-            return jsonify({'error': f'Missing required CSV headers: {", ".join(missing_headers)}'}), 400
-
-        imported_count = 0
-        employees_added = set()
-
-        # Begin database transaction
-        try:
-            for row in csv_reader:
-                # First, ensure employee exists
-                employee_id = row['Employee ID'].strip() if row['Employee ID'] else ''
-                rep_name = row['Rep Name'].strip() if row['Rep Name'] else ''
-
-                if employee_id and rep_name and employee_id not in employees_added:
-                    existing_employee = Employee.query.filter_by(id=employee_id).first()
-                    if not existing_employee:
-                        new_employee = Employee(id=employee_id, name=rep_name)
-                        db.session.add(new_employee)
-                        employees_added.add(employee_id)
-
-                # Parse and validate event data
-                project_ref_num = int(row['Project Reference Number'])
-
-                # Check for duplicate
-                existing_event = Event.query.filter_by(project_ref_num=project_ref_num).first()
-                if existing_event:
-                    continue  # Skip duplicates
-
-                # Parse dates with correct format for MM/DD/YYYY HH:MM:SS AM/PM
-                start_datetime = datetime.strptime(row['Start Date/Time'], '%m/%d/%Y %I:%M:%S %p')
-                due_datetime = datetime.strptime(row['Due Date/Time'], '%m/%d/%Y %I:%M:%S %p')
-
-                # Create new event
-                new_event = Event(
-                    project_name=row['Project Name'].strip() if row['Project Name'] else '',
-                    project_ref_num=project_ref_num,
-                    location_mvid=row['Location MVID'].strip() if row['Location MVID'] else None,
-                    store_number=int(row['Store Number']) if row['Store Number'] else None,
-                    store_name=row['Store Name'].strip() if row['Store Name'] else None,
-                    start_datetime=start_datetime,
-                    due_datetime=due_datetime,
-                    estimated_time=int(row['Estimated Time']) if row['Estimated Time'] else None,
-                    is_scheduled=False
-                )
-
-                # Auto-detect and set event type
-                new_event.event_type = new_event.detect_event_type()
-
-                # Set default duration if estimated_time is not set
-                new_event.set_default_duration()
-
-                db.session.add(new_event)
-                imported_count += 1
-
-            # Commit all changes
-            db.session.commit()
-
-            return jsonify({
-                'imported_count': imported_count,
-                'message': f'Successfully imported {imported_count} events'
-            }), 200
-
-        except Exception as e:
-            # Rollback transaction on error
-            db.session.rollback()
-            return jsonify({'error': f'Database error during import: {str(e)}'}), 500
-
-    except Exception as e:
-        return jsonify({'error': f'Error processing CSV file: {str(e)}'}), 400
-
+def _import_csv(kind):
+    """
+    Shared handler for the CSV import endpoints
 
-@api_bp.route('/import/scheduled', methods=['POST'])
-def import_scheduled_events():
-    """Import already scheduled events from CSV file"""
-    db = current_app.extensions['sqlalchemy']
-    models = get_models()
-    Event = models['Event']
-    Employee = models['Employee']
-    Schedule = models['Schedule']
-    EmployeeWeeklyAvailability = models['EmployeeWeeklyAvailability']
+    Small files are imported in the request. Files larger than
+    CSV_IMPORT_ASYNC_BYTES (or any file with form field async=true) are saved
+    and imported by a background job; the response then carries its job_id.
+    """
+    from app.services.csv_import_service import CSVImportError, run_import, save_upload
 
+    # Check if file is provided
     if 'file' not in request.files:
         return jsonify({'error': 'No file provided'}), 400
 
@@ -4271,142 +4073,49 @@ def import_scheduled_events():
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
 
+    # Validate file extension
     if not file.filename.lower().endswith('.csv'):
-        return jsonify({'error': 'File must be a CSV'}), 400
+        return jsonify({'error': 'File must be a CSV file'}), 400
+
+    async_requested = request.form.get('async', '').lower() in ('1', 'true', 'yes')
+    size = request.content_length or 0
+    if async_requested or size > current_app.config.get('CSV_IMPORT_ASYNC_BYTES', 5 * 1024 * 1024):
+        from app.services.job_runner import submit_job
+        path = save_upload(file)
+        job_id, created = submit_job('csv_import', params={'kind': kind, 'path': path})
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'created': created,
+            'message': 'Import started in the background'
+        }), 202
 
     try:
-        # Read CSV file
-        content = file.read().decode('utf-8')
-        csv_data = list(csv.DictReader(StringIO(content)))
-
-        imported_count = 0
-
-        try:
-            for row in csv_data:
-                # Parse dates
-                start_datetime = datetime.strptime(row['Start Date/Time'], '%m/%d/%Y %I:%M:%S %p')
-                due_datetime = datetime.strptime(row['Due Date/Time'], '%m/%d/%Y %I:%M:%S %p')
-                schedule_datetime = datetime.strptime(row['Schedule Date/Time'], '%m/%d/%Y %I:%M:%S %p')
-
-                # Get or create the event first
-                project_ref_num = row['Project Reference Number'].strip() if row['Project Reference Number'] else None
-
-                # Check if event already exists
-                existing_event = Event.query.filter_by(project_ref_num=project_ref_num).first()
-
-                if not existing_event:
-                    # Create new event
-                    new_event = Event(
-                        project_name=row['Project Name'].strip() if row['Project Name'] else '',
-                        project_ref_num=project_ref_num,
-                        location_mvid=row['Location MVID'].strip() if row['Location MVID'] else None,
-                        store_number=int(row['Store Number']) if row['Store Number'] else None,
-                        store_name=row['Store Name'].strip() if row['Store Name'] else None,
-                        start_datetime=start_datetime,
-                        due_datetime=due_datetime,
-                        estimated_time=int(row['Estimated Time']) if row['Estimated Time'] else None,
-                        is_scheduled=True
-                    )
-
-                    # Auto-detect and set event type
-                    new_event.event_type = new_event.detect_event_type()
-
-                    # Set default duration if estimated_time is not set
-                    new_event.set_default_duration()
-
-                    db.session.add(new_event)
-                    db.session.flush()  # Get the ID
-                    event = new_event
-                else:
-                    # Update existing event to be scheduled
-                    existing_event.is_scheduled = True
-                    event = existing_event
-
-                # Get or create the employee
-                employee_id = row['Employee ID'].strip() if row['Employee ID'] else None
-                employee_name = row['Rep Name'].strip() if row['Rep Name'] else None
-
-                if employee_id:
-                    employee = Employee.query.filter_by(id=employee_id).first()
-                    if not employee:
-                        # Create new employee if not exists
-                        employee = Employee(
-                            id=employee_id,
-                            name=employee_name or f'Employee {employee_id}',
-                            is_active=True,
-                            is_supervisor=False,
-                            job_title='Event Specialist',  # Default job title
-                            adult_beverage_trained=False
-                        )
-                        db.session.add(employee)
-
-                        # Add default weekly availability (available all days)
-                        availability = EmployeeWeeklyAvailability(
-                            employee_id=employee_id,
-                            monday=True,
-                            tuesday=True,
-                            wednesday=True,
-                            thursday=True,
-                            friday=True,
-                            saturday=True,
-                            sunday=True
-                        )
-                        db.session.add(availability)
-
-                    # Create the schedule entry
-                    existing_schedule = Schedule.query.filter_by(
-                        event_ref_num=event.project_ref_num,
-                        employee_id=employee_id
-                    ).first()
-
-                    if not existing_schedule:
-                        new_schedule = Schedule(
-                            event_ref_num=event.project_ref_num,
-                            employee_id=employee_id,
-                            schedule_datetime=schedule_datetime
-                        )
-                        db.session.add(new_schedule)
-                        db.session.flush()  # Get the ID for shift block assignment
-                        
-                        # NEW: Assign shift block for Core events
-                        if event.event_type == 'Core':
-                            try:
-                                from app.services.shift_block_config import ShiftBlockConfig
-                                ShiftBlockConfig.assign_next_available_block(
-                                    new_schedule, 
-                                    schedule_datetime.date()
-                                )
-                            except Exception as e:
-                                logger.warning(f"Could not assign shift block during import: {e}")
-
-                    # AUTO-SCHEDULE SUPERVISOR EVENT if this is a Core event
-                    if event.event_type == 'Core' and not existing_schedule:
-                        from routes.scheduling import auto_schedule_supervisor_event
-                        scheduled_date = schedule_datetime.date()
-                        auto_schedule_supervisor_event(
-                            db, Event, Schedule, Employee,
-                            event.project_ref_num,
-                            scheduled_date,
-                            employee_id
-                        )
-
-                imported_count += 1
+        # Stream rows from the upload instead of decoding it all into memory
+        stream = io.TextIOWrapper(file.stream, encoding='utf-8-sig', newline='')
+        result = run_import(kind, stream)
+        return jsonify(result), 200
+
+    except CSVImportError as e:
+        return jsonify({'error': str(e)}), 400
+    except UnicodeDecodeError as e:
+        return jsonify({'error': f'Error processing CSV file: {str(e)}'}), 400
+    except Exception as e:
+        current_app.extensions['sqlalchemy'].session.rollback()
+        logger.error(f'CSV import failed: {e}', exc_info=True)
+        return jsonify({'error': f'Database error during import: {str(e)}'}), 500
 
-            # Commit all changes
-            db.session.commit()
 
-            return jsonify({
-                'imported_count': imported_count,
-                'message': f'Successfully imported {imported_count} scheduled events'
-            }), 200
+@api_bp.route('/import/events', methods=['POST'])
+def import_events():
+    """Import unscheduled events from WorkBankVisits.csv file"""
+    return _import_csv('events')
 
-        except Exception as e:
-            # Rollback transaction on error
-            db.session.rollback()
-            return jsonify({'error': f'Database error during import: {str(e)}'}), 500
 
-    except Exception as e:
-        return jsonify({'error': f'Error processing CSV file: {str(e)}'}), 400
+@api_bp.route('/import/scheduled', methods=['POST'])
+def import_scheduled_events():
+    """Import already scheduled events from CSV file"""
+    return _import_csv('scheduled')
 
 
 @api_bp.route('/validate-schedule', methods=['POST'])
@@ -4799,7 +4508,7 @@ def get_workload():
             return jsonify({'error': 'End date must be after start date'}), 400
 
         # Get workload data
-        analytics = WorkloadAnalytics(db)
+        analytics = WorkloadAnalytics(db.session, get_models())
         workload_data = analytics.get_workload_data(start_date, end_date)
 
         return jsonify(workload_data)
@@ -5172,11 +4881,13 @@ def get_available_employees():
 
     Note:
         - Queries all active employees
-        - Filters out employees with conflicts at specified datetime
-        - Uses ConflictValidator to check each employee
+        - With event_id, applies ConstraintValidator's hard constraints to
+          the whole roster in one evaluation (WhatIfService)
+        - Without event_id, filters out employees already scheduled at the
+          exact datetime
         - Returns only conflict-free employees
     """
-    from app.services.conflict_validation import ConflictValidator
+    from app.services.what_if_service import WhatIfService
 
     db = current_app.extensions['sqlalchemy']
     models = get_models()
@@ -5189,7 +4900,7 @@ def get_available_employees():
     time_str = request.args.get('time')
     duration = int(request.args.get('duration', 120))
     event_id = request.args.get('event_id')
-    exclude_schedule_id = request.args.get('exclude_schedule_id')
+    exclude_schedule_id = request.args.get('exclude_schedule_id', type=int)
 
     # Validate required parameters
     if not date_str or not time_str:
@@ -5207,66 +4918,38 @@ def get_available_employees():
     if event_id:
         event = db.session.query(Event).filter_by(project_ref_num=int(event_id)).first()
 
-    # Query all active employees
-    all_employees = db.session.query(Employee).filter_by(is_active=True).all()
-
-    # Initialize ConflictValidator
     try:
-        models = {
-            'Employee': Employee,
-            'Event': Event,
-            'Schedule': Schedule,
-            'EmployeeTimeOff': current_app.config.get('EmployeeTimeOff'),
-            'EmployeeAvailability': current_app.config.get('EmployeeAvailability'),
-            'EmployeeWeeklyAvailability': current_app.config.get('EmployeeWeeklyAvailability'),
-        }
-
-        validator = ConflictValidator(db.session, models)
-
-        # Filter employees by checking conflicts
-        available_employees = []
+        # Query all active employees
+        all_employees = db.session.query(Employee).filter_by(is_active=True).order_by(Employee.name).all()
+        excluded = [exclude_schedule_id] if exclude_schedule_id else []
+
+        if event:
+            # Full validation of every employee at once
+            result = WhatIfService(db.session, models).evaluate(
+                event, target_datetime, duration_minutes=duration, exclude_schedule_ids=excluded
+            )
+            is_free = result.is_available
+        else:
+            # No event_id provided - just check basic time conflicts
+            # (employees with any schedule at this exact time)
+            query = db.session.query(Schedule.employee_id).filter(
+                Schedule.schedule_datetime == target_datetime
+            )
+            if excluded:
+                query = query.filter(~Schedule.id.in_(excluded))
+            busy = {row[0] for row in query}
 
-        for employee in all_employees:
-            try:
-                # If event_id is provided, do full validation
-                if event_id and event:
-                    validation_result = validator.validate_schedule(
-                        employee_id=employee.id,
-                        event_id=int(event_id),
-                        schedule_datetime=target_datetime,
-                        duration_minutes=duration
-                    )
+            def is_free(employee_id):
+                return employee_id not in busy
 
-                    # Only include if no conflicts
-                    if validation_result.is_valid:
-                        available_employees.append({
-                            'employee_id': employee.id,
-                            'employee_name': employee.name,
-                            'is_active': employee.is_active
-                        })
-                else:
-                    # No event_id provided - just check basic time conflicts
-                    # Check if employee has any schedule at this exact time
-                    existing_schedule = db.session.query(Schedule).filter_by(
-                        employee_id=employee.id,
-                        schedule_datetime=target_datetime
-                    ).first()
-
-                    if not existing_schedule:
-                        available_employees.append({
-                            'employee_id': employee.id,
-                            'employee_name': employee.name,
-                            'is_active': employee.is_active
-                        })
-
-            except ValueError as e:
-                # Event not found - skip this employee
-                logger.debug(f"Skipping employee {employee.id}: {e}")
-                continue
-            except Exception as e:
-                logger.warning(f"Validation failed for employee {employee.id}: {e}")
-                # Skip this employee if validation fails
-                continue
+        available_employees = [
+            {
+                'employee_id': employee.id,
+                'employee_name': employee.name,
+                'is_active': employee.is_active
+            }
+            for employee in all_employees if is_free(employee.id)
+        ]
 
         logger.info(
             f"Available employees query: date={date_str}, time={time_str}, "
@@ -0,0 +1,79 @@
+"""
+API endpoints for background jobs.
+
+Jobs are submitted by the feature routes (loading page refresh, complete
+paperwork, EDR batch downloads, auto-scheduler run, CSV imports); these
+endpoints report their status, stream progress and serve file results.
+"""
+import json
+import os
+
+from flask import Blueprint, jsonify, Response, send_file, stream_with_context
+
+from app.routes.auth import require_authentication
+from app.services.job_runner import get_job, iter_job_progress, JOB_STATUS_COMPLETED
+
+api_jobs_bp = Blueprint('api_jobs', __name__, url_prefix='/api/jobs')
+
+
+def _public_record(record):
+    """Job record without submitted params or server file paths"""
+    public = {k: v for k, v in record.items() if k != 'params'}
+    result = public.get('result')
+    if isinstance(result, dict) and 'path' in result:
+        public['result'] = {k: v for k, v in result.items() if k != 'path'}
+        public['download'] = True
+    return public
+
+
+@api_jobs_bp.route('/<job_id>', methods=['GET'])
+@require_authentication()
+def job_status(job_id):
+    """Get a job's status, progress and result"""
+    record = get_job(job_id)
+    if not record:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': _public_record(record)})
+
+
+@api_jobs_bp.route('/<job_id>/progress', methods=['GET'])
+@require_authentication()
+def job_progress(job_id):
+    """Stream job progress via Server-Sent Events"""
+
+    def generate():
+        for progress in iter_job_progress(job_id):
+            yield f"data: {json.dumps(_public_record(progress))}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+            'Connection': 'keep-alive'
+        }
+    )
+
+
+@api_jobs_bp.route('/<job_id>/download', methods=['GET'])
+@require_authentication()
+def job_download(job_id):
+    """Download a completed job's file result (e.g. complete paperwork PDF)"""
+    record = get_job(job_id)
+    if not record:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if record.get('status') != JOB_STATUS_COMPLETED:
+        return jsonify({'success': False, 'error': 'Job has not completed', 'status': record.get('status')}), 409
+
+    result = record.get('result') or {}
+    path = result.get('path')
+    if not path or not os.path.exists(path):
+        return jsonify({'success': False, 'error': 'Job has no downloadable result'}), 404
+
+    return send_file(
+        path,
+        mimetype=result.get('mimetype', 'application/octet-stream'),
+        as_attachment=False,
+        download_name=result.get('filename') or os.path.basename(path)
+    )
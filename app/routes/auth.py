@@ -9,7 +9,6 @@ import secrets
 import redis
 import json
 import os
-import time
 
 import urllib.parse
 
@@ -470,57 +469,76 @@ def session_heartbeat():
 # Database Refresh Progress Tracking
 # =============================================================================
 
-REFRESH_PROGRESS_PREFIX = "db_refresh_progress:"
-REFRESH_PROGRESS_TTL = 300  # 5 minutes
+# Progress records are background job records (app.services.job_runner), so
+# the loading page and /api/jobs/<id>/progress read the same data.
 
 
 def save_refresh_progress(task_id, progress_data):
-    """Save refresh progress state to Redis"""
-    try:
-        client = get_redis_client()
-        client.setex(
-            f"{REFRESH_PROGRESS_PREFIX}{task_id}",
-            REFRESH_PROGRESS_TTL,
-            json.dumps(progress_data)
-        )
-    except Exception as e:
-        current_app.logger.error(f"Redis progress write error: {e}")
+    """Save refresh progress state"""
+    from app.services.job_runner import job_store
+    job_store.save(task_id, progress_data)
 
 
 def get_refresh_progress(task_id):
-    """Get refresh progress state from Redis"""
-    try:
-        client = get_redis_client()
-        data = client.get(f"{REFRESH_PROGRESS_PREFIX}{task_id}")
-        return json.loads(data) if data else None
-    except Exception as e:
-        current_app.logger.error(f"Redis progress read error: {e}")
-        return None
+    """Get refresh progress state"""
+    from app.services.job_runner import job_store
+    return job_store.get(task_id)
 
 
 def update_refresh_progress(task_id, **kwargs):
     """Update specific refresh progress fields"""
-    progress = get_refresh_progress(task_id) or {
-        'status': 'pending',
-        'current_step': 0,
-        'total_steps': 5,
-        'step_label': 'Initializing...',
+    from app.services.job_runner import job_store
+    progress = get_refresh_progress(task_id) or _new_refresh_progress(task_id)
+    progress.update(kwargs)
+    job_store.save(task_id, progress)
+
+
+def _new_refresh_progress(task_id):
+    """Initial progress record for a database refresh job"""
+    from app.services.job_runner import new_job_record
+    return new_job_record(task_id, 'db_refresh', total_steps=6)
+
+
+def _get_attached_progress(owner_task_id):
+    """
+    Progress of the refresh a task is attached to
+
+    Once the owning refresh is gone (finished and cleaned up, or it was the
+    hourly task which has no progress record) the lock is checked: no lock
+    means the data has just been refreshed.
+    """
+    progress = get_refresh_progress(owner_task_id)
+    if progress:
+        return progress
+
+    from app.services.database_refresh_service import get_refresh_lock_owner
+    if get_refresh_lock_owner() == owner_task_id:
+        return {
+            'status': 'running',
+            'current_step': 0,
+            'total_steps': 6,
+            'step_label': 'Waiting for refresh in progress',
+            'processed': 0,
+            'total': 0,
+            'error': None,
+            'stats': None
+        }
+    return {
+        'status': 'completed',
+        'current_step': 6,
+        'total_steps': 6,
+        'step_label': 'Complete',
         'processed': 0,
         'total': 0,
         'error': None,
-        'stats': None
+        'stats': {'mode': 'attached'}
     }
-    progress.update(kwargs)
-    save_refresh_progress(task_id, progress)
 
 
 def delete_refresh_progress(task_id):
-    """Delete refresh progress from Redis"""
-    try:
-        client = get_redis_client()
-        client.delete(f"{REFRESH_PROGRESS_PREFIX}{task_id}")
-    except Exception as e:
-        current_app.logger.error(f"Redis progress delete error: {e}")
+    """Delete refresh progress"""
+    from app.services.job_runner import job_store
+    job_store.delete(task_id)
 
 
 # =============================================================================
@@ -534,17 +552,9 @@ def loading_page():
     # Generate unique task ID for this refresh operation
     task_id = secrets.token_urlsafe(16)
 
-    # Initialize progress state in Redis
-    progress_data = {
-        'status': 'pending',
-        'current_step': 0,
-        'total_steps': 5,
-        'step_label': 'Initializing...',
-        'processed': 0,
-        'total': 0,
-        'error': None,
-        'stats': None
-    }
+    # Initialize progress state (a pending db_refresh job record)
+    progress_data = _new_refresh_progress(task_id)
+    progress_data['user'] = (get_current_user() or {}).get('username')
     save_refresh_progress(task_id, progress_data)
 
     # Get today's date for redirect after completion
@@ -563,24 +573,14 @@ def loading_progress(task_id):
     """Stream database refresh progress via Server-Sent Events"""
 
     def generate():
-        max_iterations = 3000  # Max 5 minutes (3000 * 0.1s)
-        iteration = 0
-
-        while iteration < max_iterations:
-            progress = get_refresh_progress(task_id)
-
-            if not progress:
-                yield f"data: {json.dumps({'error': 'Task not found', 'status': 'error'})}\n\n"
-                break
+        from app.services.job_runner import iter_job_progress
 
+        progress = None
+        # Follow a refresh started by another login instead of running a second one
+        for progress in iter_job_progress(
+                task_id, resolve=lambda p: _get_attached_progress(p['attached_to'])):
             yield f"data: {json.dumps(progress)}\n\n"
 
-            if progress.get('status') in ('completed', 'error'):
-                break
-
-            time.sleep(0.1)  # 100ms delay - 5x faster updates
-            iteration += 1
-
         # Cleanup progress data after completion
         if progress and progress.get('status') == 'completed':
             delete_refresh_progress(task_id)
@@ -607,30 +607,27 @@ def start_loading_refresh(task_id):
             return jsonify({'success': False, 'error': 'Invalid task ID'}), 400
 
         # Check if already running
-        if progress.get('status') == 'running':
+        if progress.get('status') in ('queued', 'running'):
             return jsonify({'success': False, 'error': 'Refresh already in progress'}), 400
 
-        # Import and run the refresh service IN BACKGROUND THREAD
-        # This prevents blocking the single gunicorn worker, allowing SSE to work
-        import threading
-        from app.services.database_refresh_service import refresh_database_with_progress
-
-        # CRITICAL: Capture the actual Flask app BEFORE starting the thread
-        # current_app is a proxy that doesn't work in background threads
-        app = current_app._get_current_object()
-
-        def run_refresh():
-            """Run refresh in background with Flask app context"""
-            with app.app_context():
-                try:
-                    refresh_database_with_progress(task_id)
-                except Exception as e:
-                    app.logger.error(f"Background refresh failed: {e}", exc_info=True)
-                    update_refresh_progress(task_id, status='error', error=str(e))
-
-        # Start background thread
-        thread = threading.Thread(target=run_refresh, daemon=True)
-        thread.start()
+        from app.services.database_refresh_service import get_refresh_lock_owner
+        from app.services.job_runner import submit_job
+
+        # Another login (or the hourly task) is already refreshing - attach to it
+        owner = get_refresh_lock_owner()
+        if owner and owner != task_id:
+            update_refresh_progress(task_id, status='running', attached_to=owner,
+                                    step_label='Waiting for refresh in progress')
+            return jsonify({'success': True, 'message': 'Attached to refresh in progress', 'attached_to': owner})
+
+        # Run the refresh as a background job (keeps the gunicorn worker free
+        # to serve the SSE stream); logins racing each other share one job
+        job_id, created = submit_job('db_refresh', job_key='crossmark-refresh', job_id=task_id,
+                                     user=progress.get('user'))
+        if not created:
+            update_refresh_progress(task_id, status='running', attached_to=job_id,
+                                    step_label='Waiting for refresh in progress')
+            return jsonify({'success': True, 'message': 'Attached to refresh in progress', 'attached_to': job_id})
 
         # Return immediately so SSE endpoint can be served
         return jsonify({'success': True, 'message': 'Database refresh started'})
@@ -3,16 +3,19 @@ Auto-scheduler routes
 Handles scheduler runs, review, and approval workflow
 """
 import csv
+import re
+from collections import defaultdict
 from io import StringIO
 
 from flask import Blueprint, render_template, request, jsonify, current_app, Response
 from app.models import get_models
 from app.constants import INACTIVE_CONDITIONS, CONDITION_SCHEDULED, CONDITION_SUBMITTED
 from datetime import datetime, timedelta, date
-from sqlalchemy import func
+from sqlalchemy import func, or_
 
 from app.services.scheduling_engine import SchedulingEngine
 from app.routes.auth import require_authentication
+from app.utils.db_routing import read_only_view
 from app.utils.timezone import to_local_time
 
 auto_scheduler_bp = Blueprint('auto_scheduler', __name__, url_prefix='/auto-schedule')
@@ -79,14 +82,56 @@ def index():
                          today=today)
 
 
+def execute_scheduler_run(use_cpsat=None, emergency_mode=False, run_type='manual'):
+    """
+    Run the auto-scheduler with the configured solver
+
+    Args:
+        use_cpsat: Force CP-SAT (True) or greedy (False); None uses CPSAT_ENABLED
+        emergency_mode: Reduce the scheduling buffer from 3 days to 0
+        run_type: Run type recorded on the SchedulerRunHistory row
+
+    Returns:
+        tuple: (SchedulerRunHistory run, solver name)
+    """
+    db = current_app.extensions['sqlalchemy']
+    models = get_models()
+
+    if use_cpsat is None:
+        use_cpsat = current_app.config.get('CPSAT_ENABLED', False)
+
+    if use_cpsat:
+        from app.services.cpsat_scheduler import CPSATSchedulingEngine
+        cpsat_models = dict(models)
+        # CP-SAT engine needs additional models
+        for extra in ['LockedDay', 'EventSchedulingOverride', 'EventTypeOverride',
+                      'EmployeeAvailabilityOverride']:
+            if extra not in cpsat_models and extra in current_app.config:
+                cpsat_models[extra] = current_app.config[extra]
+        engine = CPSATSchedulingEngine(db.session, cpsat_models)
+        if emergency_mode:
+            engine.emergency_mode = True
+        time_limit = current_app.config.get('CPSAT_TIME_LIMIT', 60)
+        return engine.run_auto_scheduler(run_type=run_type, time_limit_seconds=time_limit), 'cpsat'
+
+    engine = SchedulingEngine(db.session, models)
+    if emergency_mode:
+        engine.emergency_mode = True
+    return engine.run_auto_scheduler(run_type=run_type), 'greedy'
+
+
 @auto_scheduler_bp.route('/run', methods=['POST'])
 @require_authentication()
 def run_scheduler():
-    """Manually trigger auto-scheduler run"""
-    from app.models import get_models
-    db = current_app.extensions['sqlalchemy']
-    models = get_models()
+    """
+    Manually trigger auto-scheduler run
 
+    Query params:
+        solver: 'cpsat' or 'greedy' (overrides CPSAT_ENABLED)
+        emergency: 'true' to reduce the scheduling buffer from 3 days to 0
+        async: 'true' to run as a background job; returns 202 with a job ID
+               whose progress is at /api/jobs/<job_id>/progress
+    """
     # Use CP-SAT solver if enabled, otherwise fall back to greedy engine
     use_cpsat = current_app.config.get('CPSAT_ENABLED', False)
 
@@ -101,26 +146,21 @@ def run_scheduler():
     emergency_mode = request.args.get('emergency') == 'true'
 
     try:
-        if use_cpsat:
-            from app.services.cpsat_scheduler import CPSATSchedulingEngine
-            cpsat_models = dict(models)
-            # CP-SAT engine needs additional models
-            for extra in ['LockedDay', 'EventSchedulingOverride', 'EventTypeOverride',
-                          'EmployeeAvailabilityOverride']:
-                if extra not in cpsat_models and extra in current_app.config:
-                    cpsat_models[extra] = current_app.config[extra]
-            engine = CPSATSchedulingEngine(db.session, cpsat_models)
-            if emergency_mode:
-                engine.emergency_mode = True
-            time_limit = current_app.config.get('CPSAT_TIME_LIMIT', 60)
-            run = engine.run_auto_scheduler(run_type='manual', time_limit_seconds=time_limit)
-            solver_used = 'cpsat'
-        else:
-            engine = SchedulingEngine(db.session, models)
-            if emergency_mode:
-                engine.emergency_mode = True
-            run = engine.run_auto_scheduler(run_type='manual')
-            solver_used = 'greedy'
+        if request.args.get('async') == 'true':
+            from app.services.job_runner import submit_job
+            job_id, created = submit_job(
+                'scheduler_run',
+                params={'use_cpsat': use_cpsat, 'emergency_mode': emergency_mode},
+                job_key='auto-scheduler'
+            )
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'created': created,
+                'message': 'Scheduler run started' if created else 'Scheduler run already in progress'
+            }), 202
+
+        run, solver_used = execute_scheduler_run(use_cpsat=use_cpsat, emergency_mode=emergency_mode)
 
         return jsonify({
             'success': True,
@@ -168,6 +208,51 @@ def get_run_status(run_id):
     })
 
 
+@auto_scheduler_bp.route('/stop', methods=['POST'])
+@require_authentication()
+def stop_run():
+    """
+    Ask a running CP-SAT run to stop and keep its best solution so far
+
+    Body/query params:
+        run_id: Run to stop (default: the latest running run)
+
+    The run polls its status while solving; once it sees 'stopping' it ends
+    the search and saves the best proposal found.
+    """
+    db = current_app.extensions['sqlalchemy']
+    SchedulerRunHistory = get_models()['SchedulerRunHistory']
+
+    data = request.get_json(silent=True) or {}
+    run_id = data.get('run_id') or request.args.get('run_id', type=int)
+    if run_id is None:
+        latest = db.session.query(SchedulerRunHistory.id).filter(
+            SchedulerRunHistory.status == 'running'
+        ).order_by(SchedulerRunHistory.started_at.desc()).first()
+        run_id = latest[0] if latest else None
+
+    try:
+        stopped = 0
+        if run_id is not None:
+            stopped = db.session.query(SchedulerRunHistory).filter_by(
+                id=run_id, status='running'
+            ).update({'status': 'stopping'}, synchronize_session=False)
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Failed to stop scheduler run: {str(e)}", exc_info=True)
+        return jsonify({'success': False, 'error': f'Failed to stop scheduler run: {str(e)}'}), 500
+
+    if not stopped:
+        return jsonify({'success': False, 'error': 'No running scheduler run to stop'}), 404
+
+    return jsonify({
+        'success': True,
+        'run_id': run_id,
+        'message': 'Stopping scheduler run; the best schedule found so far will be kept'
+    })
+
+
 @auto_scheduler_bp.route('/review')
 @require_authentication()
 def review():
@@ -508,6 +593,17 @@ def approve_schedule():
 
     current_app.logger.info(f"Found {len(pending_schedules)} pending schedules to approve for run {run_id}")
 
+    # Posted schedules of every bumped event, loaded once for the locked-day check and the bumps
+    bumped_refs = list(dict.fromkeys(
+        ps.bumped_event_ref_num for ps in pending_schedules if ps.is_swap and ps.bumped_event_ref_num
+    ))
+    bumped_posted = defaultdict(list)
+    if bumped_refs:
+        for posted_schedule in db.session.query(models['Schedule']).filter(
+            models['Schedule'].event_ref_num.in_(bumped_refs)
+        ).all():
+            bumped_posted[posted_schedule.event_ref_num].append(posted_schedule)
+
     # CHECK LOCKED DAYS: Before approving, check if any affected dates are locked
     # This includes both target schedule dates and dates of events being bumped
     LockedDay = current_app.config.get('LockedDay')
@@ -515,46 +611,43 @@ def approve_schedule():
         locked_date_conflicts = []
         checked_dates = set()
 
+        # (date, conflict type, event ref) in the order they are reported
+        affected = []
         for pending in pending_schedules:
             # Skip superseded schedules - they're not actually being scheduled
             if pending.status == 'superseded':
                 continue
 
-            # Check target schedule date
+            # Target schedule date
             if pending.schedule_datetime:
-                schedule_date = pending.schedule_datetime.date()
-                if schedule_date not in checked_dates:
-                    checked_dates.add(schedule_date)
-                    locked_info = LockedDay.get_locked_day(schedule_date)
-                    if locked_info:
-                        locked_date_conflicts.append({
-                            'date': schedule_date.isoformat(),
-                            'reason': locked_info.reason or 'No reason provided',
-                            'locked_by': locked_info.locked_by,
-                            'type': 'schedule_target',
-                            'event_ref': pending.event_ref_num
-                        })
+                affected.append((pending.schedule_datetime.date(), 'schedule_target', pending.event_ref_num))
 
-            # Check if this approval involves bumping an event from a locked day
+            # Current schedule dates of an event this approval bumps
             if pending.is_swap and pending.bumped_event_ref_num:
-                # Find the bumped event's current schedule date
-                bumped_schedules = db.session.query(models['Schedule']).filter(
-                    models['Schedule'].event_ref_num == pending.bumped_event_ref_num
-                ).all()
-
-                for bumped_sched in bumped_schedules:
-                    bumped_date = bumped_sched.schedule_datetime.date()
-                    if bumped_date not in checked_dates:
-                        checked_dates.add(bumped_date)
-                        locked_info = LockedDay.get_locked_day(bumped_date)
-                        if locked_info:
-                            locked_date_conflicts.append({
-                                'date': bumped_date.isoformat(),
-                                'reason': locked_info.reason or 'No reason provided',
-                                'locked_by': locked_info.locked_by,
-                                'type': 'bump_source',
-                                'event_ref': pending.bumped_event_ref_num
-                            })
+                for bumped_sched in bumped_posted.get(pending.bumped_event_ref_num, ()):
+                    affected.append((
+                        bumped_sched.schedule_datetime.date(), 'bump_source', pending.bumped_event_ref_num
+                    ))
+
+        # One query for every locked day in the span the approval touches
+        locked_days = {}
+        if affected:
+            affected_dates = [affected_date for affected_date, _, _ in affected]
+            locked_days = LockedDay.get_locked_days_between(min(affected_dates), max(affected_dates))
+
+        for affected_date, conflict_type, event_ref in affected:
+            if affected_date in checked_dates:
+                continue
+            checked_dates.add(affected_date)
+            locked_info = locked_days.get(affected_date)
+            if locked_info:
+                locked_date_conflicts.append({
+                    'date': affected_date.isoformat(),
+                    'reason': locked_info.reason or 'No reason provided',
+                    'locked_by': locked_info.locked_by,
+                    'type': conflict_type,
+                    'event_ref': event_ref
+                })
 
         if locked_date_conflicts:
             # Sort by date for cleaner display
@@ -574,101 +667,88 @@ def approve_schedule():
     # FIRST: Handle bumped events BEFORE processing pending schedules
     # This ensures that bumped events are unscheduled before we try to schedule new events
     try:
-        # Find all pending schedules that involve bumping another event
-        swap_schedules = [ps for ps in pending_schedules if ps.is_swap and ps.bumped_event_ref_num]
-        
-        if swap_schedules:
-            current_app.logger.info(f"Processing {len(swap_schedules)} schedules with bumps")
-            
-            # Track which events have been bumped to avoid duplicate processing
-            bumped_event_refs = set()
-            
-            for swap_schedule in swap_schedules:
-                bumped_ref = swap_schedule.bumped_event_ref_num
-                
-                if bumped_ref in bumped_event_refs:
-                    continue  # Already processed this bumped event
-                
-                bumped_event_refs.add(bumped_ref)
-                
-                current_app.logger.info(f"Executing bump for event {bumped_ref}")
-                
-                # 1. Delete superseded PendingSchedule records for the bumped event
-                superseded_pending = db.session.query(models['PendingSchedule']).filter(
-                    models['PendingSchedule'].scheduler_run_id == run_id,
-                    models['PendingSchedule'].event_ref_num == bumped_ref,
-                    models['PendingSchedule'].status == 'superseded'
-                ).all()
-                
-                for sup_pending in superseded_pending:
-                    current_app.logger.info(
-                        f"  Deleting superseded pending schedule for event {bumped_ref}"
-                    )
-                    db.session.delete(sup_pending)
-                
-                # 2. Delete any posted Schedule records for the bumped event
-                # (These might exist from previous approved runs)
-                posted_schedules = db.session.query(models['Schedule']).filter(
-                    models['Schedule'].event_ref_num == bumped_ref
-                ).all()
-                
-                scheduled_dates = set()  # Track dates for supervisor deletion
-                for posted_schedule in posted_schedules:
+        if bumped_refs:
+            current_app.logger.info(f"Processing bumps of {len(bumped_refs)} events: {bumped_refs}")
+            PendingSchedule = models['PendingSchedule']
+            Schedule = models['Schedule']
+            Event = models['Event']
+
+            # 1. Delete superseded PendingSchedule records for the bumped events
+            superseded_deleted = db.session.query(PendingSchedule).filter(
+                PendingSchedule.scheduler_run_id == run_id,
+                PendingSchedule.event_ref_num.in_(bumped_refs),
+                PendingSchedule.status == 'superseded'
+            ).delete(synchronize_session='fetch')
+            current_app.logger.info(f"  Deleted {superseded_deleted} superseded pending schedules")
+
+            # 2. Delete any posted Schedule records for the bumped events
+            # (These might exist from previous approved runs). Deleted through the session so
+            # calendar summaries update per day; the flush sends them as one batched DELETE.
+            scheduled_dates = defaultdict(set)  # Bumped ref -> dates, for supervisor deletion
+            for bumped_ref in bumped_refs:
+                for posted_schedule in bumped_posted.get(bumped_ref, ()):
                     current_app.logger.info(
                         f"  Deleting posted schedule for event {bumped_ref} "
                         f"(was scheduled to {posted_schedule.employee_id} at {posted_schedule.schedule_datetime})"
                     )
-                    scheduled_dates.add(posted_schedule.schedule_datetime.date())
+                    scheduled_dates[bumped_ref].add(posted_schedule.schedule_datetime.date())
                     db.session.delete(posted_schedule)
-                
-                # 3. Delete matching Supervisor events (both pending and posted)
-                bumped_event = db.session.query(models['Event']).filter_by(
-                    project_ref_num=bumped_ref
-                ).first()
-                
-                if bumped_event and bumped_event.event_type == 'Core':
-                    # Extract event number to find matching Supervisor events
-                    import re
+
+            # 3. Delete matching Supervisor events (both pending and posted)
+            bumped_events = db.session.query(Event).filter(Event.project_ref_num.in_(bumped_refs)).all()
+
+            # Extract event numbers of bumped Core events to find matching Supervisor events
+            core_event_numbers = {}
+            for bumped_event in bumped_events:
+                if bumped_event.event_type == 'Core':
                     match = re.search(r'\d{6}', bumped_event.project_name)
-                    core_event_number = match.group(0) if match else None
-                    
-                    if core_event_number:
-                        # Delete matching Supervisor pending schedules
-                        supervisor_pending = db.session.query(models['PendingSchedule']).join(
-                            models['Event'], models['PendingSchedule'].event_ref_num == models['Event'].project_ref_num
-                        ).filter(
-                            models['PendingSchedule'].scheduler_run_id == run_id,
-                            models['Event'].event_type == 'Supervisor',
-                            models['Event'].project_name.contains(core_event_number)
-                        ).all()
-                        
-                        for sup_pending in supervisor_pending:
+                    if match:
+                        core_event_numbers[bumped_event.project_ref_num] = match.group(0)
+
+            if core_event_numbers:
+                matches_number = or_(*[
+                    Event.project_name.contains(number) for number in set(core_event_numbers.values())
+                ])
+                supervisor_refs = db.session.query(Event.project_ref_num).filter(
+                    Event.event_type == 'Supervisor', matches_number
+                )
+
+                # Delete matching Supervisor pending schedules
+                supervisor_pending_deleted = db.session.query(PendingSchedule).filter(
+                    PendingSchedule.scheduler_run_id == run_id,
+                    PendingSchedule.event_ref_num.in_(supervisor_refs.scalar_subquery())
+                ).delete(synchronize_session='fetch')
+                current_app.logger.info(f"  Deleted {supervisor_pending_deleted} matching Supervisor pending schedules")
+
+                # Delete matching Supervisor posted schedules (for the dates that were scheduled)
+                dates_by_number = defaultdict(set)
+                for bumped_ref, number in core_event_numbers.items():
+                    dates_by_number[number] |= scheduled_dates[bumped_ref]
+                all_dates = set().union(*dates_by_number.values())
+
+                if all_dates:
+                    supervisor_posted = db.session.query(Schedule, Event.project_name).join(
+                        Event, Schedule.event_ref_num == Event.project_ref_num
+                    ).filter(
+                        Event.event_type == 'Supervisor',
+                        matches_number,
+                        func.date(Schedule.schedule_datetime).in_(sorted(all_dates))
+                    ).all()
+
+                    for sup_posted, project_name in supervisor_posted:
+                        sup_date = sup_posted.schedule_datetime.date()
+                        if any(number in project_name and sup_date in dates
+                               for number, dates in dates_by_number.items()):
                             current_app.logger.info(
-                                f"  Deleting matching Supervisor pending schedule {sup_pending.event_ref_num}"
+                                f"  Deleting matching Supervisor posted schedule {sup_posted.event_ref_num}"
                             )
-                            db.session.delete(sup_pending)
-                        
-                        # Delete matching Supervisor posted schedules (for the dates that were scheduled)
-                        for scheduled_date in scheduled_dates:
-                            supervisor_posted = db.session.query(models['Schedule']).join(
-                                models['Event'], models['Schedule'].event_ref_num == models['Event'].project_ref_num
-                            ).filter(
-                                models['Event'].event_type == 'Supervisor',
-                                models['Event'].project_name.contains(core_event_number),
-                                func.date(models['Schedule'].schedule_datetime) == scheduled_date
-                            ).all()
-                            
-                            for sup_posted in supervisor_posted:
-                                current_app.logger.info(
-                                    f"  Deleting matching Supervisor posted schedule {sup_posted.event_ref_num}"
-                                )
-                                db.session.delete(sup_posted)
-                
-                # 4. Set the bumped event's is_scheduled flag to False
-                if bumped_event:
-                    bumped_event.is_scheduled = False
-                    current_app.logger.info(f"  Set event {bumped_ref} is_scheduled=False")
-            
+                            db.session.delete(sup_posted)
+
+            # 4. Set the bumped events' is_scheduled flag to False
+            for bumped_event in bumped_events:
+                bumped_event.is_scheduled = False
+                current_app.logger.info(f"  Set event {bumped_event.project_ref_num} is_scheduled=False")
+
             # Commit the bump deletions before proceeding with approvals
             db.session.flush()
             current_app.logger.info("Completed processing all bumps")
@@ -687,6 +767,21 @@ def approve_schedule():
 
     try:
         all_models = get_models()
+
+        # Event and employee details for every pending schedule
+        events_by_ref = {}
+        employees_by_id = {}
+        event_refs = {ps.event_ref_num for ps in pending_schedules}
+        employee_ids = {ps.employee_id for ps in pending_schedules if ps.employee_id}
+        if event_refs:
+            events_by_ref = {e.project_ref_num: e for e in db.session.query(models['Event']).filter(
+                models['Event'].project_ref_num.in_(event_refs)
+            ).all()}
+        if employee_ids:
+            employees_by_id = {e.id: e for e in db.session.query(models['Employee']).filter(
+                models['Employee'].id.in_(employee_ids)
+            ).all()}
+
         # Filter out superseded schedules - only process valid schedules
         for pending in pending_schedules:
             # Skip superseded schedules - they were bumped and should not be approved
@@ -695,14 +790,8 @@ def approve_schedule():
             if not pending.employee_id or not pending.schedule_datetime:
                 continue
 
-            # Get event and employee details
-            event = db.session.query(models['Event']).filter_by(
-                project_ref_num=pending.event_ref_num
-            ).first()
-
-            employee = db.session.query(models['Employee']).filter_by(
-                id=pending.employee_id
-            ).first()
+            event = events_by_ref.get(pending.event_ref_num)
+            employee = employees_by_id.get(pending.employee_id)
 
             if not event or not employee:
                 current_app.logger.warning(f"Missing data: event={event}, employee={employee} for pending {pending.id}")
@@ -1411,6 +1500,7 @@ def dashboard_status():
 
 @auto_scheduler_bp.route('/api/verify/<int:run_id>', methods=['GET'])
 @require_authentication()
+@read_only_view
 def verify_pending_run(run_id):
     """Verify pending schedules for a scheduler run (pre-approval)"""
     from app.services.schedule_verification import ScheduleVerificationService
@@ -1467,6 +1557,7 @@ def verify_pending_run(run_id):
 
 @auto_scheduler_bp.route('/api/verify-date', methods=['GET'])
 @require_authentication()
+@read_only_view
 def verify_date():
     """Verify schedules for a specific date (dashboard widget)"""
     from app.services.schedule_verification import ScheduleVerificationService
@@ -1512,6 +1603,7 @@ def verify_date():
 
 @auto_scheduler_bp.route('/api/verify-date-range', methods=['GET'])
 @require_authentication()
+@read_only_view
 def verify_date_range_endpoint():
     """Verify schedules for a date range (post-approval audit)"""
     from app.services.schedule_verification import ScheduleVerificationService
@@ -1674,7 +1766,9 @@ def get_run_history(run_id):
             'total_events_processed': run.total_events_processed,
             'events_scheduled': run.events_scheduled,
             'events_failed': run.events_failed,
-            'approved_at': to_local_time(run.approved_at, '%Y-%m-%d %I:%M %p')
+            'approved_at': to_local_time(run.approved_at, '%Y-%m-%d %I:%M %p'),
+            'solver_type': run.solver_type,
+            'profile': run.profile_data
         },
         'events': events_data,
         'counts': {
@@ -1688,6 +1782,7 @@ def get_run_history(run_id):
 
 @auto_scheduler_bp.route('/api/history/<int:run_id>/export')
 @require_authentication()
+@read_only_view
 def export_run_history(run_id):
     """Export scheduler run events to CSV
 
@@ -1776,6 +1871,7 @@ def export_run_history(run_id):
 
 @auto_scheduler_bp.route('/api/review/export')
 @require_authentication()
+@read_only_view
 def export_review_category():
     """Export auto-schedule review category to CSV
 
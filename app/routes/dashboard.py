@@ -7,9 +7,11 @@ from datetime import datetime, date, timedelta
 from sqlalchemy import func, and_, or_
 from urllib.parse import quote
 from app.routes.auth import require_authentication
+from app.utils.db_routing import route_reads
 
 # Create blueprint
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/dashboard')
+route_reads(dashboard_bp)
 
 
 @dashboard_bp.route('/command-center')
@@ -14,6 +14,88 @@ import traceback
 edr_sync_bp = Blueprint('edr_sync', __name__, url_prefix='/api/sync')
 
 
+def run_retaillink_sync(mfa_code):
+    """
+    Authenticate with Retail Link and refresh the EDR event cache.
+
+    Args:
+        mfa_code: MFA authentication code
+
+    Returns:
+        tuple: (response dict, HTTP status code)
+    """
+    # Import EDR functionality
+    try:
+        from edr.report_generator import EDRReportGenerator
+    except ImportError as e:
+        return {
+            'success': False,
+            'message': 'EDR module not available',
+            'details': str(e)
+        }, 500
+
+    # Get credentials from system settings
+    SystemSetting = current_app.config.get('SystemSetting')
+    if not SystemSetting:
+        return {
+            'success': False,
+            'message': 'System configuration error',
+            'details': 'SystemSetting model not available'
+        }, 500
+
+    username_setting = SystemSetting.query.filter_by(setting_key='edr_username').first()
+    password_setting = SystemSetting.query.filter_by(setting_key='edr_password').first()
+    mfa_id_setting = SystemSetting.query.filter_by(setting_key='edr_mfa_credential_id').first()
+
+    if not username_setting or not password_setting or not mfa_id_setting:
+        return {
+            'success': False,
+            'message': 'Credentials not configured',
+            'details': 'Please configure Retail Link credentials in settings first'
+        }, 400
+
+    # Initialize EDR generator with caching enabled
+    generator = EDRReportGenerator(
+        enable_caching=True,
+        cache_max_age_hours=24
+    )
+
+    # Set credentials
+    generator.username = username_setting.setting_value
+    generator.password = password_setting.setting_value
+    generator.mfa_credential_id = mfa_id_setting.setting_value
+
+    # Authenticate with Retail Link using provided MFA code
+    auth_success = generator.authenticate(mfa_code=mfa_code)
+
+    if not auth_success:
+        return {
+            'success': False,
+            'message': 'Authentication failed',
+            'details': 'Could not authenticate with Retail Link. Please check your credentials and MFA code.'
+        }, 401
+
+    # Fetch and cache events (defaults to 1 month before/after)
+    events_data = generator.browse_events_with_cache(force_refresh=True)
+
+    if not events_data:
+        return {
+            'success': False,
+            'message': 'No events found',
+            'details': 'Successfully authenticated but no events were returned from the API'
+        }, 200
+
+    # Get cache statistics
+    cache_stats = generator.get_cache_stats()
+
+    return {
+        'success': True,
+        'message': f'Successfully synced {len(events_data)} event items',
+        'details': f"Cache updated: {cache_stats.get('unique_events', 0)} unique events from {cache_stats.get('earliest_event_date')} to {cache_stats.get('latest_event_date')}",
+        'cache_stats': cache_stats
+    }, 200
+
+
 @edr_sync_bp.route('/retaillink', methods=['POST'])
 def sync_retaillink():
     """
@@ -36,16 +118,6 @@ def sync_retaillink():
         }
     """
     try:
-        # Import EDR functionality
-        try:
-            from edr.report_generator import EDRReportGenerator
-        except ImportError as e:
-            return jsonify({
-                'success': False,
-                'message': 'EDR module not available',
-                'details': str(e)
-            }), 500
-
         # Get MFA code from request
         data = request.get_json()
         if not data or 'mfa_code' not in data:
@@ -63,66 +135,8 @@ def sync_retaillink():
                 'details': 'MFA code cannot be empty'
             }), 400
 
-        # Get credentials from system settings
-        SystemSetting = current_app.config.get('SystemSetting')
-        if not SystemSetting:
-            return jsonify({
-                'success': False,
-                'message': 'System configuration error',
-                'details': 'SystemSetting model not available'
-            }), 500
-
-        username_setting = SystemSetting.query.filter_by(setting_key='edr_username').first()
-        password_setting = SystemSetting.query.filter_by(setting_key='edr_password').first()
-        mfa_id_setting = SystemSetting.query.filter_by(setting_key='edr_mfa_credential_id').first()
-
-        if not username_setting or not password_setting or not mfa_id_setting:
-            return jsonify({
-                'success': False,
-                'message': 'Credentials not configured',
-                'details': 'Please configure Retail Link credentials in settings first'
-            }), 400
-
-        # Initialize EDR generator with caching enabled
-        generator = EDRReportGenerator(
-            enable_caching=True,
-            cache_max_age_hours=24
-        )
-
-        # Set credentials
-        generator.username = username_setting.setting_value
-        generator.password = password_setting.setting_value
-        generator.mfa_credential_id = mfa_id_setting.setting_value
-
-        # Authenticate with Retail Link using provided MFA code
-        auth_success = generator.authenticate(mfa_code=mfa_code)
-
-        if not auth_success:
-            return jsonify({
-                'success': False,
-                'message': 'Authentication failed',
-                'details': 'Could not authenticate with Retail Link. Please check your credentials and MFA code.'
-            }), 401
-
-        # Fetch and cache events (defaults to 1 month before/after)
-        events_data = generator.browse_events_with_cache(force_refresh=True)
-
-        if not events_data:
-            return jsonify({
-                'success': False,
-                'message': 'No events found',
-                'details': 'Successfully authenticated but no events were returned from the API'
-            }), 200
-
-        # Get cache statistics
-        cache_stats = generator.get_cache_stats()
-
-        return jsonify({
-            'success': True,
-            'message': f'Successfully synced {len(events_data)} event items',
-            'details': f"Cache updated: {cache_stats.get('unique_events', 0)} unique events from {cache_stats.get('earliest_event_date')} to {cache_stats.get('latest_event_date')}",
-            'cache_stats': cache_stats
-        }), 200
+        result, status = run_retaillink_sync(mfa_code)
+        return jsonify(result), status
 
     except Exception as e:
         # Log the full error
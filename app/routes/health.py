@@ -166,27 +166,20 @@ def metrics():
     """
     try:
         from app.extensions import db
+        from app.models import get_models
+        from app.services.request_profiler import endpoint_metrics
+        from app.utils.boot_timing import render_boot_metrics
 
         # Count records in key tables
         metrics_data = []
+        models = get_models()
 
-        try:
-            employee_count = db.session.execute('SELECT COUNT(*) FROM employee').scalar()
-            metrics_data.append(f'scheduler_employees_total {employee_count}')
-        except:
-            pass
-
-        try:
-            schedule_count = db.session.execute('SELECT COUNT(*) FROM schedule').scalar()
-            metrics_data.append(f'scheduler_schedules_total {schedule_count}')
-        except:
-            pass
-
-        try:
-            event_count = db.session.execute('SELECT COUNT(*) FROM event').scalar()
-            metrics_data.append(f'scheduler_events_total {event_count}')
-        except:
-            pass
+        for name, model in (('employees', 'Employee'), ('schedules', 'Schedule'), ('events', 'Event')):
+            try:
+                count = db.session.query(db.func.count()).select_from(models[model]).scalar()
+                metrics_data.append(f'scheduler_{name}_total {count}')
+            except Exception:
+                pass
 
         # Process metrics
         process = psutil.Process()
@@ -196,8 +189,11 @@ def metrics():
         metrics_data.append(f'scheduler_memory_bytes {memory_info.rss}')
         metrics_data.append(f'scheduler_cpu_percent {cpu_percent}')
 
-        # Add timestamp
-        timestamp = int(datetime.utcnow().timestamp() * 1000)
+        # Per-endpoint latency / SQL histograms from the request profiler
+        metrics_data.extend(endpoint_metrics.render())
+
+        # Startup timings of this worker
+        metrics_data.extend(render_boot_metrics(current_app.config.get('BOOT_TIMINGS')))
 
         return '\n'.join(metrics_data) + '\n', 200, {'Content-Type': 'text/plain; charset=utf-8'}
 
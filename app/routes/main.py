@@ -5,6 +5,7 @@ Handles dashboard, events list, and calendar views
 from flask import Blueprint, render_template, request, jsonify, current_app, flash, redirect, url_for
 from sqlalchemy import or_
 from app.routes.auth import require_authentication
+from app.utils.db_routing import read_only_view
 from app.models import init_models
 from datetime import datetime, date, timedelta
 
@@ -136,6 +137,9 @@ def unscheduled_events():
         Schedule = models['Schedule']
         Employee = models['Employee']
 
+        from app.services.search_index import get_search_index
+        search = get_search_index(db.session, models)
+
         search_conditions = []
 
         # Helper function to parse dates
@@ -247,32 +251,29 @@ def unscheduled_events():
             elif not date_prefix and original_term.isupper() and len(original_term) > 1:
                 # Try matching as employee name first (for events with schedules)
                 # Subquery to find events assigned to this employee
-                employee_ids = db.session.query(Employee.id).filter(
-                    Employee.name.ilike(f'%{original_term}%')
-                )
-                scheduled_by_employee = db.session.query(Schedule.event_ref_num).filter(
-                    Schedule.employee_id.in_(employee_ids)
-                ).distinct()
-                
-                # Also check if it matches a location/store name
-                location_condition = or_(
-                    Event.store_name.ilike(f'%{original_term}%'),
-                    Event.location_mvid.ilike(f'%{original_term}%')
-                )
-                
-                # Combine: match either by employee OR by location
-                term_conditions.append(or_(
-                    Event.project_ref_num.in_(scheduled_by_employee),
-                    location_condition
-                ))
+                employee_matches = search.employees(original_term, fields=('name',))
+                location_matches = search.events(original_term, fields=('store_name', 'location_mvid'))
+                if employee_matches is not None:
+                    scheduled_by_employee = db.session.query(Schedule.event_ref_num).filter(
+                        Schedule.employee_id.in_(db.select(employee_matches.c.id))
+                    ).distinct()
+
+                    # Combine: match either by employee OR by location/store name
+                    term_conditions.append(or_(
+                        Event.project_ref_num.in_(scheduled_by_employee),
+                        Event.id.in_(db.select(location_matches.c.id))
+                    ))
 
             # Check if it's all digits (event number) - only if no date prefix
             elif not date_prefix and original_term.isdigit():
-                term_conditions.append(Event.project_name.contains(original_term))
+                number_matches = search.events(original_term, fields=('project_name', 'project_ref_num'))
+                term_conditions.append(Event.id.in_(db.select(number_matches.c.id)))
 
             # Otherwise, search in event name - only if no date prefix
             elif not date_prefix:
-                term_conditions.append(Event.project_name.ilike(f'%{original_term}%'))
+                name_matches = search.events(original_term, fields=('project_name',))
+                if name_matches is not None:
+                    term_conditions.append(Event.id.in_(db.select(name_matches.c.id)))
 
             # Add this term's conditions to the overall search (OR within term)
             if term_conditions:
@@ -470,39 +471,40 @@ def calendar_view():
     else:
         selected_date = date.today()
 
-    # Get all scheduled events for the selected month
+    # Month boundaries and the 6-week grid shown for it (weeks start on Sunday)
     start_of_month = selected_date.replace(day=1)
-    if start_of_month.month == 12:
-        end_of_month = start_of_month.replace(year=start_of_month.year + 1, month=1)
-    else:
-        end_of_month = start_of_month.replace(month=start_of_month.month + 1)
+    grid_start = start_of_month - timedelta(days=(start_of_month.weekday() + 1) % 7)
+    grid_end = grid_start + timedelta(days=42)
 
-    # Get scheduled events for the month
+    # Badge counts and unscheduled warnings: one precomputed row per day
+    from app.services.calendar_summary import CalendarSummaryService
+    summaries = CalendarSummaryService(db.session, models).get_range(grid_start, grid_end)
+
+    event_counts_by_date = {}
+    unscheduled_by_date = {}
+    for day, summary in summaries.items():
+        date_str = day.strftime('%Y-%m-%d')
+        if summary['scheduled_count']:
+            event_counts_by_date[date_str] = dict(summary['counts'], total=summary['scheduled_count'])
+        if summary['unscheduled_count']:
+            unscheduled_by_date[date_str] = summary['unscheduled_count']
+
+    # Event details are only needed for the week view of the selected week
+    week_start = selected_date - timedelta(days=(selected_date.weekday() + 1) % 7)
+    week_end = week_start + timedelta(days=7)
     scheduled_events = db.session.query(Schedule, Event, Employee).join(
         Event, Schedule.event_ref_num == Event.project_ref_num
     ).join(
         Employee, Schedule.employee_id == Employee.id
     ).filter(
-        db.func.date(Schedule.schedule_datetime) >= start_of_month,
-        db.func.date(Schedule.schedule_datetime) < end_of_month
+        Schedule.schedule_datetime >= datetime.combine(week_start, datetime.min.time()),
+        Schedule.schedule_datetime < datetime.combine(week_end, datetime.min.time())
     ).order_by(Schedule.schedule_datetime).all()
 
-    # Group events by date (convert dates to strings for JSON serialization)
     events_by_date = {}
-    event_counts_by_date = {}  # New: Track counts by type
-
     for schedule, event, employee in scheduled_events:
-        event_date = schedule.schedule_datetime.date()
-        date_str = event_date.strftime('%Y-%m-%d')
-
-        if date_str not in events_by_date:
-            events_by_date[date_str] = []
-            event_counts_by_date[date_str] = {
-                'Core': 0, 'Juicer Production': 0, 'Juicer Survey': 0, 'Juicer Deep Clean': 0,
-                'Supervisor': 0, 'Freeosk': 0, 'Digitals': 0, 'Other': 0
-            }
-
-        events_by_date[date_str].append({
+        date_str = schedule.schedule_datetime.strftime('%Y-%m-%d')
+        events_by_date.setdefault(date_str, []).append({
             'id': schedule.id,
             'event_name': event.project_name,
             'event_type': event.event_type,
@@ -512,45 +514,6 @@ def calendar_view():
             'estimated_time': event.estimated_time
         })
 
-        # Increment count for this event type
-        if event.event_type in event_counts_by_date[date_str]:
-            event_counts_by_date[date_str][event.event_type] += 1
-        else:
-            event_counts_by_date[date_str]['Other'] += 1
-
-    # Add consolidated Juicer count for calendar badge display
-    for date_str, counts in event_counts_by_date.items():
-        counts['Juicer'] = (
-            counts.get('Juicer Production', 0) +
-            counts.get('Juicer Survey', 0) +
-            counts.get('Juicer Deep Clean', 0)
-        )
-
-    # Get unscheduled events by date for warning indicators
-    unscheduled_by_date = {}
-    unscheduled_events = Event.query.filter(
-        Event.condition == 'Unstaffed',
-        or_(
-            db.and_(
-                Event.start_datetime >= start_of_month,
-                Event.start_datetime < end_of_month
-            ),
-            db.and_(
-                Event.due_datetime >= start_of_month,
-                Event.due_datetime < end_of_month
-            )
-        )
-    ).all()
-
-    for event in unscheduled_events:
-        # Use due_datetime as the primary date for warnings
-        warning_date = event.due_datetime.date() if event.due_datetime else event.start_datetime.date()
-        date_str = warning_date.strftime('%Y-%m-%d')
-
-        if date_str not in unscheduled_by_date:
-            unscheduled_by_date[date_str] = 0
-        unscheduled_by_date[date_str] += 1
-
     return render_template('calendar.html',
                          selected_date=selected_date,
                          events_by_date=events_by_date,
@@ -842,6 +805,7 @@ def attendance_calendar(employee_id=None):
 
 @main_bp.route('/api/schedule/print/<date>')
 @require_authentication()
+@read_only_view
 def print_schedule_by_date(date):
     """Get schedule data for printing for a specific date"""
     from flask import current_app
@@ -20,52 +20,60 @@ from datetime import datetime, timedelta, date
 from sqlalchemy import or_
 from app.routes.auth import require_authentication, get_current_user
 import os
+import shutil
 import logging
 import requests
 import re
 import time
-from PyPDF2 import PdfWriter, PdfReader
 from io import BytesIO
 
 # Initialize logger FIRST before any code that might use it
 logger = logging.getLogger(__name__)
 
-# Import EDR components
+# Import EDR components (the PDF generators and the PyPDF2/reportlab/xhtml2pdf
+# stack are loaded on first use, not at worker boot)
 try:
-    from app.integrations.edr import EDRReportGenerator, EDRPDFGenerator, DailyItemsListPDFGenerator
+    from app.integrations.edr import EDRReportGenerator
     edr_available = True
 except ImportError as e:
     logger.warning(f"Could not import EDR modules: {e}")
     edr_available = False
     EDRReportGenerator = None
-    EDRPDFGenerator = None
-    DailyItemsListPDFGenerator = None
 
-# Import CancelledEventError for handling cancelled events during paperwork generation
-try:
-    from app.services.daily_paperwork_generator import CancelledEventError
-except ImportError:
-    CancelledEventError = None
-
-# Import constants
-try:
-    from app.constants import WALMART_WEEKS
-except ImportError:
-    logger.warning("Could not import WALMART_WEEKS mapping")
-    WALMART_WEEKS = []
+from app.utils.reference_data import get_reference_data
+from app.utils.db_routing import route_reads
 
 printing_bp = Blueprint('printing', __name__, url_prefix='/printing')
+route_reads(printing_bp)
 
-# Global authenticator and generator instances
+# Global authenticator and generator instances (generators are created on first use)
 edr_authenticator = EDRReportGenerator() if edr_available else None
-edr_pdf_generator = EDRPDFGenerator() if edr_available else None
-daily_items_pdf_generator = DailyItemsListPDFGenerator() if edr_available else None
+edr_pdf_generator = None
+daily_items_pdf_generator = None
 
 # MFA code expiration tracking
 MFA_CODE_EXPIRY_SECONDS = 300  # 5 minutes
 mfa_request_timestamp = None
 
 
+def get_edr_pdf_generator():
+    """Shared EDRPDFGenerator, created on first use"""
+    global edr_pdf_generator
+    if edr_pdf_generator is None:
+        from app.integrations.edr import EDRPDFGenerator
+        edr_pdf_generator = EDRPDFGenerator()
+    return edr_pdf_generator
+
+
+def get_daily_items_pdf_generator():
+    """Shared DailyItemsListPDFGenerator, created on first use"""
+    global daily_items_pdf_generator
+    if daily_items_pdf_generator is None:
+        from app.integrations.edr import DailyItemsListPDFGenerator
+        daily_items_pdf_generator = DailyItemsListPDFGenerator()
+    return daily_items_pdf_generator
+
+
 def get_walmart_week(target_date):
     """
     Get the Walmart week number for a given date.
@@ -76,14 +84,7 @@ def get_walmart_week(target_date):
     Returns:
         str: Walmart week number (e.g., "Week 36") or None
     """
-    for week in WALMART_WEEKS:
-        start = datetime.fromisoformat(week['start_date'].replace('Z', '+00:00')).date()
-        end = datetime.fromisoformat(week['end_date'].replace('Z', '+00:00')).date()
-
-        if start <= target_date <= end:
-            return week['WMWeek']
-
-    return None
+    return get_reference_data().walmart_week(target_date)
 
 
 @printing_bp.route('/')
@@ -405,6 +406,45 @@ def get_employee_schedule():
         return jsonify({'error': str(e)}), 500
 
 
+def merge_instruction_pdfs(urls, event_names=None, job_id=None):
+    """
+    Download instruction PDFs concurrently (through the document cache) and
+    merge them in request order
+
+    Pages are appended as each document arrives while later downloads are
+    still running. URLs that fail are skipped.
+
+    Args:
+        urls: Instruction PDF URLs, in merge order
+        event_names: Optional event names parallel to urls (for logging)
+        job_id: Background job ID; the PDF is written under instance/job_results
+
+    Returns:
+        tuple: (BytesIO or file path, download filename, pages merged, failed URLs)
+    """
+    from app.services.document_fetcher import get_document_fetcher, merge_pdf_documents
+
+    fetcher = get_document_fetcher()
+    logger.info(f"Fetching {len(urls)} instruction PDFs ({fetcher.max_workers} at a time)")
+    pdf_writer, pages, failed = merge_pdf_documents(fetcher.iter_fetch(urls), labels=event_names)
+
+    # Generate filename with timestamp
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'instruction_manuals_{timestamp}.pdf'
+
+    if job_id:
+        from app.services.job_runner import job_results_dir
+        output = os.path.join(job_results_dir(), f'{job_id}.pdf')
+        with open(output, 'wb') as f:
+            pdf_writer.write(f)
+    else:
+        output = BytesIO()
+        pdf_writer.write(output)
+        output.seek(0)
+
+    return output, filename, pages, failed
+
+
 @printing_bp.route('/event-instructions/merge', methods=['POST'])
 @require_authentication()
 def merge_event_instructions():
@@ -414,11 +454,12 @@ def merge_event_instructions():
     Request Body:
         {
             "urls": ["url1", "url2", ...],
-            "event_names": ["name1", "name2", ...]
+            "event_names": ["name1", "name2", ...],
+            "async": false   # true: merge in a background job, returns job_id
         }
 
     Returns:
-        Merged PDF file
+        Merged PDF file (202 with job_id when async)
     """
     try:
         data = request.get_json()
@@ -428,37 +469,12 @@ def merge_event_instructions():
         if not urls:
             return jsonify({'error': 'No URLs provided'}), 400
 
-        # Create PDF merger
-        pdf_writer = PdfWriter()
-
-        # Download and merge each PDF
-        for idx, url in enumerate(urls):
-            try:
-                logger.info(f"Downloading PDF from: {url}")
-                response = requests.get(url, timeout=30)
-                response.raise_for_status()
-
-                # Read PDF content
-                pdf_reader = PdfReader(BytesIO(response.content))
+        if data.get('async'):
+            from app.services.job_runner import submit_job
+            job_id, created = submit_job('instructions_merge', params={'urls': urls, 'event_names': event_names})
+            return jsonify({'success': True, 'job_id': job_id, 'created': created}), 202
 
-                # Add all pages from this PDF
-                for page in pdf_reader.pages:
-                    pdf_writer.add_page(page)
-
-                logger.info(f"Successfully added {len(pdf_reader.pages)} pages from {event_names[idx] if idx < len(event_names) else url}")
-
-            except Exception as e:
-                logger.error(f"Error processing PDF from {url}: {str(e)}")
-                # Continue with other PDFs even if one fails
-
-        # Write merged PDF to BytesIO
-        output = BytesIO()
-        pdf_writer.write(output)
-        output.seek(0)
-
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'instruction_manuals_{timestamp}.pdf'
+        output, filename, _pages, _failed = merge_instruction_pdfs(urls, event_names)
 
         return send_file(
             output,
@@ -645,6 +661,68 @@ def get_core_events_count():
         return jsonify({'error': str(e)}), 500
 
 
+def generate_complete_paperwork_file(target_date, job_id=None):
+    """
+    Generate the complete daily paperwork PDF with the authenticated EDR session
+
+    Args:
+        target_date: Date to generate paperwork for
+        job_id: Background job ID; the PDF is kept under instance/job_results
+                for download instead of a temp file
+
+    Returns:
+        tuple: (pdf path, download filename)
+
+    Raises:
+        CancelledEventError: If any event for the day is cancelled
+        RuntimeError: If not authenticated or generation fails
+    """
+    from app.services.daily_paperwork_generator import DailyPaperworkGenerator
+
+    if not edr_available:
+        raise RuntimeError('EDR modules not available')
+    if not edr_authenticator or not edr_authenticator.auth_token:
+        raise RuntimeError('Not authenticated. Please authenticate first.')
+
+    # Get database session and models
+    models = get_models()
+    db = current_app.extensions['sqlalchemy']
+    models_dict = {
+        'Event': models['Event'],
+        'Schedule': models['Schedule'],
+        'Employee': models['Employee'],
+        'PaperworkTemplate': models['PaperworkTemplate'],
+        'SystemSetting': current_app.config.get('SystemSetting')
+    }
+
+    # Create DailyPaperworkGenerator instance
+    paperwork_generator = DailyPaperworkGenerator(
+        db_session=db.session,
+        models_dict=models_dict,
+        edr_generator=edr_authenticator  # Pass authenticated EDR generator
+    )
+
+    # Generate complete paperwork
+    logger.info(f"Generating complete paperwork for {target_date}")
+    output_path = paperwork_generator.generate_complete_daily_paperwork(target_date)
+
+    if not output_path or not os.path.exists(output_path):
+        raise RuntimeError('Failed to generate complete paperwork')
+
+    if job_id:
+        from app.services.job_runner import job_results_dir
+        job_path = os.path.join(job_results_dir(), f'{job_id}.pdf')
+        shutil.move(output_path, job_path)
+        output_path = job_path
+
+    try:
+        paperwork_generator.cleanup()
+    except Exception:
+        pass
+
+    return output_path, f'Complete_Paperwork_{target_date.strftime("%Y-%m-%d")}.pdf'
+
+
 @printing_bp.route('/complete-paperwork', methods=['POST'])
 @require_authentication()
 def get_complete_paperwork():
@@ -662,13 +740,15 @@ def get_complete_paperwork():
 
     Request Body:
         {
-            "date": "YYYY-MM-DD"
+            "date": "YYYY-MM-DD",
+            "async": false  # true: run as a background job and return 202
+                            # with a job ID (PDF at /api/jobs/<id>/download)
         }
 
     Returns:
         Merged PDF file
     """
-    global edr_authenticator
+    from app.services.daily_paperwork_generator import CancelledEventError
 
     logger.info("Complete paperwork request received")
 
@@ -681,10 +761,6 @@ def get_complete_paperwork():
         return jsonify({'success': False, 'error': 'Not authenticated. Please authenticate first.'}), 401
 
     try:
-        # Import the DailyPaperworkGenerator
-        from app.services.daily_paperwork_generator import DailyPaperworkGenerator
-        from app.integrations.external_api.session_api_service import SessionAPIService
-
         data = request.get_json()
         date_str = data.get('date')
 
@@ -694,34 +770,12 @@ def get_complete_paperwork():
         # Parse date
         target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
 
-        # Get database session and models
-        models = get_models()
-        db = current_app.extensions['sqlalchemy']
-        models_dict = {
-            'Event': models['Event'],
-            'Schedule': models['Schedule'],
-            'Employee': models['Employee'],
-            'PaperworkTemplate': models['PaperworkTemplate'],
-            'SystemSetting': current_app.config.get('SystemSetting')
-        }
-
-        # Create DailyPaperworkGenerator instance
-        paperwork_generator = DailyPaperworkGenerator(
-            db_session=db.session,
-            models_dict=models_dict,
-            edr_generator=edr_authenticator  # Pass authenticated EDR generator
-        )
-
-        # Generate complete paperwork
-        logger.info(f"Generating complete paperwork for {target_date}")
-        output_path = paperwork_generator.generate_complete_daily_paperwork(target_date)
+        if data.get('async'):
+            from app.services.job_runner import submit_job
+            job_id, created = submit_job('paperwork', params={'date': date_str}, job_key=date_str)
+            return jsonify({'success': True, 'job_id': job_id, 'created': created}), 202
 
-        if not output_path or not os.path.exists(output_path):
-            logger.error("Failed to generate complete paperwork")
-            return jsonify({
-                'success': False,
-                'error': 'Failed to generate complete paperwork'
-            }), 500
+        output_path, filename = generate_complete_paperwork_file(target_date)
 
         # Read the generated PDF
         with open(output_path, 'rb') as f:
@@ -733,13 +787,9 @@ def get_complete_paperwork():
         # Clean up temp file
         try:
             os.unlink(output_path)
-            paperwork_generator.cleanup()
         except:
             pass
 
-        # Generate filename
-        filename = f'Complete_Paperwork_{target_date.strftime("%Y-%m-%d")}.pdf'
-
         logger.info(f"Successfully generated complete paperwork PDF ({len(pdf_data)} bytes)")
 
         return send_file(
@@ -786,7 +836,7 @@ def get_event_paperwork():
     Returns:
         Merged PDF file
     """
-    global edr_authenticator, edr_pdf_generator
+    global edr_authenticator
 
     logger.info("Single event paperwork request received")
 
@@ -892,7 +942,7 @@ def get_event_paperwork():
                     }
                     logger.info(f"Schedule info: date={schedule_info['scheduled_date']}, time={schedule_info['scheduled_time']}, shift_block={schedule_info['shift_block']}")
 
-                if edr_pdf_generator.generate_pdf(edr_data, edr_temp_path, employee_name, schedule_info):
+                if get_edr_pdf_generator().generate_pdf(edr_data, edr_temp_path, employee_name, schedule_info):
                     with open(edr_temp_path, 'rb') as f:
                         edr_buffer = BytesIO(f.read())
                         pdf_buffers.append(edr_buffer)
@@ -910,19 +960,18 @@ def get_event_paperwork():
         # 2. Get Instructions PDF (Sales Tool)
         if event.sales_tools_url and event.sales_tools_url.strip():
             logger.info(f"Downloading instructions from: {event.sales_tools_url}")
-            try:
-                response = requests.get(event.sales_tools_url, timeout=30)
-                response.raise_for_status()
-
-                # Verify it's a PDF
-                if b'%PDF' in response.content[:4]:
-                    instructions_buffer = BytesIO(response.content)
-                    pdf_buffers.append(instructions_buffer)
-                    logger.info("✅ Instructions PDF added")
-                else:
-                    logger.warning("⚠️ Instructions URL did not return a valid PDF")
-            except Exception as e:
-                logger.error(f"Error downloading instructions: {str(e)}")
+            from app.services.document_fetcher import get_document_fetcher
+            document = get_document_fetcher().fetch(event.sales_tools_url)
+
+            # Verify it's a PDF
+            if document.is_pdf:
+                instructions_buffer = BytesIO(document.content)
+                pdf_buffers.append(instructions_buffer)
+                logger.info("✅ Instructions PDF added")
+            elif document.ok:
+                logger.warning("⚠️ Instructions URL did not return a valid PDF")
+            else:
+                logger.error(f"Error downloading instructions: {document.error}")
                 # Continue without instructions
 
         # 3. Add Core event templates from database (like complete paperwork generator)
@@ -984,6 +1033,7 @@ def get_event_paperwork():
 
         # Merge all PDFs
         logger.info(f"Merging {len(pdf_buffers)} PDFs...")
+        from PyPDF2 import PdfWriter, PdfReader
         pdf_writer = PdfWriter()
 
         for pdf_buffer in pdf_buffers:
@@ -1350,195 +1400,225 @@ def edr_authenticate():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@printing_bp.route('/edr/batch-download', methods=['POST'])
-@require_authentication()
-def edr_batch_download():
+def generate_edr_batch_file(target_date, job_id=None, progress=None):
     """
-    Download and merge EDR PDFs for all CORE events on the selected date.
-    Returns a merged PDF ready for printing.
-    """
-    global edr_authenticator, edr_pdf_generator
+    Download the EDRs of the date's CORE events with the authenticated EDR
+    session and merge them into one PDF
 
-    logger.info("EDR batch download request received")
+    Args:
+        target_date: Date whose CORE events are printed
+        job_id: Background job ID; the PDF is written under instance/job_results
+        progress: Optional callback called with (processed, total, event name)
 
-    if not edr_available:
-        logger.error("EDR modules not available - check import errors on startup")
-        return jsonify({'success': False, 'error': 'EDR modules not available'}), 500
+    Returns:
+        tuple: (BytesIO or file path, download filename, PDFs merged, failed events)
 
+    Raises:
+        LookupError: If no CORE events are scheduled on the date
+        RuntimeError: If not authenticated or no EDR PDF could be generated
+    """
+    if not edr_available:
+        raise RuntimeError('EDR modules not available')
     if not edr_authenticator or not edr_authenticator.auth_token:
-        logger.error("Not authenticated - auth_token missing")
-        return jsonify({'success': False, 'error': 'Not authenticated. Please authenticate first.'}), 401
+        raise RuntimeError('Not authenticated. Please authenticate first.')
 
-    try:
-        data = request.get_json()
-        date_str = data.get('date')
+    # Get database models
+    db = current_app.extensions['sqlalchemy']
+    models = get_models()
+    Event = models['Event']
+    Schedule = models['Schedule']
+    Employee = models['Employee']
 
-        if not date_str:
-            return jsonify({'success': False, 'error': 'Date is required'}), 400
+    # Query CORE events scheduled on this date
+    events = db.session.query(Event).join(
+        Schedule, Event.project_ref_num == Schedule.event_ref_num
+    ).filter(
+        db.func.date(Schedule.schedule_datetime) == target_date,
+        Event.event_type == 'Core'
+    ).distinct().all()
 
-        # Parse date
-        target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+    if not events:
+        logger.warning(f'No CORE events found for {target_date}')
+        raise LookupError(f'No CORE events found for {target_date.strftime("%B %d, %Y")}')
 
-        # Get database models
-        db = current_app.extensions['sqlalchemy']
-        models = get_models()
-        Event = models['Event']
-        Schedule = models['Schedule']
-        Employee = models['Employee']
+    logger.info(f'Found {len(events)} CORE events for {target_date}')
 
-        # Query CORE events scheduled on this date
-        events = db.session.query(Event).join(
-            Schedule, Event.project_ref_num == Schedule.event_ref_num
-        ).filter(
-            db.func.date(Schedule.schedule_datetime) == target_date,
-            Event.event_type == 'Core'
-        ).distinct().all()
+    # Process each event and generate PDFs
+    pdf_files = []
+    failed_events = []
 
-        if not events:
-            logger.warning(f'No CORE events found for {target_date}')
-            return jsonify({
-                'success': False,
-                'error': f'No CORE events found for {target_date.strftime("%B %d, %Y")}'
-            }), 404
+    for index, event in enumerate(events):
+        if progress:
+            progress(index, len(events), event.project_name)
 
-        logger.info(f'Found {len(events)} CORE events for {target_date}')
+        # Extract 6-digit event number from project_name
+        match = re.search(r'\d{6}', event.project_name)
+        event_number = match.group(0) if match else None
 
-        # Process each event and generate PDFs
-        pdf_files = []
-        failed_events = []
+        if not event_number:
+            logger.warning(f"Could not extract event number from: {event.project_name}")
+            failed_events.append({
+                'project_name': event.project_name,
+                'error': 'Could not extract event number'
+            })
+            continue
 
-        for event in events:
-            # Extract 6-digit event number from project_name
-            match = re.search(r'\d{6}', event.project_name)
-            event_number = match.group(0) if match else None
+        try:
+            # Look up employee assigned to this event
+            schedule = db.session.query(Schedule).filter(
+                Schedule.event_ref_num == event.project_ref_num,
+                db.func.date(Schedule.schedule_datetime) == target_date
+            ).first()
 
-            if not event_number:
-                logger.warning(f"Could not extract event number from: {event.project_name}")
+            employee_name = 'N/A'
+            if schedule:
+                employee = db.session.query(Employee).filter_by(id=schedule.employee_id).first()
+                employee_name = employee.name if employee else schedule.employee_id
+
+            # Fetch EDR data from Walmart API
+            logger.info(f"Downloading EDR for event {event_number}: {event.project_name}")
+            edr_data = edr_authenticator.get_edr_report(event_number)
+
+            if not edr_data:
                 failed_events.append({
                     'project_name': event.project_name,
-                    'error': 'Could not extract event number'
+                    'event_number': event_number,
+                    'error': 'Failed to retrieve EDR data'
                 })
                 continue
 
-            try:
-                # Look up employee assigned to this event
-                schedule = db.session.query(Schedule).filter(
-                    Schedule.event_ref_num == event.project_ref_num,
-                    db.func.date(Schedule.schedule_datetime) == target_date
-                ).first()
+            # Generate PDF in memory
+            pdf_buffer = BytesIO()
+            safe_filename = re.sub(r'[<>:"/\\|?*]', '_', event.project_name) + '.pdf'
 
-                employee_name = 'N/A'
-                if schedule:
-                    employee = db.session.query(Employee).filter_by(id=schedule.employee_id).first()
-                    employee_name = employee.name if employee else schedule.employee_id
+            # Use temp file for PDF generation (ReportLab needs a filename)
+            import tempfile
+            with tempfile.NamedTemporaryFile(mode='w+b', suffix='.pdf', delete=False) as tmp_file:
+                temp_path = tmp_file.name
 
-                # Fetch EDR data from Walmart API
-                logger.info(f"Downloading EDR for event {event_number}: {event.project_name}")
-                edr_data = edr_authenticator.get_edr_report(event_number)
-
-                if not edr_data:
+            try:
+                # Build schedule_info for EDR times display
+                schedule_info = None
+                if schedule:
+                    schedule_info = {
+                        'scheduled_time': schedule.schedule_datetime.time() if schedule.schedule_datetime else None,
+                        'scheduled_date': schedule.schedule_datetime.date() if schedule.schedule_datetime else None,
+                        'event_type': event.event_type,
+                        'shift_block': schedule.shift_block
+                    }
+                
+                if get_edr_pdf_generator().generate_pdf(edr_data, temp_path, employee_name, schedule_info):
+                    # Read the generated PDF
+                    with open(temp_path, 'rb') as f:
+                        pdf_buffer.write(f.read())
+                    pdf_buffer.seek(0)
+                    pdf_files.append({
+                        'name': event.project_name,
+                        'buffer': pdf_buffer
+                    })
+                    logger.info(f"Successfully generated PDF for {event.project_name}")
+                else:
                     failed_events.append({
                         'project_name': event.project_name,
                         'event_number': event_number,
-                        'error': 'Failed to retrieve EDR data'
+                        'error': 'Failed to generate PDF'
                     })
-                    continue
-
-                # Generate PDF in memory
-                pdf_buffer = BytesIO()
-                safe_filename = re.sub(r'[<>:"/\\|?*]', '_', event.project_name) + '.pdf'
-
-                # Use temp file for PDF generation (ReportLab needs a filename)
-                import tempfile
-                with tempfile.NamedTemporaryFile(mode='w+b', suffix='.pdf', delete=False) as tmp_file:
-                    temp_path = tmp_file.name
-
-                try:
-                    # Build schedule_info for EDR times display
-                    schedule_info = None
-                    if schedule:
-                        schedule_info = {
-                            'scheduled_time': schedule.schedule_datetime.time() if schedule.schedule_datetime else None,
-                            'scheduled_date': schedule.schedule_datetime.date() if schedule.schedule_datetime else None,
-                            'event_type': event.event_type,
-                            'shift_block': schedule.shift_block
-                        }
-                    
-                    if edr_pdf_generator.generate_pdf(edr_data, temp_path, employee_name, schedule_info):
-                        # Read the generated PDF
-                        with open(temp_path, 'rb') as f:
-                            pdf_buffer.write(f.read())
-                        pdf_buffer.seek(0)
-                        pdf_files.append({
-                            'name': event.project_name,
-                            'buffer': pdf_buffer
-                        })
-                        logger.info(f"Successfully generated PDF for {event.project_name}")
-                    else:
-                        failed_events.append({
-                            'project_name': event.project_name,
-                            'event_number': event_number,
-                            'error': 'Failed to generate PDF'
-                        })
-                finally:
-                    # Clean up temp file
-                    if os.path.exists(temp_path):
-                        os.unlink(temp_path)
-
-            except Exception as e:
-                logger.error(f"Error processing event {event.project_name}: {str(e)}")
-                failed_events.append({
-                    'project_name': event.project_name,
-                    'event_number': event_number,
-                    'error': str(e)
-                })
+            finally:
+                # Clean up temp file
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
 
-        # Merge all PDFs
-        if not pdf_files:
-            logger.error(f'No EDR PDFs were successfully generated. Failed events: {len(failed_events)}')
-            for failure in failed_events:
-                logger.error(f"  - {failure.get('project_name', 'Unknown')}: {failure.get('error', 'Unknown error')}")
-            return jsonify({
-                'success': False,
-                'error': 'No EDR PDFs were successfully generated',
-                'failed': failed_events
-            }), 500
+        except Exception as e:
+            logger.error(f"Error processing event {event.project_name}: {str(e)}")
+            failed_events.append({
+                'project_name': event.project_name,
+                'event_number': event_number,
+                'error': str(e)
+            })
 
-        logger.info(f'Successfully generated {len(pdf_files)} EDR PDFs, merging...')
+    # Merge all PDFs
+    if not pdf_files:
+        logger.error(f'No EDR PDFs were successfully generated. Failed events: {len(failed_events)}')
+        for failure in failed_events:
+            logger.error(f"  - {failure.get('project_name', 'Unknown')}: {failure.get('error', 'Unknown error')}")
+        raise RuntimeError('No EDR PDFs were successfully generated')
 
-        # Create merged PDF
-        pdf_writer = PdfWriter()
+    logger.info(f'Successfully generated {len(pdf_files)} EDR PDFs, merging...')
 
-        for pdf_file in pdf_files:
-            try:
-                pdf_reader = PdfReader(pdf_file['buffer'])
-                for page in pdf_reader.pages:
-                    pdf_writer.add_page(page)
-            except Exception as e:
-                logger.error(f"Error adding PDF {pdf_file['name']}: {str(e)}")
+    # Create merged PDF
+    from PyPDF2 import PdfWriter, PdfReader
+    pdf_writer = PdfWriter()
 
-        # Write merged PDF to output buffer
+    for pdf_file in pdf_files:
+        try:
+            pdf_reader = PdfReader(pdf_file['buffer'])
+            for page in pdf_reader.pages:
+                pdf_writer.add_page(page)
+        except Exception as e:
+            logger.error(f"Error adding PDF {pdf_file['name']}: {str(e)}")
+
+    # Generate filename
+    timestamp = datetime.now().strftime('%Y%m%d')
+    filename = f'EDRs_{target_date.strftime("%Y-%m-%d")}_{timestamp}.pdf'
+
+    if job_id:
+        from app.services.job_runner import job_results_dir
+        output = os.path.join(job_results_dir(), f'{job_id}.pdf')
+        with open(output, 'wb') as f:
+            pdf_writer.write(f)
+    else:
         output = BytesIO()
         pdf_writer.write(output)
         output.seek(0)
 
-        # Generate filename
-        timestamp = datetime.now().strftime('%Y%m%d')
-        filename = f'EDRs_{target_date.strftime("%Y-%m-%d")}_{timestamp}.pdf'
+    logger.info(f"Successfully merged {len(pdf_files)} EDR PDFs, {len(failed_events)} failed")
 
-        logger.info(f"Successfully merged {len(pdf_files)} EDR PDFs into {output.tell()} bytes, {len(failed_events)} failed")
+    return output, filename, len(pdf_files), failed_events
 
-        return send_file(
-            output,
-            mimetype='application/pdf',
-            as_attachment=False,
-            download_name=filename
-        )
+
+@printing_bp.route('/edr/batch-download', methods=['POST'])
+@require_authentication()
+def edr_batch_download():
+    """
+    Download and merge EDR PDFs for all CORE events on the selected date.
+
+    The EDRs are fetched by an edr_batch background job; poll
+    /api/jobs/<job_id> and fetch the merged PDF from /api/jobs/<job_id>/download.
+
+    Request Body:
+        {"date": "YYYY-MM-DD"}
+
+    Returns:
+        202 with job_id
+    """
+    logger.info("EDR batch download request received")
+
+    if not edr_available:
+        logger.error("EDR modules not available - check import errors on startup")
+        return jsonify({'success': False, 'error': 'EDR modules not available'}), 500
+
+    if not edr_authenticator or not edr_authenticator.auth_token:
+        logger.error("Not authenticated - auth_token missing")
+        return jsonify({'success': False, 'error': 'Not authenticated. Please authenticate first.'}), 401
+
+    try:
+        data = request.get_json()
+        date_str = data.get('date')
+
+        if not date_str:
+            return jsonify({'success': False, 'error': 'Date is required'}), 400
+
+        try:
+            datetime.strptime(date_str, '%Y-%m-%d')
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+        from app.services.job_runner import submit_job
+        job_id, created = submit_job('edr_batch', params={'date': date_str}, job_key=f'printing:{date_str}')
+        return jsonify({'success': True, 'job_id': job_id, 'created': created}), 202
 
     except Exception as e:
         logger.error(f"Failed to download EDRs: {str(e)}")
-        import traceback
-        traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -1549,7 +1629,7 @@ def edr_daily_items_list():
     Generate a consolidated daily items list from all CORE events on the selected date.
     Returns a single PDF with all unique items.
     """
-    global edr_authenticator, daily_items_pdf_generator
+    global edr_authenticator
 
     logger.info("Daily items list request received")
 
@@ -1651,7 +1731,7 @@ def edr_daily_items_list():
             temp_path = tmp_file.name
 
         try:
-            if daily_items_pdf_generator.generate_daily_items_pdf(edr_data_list, temp_path, date_display):
+            if get_daily_items_pdf_generator().generate_daily_items_pdf(edr_data_list, temp_path, date_display):
                 # Read the generated PDF
                 with open(temp_path, 'rb') as f:
                     pdf_data = f.read()
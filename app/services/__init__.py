@@ -11,10 +11,25 @@ from .validation_types import (
     SchedulingDecision
 )
 
-from .rotation_manager import RotationManager
-from .constraint_validator import ConstraintValidator
-from .conflict_resolver import ConflictResolver
-from .scheduling_engine import SchedulingEngine
+# Service classes are imported on first access so that importing any
+# app.services submodule does not load the scheduling engine (and its
+# dependencies) at worker boot
+_LAZY_SERVICES = {
+    'RotationManager': '.rotation_manager',
+    'ConstraintValidator': '.constraint_validator',
+    'ConflictResolver': '.conflict_resolver',
+    'SchedulingEngine': '.scheduling_engine',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_SERVICES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     # Validation types
@@ -12,6 +12,7 @@ import logging
 
 from app.ai.context.retriever import ContextRetriever
 from app.ai.context.classifier import QueryClassifier
+from app.ai.context.entity_index import get_entity_index
 
 logger = logging.getLogger(__name__)
 
@@ -71,18 +72,11 @@ class AIAssistant:
             self.classifier = None
 
     def _init_classifier(self):
-        """Initialize QueryClassifier with entity names"""
+        """Initialize QueryClassifier with the shared entity index"""
         try:
-            Employee = self.models['Employee']
-            Event = self.models['Event']
-            
-            employees = self.db.query(Employee.name).filter(Employee.is_active == True).all()
-            employee_names = [e[0] for e in employees]
-            
-            events = self.db.query(Event.project_name).limit(100).all()
-            event_names = list(set([e[0] for e in events]))
-            
-            self.classifier = QueryClassifier(employees=employee_names, events=event_names)
+            self.classifier = QueryClassifier(
+                entity_index=get_entity_index(self.db, self.models)
+            )
         except Exception:
             self.classifier = QueryClassifier()
 
@@ -2605,34 +2605,24 @@ class AITools:
             start_date = today - timedelta(days=today.weekday())
             end_date = start_date + timedelta(days=6)
 
-        Schedule = self.models['Schedule']
-        Event = self.models['Event']
+        from app.services.workload_analytics import WorkloadAnalytics
+
         Employee = self.models['Employee']
 
         # Get all active employees
         employees = self.db.query(Employee).filter(Employee.is_active == True).all()
+        totals = WorkloadAnalytics(self.db, self.models).employee_totals(start_date, end_date)
 
         workload = []
         for emp in employees:
-            schedules = self.db.query(Schedule, Event).join(
-                Event, Schedule.event_ref_num == Event.project_ref_num
-            ).filter(
-                Schedule.employee_id == emp.id,
-                func.date(Schedule.schedule_datetime) >= start_date,
-                func.date(Schedule.schedule_datetime) <= end_date
-            ).all()
-
-            event_count = len(schedules)
-            days_worked = len(set(s.schedule_datetime.date() for s, e in schedules))
-            total_hours = sum((e.estimated_time or e.get_default_duration(e.event_type)) / 60 for s, e in schedules)
-
+            entry = totals.get(emp.id, {})
             workload.append({
                 'employee_id': emp.id,
                 'name': emp.name,
                 'job_title': emp.job_title,
-                'event_count': event_count,
-                'days_worked': days_worked,
-                'hours': round(total_hours, 1)
+                'event_count': entry.get('event_count', 0),
+                'days_worked': entry.get('days_worked', 0),
+                'hours': round(entry.get('minutes', 0) / 60, 1)
             })
 
         # Sort
@@ -2687,20 +2677,16 @@ class AITools:
         week_start = week_of - timedelta(days=days_since_sunday)
         week_end = week_start + timedelta(days=6)
 
-        Schedule = self.models['Schedule']
+        from app.services.workload_analytics import WorkloadAnalytics
+
         Employee = self.models['Employee']
 
         employees = self.db.query(Employee).filter(Employee.is_active == True).all()
+        totals = WorkloadAnalytics(self.db, self.models).employee_totals(week_start, week_end)
 
         at_risk = []
         for emp in employees:
-            days_worked = self.db.query(
-                func.date(Schedule.schedule_datetime)
-            ).filter(
-                Schedule.employee_id == emp.id,
-                func.date(Schedule.schedule_datetime) >= week_start,
-                func.date(Schedule.schedule_datetime) <= week_end
-            ).distinct().count()
+            days_worked = totals.get(emp.id, {}).get('days_worked', 0)
 
             if days_worked >= 5:
                 at_risk.append({
@@ -3933,45 +3919,31 @@ class AITools:
         if not start or not end:
             return {'success': False, 'message': "Could not parse date range", 'data': None}
 
-        Schedule = self.models['Schedule']
-        Event = self.models['Event']
-        Employee = self.models['Employee']
-
-        start_dt = datetime.combine(start, datetime.min.time())
-        end_dt = datetime.combine(end, datetime.max.time())
+        from app.services.workload_analytics import WorkloadAnalytics
 
-        schedules = self.db.query(Schedule).filter(
-            Schedule.schedule_datetime >= start_dt,
-            Schedule.schedule_datetime <= end_dt
-        ).all()
+        Employee = self.models['Employee']
 
-        if not schedules:
+        totals = WorkloadAnalytics(self.db, self.models).employee_totals(start, end)
+        if not totals:
             return {'success': True, 'message': f"No schedules found between {start} and {end}", 'data': None}
 
+        names = dict(self.db.query(Employee.id, Employee.name).filter(Employee.id.in_(list(totals))))
+
         # Build per-employee stats
         emp_stats = {}
-        for sched in schedules:
-            eid = sched.employee_id
-            if eid not in emp_stats:
-                emp = self.db.query(Employee).filter_by(id=eid).first()
-                emp_stats[eid] = {
-                    'name': emp.name if emp else eid,
-                    'total': 0, 'core': 0, 'juicer': 0, 'other': 0,
-                    'minutes': 0,
-                }
-
-            emp_stats[eid]['total'] += 1
-
-            event = self.db.query(Event).filter_by(project_ref_num=sched.event_ref_num).first()
-            if event:
-                etype = event.event_type or 'Other'
+        for eid, entry in totals.items():
+            stats = emp_stats[eid] = {
+                'name': names.get(eid, eid),
+                'total': entry['event_count'], 'core': 0, 'juicer': 0, 'other': 0,
+                'minutes': entry['minutes'],
+            }
+            for etype, count in entry['type_counts'].items():
                 if etype == 'Core':
-                    emp_stats[eid]['core'] += 1
+                    stats['core'] += count
                 elif etype.startswith('Juicer'):
-                    emp_stats[eid]['juicer'] += 1
+                    stats['juicer'] += count
                 else:
-                    emp_stats[eid]['other'] += 1
-                emp_stats[eid]['minutes'] += event.estimated_time or 0
+                    stats['other'] += count
 
         # Compute fairness metrics
         totals = [s['total'] for s in emp_stats.values()]
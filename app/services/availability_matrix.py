@@ -0,0 +1,370 @@
+"""
+Employee Availability Matrix
+One employees x days view of who can work, shared by the CP-SAT solver, the
+greedy scheduling engine, ConstraintValidator and WeeklyPlanningService.
+
+For a date window the matrix holds two boolean arrays (NumPy):
+
+- available: the weekly pattern with availability overrides applied (an
+  override's non-NULL day value replaces the weekly value; the newest
+  override wins where they overlap)
+- time_off: requested time off
+
+and free = available & ~time_off. Employees with no availability rows are
+free every day. Company holidays and locked days are left to the callers.
+
+Matrices are built from date-bounded, column-only queries and cached per
+process, keyed by window and a data-version stamp. The stamp is a random
+token in system_settings that is replaced in the same transaction as any ORM
+change to employees, weekly availability, overrides or time off (including
+bulk DML), so every worker notices edits made by the others. Writers that
+bypass the ORM call mark_availability_changed().
+"""
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event as sa_event, select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+DAY_NAMES = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+VERSION_SETTING_KEY = 'availability_data_version'
+CACHE_SIZE = 16
+
+_CHANGED_KEY = 'availability_changed'
+_registered_models = {}
+_cache: 'OrderedDict[tuple, Tuple[str, AvailabilityMatrix]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class AvailabilityMatrix:
+    """Availability of employees (rows) over consecutive days (columns)"""
+
+    def __init__(self, start: date, end: date, employee_ids: Sequence[str], available, time_off):
+        import numpy as np
+
+        self.start = start
+        self.end = end
+        self.days: List[date] = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        self.employee_ids: List[str] = list(employee_ids)
+        self.index: Dict[str, int] = {emp_id: row for row, emp_id in enumerate(self.employee_ids)}
+        self.available = available
+        self.time_off = time_off
+        self.free = available & ~time_off
+        self._ids = np.array(self.employee_ids, dtype=object)
+
+    def covers(self, day: date) -> bool:
+        return self.start <= day <= self.end
+
+    def _column(self, day: date) -> int:
+        if isinstance(day, datetime):
+            day = day.date()
+        if not self.covers(day):
+            raise ValueError(f"{day} is outside the availability window {self.start} - {self.end}")
+        return (day - self.start).days
+
+    # -------------------------------------------------------------------------
+    # Single lookups
+    # -------------------------------------------------------------------------
+
+    def is_free(self, employee_id: str, day: date) -> bool:
+        """Available by pattern/override and not on time off"""
+        column = self._column(day)
+        row = self.index.get(employee_id)
+        return True if row is None else bool(self.free[row, column])
+
+    def is_available(self, employee_id: str, day: date) -> bool:
+        """Weekly pattern with overrides applied (time off not considered)"""
+        column = self._column(day)
+        row = self.index.get(employee_id)
+        return True if row is None else bool(self.available[row, column])
+
+    def has_time_off(self, employee_id: str, day: date) -> bool:
+        column = self._column(day)
+        row = self.index.get(employee_id)
+        return False if row is None else bool(self.time_off[row, column])
+
+    # -------------------------------------------------------------------------
+    # Vectorized queries
+    # -------------------------------------------------------------------------
+
+    def free_employees(self, day: date, employee_ids: Optional[Sequence[str]] = None) -> List[str]:
+        """
+        Employees free on a day
+
+        Args:
+            day: Day in the window
+            employee_ids: Candidates, in the order to return them (default:
+                          every employee in the matrix)
+        """
+        import numpy as np
+
+        column = self.free[:, self._column(day)]
+        if employee_ids is None:
+            return self._ids[column].tolist()
+        rows = np.fromiter((self.index.get(emp_id, -1) for emp_id in employee_ids), dtype=np.int64,
+                           count=len(employee_ids))
+        mask = np.ones(len(rows), dtype=bool)
+        known = rows >= 0
+        mask[known] = column[rows[known]]
+        return [emp_id for emp_id, keep in zip(employee_ids, mask) if keep]
+
+    def free_days(self, employee_id: str) -> List[date]:
+        """Days in the window an employee is free"""
+        import numpy as np
+
+        row = self.index.get(employee_id)
+        if row is None:
+            return list(self.days)
+        return [self.days[i] for i in np.flatnonzero(self.free[row])]
+
+    def unavailable_pairs(self, employee_ids: Optional[Iterable[str]] = None,
+                          days: Optional[Iterable[date]] = None) -> Set[Tuple[str, date]]:
+        """(employee_id, day) pairs that are not free, restricted to the given employees/days"""
+        import numpy as np
+
+        blocked = ~self.free
+        if employee_ids is not None:
+            wanted = {emp_id for emp_id in employee_ids}
+            row_mask = np.fromiter((emp_id in wanted for emp_id in self.employee_ids), dtype=bool,
+                                   count=len(self.employee_ids))
+            blocked = blocked & row_mask[:, None]
+        if days is not None:
+            column_mask = np.zeros(len(self.days), dtype=bool)
+            for day in days:
+                if self.covers(day):
+                    column_mask[(day - self.start).days] = True
+            blocked = blocked & column_mask[None, :]
+        rows, columns = np.nonzero(blocked)
+        return {(self.employee_ids[row], self.days[column]) for row, column in zip(rows, columns)}
+
+    def free_grid(self, employee_ids: Sequence[str], days: Sequence[date]):
+        """
+        Free flags for the given employees (rows) and days (columns), in that order
+
+        Employees not in the matrix are free; every day must be in the window.
+        """
+        import numpy as np
+
+        rows = np.fromiter((self.index.get(emp_id, -1) for emp_id in employee_ids), dtype=np.int64,
+                           count=len(employee_ids))
+        columns = np.fromiter((self._column(day) for day in days), dtype=np.int64, count=len(days))
+        grid = np.ones((len(rows), len(columns)), dtype=bool)
+        known = rows >= 0
+        grid[known] = self.free[np.ix_(rows[known], columns)]
+        return grid
+
+
+class AvailabilityService:
+    """Builds and caches AvailabilityMatrix windows"""
+
+    def __init__(self, db_session, models: dict):
+        self.db = db_session
+        self.Employee = models['Employee']
+        self.EmployeeWeeklyAvailability = models.get('EmployeeWeeklyAvailability')
+        self.EmployeeAvailabilityOverride = models.get('EmployeeAvailabilityOverride')
+        self.EmployeeTimeOff = models.get('EmployeeTimeOff')
+        self.SystemSetting = models.get('SystemSetting')
+
+    def data_version(self) -> Optional[str]:
+        """Current availability data stamp (None before the first recorded change)"""
+        if self.SystemSetting is None:
+            return None
+        table = self.SystemSetting.__table__
+        return self.db.execute(
+            select(table.c.setting_value).where(table.c.setting_key == VERSION_SETTING_KEY)
+        ).scalar()
+
+    def matrix(self, start: date, end: date) -> AvailabilityMatrix:
+        """
+        Matrix for every employee over [start, end], from the cache when current
+
+        Args:
+            start: First day
+            end: Last day (inclusive)
+        """
+        # This transaction's own uncommitted edits are not in any cached matrix
+        version = None if _has_pending_changes(self.db) else self.data_version()
+        key = (start, end)
+        if version is not None:
+            with _cache_lock:
+                cached = _cache.get(key)
+                if cached and cached[0] == version:
+                    _cache.move_to_end(key)
+                    return cached[1]
+
+        matrix = self.build(start, end)
+        if version is not None:
+            with _cache_lock:
+                _cache[key] = (version, matrix)
+                _cache.move_to_end(key)
+                while len(_cache) > CACHE_SIZE:
+                    _cache.popitem(last=False)
+        return matrix
+
+    def build(self, start: date, end: date, employee_ids: Optional[Sequence[str]] = None) -> AvailabilityMatrix:
+        """
+        Build a matrix without the cache
+
+        Args:
+            start: First day
+            end: Last day (inclusive)
+            employee_ids: Rows to include (default: every employee)
+        """
+        import numpy as np
+
+        if end < start:
+            raise ValueError(f"Availability window ends before it starts: {start} - {end}")
+
+        selected = employee_ids is not None
+        if not selected:
+            employee_ids = [row[0] for row in self.db.query(self.Employee.id).order_by(self.Employee.id)]
+        employee_ids = list(employee_ids)
+        index = {emp_id: row for row, emp_id in enumerate(employee_ids)}
+        num_days = (end - start).days + 1
+        weekdays = (np.arange(num_days) + start.weekday()) % 7
+
+        def restrict(query, model):
+            return query.filter(model.employee_id.in_(employee_ids)) if selected else query
+
+        # Weekly pattern: one row of 7 flags per employee (newest record wins)
+        pattern = np.ones((len(employee_ids), 7), dtype=bool)
+        if self.EmployeeWeeklyAvailability is not None and employee_ids:
+            model = self.EmployeeWeeklyAvailability
+            columns = [getattr(model, name) for name in DAY_NAMES]
+            query = restrict(self.db.query(model.employee_id, *columns), model).order_by(model.id)
+            for emp_id, *flags in query:
+                row = index.get(emp_id)
+                if row is not None:
+                    pattern[row] = [flag is not False for flag in flags]
+        available = pattern[:, weekdays]
+
+        # Overrides replace the weekly value on days they set (newest applied last)
+        if self.EmployeeAvailabilityOverride is not None and employee_ids:
+            model = self.EmployeeAvailabilityOverride
+            columns = [getattr(model, name) for name in DAY_NAMES]
+            query = restrict(
+                self.db.query(model.employee_id, model.start_date, model.end_date, *columns)
+                .filter(model.start_date <= end, model.end_date >= start),
+                model
+            ).order_by(model.id)
+            for emp_id, ov_start, ov_end, *flags in query:
+                row = index.get(emp_id)
+                if row is None:
+                    continue
+                first = max(0, (ov_start - start).days)
+                last = min(num_days, (ov_end - start).days + 1)
+                values = np.array([-1 if flag is None else int(bool(flag)) for flag in flags], dtype=np.int8)
+                day_values = values[weekdays[first:last]]
+                is_set = day_values >= 0
+                available[row, first:last][is_set] = day_values[is_set] == 1
+
+        # Time off
+        time_off = np.zeros((len(employee_ids), num_days), dtype=bool)
+        if self.EmployeeTimeOff is not None and employee_ids:
+            model = self.EmployeeTimeOff
+            query = restrict(
+                self.db.query(model.employee_id, model.start_date, model.end_date)
+                .filter(model.start_date <= end, model.end_date >= start),
+                model
+            )
+            for emp_id, to_start, to_end in query:
+                row = index.get(emp_id)
+                if row is not None:
+                    time_off[row, max(0, (to_start - start).days):min(num_days, (to_end - start).days + 1)] = True
+
+        return AvailabilityMatrix(start, end, employee_ids, available, time_off)
+
+
+def clear_availability_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+# =============================================================================
+# Data-version stamp
+# =============================================================================
+
+def mark_availability_changed(session) -> None:
+    """Replace the data-version stamp when the session commits"""
+    session.info[_CHANGED_KEY] = True
+
+
+def _has_pending_changes(session) -> bool:
+    if session.info.get(_CHANGED_KEY):
+        return True
+    tracked = _registered_models.get('tracked', ())
+    return any(
+        isinstance(obj, tracked)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    )
+
+
+def _row_listener(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        mark_availability_changed(session)
+
+
+def _before_commit(session) -> None:
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    if not session.info.pop(_CHANGED_KEY, False) or 'SystemSetting' not in _registered_models:
+        return
+    table = _registered_models['SystemSetting'].__table__
+    values = {'setting_value': uuid.uuid4().hex, 'updated_at': datetime.utcnow()}
+    connection = session.connection()
+    result = connection.execute(
+        table.update().where(table.c.setting_key == VERSION_SETTING_KEY).values(**values)
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(
+            setting_key=VERSION_SETTING_KEY, setting_type='string',
+            description='Changes whenever employee availability data changes (availability matrix cache key)',
+            **values
+        ))
+
+
+def _discard(session, *args) -> None:
+    session.info.pop(_CHANGED_KEY, None)
+
+
+def _bulk_dml(orm_execute_state) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in _registered_models.get('tracked', ()):
+        mark_availability_changed(orm_execute_state.session)
+
+
+def register_availability_versioning(models) -> None:
+    """Replace the data-version stamp on availability changes (idempotent)"""
+    if _registered_models.get('Employee') is models['Employee']:
+        return
+    tracked = tuple(
+        models[name] for name in ('EmployeeWeeklyAvailability', 'EmployeeAvailabilityOverride', 'EmployeeTimeOff')
+        if models.get(name) is not None
+    )
+    _registered_models.update({
+        'Employee': models['Employee'],
+        'SystemSetting': models['SystemSetting'],
+        'tracked': tracked + (models['Employee'],),
+    })
+
+    for model in tracked:
+        for mapper_event in ('after_insert', 'after_update', 'after_delete'):
+            sa_event.listen(model, mapper_event, _row_listener)
+    # Only the set of employees matters to the matrix
+    for mapper_event in ('after_insert', 'after_delete'):
+        sa_event.listen(models['Employee'], mapper_event, _row_listener)
+
+    if not sa_event.contains(Session, 'before_commit', _before_commit):
+        sa_event.listen(Session, 'before_commit', _before_commit)
+        sa_event.listen(Session, 'after_rollback', _discard)
+        sa_event.listen(Session, 'do_orm_execute', _bulk_dml)
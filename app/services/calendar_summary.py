@@ -0,0 +1,454 @@
+"""
+Calendar Day Summaries
+
+Keeps one CalendarDaySummary row per day (event counts by type, consolidated
+Juicer count, unscheduled warnings) so the calendar month view reads at most
+42 rows instead of joining every schedule in the month on each page load.
+
+The same recomputation writes EmployeeDailyStats rows (per-employee event
+counts by type and scheduled minutes) for workload and fairness reports; a
+day with a CalendarDaySummary row also has its employee rows.
+
+Maintenance:
+- ORM inserts/updates/deletes of Schedule and Event rows record the days
+  they touch; the days are recomputed inside the committing transaction.
+- Bulk ORM DELETE/UPDATE statements on those tables (full database refresh,
+  time-off unscheduling) drop the summaries of the days their rows touch in
+  the same transaction; statements without a WHERE clause, or updates that
+  move rows to other days, clear the whole table.
+- Days without a row are built on first read, on a connection of their own
+  so readers never commit or roll back the caller's session.
+"""
+import json
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable
+
+from sqlalchemy import event as sa_event, func, inspect, select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Event types with their own calendar badge; anything else counts as 'Other'
+EVENT_TYPE_BUCKETS = (
+    'Core', 'Juicer Production', 'Juicer Survey', 'Juicer Deep Clean',
+    'Supervisor', 'Freeosk', 'Digitals', 'Other'
+)
+JUICER_TYPES = ('Juicer Production', 'Juicer Survey', 'Juicer Deep Clean')
+UNSCHEDULED_CONDITION = 'Unstaffed'
+
+# Event columns that change summary contents
+EVENT_TRACKED_FIELDS = (
+    'event_type', 'condition', 'start_datetime', 'due_datetime', 'project_ref_num', 'estimated_time'
+)
+# Changes that alter the per-day figures of the event's scheduled days
+SCHEDULED_DAY_FIELDS = {'event_type', 'project_ref_num', 'estimated_time'}
+# Columns whose bulk update moves a row's figures to days not known up front
+SCHEDULE_DAY_COLUMNS = {'schedule_datetime'}
+EVENT_DAY_COLUMNS = {'due_datetime', 'start_datetime', 'project_ref_num'}
+
+_DIRTY_DAYS_KEY = 'calendar_summary_days'
+_registered_models = {}
+
+
+def empty_counts() -> Dict[str, int]:
+    """Zeroed type counts (including the consolidated Juicer count)"""
+    counts = {event_type: 0 for event_type in EVENT_TYPE_BUCKETS}
+    counts['Juicer'] = 0
+    return counts
+
+
+def _as_date(value):
+    """Normalize func.date() results (str on SQLite, date elsewhere)"""
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def _warning_date(due_datetime, start_datetime):
+    """Day an unscheduled event is flagged on (due date, else start date)"""
+    when = due_datetime or start_datetime
+    return when.date() if when else None
+
+
+# =============================================================================
+# Computation
+# =============================================================================
+
+def compute_days(connection, models, days: Iterable[date]) -> Dict[date, dict]:
+    """
+    Aggregate summaries for the given days
+
+    Args:
+        connection: SQLAlchemy connection (or session) to query with
+        models: Model registry
+        days: Days to compute
+
+    Returns:
+        dict: {day: {'counts': {...}, 'scheduled_count': n, 'unscheduled_count': n,
+                     'employees': {employee_id: {'counts': {...}, 'event_count': n, 'minutes': n}}}}
+    """
+    days = sorted(set(days))
+    if not days:
+        return {}
+    Schedule = models['Schedule']
+    Event = models['Event']
+    Employee = models['Employee']
+
+    summaries = {
+        day: {'counts': empty_counts(), 'scheduled_count': 0, 'unscheduled_count': 0, 'employees': {}}
+        for day in days
+    }
+    range_start = datetime.combine(days[0], datetime.min.time())
+    range_end = datetime.combine(days[-1] + timedelta(days=1), datetime.min.time())
+
+    # One pass per (day, employee, type) feeds both the day and the employee figures
+    schedule_day = func.date(Schedule.schedule_datetime)
+    scheduled = connection.execute(
+        select(
+            schedule_day, Schedule.employee_id, Event.event_type, func.count(),
+            func.coalesce(func.sum(Event.estimated_time), 0), func.count(Event.estimated_time)
+        )
+        .select_from(Schedule)
+        .join(Event, Schedule.event_ref_num == Event.project_ref_num)
+        .join(Employee, Schedule.employee_id == Employee.id)
+        .where(Schedule.schedule_datetime >= range_start, Schedule.schedule_datetime < range_end)
+        .group_by(schedule_day, Schedule.employee_id, Event.event_type)
+    )
+    for day_value, employee_id, event_type, count, estimated, with_estimate in scheduled:
+        summary = summaries.get(_as_date(day_value))
+        if summary is None:
+            continue
+        bucket = event_type if event_type in EVENT_TYPE_BUCKETS else 'Other'
+        summary['counts'][bucket] += count
+        summary['scheduled_count'] += count
+
+        stats = summary['employees'].setdefault(employee_id, {'counts': {}, 'event_count': 0, 'minutes': 0})
+        type_name = event_type or 'Other'
+        stats['counts'][type_name] = stats['counts'].get(type_name, 0) + count
+        stats['event_count'] += count
+        # Events without an estimate count at their type's default duration
+        stats['minutes'] += int(estimated) + (count - with_estimate) * Event.get_default_duration(event_type)
+
+    warning_day = func.date(func.coalesce(Event.due_datetime, Event.start_datetime))
+    unscheduled = connection.execute(
+        select(warning_day, func.count())
+        .where(
+            Event.condition == UNSCHEDULED_CONDITION,
+            func.coalesce(Event.due_datetime, Event.start_datetime) >= range_start,
+            func.coalesce(Event.due_datetime, Event.start_datetime) < range_end
+        )
+        .group_by(warning_day)
+    )
+    for day_value, count in unscheduled:
+        summary = summaries.get(_as_date(day_value))
+        if summary is not None:
+            summary['unscheduled_count'] = count
+
+    for summary in summaries.values():
+        counts = summary['counts']
+        counts['Juicer'] = sum(counts[t] for t in JUICER_TYPES)
+    return summaries
+
+
+def store_days(connection, models, summaries: Dict[date, dict]) -> None:
+    """Replace summary and employee stats rows for the given days"""
+    if not summaries:
+        return
+    table = models['CalendarDaySummary'].__table__
+    stats_table = models['EmployeeDailyStats'].__table__
+    now = datetime.utcnow()
+    connection.execute(table.delete().where(table.c.summary_date.in_(list(summaries))))
+    connection.execute(stats_table.delete().where(stats_table.c.stat_date.in_(list(summaries))))
+    connection.execute(table.insert(), [
+        {
+            'summary_date': day,
+            'type_counts': json.dumps(summary['counts']),
+            'scheduled_count': summary['scheduled_count'],
+            'unscheduled_count': summary['unscheduled_count'],
+            'updated_at': now,
+        }
+        for day, summary in summaries.items()
+    ])
+    stats_rows = [
+        {
+            'stat_date': day,
+            'employee_id': employee_id,
+            'event_count': stats['event_count'],
+            'scheduled_minutes': stats['minutes'],
+            'type_counts': json.dumps(stats['counts']),
+        }
+        for day, summary in summaries.items()
+        for employee_id, stats in summary.get('employees', {}).items()
+    ]
+    if stats_rows:
+        connection.execute(stats_table.insert(), stats_rows)
+
+
+class CalendarSummaryService:
+    """Reads calendar day summaries, building missing days on demand"""
+
+    def __init__(self, db_session, models):
+        """
+        Initialize the service
+
+        Args:
+            db_session: SQLAlchemy database session
+            models: Model registry from get_models()
+        """
+        self.db = db_session
+        self.models = models
+
+    def get_range(self, start_date: date, end_date: date) -> Dict[date, dict]:
+        """
+        Summaries for [start_date, end_date)
+
+        Args:
+            start_date: First day
+            end_date: Day after the last day
+
+        Returns:
+            dict: {day: {'counts': {...}, 'scheduled_count': n, 'unscheduled_count': n}}
+        """
+        CalendarDaySummary = self.models['CalendarDaySummary']
+        rows = self.db.query(CalendarDaySummary).filter(
+            CalendarDaySummary.summary_date >= start_date,
+            CalendarDaySummary.summary_date < end_date
+        ).all()
+        summaries = {
+            row.summary_date: {
+                'counts': row.counts,
+                'scheduled_count': row.scheduled_count,
+                'unscheduled_count': row.unscheduled_count
+            }
+            for row in rows
+        }
+
+        all_days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days)]
+        missing = [day for day in all_days if day not in summaries]
+        if missing:
+            built = self.rebuild_days(missing)
+            summaries.update(built)
+        return summaries
+
+    def ensure_range(self, start_date: date, end_date: date) -> int:
+        """
+        Build any missing days in [start_date, end_date)
+
+        Readers of EmployeeDailyStats call this first; days without a
+        summary row have no employee rows yet either.
+
+        Returns:
+            int: Number of days built
+        """
+        CalendarDaySummary = self.models['CalendarDaySummary']
+        present = {
+            row[0] for row in self.db.query(CalendarDaySummary.summary_date).filter(
+                CalendarDaySummary.summary_date >= start_date,
+                CalendarDaySummary.summary_date < end_date
+            )
+        }
+        missing = [
+            start_date + timedelta(days=i) for i in range((end_date - start_date).days)
+            if start_date + timedelta(days=i) not in present
+        ]
+        if missing:
+            self.rebuild_days(missing)
+        return len(missing)
+
+    def rebuild_days(self, days: Iterable[date]) -> Dict[date, dict]:
+        """
+        Recompute and store summaries for the given days
+
+        Read paths build missing days, so the caller's transaction is left
+        alone: the days are computed from committed data and stored on a
+        separate connection in a transaction of their own (days the caller
+        has changed are recomputed when it commits). A caller that has
+        already written holds the write lock; its days are stored in its own
+        transaction instead and committed with it.
+        """
+        from app.utils.db_routing import has_written
+
+        days = list(days)
+        if has_written(self.db):
+            connection = self.db.connection()
+            summaries = compute_days(connection, self.models, days)
+            store_days(connection, self.models, summaries)
+            return summaries
+
+        summaries = None
+        try:
+            with self.db.get_bind(mapper=self.models['CalendarDaySummary']).begin() as connection:
+                summaries = compute_days(connection, self.models, days)
+                store_days(connection, self.models, summaries)
+        except Exception as e:
+            # Another request built the same days concurrently - serve computed values
+            logger.warning(f"Could not store calendar summaries: {e}")
+            if summaries is None:
+                summaries = compute_days(self.db.connection(), self.models, days)
+        return summaries
+
+    def rebuild_range(self, start_date: date, end_date: date) -> int:
+        """Recompute [start_date, end_date); returns the number of days"""
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days)]
+        self.rebuild_days(days)
+        return len(days)
+
+
+# =============================================================================
+# Incremental maintenance
+# =============================================================================
+
+def mark_days(session, days: Iterable[date]) -> None:
+    """
+    Record days to recompute when the session commits
+
+    The mapper listeners call this for ORM changes; bulk writers that bypass
+    them (e.g. CSV imports) call it with the days they touched.
+    """
+    dirty = session.info.setdefault(_DIRTY_DAYS_KEY, set())
+    dirty.update(day for day in days if day is not None)
+
+
+def _history_values(target, attr) -> list:
+    """Current and previous values of an attribute"""
+    history = inspect(target).attrs[attr].history
+    values = list(history.added or []) + list(history.deleted or [])
+    if not values:
+        values = [getattr(target, attr)]
+    return values
+
+
+def _schedule_listener(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is None:
+        return
+    mark_days(session, [
+        value.date() for value in _history_values(target, 'schedule_datetime')
+        if isinstance(value, datetime)
+    ])
+
+
+def _event_listener(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is None:
+        return
+
+    state = inspect(target)
+    deleting = target in session.deleted
+    changed = {attr for attr in EVENT_TRACKED_FIELDS if state.attrs[attr].history.has_changes()}
+    if not changed and not deleting:
+        return
+
+    # Unscheduled warning day, before and after
+    due_values = _history_values(target, 'due_datetime')
+    start_values = _history_values(target, 'start_datetime')
+    mark_days(session, [_warning_date(due, start) for due in due_values for start in start_values])
+
+    # Scheduled days of this event if its type, number or duration changed
+    if changed & SCHEDULED_DAY_FIELDS or deleting:
+        Schedule = _registered_models['Schedule']
+        ref_nums = [v for v in _history_values(target, 'project_ref_num') if v is not None]
+        if ref_nums:
+            rows = connection.execute(
+                select(func.date(Schedule.schedule_datetime))
+                .where(Schedule.event_ref_num.in_(ref_nums))
+                .distinct()
+            )
+            mark_days(session, [_as_date(row[0]) for row in rows])
+
+
+def _before_commit(session) -> None:
+    """Recompute days touched in this transaction (after a final flush)"""
+    if not session.info.get(_DIRTY_DAYS_KEY) and not session.new and not session.dirty and not session.deleted:
+        return
+    session.flush()
+    days = session.info.pop(_DIRTY_DAYS_KEY, None)
+    if not days or not _registered_models:
+        return
+    connection = session.connection()
+    store_days(connection, _registered_models, compute_days(connection, _registered_models, days))
+
+
+def _discard(session, *args) -> None:
+    session.info.pop(_DIRTY_DAYS_KEY, None)
+
+
+def _updated_columns(statement) -> set:
+    """Names of the columns an UPDATE statement sets (empty if unknown)"""
+    values = getattr(statement, '_values', None) or dict(getattr(statement, '_ordered_values', None) or ())
+    return {getattr(key, 'key', key) for key in values}
+
+
+def _bulk_dml_days(connection, statement, model, is_update):
+    """
+    Days whose figures a bulk DELETE/UPDATE on schedules or events changes,
+    read before the statement runs; None when they cannot be bounded
+    """
+    Schedule = _registered_models['Schedule']
+    Event = _registered_models['Event']
+    where = statement.whereclause
+    if where is None:
+        return None
+    if is_update:
+        updated = _updated_columns(statement)
+        if not updated or updated & (SCHEDULE_DAY_COLUMNS if model is Schedule else EVENT_DAY_COLUMNS):
+            return None
+
+    if model is Schedule:
+        queries = [select(func.date(Schedule.schedule_datetime)).where(where).distinct()]
+    else:
+        warning_day = func.date(func.coalesce(Event.due_datetime, Event.start_datetime))
+        queries = [
+            select(warning_day).where(where).distinct(),
+            select(func.date(Schedule.schedule_datetime)).where(
+                Schedule.event_ref_num.in_(select(Event.project_ref_num).where(where))
+            ).distinct(),
+        ]
+    return {_as_date(row[0]) for query in queries for row in connection.execute(query) if row[0] is not None}
+
+
+def _bulk_dml(orm_execute_state) -> None:
+    """Bulk DELETE/UPDATE on schedules/events invalidates the summaries and employee stats of the days it touches"""
+    if not (orm_execute_state.is_delete or orm_execute_state.is_update) or not _registered_models:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ not in (_registered_models['Schedule'], _registered_models['Event']):
+        return
+    connection = orm_execute_state.session.connection()
+    table = _registered_models['CalendarDaySummary'].__table__
+    stats_table = _registered_models['EmployeeDailyStats'].__table__
+
+    days = _bulk_dml_days(connection, orm_execute_state.statement, mapper.class_, orm_execute_state.is_update)
+    if days is None:
+        connection.execute(table.delete())
+        connection.execute(stats_table.delete())
+        _discard(orm_execute_state.session)
+    elif days:
+        connection.execute(table.delete().where(table.c.summary_date.in_(days)))
+        connection.execute(stats_table.delete().where(stats_table.c.stat_date.in_(days)))
+
+
+def register_calendar_summary(models) -> None:
+    """Keep calendar day summaries current from ORM changes (idempotent)"""
+    if _registered_models.get('Schedule') is models['Schedule']:
+        return
+    _registered_models.update({
+        'Schedule': models['Schedule'],
+        'Event': models['Event'],
+        'Employee': models['Employee'],
+        'CalendarDaySummary': models['CalendarDaySummary'],
+        'EmployeeDailyStats': models['EmployeeDailyStats'],
+    })
+
+    # Deletes are recorded before the row goes so unloaded columns can still be read
+    for mapper_event in ('after_insert', 'after_update', 'before_delete'):
+        sa_event.listen(models['Schedule'], mapper_event, _schedule_listener)
+        sa_event.listen(models['Event'], mapper_event, _event_listener)
+
+    if not sa_event.contains(Session, 'before_commit', _before_commit):
+        sa_event.listen(Session, 'before_commit', _before_commit)
+        sa_event.listen(Session, 'after_rollback', _discard)
+        sa_event.listen(Session, 'do_orm_execute', _bulk_dml)
@@ -2,11 +2,12 @@
 Constraint Validator Service
 Validates scheduling assignments against business rules
 """
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
+from .availability_matrix import AvailabilityMatrix, AvailabilityService
 from .validation_types import (
     ValidationResult,
     ConstraintViolation,
@@ -45,6 +46,7 @@ class ConstraintValidator:
             models: Dictionary of model classes from app.config
         """
         self.db = db_session
+        self.models = models
         self.Employee = models['Employee']
         self.Event = models['Event']
         self.Schedule = models['Schedule']
@@ -56,6 +58,8 @@ class ConstraintValidator:
         self.SchedulerRunHistory = models.get('SchedulerRunHistory')
         self.current_run_id = None  # Track current scheduler run
         self._active_run_ids_cache = None  # Cache for active run IDs
+        self.availability_service = AvailabilityService(db_session, models)
+        self.availability_matrix = None  # Shared matrix supplied by a scheduler run
 
     def set_current_run(self, run_id: int) -> None:
         """
@@ -68,6 +72,24 @@ class ConstraintValidator:
         # Invalidate cache when run changes
         self._active_run_ids_cache = None
 
+    def use_availability(self, matrix: Optional[AvailabilityMatrix]) -> None:
+        """
+        Answer availability and time-off checks from a precomputed matrix
+
+        Args:
+            matrix: AvailabilityMatrix covering the dates being validated
+                    (days outside it fall back to the cached weekly matrix)
+        """
+        self.availability_matrix = matrix
+
+    def _availability_for(self, target_date: date) -> AvailabilityMatrix:
+        """Availability matrix covering target_date"""
+        if self.availability_matrix is not None and self.availability_matrix.covers(target_date):
+            return self.availability_matrix
+        # Sunday-Saturday week around the date (reused across validations)
+        week_start = target_date - timedelta(days=(target_date.weekday() + 1) % 7)
+        return self.availability_service.matrix(week_start, week_start + timedelta(days=6))
+
     def _get_active_run_ids(self) -> list:
         """
         Get all active (unapproved) scheduler run IDs with caching
@@ -83,7 +105,7 @@ class ConstraintValidator:
         if self.SchedulerRunHistory:
             active_runs = self.db.query(self.SchedulerRunHistory.id).filter(
                 self.SchedulerRunHistory.approved_at.is_(None),
-                self.SchedulerRunHistory.status.in_(['completed', 'running'])
+                self.SchedulerRunHistory.active_condition()
             ).all()
             self._active_run_ids_cache = [r.id for r in active_runs]
         else:
@@ -152,6 +174,8 @@ class ConstraintValidator:
                        result: ValidationResult) -> None:
         """Check if employee has requested time off"""
         target_date = schedule_datetime.date()
+        if not self._availability_for(target_date).has_time_off(employee.id, target_date):
+            return
 
         time_off = self.db.query(self.EmployeeTimeOff).filter(
             self.EmployeeTimeOff.employee_id == employee.id,
@@ -170,29 +194,21 @@ class ConstraintValidator:
     def _check_availability(self, employee: object, schedule_datetime: datetime,
                            result: ValidationResult) -> None:
         """Check if schedule_datetime falls within employee's availability window"""
-        # Check weekly availability pattern
-        if self.EmployeeWeeklyAvailability:
+        # Weekly availability pattern, with availability overrides applied
+        target_date = schedule_datetime.date()
+        if not self._availability_for(target_date).is_available(employee.id, target_date):
             day_of_week = schedule_datetime.weekday()  # 0=Monday, 6=Sunday
 
             # Map day_of_week to column name
             day_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
             day_column = day_names[day_of_week]
 
-            weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                employee_id=employee.id
-            ).first()
-
-            if weekly_avail:
-                # Check if employee is available on this day
-                is_available = getattr(weekly_avail, day_column, True)
-
-                if not is_available:
-                    result.add_violation(ConstraintViolation(
-                        constraint_type=ConstraintType.AVAILABILITY,
-                        message=f"Employee {employee.name} not available on {day_column.capitalize()}",
-                        severity=ConstraintSeverity.HARD,
-                        details={'day_of_week': day_of_week, 'day_name': day_column}
-                    ))
+            result.add_violation(ConstraintViolation(
+                constraint_type=ConstraintType.AVAILABILITY,
+                message=f"Employee {employee.name} not available on {day_column.capitalize()}",
+                severity=ConstraintSeverity.HARD,
+                details={'day_of_week': day_of_week, 'day_name': day_column}
+            ))
 
     def _check_role_requirements(self, event: object, employee: object,
                                  result: ValidationResult) -> None:
@@ -424,7 +440,7 @@ class ConstraintValidator:
             # Get all unapproved/active scheduler runs
             active_run_ids = self.db.query(self.SchedulerRunHistory.id).filter(
                 self.SchedulerRunHistory.approved_at.is_(None),
-                self.SchedulerRunHistory.status.in_(['completed', 'running'])
+                self.SchedulerRunHistory.active_condition()
             ).all()
             active_run_ids = [r.id for r in active_run_ids]
 
@@ -508,11 +524,8 @@ class ConstraintValidator:
         """
         Get list of employees who can be assigned to this event at this time
 
-        Filters by:
-        - Role requirements
-        - Time off
-        - Daily limits
-        - Availability
+        Applies the same hard constraints as validate_assignment() to the
+        whole roster in one evaluation (WhatIfService).
 
         Args:
             event: Event to schedule
@@ -521,16 +534,15 @@ class ConstraintValidator:
         Returns:
             List of Employee objects who pass all constraints
         """
-        # Start with all employees
-        all_employees = self.db.query(self.Employee).all()
+        from .what_if_service import WhatIfService
 
-        available = []
-        for employee in all_employees:
-            validation = self.validate_assignment(event, employee, schedule_datetime)
-            if validation.is_valid:
-                available.append(employee)
+        what_if = WhatIfService(self.db, self.models)
+        what_if.use_availability(self.availability_matrix)
+        result = what_if.evaluate(event, schedule_datetime)
 
-        return available
+        # Start with all employees
+        all_employees = self.db.query(self.Employee).all()
+        return [employee for employee in all_employees if result.is_available(employee.id)]
 
     def get_available_employee_ids(self, event: object, schedule_datetime: datetime) -> List[str]:
         """
@@ -0,0 +1,195 @@
+"""
+CP-SAT Assignment Domains
+=========================
+
+Feasible (event, employee, day) triples for the CP-SAT scheduler.
+
+Instead of one employee variable per eligible employee and one day variable
+per valid day for every event, with per-employee/per-day rules re-deriving
+"employee works this event on this day" through AND indicators, the triples
+an event could actually take are enumerated once up front: eligible employees
+x valid days, masked by the availability matrix, minus any triple that
+capacity already used by posted schedules rules out. The scheduler creates
+one Boolean per surviving triple, and the per-employee/per-day/per-week rules
+become linear sums over triples grouped with the index arrays held here.
+
+Usage:
+    domains = FeasibleAssignments.build(events, eligible, employee_ids, days, week_of_day, free)
+    for (emp_id, day), positions in domains.groups(('employee', 'day')):
+        ...
+"""
+
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+import numpy as np
+
+
+class FeasibleAssignments:
+    """Feasible (event, employee, day) triples as parallel index arrays
+
+    event, employee and day hold positions into event_ids, employee_ids and
+    days; week holds the week index of each triple's day. `pruned` counts the
+    triples removed, by reason.
+    """
+
+    def __init__(self, event_ids: Sequence, employee_ids: Sequence[str], days: Sequence,
+                 day_weeks: Sequence[int], event, employee, day):
+        self.event_ids = list(event_ids)
+        self.employee_ids = list(employee_ids)
+        self.days = list(days)
+        self.day_weeks = np.asarray(day_weeks, dtype=np.int64)
+        self.event = np.asarray(event, dtype=np.int64)
+        self.employee = np.asarray(employee, dtype=np.int64)
+        self.day = np.asarray(day, dtype=np.int64)
+        self.pruned: Dict[str, int] = {}
+
+    @classmethod
+    def build(cls, events: Iterable[Tuple[object, Sequence]], eligible: Dict[object, Set[str]],
+              employee_ids: Sequence[str], days: Sequence, week_of_day: Dict, free) -> 'FeasibleAssignments':
+        """
+        Enumerate eligible employee x valid day triples that are free
+
+        Args:
+            events: (event_id, valid days) pairs
+            eligible: event_id -> eligible employee ids
+            employee_ids: Employees (rows of `free`)
+            days: Days (columns of `free`)
+            week_of_day: day -> week index
+            free: Boolean array [employee, day]
+        """
+        employee_pos = {emp_id: i for i, emp_id in enumerate(employee_ids)}
+        day_pos = {d: i for i, d in enumerate(days)}
+
+        event_ids, event_chunks, employee_chunks, day_chunks = [], [], [], []
+        unavailable = 0
+        for eid, valid_days in events:
+            position = len(event_ids)
+            event_ids.append(eid)
+            rows = np.array(sorted(employee_pos[emp_id] for emp_id in eligible.get(eid, ())
+                                   if emp_id in employee_pos), dtype=np.int64)
+            columns = np.array([day_pos[d] for d in valid_days if d in day_pos], dtype=np.int64)
+            if not len(rows) or not len(columns):
+                continue
+            row, column = np.nonzero(free[np.ix_(rows, columns)])
+            unavailable += len(rows) * len(columns) - len(row)
+            event_chunks.append(np.full(len(row), position, dtype=np.int64))
+            employee_chunks.append(rows[row])
+            day_chunks.append(columns[column])
+
+        def join(chunks):
+            return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int64)
+
+        domains = cls(event_ids, employee_ids, days, [week_of_day[d] for d in days],
+                      join(event_chunks), join(employee_chunks), join(day_chunks))
+        domains.pruned['unavailable'] = unavailable
+        return domains
+
+    def __len__(self) -> int:
+        return len(self.event)
+
+    @property
+    def week(self):
+        return self.day_weeks[self.day] if len(self.day_weeks) else np.zeros(0, dtype=np.int64)
+
+    def triple(self, position: int) -> Tuple[object, str, object]:
+        """(event_id, employee_id, day) of a triple"""
+        return (self.event_ids[self.event[position]], self.employee_ids[self.employee[position]],
+                self.days[self.day[position]])
+
+    def triples(self) -> Iterator[Tuple[object, str, object]]:
+        for position in range(len(self)):
+            yield self.triple(position)
+
+    # ------------------------------------------------------------------
+    # Selection
+    # ------------------------------------------------------------------
+
+    def of_events(self, event_ids: Iterable) -> np.ndarray:
+        """Mask of triples belonging to the given events"""
+        wanted = set(event_ids)
+        positions = [i for i, eid in enumerate(self.event_ids) if eid in wanted]
+        return np.isin(self.event, positions)
+
+    def of_employees(self, employee_ids: Iterable[str]) -> np.ndarray:
+        """Mask of triples assigned to the given employees"""
+        wanted = set(employee_ids)
+        positions = [i for i, emp_id in enumerate(self.employee_ids) if emp_id in wanted]
+        return np.isin(self.employee, positions)
+
+    def lookup(self, values: Dict[Tuple[str, object], int], by: str = 'day') -> np.ndarray:
+        """
+        Per-triple values of an {(employee_id, day or week index): value} mapping
+
+        Pairs missing from the mapping read as 0.
+        """
+        if by == 'day':
+            column_pos = {d: i for i, d in enumerate(self.days)}
+            width = len(self.days)
+        else:
+            width = int(self.day_weeks.max()) + 1 if len(self.day_weeks) else 0
+            column_pos = {w: w for w in range(width)}
+        employee_pos = {emp_id: i for i, emp_id in enumerate(self.employee_ids)}
+
+        grid = np.zeros((len(self.employee_ids), width), dtype=np.int64)
+        for (emp_id, column), value in values.items():
+            row = employee_pos.get(emp_id)
+            column = column_pos.get(column)
+            if row is not None and column is not None:
+                grid[row, column] = value
+        return grid[self.employee, getattr(self, by)]
+
+    def prune(self, drop: np.ndarray, reason: str) -> int:
+        """Remove the triples flagged in `drop`; returns how many were removed"""
+        count = int(np.count_nonzero(drop))
+        if count:
+            keep = ~drop
+            self.event = self.event[keep]
+            self.employee = self.employee[keep]
+            self.day = self.day[keep]
+        self.pruned[reason] = self.pruned.get(reason, 0) + count
+        return count
+
+    # ------------------------------------------------------------------
+    # Grouping
+    # ------------------------------------------------------------------
+
+    def _label(self, key: str, value: int):
+        if key == 'event':
+            return self.event_ids[value]
+        if key == 'employee':
+            return self.employee_ids[value]
+        if key == 'day':
+            return self.days[value]
+        return int(value)
+
+    def groups(self, keys: Sequence[str], where=None) -> Iterator[Tuple[tuple, np.ndarray]]:
+        """
+        Triple positions grouped by one or more of event/employee/day/week
+
+        Args:
+            keys: Columns to group on, e.g. ('employee', 'day')
+            where: Optional boolean mask restricting the triples
+
+        Yields:
+            (key labels, positions) with labels as ids/dates (week as int)
+        """
+        positions = np.arange(len(self)) if where is None else np.flatnonzero(where)
+        if not len(positions):
+            return
+        columns = [getattr(self, key)[positions] for key in keys]
+        order = np.lexsort(columns[::-1])
+        positions = positions[order]
+        columns = [column[order] for column in columns]
+
+        boundary = np.zeros(len(positions), dtype=bool)
+        boundary[0] = True
+        for column in columns:
+            boundary[1:] |= column[1:] != column[:-1]
+        starts = np.flatnonzero(boundary)
+
+        for start, chunk in zip(starts, np.split(positions, starts[1:])):
+            yield tuple(self._label(key, column[start]) for key, column in zip(keys, columns)), chunk
+
+    def group_map(self, keys: Sequence[str], where=None) -> Dict[tuple, List[int]]:
+        """groups() as a dict of key labels -> list of positions"""
+        return {key: chunk.tolist() for key, chunk in self.groups(keys, where)}
@@ -17,12 +17,21 @@ Usage:
 
 import logging
 import re
+import threading
 from collections import defaultdict
 from datetime import date, datetime, time, timedelta
+from time import perf_counter
 
+import numpy as np
 from ortools.sat.python import cp_model
+from sqlalchemy import select
 
 from app.constants import INACTIVE_CONDITIONS
+from app.services.cpsat_domains import FeasibleAssignments
+from app.services.cpsat_streaming import (
+    DEFAULT_STALL_SECONDS, DEFAULT_STOP_GAP, POLL_SECONDS, SAVE_INTERVAL_SECONDS, STOP_USER, SolutionMonitor,
+)
+from app.services.run_profiler import RunProfiler
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +59,7 @@ WEIGHT_ML_AFFINITY = 8           # S15: Bonus for ML-predicted employee-event af
 # Scheduling constants
 # ---------------------------------------------------------------------------
 SCHEDULING_WINDOW_DAYS = 3
+RUN_STATUS_STOPPING = 'stopping'        # Set by POST /auto-schedule/stop while a run is solving
 MAX_CORE_EVENTS_PER_DAY = 1
 MAX_CORE_EVENTS_PER_WEEK = 6
 MAX_JUICER_PRODUCTION_PER_WEEK = 5
@@ -73,6 +83,9 @@ LEAD_ONLY_EVENT_TYPES = {'Freeosk', 'Digitals', 'Digital Setup', 'Digital Refres
                          'Digital Teardown', 'Other'}
 SUPERVISOR_PREFERRED_TYPES = {'Supervisor', 'Digitals', 'Freeosk',
                               'Juicer', 'Juicer Production', 'Juicer Survey', 'Juicer Deep Clean'}
+# H18: support events need a base event (same employee, same day)
+SUPPORT_EVENT_TYPES = {'Freeosk', 'Digitals', 'Digital Setup', 'Digital Refresh', 'Digital Teardown'}
+SUPPORT_BASE_TYPES = {'Core', 'Juicer', 'Juicer Production'}
 
 
 class CPSATSchedulingEngine:
@@ -89,6 +102,7 @@ class CPSATSchedulingEngine:
         self.db = db_session
         self.models = models
         self.emergency_mode = False  # When True, reduces scheduling buffer to 0 days
+        self.profiler = RunProfiler()  # Replaced by a started profiler for each run
 
         self.Event = models['Event']
         self.Schedule = models['Schedule']
@@ -111,6 +125,10 @@ class CPSATSchedulingEngine:
         # Load user preference multipliers from SystemSetting
         self.user_pref_multipliers = self._load_user_preferences()
 
+        # Early stopping / solution streaming (CPSAT_* config)
+        self._load_solve_settings()
+        self.solve_monitor = None
+
     # ------------------------------------------------------------------
     # Time settings
     # ------------------------------------------------------------------
@@ -161,6 +179,15 @@ class CPSATSchedulingEngine:
         for b in self.shift_blocks:
             self.block_arrive_time[b['block']] = b['arrive']
 
+    def _load_solve_settings(self):
+        """Load early-stop thresholds and whether to stream solutions."""
+        from flask import current_app, has_app_context
+        config = current_app.config if has_app_context() else {}
+
+        self.stream_solutions = config.get('CPSAT_STREAM_SOLUTIONS', True)
+        self.stop_gap = config.get('CPSAT_STOP_GAP', DEFAULT_STOP_GAP)
+        self.stall_seconds = config.get('CPSAT_STALL_SECONDS', DEFAULT_STALL_SECONDS)
+
     def _load_user_preferences(self):
         """
         Load scheduling preference multipliers from SystemSetting.
@@ -318,7 +345,8 @@ class CPSATSchedulingEngine:
         self.day_index = {d: i for i, d in enumerate(self.valid_days)}
 
         # --- Employee availability pre-computation ---
-        self._precompute_availability()
+        with self.profiler.phase('precompute'):
+            self._precompute_availability()
 
         # --- Rotation assignments ---
         self._load_rotations()
@@ -378,48 +406,25 @@ class CPSATSchedulingEngine:
 
     def _precompute_availability(self):
         """Build a set of (employee_id, date) pairs where employee is UNAVAILABLE."""
+        self.availability = None
         self.unavailable = set()  # (emp_id, date)
+        if not self.valid_days:
+            return
 
-        # Weekly availability
-        if self.EmployeeWeeklyAvailability:
-            day_attrs = ['monday', 'tuesday', 'wednesday', 'thursday',
-                         'friday', 'saturday', 'sunday']
-            for wa in self.EmployeeWeeklyAvailability.query.all():
-                for d in self.valid_days:
-                    day_idx = d.weekday()  # 0=Mon, 6=Sun
-                    if not getattr(wa, day_attrs[day_idx], True):
-                        self.unavailable.add((wa.employee_id, d))
-
-        # Availability overrides (takes priority over weekly)
-        if self.EmployeeAvailabilityOverride:
-            day_attrs = ['monday', 'tuesday', 'wednesday', 'thursday',
-                         'friday', 'saturday', 'sunday']
-            for ov in self.EmployeeAvailabilityOverride.query.all():
-                for d in self.valid_days:
-                    if ov.start_date <= d <= ov.end_date:
-                        day_idx = d.weekday()
-                        val = getattr(ov, day_attrs[day_idx], None)
-                        if val is not None:
-                            if val:
-                                # Override says available — remove unavailability
-                                self.unavailable.discard((ov.employee_id, d))
-                            else:
-                                # Override says unavailable
-                                self.unavailable.add((ov.employee_id, d))
-
-        # Time off
+        # Weekly availability, overrides and time off for the solver window,
+        # from the shared availability matrix
         # TODO Fix #3: When EmployeeTimeOff gains an 'approved' or 'status'
-        # column, filter here: .filter_by(status='approved') or
-        # .filter(EmployeeTimeOff.approved == True)
-        if self.EmployeeTimeOff:
-            for to in self.EmployeeTimeOff.query.all():
-                # TODO Fix #2: When partial-day time-off is supported
-                # (start_time/end_time fields), only block the employee for
-                # events whose scheduled time overlaps the time-off window
-                # instead of blocking the entire day.
-                for d in self.valid_days:
-                    if to.start_date <= d <= to.end_date:
-                        self.unavailable.add((to.employee_id, d))
+        # column, filter the matrix's time-off query on it.
+        # TODO Fix #2: When partial-day time-off is supported
+        # (start_time/end_time fields), only block the employee for
+        # events whose scheduled time overlaps the time-off window
+        # instead of blocking the entire day.
+        from app.services.availability_matrix import AvailabilityService
+
+        self.availability = AvailabilityService(self.db, self.models).matrix(
+            self.valid_days[0], self.valid_days[-1]
+        )
+        self.unavailable = self.availability.unavailable_pairs(self.employee_ids, self.valid_days)
 
     def _load_rotations(self):
         """Load rotation assignments and exceptions into lookup dicts."""
@@ -651,12 +656,84 @@ class CPSATSchedulingEngine:
     # Model building
     # ------------------------------------------------------------------
 
+    def _compute_domains(self):
+        """Enumerate feasible (event, employee, day) triples for the model.
+
+        Starts from eligible employees x valid days, masked by the
+        availability matrix, then drops triples that posted schedules have
+        already ruled out: Core/Juicer day and week limits used up (H11,
+        H12, H22, H23), an event longer than the minutes left under the
+        weekly cap (H24), and support events for a non-Club-Supervisor with
+        no base event possible that day (H18, only when the run has base
+        events; see _support_requires_base_applies).
+        """
+        if self.availability is not None:
+            free = self.availability.free_grid(self.employee_ids, self.valid_days)
+        else:
+            free = np.ones((len(self.employee_ids), len(self.valid_days)), dtype=bool)
+            for i, emp_id in enumerate(self.employee_ids):
+                for j, d in enumerate(self.valid_days):
+                    free[i, j] = (emp_id, d) not in self.unavailable
+
+        domains = FeasibleAssignments.build(
+            ((e.id, self._valid_days_for_event(e)) for e in self.events),
+            self.eligible_employees, self.employee_ids, self.valid_days, self.week_of_day, free,
+        )
+        if not len(domains):
+            return domains
+
+        def of_types(types):
+            return domains.of_events(e.id for e in self.events if self._get_event_type(e) in types)
+
+        core = of_types({'Core'})
+        domains.prune(
+            core & ((domains.lookup(self.existing_core_count_by_emp_day) >= MAX_CORE_EVENTS_PER_DAY) |
+                    (domains.lookup(self.existing_core_count_by_emp_week, by='week')
+                     >= MAX_CORE_EVENTS_PER_WEEK)),
+            'core_limit',
+        )
+
+        juicer = of_types(JUICER_EVENT_TYPES)
+        domains.prune(
+            juicer & ((domains.lookup(self.existing_juicer_count_by_emp_day) >= 1) |
+                      (domains.lookup(self.existing_juicer_count_by_emp_week, by='week')
+                       >= MAX_JUICER_PRODUCTION_PER_WEEK)),
+            'juicer_limit',
+        )
+
+        minutes = np.array([e.estimated_time or 60 for e in self.events], dtype=np.int64)
+        remaining = MAX_WEEKLY_MINUTES - domains.lookup(self.existing_minutes_by_emp_week, by='week')
+        domains.prune(minutes[domains.event] > remaining, 'weekly_hours')
+
+        if not self._support_requires_base_applies():
+            return domains
+
+        # Support events need a base event for the same employee and day
+        base = of_types(SUPPORT_BASE_TYPES)
+        base_slots = set(zip(domains.employee[base].tolist(), domains.day[base].tolist()))
+        support = of_types(SUPPORT_EVENT_TYPES) & ~domains.of_employees(
+            emp_id for emp_id, emp in self.employees.items() if emp.job_title == 'Club Supervisor'
+        )
+        no_base = np.fromiter(
+            ((emp, d) not in base_slots for emp, d in zip(domains.employee.tolist(), domains.day.tolist())),
+            dtype=bool, count=len(domains),
+        )
+        domains.prune(support & no_base, 'support_without_base')
+
+        return domains
+
     def _build_model(self):
         """Build the CP-SAT model with all constraints and objective."""
         model = cp_model.CpModel()
 
         # ======== Decision Variables ========
 
+        self.domains = self._compute_domains()
+
+        # v_triple[pos] / v_assign[(event_id, emp_id, day)] = BoolVar:
+        # employee works event on day (one per feasible triple)
+        self.v_triple = []
+        self.v_assign = {}
         # assign_day[(event_id, day)] = BoolVar: event scheduled on day
         self.v_assign_day = {}
         # assign_emp[(event_id, emp_id)] = BoolVar: employee assigned to event
@@ -671,45 +748,38 @@ class CPSATSchedulingEngine:
         self.v_sup_emp = {}
         self.v_sup_scheduled = {}
 
+        for triple in self.domains.triples():
+            eid, emp_id, d = triple
+            var = model.NewBoolVar(f'x_{eid}_{emp_id}_{d}')
+            self.v_triple.append(var)
+            self.v_assign[triple] = var
+
+        # Day and employee variables only where an event has triples; each is
+        # the sum of its triples (an event takes at most one triple, H2/H3),
+        # so unavailable (employee, day) pairs need no constraint (H5/H6)
+        for (eid, d), positions in self.domains.groups(('event', 'day')):
+            var = model.NewBoolVar(f'day_{eid}_{d}')
+            model.Add(var == self._sum_triples(positions))
+            self.v_assign_day[(eid, d)] = var
+
+        for (eid, emp_id), positions in self.domains.groups(('event', 'employee')):
+            var = model.NewBoolVar(f'emp_{eid}_{emp_id}')
+            model.Add(var == self._sum_triples(positions))
+            self.v_assign_emp[(eid, emp_id)] = var
+
+        for (eid,), positions in self.domains.groups(('event',)):
+            self.v_scheduled[eid] = model.NewBoolVar(f'sched_{eid}')
+            model.Add(self._sum_triples(positions) == self.v_scheduled[eid])
+
         for event in self.events:
-            etype = self._get_event_type(event)
             eid = event.id
-            valid_days = self._valid_days_for_event(event)
-
-            if not valid_days:
-                # No valid days — event can't be scheduled
-                self.v_scheduled[eid] = model.NewConstant(0)
-                continue
-
-            eligible = self.eligible_employees.get(eid, set())
-            if not eligible:
-                self.v_scheduled[eid] = model.NewConstant(0)
-                continue
-
-            # Filter eligible employees by day availability
-            valid_emp_days = set()
-            for emp_id in eligible:
-                for d in valid_days:
-                    if (emp_id, d) not in self.unavailable:
-                        valid_emp_days.add((emp_id, d))
-
-            if not valid_emp_days:
+            if eid not in self.v_scheduled:
+                # No free eligible employee on any valid day — can't be scheduled
                 self.v_scheduled[eid] = model.NewConstant(0)
                 continue
 
-            # Create scheduled variable
-            self.v_scheduled[eid] = model.NewBoolVar(f'sched_{eid}')
-
-            # Day variables (only for valid days)
-            for d in valid_days:
-                self.v_assign_day[(eid, d)] = model.NewBoolVar(f'day_{eid}_{d}')
-
-            # Employee variables (only for eligible employees)
-            for emp_id in eligible:
-                self.v_assign_emp[(eid, emp_id)] = model.NewBoolVar(f'emp_{eid}_{emp_id}')
-
             # Block variables (Core events only)
-            if etype == 'Core':
+            if self._get_event_type(event) == 'Core':
                 for b in range(1, NUM_CORE_BLOCKS + 1):
                     self.v_assign_block[(eid, b)] = model.NewBoolVar(f'blk_{eid}_{b}')
 
@@ -729,39 +799,22 @@ class CPSATSchedulingEngine:
 
         return model
 
-    def _add_hard_constraints(self, model):
-        """Add all hard constraints (H1-H21) to the model."""
-
-        # H2: Exactly one day per scheduled event
-        for event in self.events:
-            eid = event.id
-            if eid not in self.v_scheduled or isinstance(self.v_scheduled[eid], int):
-                continue
+    def _sum_triples(self, positions):
+        """Sum of the triple variables at the given positions."""
+        return sum(self.v_triple[p] for p in positions)
 
-            day_vars = [self.v_assign_day[(eid, d)]
-                        for d in self._valid_days_for_event(event)
-                        if (eid, d) in self.v_assign_day]
+    def _events_of_types(self, types):
+        return [e for e in self.events if self._get_event_type(e) in types]
 
-            if day_vars:
-                model.Add(sum(day_vars) == self.v_scheduled[eid])
-            else:
-                model.Add(self.v_scheduled[eid] == 0)
+    def _support_requires_base_applies(self):
+        """H18 is only enforced when the run has both support and base events."""
+        return bool(self._events_of_types(SUPPORT_EVENT_TYPES)) and bool(self._events_of_types(SUPPORT_BASE_TYPES))
 
-        # H3: Exactly one employee per scheduled event
-        for event in self.events:
-            eid = event.id
-            if eid not in self.v_scheduled or isinstance(self.v_scheduled[eid], int):
-                continue
-
-            eligible = self.eligible_employees.get(eid, set())
-            emp_vars = [self.v_assign_emp[(eid, emp_id)]
-                        for emp_id in eligible
-                        if (eid, emp_id) in self.v_assign_emp]
+    def _add_hard_constraints(self, model):
+        """Add all hard constraints (H1-H24) to the model.
 
-            if emp_vars:
-                model.Add(sum(emp_vars) == self.v_scheduled[eid])
-            else:
-                model.Add(self.v_scheduled[eid] == 0)
+        H2, H3, H5 and H6 are part of the variable domains (see _build_model).
+        """
 
         # H4: Exactly one block per scheduled Core event
         for event in self.events:
@@ -769,8 +822,6 @@ class CPSATSchedulingEngine:
             etype = self._get_event_type(event)
             if etype != 'Core':
                 continue
-            if eid not in self.v_scheduled or isinstance(self.v_scheduled[eid], int):
-                continue
 
             block_vars = [self.v_assign_block[(eid, b)]
                           for b in range(1, NUM_CORE_BLOCKS + 1)
@@ -779,47 +830,19 @@ class CPSATSchedulingEngine:
             if block_vars:
                 model.Add(sum(block_vars) == self.v_scheduled[eid])
 
-        # H5 + H6: Employee availability (pre-filtered via domain, but also
-        # enforce that if emp is assigned, they must be available on the assigned day)
-        for event in self.events:
-            eid = event.id
-            etype = self._get_event_type(event)
-            if eid not in self.v_scheduled or isinstance(self.v_scheduled[eid], int):
-                continue
-
-            eligible = self.eligible_employees.get(eid, set())
-            valid_days = self._valid_days_for_event(event)
-
-            for emp_id in eligible:
-                if (eid, emp_id) not in self.v_assign_emp:
-                    continue
-                for d in valid_days:
-                    if (eid, d) not in self.v_assign_day:
-                        continue
-                    if (emp_id, d) in self.unavailable:
-                        # If employee is on this day AND assigned to event,
-                        # they can't both be true
-                        # assign_emp[e, emp] + assign_day[e, d] <= 1
-                        model.Add(
-                            self.v_assign_emp[(eid, emp_id)] +
-                            self.v_assign_day[(eid, d)] <= 1
-                        )
-
         # H11: Max 1 Core event per employee per day
-        core_events = [e for e in self.events if self._get_event_type(e) == 'Core']
+        core_events = self._events_of_types({'Core'})
         self._add_emp_day_limits(model, core_events, MAX_CORE_EVENTS_PER_DAY)
 
         # H12: Max 6 Core events per employee per week
         self._add_emp_week_limits(model, core_events, MAX_CORE_EVENTS_PER_WEEK)
 
         # H13: Juicer-Core mutual exclusion (same day, same employee)
-        juicer_prod_events = [e for e in self.events
-                              if self._get_event_type(e) in ('Juicer Production', 'Juicer')]
+        juicer_prod_events = self._events_of_types({'Juicer Production', 'Juicer'})
         self._add_mutual_exclusion_per_day(model, juicer_prod_events, core_events)
 
         # H22: Max 1 Juicer event per employee per day
-        juicer_all_events = [e for e in self.events
-                             if self._get_event_type(e) in JUICER_EVENT_TYPES]
+        juicer_all_events = self._events_of_types(JUICER_EVENT_TYPES)
         self._add_emp_day_limits(
             model, juicer_all_events, 1,
             existing_counts=self.existing_juicer_count_by_emp_day,
@@ -835,8 +858,7 @@ class CPSATSchedulingEngine:
         self._add_weekly_hours_cap(model)
 
         # H14: Juicer Deep Clean and Production can't be on same calendar day
-        deep_clean_events = [e for e in self.events
-                             if self._get_event_type(e) == 'Juicer Deep Clean']
+        deep_clean_events = self._events_of_types({'Juicer Deep Clean'})
         self._add_day_exclusion(model, deep_clean_events, juicer_prod_events)
 
         # H16: Core-Supervisor pairing (same day)
@@ -864,43 +886,16 @@ class CPSATSchedulingEngine:
 
         Accounts for already-posted schedules so that if an employee already
         has `existing` events on a day, the solver can only assign
-        `limit - existing` more (possibly zero).
+        `limit - existing` more (triples with nothing left were pruned in
+        _compute_domains).
         """
         if existing_counts is None:
             existing_counts = self.existing_core_count_by_emp_day
-        for emp_id in self.employee_ids:
-            for d in self.valid_days:
-                existing = existing_counts.get((emp_id, d), 0)
-                effective_limit = limit - existing
-
-                indicators = []
-                for event in typed_events:
-                    eid = event.id
-                    if (eid, emp_id) not in self.v_assign_emp:
-                        continue
-                    if (eid, d) not in self.v_assign_day:
-                        continue
-                    # Create indicator: event assigned to emp on day d
-                    ind = model.NewBoolVar(f'ind_{eid}_{emp_id}_{d}')
-                    model.AddBoolAnd([
-                        self.v_assign_emp[(eid, emp_id)],
-                        self.v_assign_day[(eid, d)]
-                    ]).OnlyEnforceIf(ind)
-                    model.AddBoolOr([
-                        self.v_assign_emp[(eid, emp_id)].Not(),
-                        self.v_assign_day[(eid, d)].Not()
-                    ]).OnlyEnforceIf(ind.Not())
-                    indicators.append(ind)
-
-                if not indicators:
-                    continue
-
-                if effective_limit <= 0:
-                    # Employee already at/over limit — forbid all new assignments
-                    for ind in indicators:
-                        model.Add(ind == 0)
-                else:
-                    model.Add(sum(indicators) <= effective_limit)
+        where = self.domains.of_events(e.id for e in typed_events)
+        for (emp_id, d), positions in self.domains.groups(('employee', 'day'), where):
+            effective_limit = limit - existing_counts.get((emp_id, d), 0)
+            if len(positions) > effective_limit:
+                model.Add(self._sum_triples(positions) <= max(effective_limit, 0))
 
     def _add_emp_week_limits(self, model, typed_events, limit, existing_counts=None):
         """Limit events of a type per employee per week.
@@ -911,38 +906,11 @@ class CPSATSchedulingEngine:
         """
         if existing_counts is None:
             existing_counts = self.existing_core_count_by_emp_week
-        for emp_id in self.employee_ids:
-            for w_idx, week_days in self.weeks.items():
-                existing = existing_counts.get((emp_id, w_idx), 0)
-                effective_limit = limit - existing
-
-                indicators = []
-                for event in typed_events:
-                    eid = event.id
-                    if (eid, emp_id) not in self.v_assign_emp:
-                        continue
-                    for d in week_days:
-                        if (eid, d) not in self.v_assign_day:
-                            continue
-                        ind = model.NewBoolVar(f'wk_{eid}_{emp_id}_{w_idx}_{d}')
-                        model.AddBoolAnd([
-                            self.v_assign_emp[(eid, emp_id)],
-                            self.v_assign_day[(eid, d)]
-                        ]).OnlyEnforceIf(ind)
-                        model.AddBoolOr([
-                            self.v_assign_emp[(eid, emp_id)].Not(),
-                            self.v_assign_day[(eid, d)].Not()
-                        ]).OnlyEnforceIf(ind.Not())
-                        indicators.append(ind)
-
-                if not indicators:
-                    continue
-
-                if effective_limit <= 0:
-                    for ind in indicators:
-                        model.Add(ind == 0)
-                else:
-                    model.Add(sum(indicators) <= effective_limit)
+        where = self.domains.of_events(e.id for e in typed_events)
+        for (emp_id, w_idx), positions in self.domains.groups(('employee', 'week'), where):
+            effective_limit = limit - existing_counts.get((emp_id, w_idx), 0)
+            if len(positions) > effective_limit:
+                model.Add(self._sum_triples(positions) <= max(effective_limit, 0))
 
     def _add_weekly_hours_cap(self, model):
         """H24: Total estimated work per employee per week <= 40 hours.
@@ -951,97 +919,31 @@ class CPSATSchedulingEngine:
         within a week, including already-posted schedules, and caps at
         MAX_WEEKLY_MINUTES.
         """
-        for emp_id in self.employee_ids:
-            for w_idx, week_days in self.weeks.items():
-                existing_minutes = self.existing_minutes_by_emp_week.get(
-                    (emp_id, w_idx), 0
-                )
-                remaining = MAX_WEEKLY_MINUTES - existing_minutes
-                if remaining <= 0:
-                    # Already at/over cap — forbid all new assignments this week
-                    for event in self.events:
-                        eid = event.id
-                        if (eid, emp_id) not in self.v_assign_emp:
-                            continue
-                        for d in week_days:
-                            if (eid, d) not in self.v_assign_day:
-                                continue
-                            ind = model.NewBoolVar(f'wh_{eid}_{emp_id}_{w_idx}_{d}')
-                            model.AddBoolAnd([
-                                self.v_assign_emp[(eid, emp_id)],
-                                self.v_assign_day[(eid, d)]
-                            ]).OnlyEnforceIf(ind)
-                            model.AddBoolOr([
-                                self.v_assign_emp[(eid, emp_id)].Not(),
-                                self.v_assign_day[(eid, d)].Not()
-                            ]).OnlyEnforceIf(ind.Not())
-                            model.Add(ind == 0)
-                    continue
-
-                # Sum estimated_time × indicator for all events in this week
-                time_terms = []
-                for event in self.events:
-                    eid = event.id
-                    est = event.estimated_time or 60
-                    if (eid, emp_id) not in self.v_assign_emp:
-                        continue
-                    for d in week_days:
-                        if (eid, d) not in self.v_assign_day:
-                            continue
-                        ind = model.NewBoolVar(f'wh_{eid}_{emp_id}_{w_idx}_{d}')
-                        model.AddBoolAnd([
-                            self.v_assign_emp[(eid, emp_id)],
-                            self.v_assign_day[(eid, d)]
-                        ]).OnlyEnforceIf(ind)
-                        model.AddBoolOr([
-                            self.v_assign_emp[(eid, emp_id)].Not(),
-                            self.v_assign_day[(eid, d)].Not()
-                        ]).OnlyEnforceIf(ind.Not())
-                        time_terms.append(ind * est)
-
-                if time_terms:
-                    model.Add(sum(time_terms) <= remaining)
+        minutes = [e.estimated_time or 60 for e in self.events]
+        event_minutes = [minutes[i] for i in self.domains.event.tolist()]
+        for (emp_id, w_idx), positions in self.domains.groups(('employee', 'week')):
+            remaining = MAX_WEEKLY_MINUTES - self.existing_minutes_by_emp_week.get((emp_id, w_idx), 0)
+            positions = positions.tolist()
+            if sum(event_minutes[p] for p in positions) <= remaining:
+                continue
+            model.Add(sum(self.v_triple[p] * event_minutes[p] for p in positions) <= remaining)
 
     def _add_mutual_exclusion_per_day(self, model, type_a_events, type_b_events):
         """H13: Two event types can't share the same employee on the same day."""
-        for emp_id in self.employee_ids:
-            for d in self.valid_days:
-                a_inds = []
-                for event in type_a_events:
-                    eid = event.id
-                    if (eid, emp_id) in self.v_assign_emp and (eid, d) in self.v_assign_day:
-                        ind = model.NewBoolVar(f'mx_a_{eid}_{emp_id}_{d}')
-                        model.AddBoolAnd([
-                            self.v_assign_emp[(eid, emp_id)],
-                            self.v_assign_day[(eid, d)]
-                        ]).OnlyEnforceIf(ind)
-                        model.AddBoolOr([
-                            self.v_assign_emp[(eid, emp_id)].Not(),
-                            self.v_assign_day[(eid, d)].Not()
-                        ]).OnlyEnforceIf(ind.Not())
-                        a_inds.append(ind)
-
-                b_inds = []
-                for event in type_b_events:
-                    eid = event.id
-                    if (eid, emp_id) in self.v_assign_emp and (eid, d) in self.v_assign_day:
-                        ind = model.NewBoolVar(f'mx_b_{eid}_{emp_id}_{d}')
-                        model.AddBoolAnd([
-                            self.v_assign_emp[(eid, emp_id)],
-                            self.v_assign_day[(eid, d)]
-                        ]).OnlyEnforceIf(ind)
-                        model.AddBoolOr([
-                            self.v_assign_emp[(eid, emp_id)].Not(),
-                            self.v_assign_day[(eid, d)].Not()
-                        ]).OnlyEnforceIf(ind.Not())
-                        b_inds.append(ind)
-
-                if a_inds and b_inds:
-                    has_a = model.NewBoolVar(f'has_a_{emp_id}_{d}')
-                    has_b = model.NewBoolVar(f'has_b_{emp_id}_{d}')
-                    model.AddMaxEquality(has_a, a_inds)
-                    model.AddMaxEquality(has_b, b_inds)
-                    model.Add(has_a + has_b <= 1)
+        a_groups = self.domains.group_map(
+            ('employee', 'day'), self.domains.of_events(e.id for e in type_a_events))
+        b_groups = self.domains.group_map(
+            ('employee', 'day'), self.domains.of_events(e.id for e in type_b_events))
+
+        for (emp_id, d), a_positions in a_groups.items():
+            b_positions = b_groups.get((emp_id, d))
+            if not b_positions:
+                continue
+            has_a = model.NewBoolVar(f'has_a_{emp_id}_{d}')
+            has_b = model.NewBoolVar(f'has_b_{emp_id}_{d}')
+            model.AddMaxEquality(has_a, [self.v_triple[p] for p in a_positions])
+            model.AddMaxEquality(has_b, [self.v_triple[p] for p in b_positions])
+            model.Add(has_a + has_b <= 1)
 
     def _add_day_exclusion(self, model, type_a_events, type_b_events):
         """H14: Two event types can't share the same calendar day (global)."""
@@ -1094,126 +996,54 @@ class CPSATSchedulingEngine:
     def _add_support_requires_base(self, model):
         """H18: Support events (Freeosk, Digital, etc.) require a base event
         (Core or Juicer) on the same day for the same employee.
-        Exception: Club Supervisor is exempt."""
-        support_types = {'Freeosk', 'Digitals', 'Digital Setup', 'Digital Refresh',
-                         'Digital Teardown'}
-        base_types = {'Core', 'Juicer', 'Juicer Production'}
+        Exception: Club Supervisor is exempt.
 
-        support_events = [e for e in self.events if self._get_event_type(e) in support_types]
-        base_events = [e for e in self.events if self._get_event_type(e) in base_types]
-
-        if not support_events or not base_events:
+        Support triples with no base triple at all were pruned in
+        _compute_domains; the rest may only be used alongside a base event.
+        """
+        if not self._support_requires_base_applies():
             return
+        club_sups = self.domains.of_employees(
+            emp_id for emp_id, emp in self.employees.items() if emp.job_title == 'Club Supervisor'
+        )
+        support_groups = self.domains.group_map(
+            ('employee', 'day'),
+            self.domains.of_events(e.id for e in self._events_of_types(SUPPORT_EVENT_TYPES)) & ~club_sups,
+        )
+        if not support_groups:
+            return
+        base_groups = self.domains.group_map(
+            ('employee', 'day'),
+            self.domains.of_events(e.id for e in self._events_of_types(SUPPORT_BASE_TYPES)),
+        )
 
-        for emp_id in self.employee_ids:
-            emp = self.employees[emp_id]
-            if emp.job_title == 'Club Supervisor':
-                continue  # Exempt
-
-            for d in self.valid_days:
-                # Indicators for support events assigned to emp on d
-                sup_inds = []
-                for event in support_events:
-                    eid = event.id
-                    if (eid, emp_id) in self.v_assign_emp and (eid, d) in self.v_assign_day:
-                        ind = model.NewBoolVar(f'sup_req_{eid}_{emp_id}_{d}')
-                        model.AddBoolAnd([
-                            self.v_assign_emp[(eid, emp_id)],
-                            self.v_assign_day[(eid, d)]
-                        ]).OnlyEnforceIf(ind)
-                        model.AddBoolOr([
-                            self.v_assign_emp[(eid, emp_id)].Not(),
-                            self.v_assign_day[(eid, d)].Not()
-                        ]).OnlyEnforceIf(ind.Not())
-                        sup_inds.append(ind)
-
-                if not sup_inds:
-                    continue
-
-                # Indicators for base events assigned to emp on d
-                base_inds = []
-                for event in base_events:
-                    eid = event.id
-                    if (eid, emp_id) in self.v_assign_emp and (eid, d) in self.v_assign_day:
-                        ind = model.NewBoolVar(f'base_{eid}_{emp_id}_{d}')
-                        model.AddBoolAnd([
-                            self.v_assign_emp[(eid, emp_id)],
-                            self.v_assign_day[(eid, d)]
-                        ]).OnlyEnforceIf(ind)
-                        model.AddBoolOr([
-                            self.v_assign_emp[(eid, emp_id)].Not(),
-                            self.v_assign_day[(eid, d)].Not()
-                        ]).OnlyEnforceIf(ind.Not())
-                        base_inds.append(ind)
-
-                if not base_inds:
-                    # No base events possible on this day for this employee
-                    # → support events cannot be assigned
-                    for ind in sup_inds:
-                        model.Add(ind == 0)
-                    continue
-
-                # has_support => has_base
-                has_support = model.NewBoolVar(f'has_sup_{emp_id}_{d}')
-                model.AddMaxEquality(has_support, sup_inds)
-                has_base = model.NewBoolVar(f'has_base_{emp_id}_{d}')
-                model.AddMaxEquality(has_base, base_inds)
-                model.AddImplication(has_support, has_base)
+        for key, support_positions in support_groups.items():
+            has_base = self._sum_triples(base_groups.get(key, ()))
+            for p in support_positions:
+                model.Add(self.v_triple[p] <= has_base)
 
     def _add_full_day_exclusivity(self, model):
         """H20: Full-day events (>= 480 min) block Core/Juicer on same day."""
-        full_day_events = [e for e in self.events
-                           if e.estimated_time and e.estimated_time >= FULL_DAY_MINUTES]
-        core_juicer_events = [e for e in self.events
-                              if self._get_event_type(e) in ('Core', 'Juicer', 'Juicer Production')]
-
-        if not full_day_events:
+        full_day_ids = {e.id for e in self.events
+                        if e.estimated_time and e.estimated_time >= FULL_DAY_MINUTES}
+        if not full_day_ids:
             return
+        # Don't block a full-day event against itself
+        core_juicer_ids = {e.id for e in self._events_of_types({'Core', 'Juicer', 'Juicer Production'})
+                           if e.id not in full_day_ids}
 
-        for emp_id in self.employee_ids:
-            for d in self.valid_days:
-                fd_inds = []
-                for event in full_day_events:
-                    eid = event.id
-                    if (eid, emp_id) in self.v_assign_emp and (eid, d) in self.v_assign_day:
-                        ind = model.NewBoolVar(f'fd_{eid}_{emp_id}_{d}')
-                        model.AddBoolAnd([
-                            self.v_assign_emp[(eid, emp_id)],
-                            self.v_assign_day[(eid, d)]
-                        ]).OnlyEnforceIf(ind)
-                        model.AddBoolOr([
-                            self.v_assign_emp[(eid, emp_id)].Not(),
-                            self.v_assign_day[(eid, d)].Not()
-                        ]).OnlyEnforceIf(ind.Not())
-                        fd_inds.append(ind)
-
-                if not fd_inds:
-                    continue
+        fd_groups = self.domains.group_map(('employee', 'day'), self.domains.of_events(full_day_ids))
+        cj_groups = self.domains.group_map(('employee', 'day'), self.domains.of_events(core_juicer_ids))
 
-                has_fd = model.NewBoolVar(f'has_fd_{emp_id}_{d}')
-                model.AddMaxEquality(has_fd, fd_inds)
+        for key, fd_positions in fd_groups.items():
+            has_fd = self._sum_triples(fd_positions)
+            # If has full-day, no OTHER Core/Juicer on same day
+            for p in cj_groups.get(key, ()):
+                model.Add(has_fd + self.v_triple[p] <= 1)
 
-                # If has full-day, no OTHER Core/Juicer on same day
-                fd_event_ids = {e.id for e in full_day_events}
-                for event in core_juicer_events:
-                    eid = event.id
-                    if eid in fd_event_ids:
-                        continue  # Don't block a full-day event against itself
-                    if (eid, emp_id) in self.v_assign_emp and (eid, d) in self.v_assign_day:
-                        cj_ind = model.NewBoolVar(f'cj_{eid}_{emp_id}_{d}')
-                        model.AddBoolAnd([
-                            self.v_assign_emp[(eid, emp_id)],
-                            self.v_assign_day[(eid, d)]
-                        ]).OnlyEnforceIf(cj_ind)
-                        model.AddBoolOr([
-                            self.v_assign_emp[(eid, emp_id)].Not(),
-                            self.v_assign_day[(eid, d)].Not()
-                        ]).OnlyEnforceIf(cj_ind.Not())
-                        model.Add(has_fd + cj_ind <= 1)
-
-                # At most 1 full-day event per employee per day
-                if len(fd_inds) > 1:
-                    model.Add(sum(fd_inds) <= 1)
+            # At most 1 full-day event per employee per day
+            if len(fd_positions) > 1:
+                model.Add(has_fd <= 1)
 
     def _add_block_uniqueness(self, model):
         """H21: Each block on a day can be assigned to at most one Core event."""
@@ -1319,31 +1149,15 @@ class CPSATSchedulingEngine:
                 if (eid, d) not in self.v_assign_day:
                     continue
                 primary, backup = self._get_rotation_employee(d, rot_type)
-                if primary and (eid, primary) in self.v_assign_emp:
-                    # Bonus if rotation employee is assigned AND event is on this day
-                    ind = model.NewBoolVar(f'rot_{eid}_{d}_{primary}')
-                    model.AddBoolAnd([
-                        self.v_assign_emp[(eid, primary)],
-                        self.v_assign_day[(eid, d)]
-                    ]).OnlyEnforceIf(ind)
-                    model.AddBoolOr([
-                        self.v_assign_emp[(eid, primary)].Not(),
-                        self.v_assign_day[(eid, d)].Not()
-                    ]).OnlyEnforceIf(ind.Not())
-                    terms.append(ind * self._get_effective_weight(WEIGHT_ROTATION, 'WEIGHT_ROTATION'))
+                # Bonus if rotation employee is assigned AND event is on this day
+                if primary and (eid, primary, d) in self.v_assign:
+                    terms.append(self.v_assign[(eid, primary, d)] *
+                                 self._get_effective_weight(WEIGHT_ROTATION, 'WEIGHT_ROTATION'))
 
                 # Smaller bonus for backup rotation employee
-                if backup and backup != primary and (eid, backup) in self.v_assign_emp:
-                    ind_bk = model.NewBoolVar(f'rot_bk_{eid}_{d}_{backup}')
-                    model.AddBoolAnd([
-                        self.v_assign_emp[(eid, backup)],
-                        self.v_assign_day[(eid, d)]
-                    ]).OnlyEnforceIf(ind_bk)
-                    model.AddBoolOr([
-                        self.v_assign_emp[(eid, backup)].Not(),
-                        self.v_assign_day[(eid, d)].Not()
-                    ]).OnlyEnforceIf(ind_bk.Not())
-                    terms.append(ind_bk * (self._get_effective_weight(WEIGHT_ROTATION, 'WEIGHT_ROTATION') // 2))
+                if backup and backup != primary and (eid, backup, d) in self.v_assign:
+                    terms.append(self.v_assign[(eid, backup, d)] *
+                                 (self._get_effective_weight(WEIGHT_ROTATION, 'WEIGHT_ROTATION') // 2))
 
         # S5: Club Supervisor misuse penalty (escalating)
         # Tier k costs k × WEIGHT, so 1st misuse = -W, 2nd = -2W, 3rd = -3W, etc.
@@ -1388,19 +1202,14 @@ class CPSATSchedulingEngine:
                 if (eid, d) not in self.v_assign_day:
                     continue
                 primary, _ = self._get_rotation_employee(d, 'primary_lead')
-                if primary and (eid, primary) in self.v_assign_emp:
+                if primary and (eid, primary, d) in self.v_assign:
                     # Bonus if primary lead gets block 1 on this day
+                    assigned = self.v_assign[(eid, primary, d)]
                     ind = model.NewBoolVar(f'lb1_{eid}_{d}')
-                    model.AddBoolAnd([
-                        self.v_assign_emp[(eid, primary)],
-                        self.v_assign_day[(eid, d)],
-                        self.v_assign_block[(eid, 1)]
-                    ]).OnlyEnforceIf(ind)
-                    # Relaxation: if any one is false, ind is 0
+                    model.AddBoolAnd([assigned, self.v_assign_block[(eid, 1)]]).OnlyEnforceIf(ind)
+                    # Relaxation: if either is false, ind is 0
                     model.AddBoolOr([
-                        self.v_assign_emp[(eid, primary)].Not(),
-                        self.v_assign_day[(eid, d)].Not(),
-                        self.v_assign_block[(eid, 1)].Not()
+                        assigned.Not(), self.v_assign_block[(eid, 1)].Not()
                     ]).OnlyEnforceIf(ind.Not())
                     terms.append(ind * WEIGHT_LEAD_BLOCK1)
 
@@ -1419,17 +1228,8 @@ class CPSATSchedulingEngine:
                 if (eid, d) not in self.v_assign_day:
                     continue
                 primary, _ = self._get_rotation_employee(d, 'primary_lead')
-                if primary and (eid, primary) in self.v_assign_emp:
-                    ind = model.NewBoolVar(f'ld_{eid}_{d}_{primary}')
-                    model.AddBoolAnd([
-                        self.v_assign_emp[(eid, primary)],
-                        self.v_assign_day[(eid, d)]
-                    ]).OnlyEnforceIf(ind)
-                    model.AddBoolOr([
-                        self.v_assign_emp[(eid, primary)].Not(),
-                        self.v_assign_day[(eid, d)].Not()
-                    ]).OnlyEnforceIf(ind.Not())
-                    terms.append(ind * WEIGHT_LEAD_DAILY)
+                if primary and (eid, primary, d) in self.v_assign:
+                    terms.append(self.v_assign[(eid, primary, d)] * WEIGHT_LEAD_DAILY)
 
         # S9: Fairness — minimize max-min spread of Core assignments per employee
         core_events = [e for e in self.events if self._get_event_type(e) == 'Core']
@@ -1464,38 +1264,18 @@ class CPSATSchedulingEngine:
         # S10: Weekly Juicer Production limit (soft penalty for > 5)
         # Note: H23 now enforces this as a hard constraint. S10 remains as a
         # secondary signal but the hard constraint prevents actual violations.
-        juicer_prod_events = [e for e in self.events
-                              if self._get_event_type(e) in ('Juicer Production', 'Juicer')]
+        juicer_prod_events = self._events_of_types({'Juicer Production', 'Juicer'})
         if juicer_prod_events:
-            for emp_id in self.employee_ids:
-                for w_idx, week_days in self.weeks.items():
-                    indicators = []
-                    for event in juicer_prod_events:
-                        eid = event.id
-                        if (eid, emp_id) not in self.v_assign_emp:
-                            continue
-                        for d in week_days:
-                            if (eid, d) not in self.v_assign_day:
-                                continue
-                            ind = model.NewBoolVar(f'jp_{eid}_{emp_id}_{w_idx}_{d}')
-                            model.AddBoolAnd([
-                                self.v_assign_emp[(eid, emp_id)],
-                                self.v_assign_day[(eid, d)]
-                            ]).OnlyEnforceIf(ind)
-                            model.AddBoolOr([
-                                self.v_assign_emp[(eid, emp_id)].Not(),
-                                self.v_assign_day[(eid, d)].Not()
-                            ]).OnlyEnforceIf(ind.Not())
-                            indicators.append(ind)
-
-                    if len(indicators) > MAX_JUICER_PRODUCTION_PER_WEEK:
-                        excess = model.NewIntVar(
-                            0, len(indicators), f'jp_excess_{emp_id}_{w_idx}'
-                        )
-                        model.Add(
-                            excess >= sum(indicators) - MAX_JUICER_PRODUCTION_PER_WEEK
-                        )
-                        terms.append(excess * (-self._get_effective_weight(WEIGHT_JUICER_WEEKLY, 'WEIGHT_JUICER_WEEKLY')))
+            where = self.domains.of_events(e.id for e in juicer_prod_events)
+            for (emp_id, w_idx), positions in self.domains.groups(('employee', 'week'), where):
+                if len(positions) > MAX_JUICER_PRODUCTION_PER_WEEK:
+                    excess = model.NewIntVar(
+                        0, len(positions), f'jp_excess_{emp_id}_{w_idx}'
+                    )
+                    model.Add(
+                        excess >= self._sum_triples(positions) - MAX_JUICER_PRODUCTION_PER_WEEK
+                    )
+                    terms.append(excess * (-self._get_effective_weight(WEIGHT_JUICER_WEEKLY, 'WEIGHT_JUICER_WEEKLY')))
 
         # S11: Duplicate product penalty (RULE-020)
         # Penalize scheduling events from the same product/brand on the same day
@@ -1503,31 +1283,10 @@ class CPSATSchedulingEngine:
             if len(group_events) < 2:
                 continue
             for d in self.valid_days:
-                # Collect indicators for "event is scheduled on this day"
-                day_indicators = []
-                for event in group_events:
-                    eid = event.id
-                    if (eid, d) not in self.v_assign_day:
-                        continue
-                    if eid not in self.v_scheduled:
-                        continue
-                    svar = self.v_scheduled[eid]
-                    if isinstance(svar, int) and svar == 0:
-                        continue
-                    # Indicator: event is both scheduled and assigned to this day
-                    ind = model.NewBoolVar(f'dp_{eid}_{d}')
-                    if isinstance(svar, int):
-                        # Constant 1 — always scheduled
-                        model.Add(self.v_assign_day[(eid, d)] == 1).OnlyEnforceIf(ind)
-                        model.Add(self.v_assign_day[(eid, d)] == 0).OnlyEnforceIf(ind.Not())
-                    else:
-                        model.AddBoolAnd([
-                            svar, self.v_assign_day[(eid, d)]
-                        ]).OnlyEnforceIf(ind)
-                        model.AddBoolOr([
-                            svar.Not(), self.v_assign_day[(eid, d)].Not()
-                        ]).OnlyEnforceIf(ind.Not())
-                    day_indicators.append(ind)
+                # An event assigned to this day is scheduled (H2), so the day
+                # variable is the indicator
+                day_indicators = [self.v_assign_day[(event.id, d)] for event in group_events
+                                  if (event.id, d) in self.v_assign_day]
 
                 if len(day_indicators) >= 2:
                     # Penalty for each event beyond the first on this day
@@ -1578,18 +1337,9 @@ class CPSATSchedulingEngine:
                 continue
 
             eid = matched_event.id
-            if (eid, sd) in self.v_assign_day and (eid, emp_id) in self.v_assign_emp:
+            if (eid, emp_id, sd) in self.v_assign:
                 # Bonus for keeping existing assignment
-                kept = model.NewBoolVar(f'kept_{eid}_{emp_id}_{sd}')
-                model.AddBoolAnd([
-                    self.v_assign_day[(eid, sd)],
-                    self.v_assign_emp[(eid, emp_id)]
-                ]).OnlyEnforceIf(kept)
-                model.AddBoolOr([
-                    self.v_assign_day[(eid, sd)].Not(),
-                    self.v_assign_emp[(eid, emp_id)].Not()
-                ]).OnlyEnforceIf(kept.Not())
-                terms.append(kept * self._get_effective_weight(WEIGHT_BUMP, 'WEIGHT_BUMP'))
+                terms.append(self.v_assign[(eid, emp_id, sd)] * self._get_effective_weight(WEIGHT_BUMP, 'WEIGHT_BUMP'))
 
         # S15: ML affinity bonus — nudge assignments toward ML-predicted matches
         affinity_scores = self._get_ml_affinity_scores()
@@ -1610,16 +1360,123 @@ class CPSATSchedulingEngine:
     # Solver execution
     # ------------------------------------------------------------------
 
-    def _solve(self, model, time_limit_seconds=60):
-        """Run the CP-SAT solver and return status."""
+    def _solve(self, model, time_limit_seconds=60, run=None):
+        """Run the CP-SAT solver and return status.
+
+        Search parameters come from the tuned solver profile
+        (scripts/tune_cpsat.py); the time limit is always the caller's.
+        With a run and CPSAT_STREAM_SOLUTIONS on, solves in anytime mode
+        (see _solve_streaming).
+        """
+        from app.services.cpsat_tuning import DEFAULT_PARAMETERS, apply_parameters, load_solver_profile
+
         solver = cp_model.CpSolver()
+        self.solver_parameters = load_solver_profile(self.models.get('SystemSetting'))
+        try:
+            apply_parameters(solver, self.solver_parameters)
+        except ValueError as e:
+            logger.warning(f"{e}; using default solver parameters")
+            solver = cp_model.CpSolver()
+            self.solver_parameters = dict(DEFAULT_PARAMETERS)
+            apply_parameters(solver, self.solver_parameters)
         solver.parameters.max_time_in_seconds = time_limit_seconds
-        solver.parameters.num_workers = 4
         solver.parameters.log_search_progress = False
 
+        if run is not None and self.stream_solutions:
+            return solver, self._solve_streaming(solver, model, run)
+
         status = solver.Solve(model)
         return solver, status
 
+    def _solution_variables(self):
+        """Variables _extract_solution reads."""
+        return (list(self.v_scheduled.values()) + list(self.v_assign_day.values()) +
+                list(self.v_assign_emp.values()) + list(self.v_assign_block.values()))
+
+    def _solve_streaming(self, solver, model, run):
+        """Solve in a worker thread, saving improving solutions and stopping early.
+
+        Each new best solution becomes the run's current proposal
+        (PendingSchedule rows, at most every SAVE_INTERVAL_SECONDS). The
+        search stops once the gap reaches stop_gap, nothing better has been
+        found for stall_seconds, or a user asked to stop the run; the solver
+        then returns its best solution as FEASIBLE.
+        """
+        monitor = SolutionMonitor(self._solution_variables(), self.stop_gap, self.stall_seconds)
+        solver.best_bound_callback = monitor.on_bound
+        self.solve_monitor = monitor
+        outcome = {}
+
+        def solve():
+            try:
+                outcome['status'] = solver.Solve(model, monitor)
+            except Exception as e:
+                outcome['error'] = e
+
+        worker = threading.Thread(target=solve, name=f'cpsat-run-{run.id}', daemon=True)
+        worker.start()
+
+        last_saved = None
+        while True:
+            worker.join(POLL_SECONDS)
+            finished = not worker.is_alive()
+
+            if not finished and monitor.stop_reason is None:
+                reason = monitor.check() or (STOP_USER if self._stop_requested(run) else None)
+                if reason:
+                    logger.info(f"CP-SAT Scheduler: Stopping early ({reason}), gap={monitor.gap}")
+                    monitor.stop_reason = reason
+                    solver.StopSearch()
+
+            now = perf_counter()
+            if finished or last_saved is None or now - last_saved >= SAVE_INTERVAL_SECONDS:
+                best = monitor.take_new_best()
+                if best is not None and not finished:
+                    self._save_current_best(best, run)
+                    last_saved = now
+
+            if finished:
+                break
+
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['status']
+
+    def _stop_requested(self, run):
+        """True when the run's status was set to 'stopping' (another request)."""
+        table = self.SchedulerRunHistory.__table__
+        status = self.db.execute(select(table.c.status).where(table.c.id == run.id)).scalar()
+        return status == RUN_STATUS_STOPPING
+
+    def _clear_pending(self, run):
+        """Remove the run's PendingSchedule rows (a superseded proposal)."""
+        self.PendingSchedule.query.filter_by(scheduler_run_id=run.id).delete(synchronize_session=False)
+
+    def _save_current_best(self, solution, run):
+        """Replace the run's proposal with an intermediate solution and commit it."""
+        self._clear_pending(run)
+        scheduled, failed, swaps = self._extract_solution(solution, run)
+        run.total_events_processed = self.total_events_processed
+        run.events_scheduled = scheduled
+        run.events_failed = failed
+        run.events_requiring_swaps = swaps
+        self.db.commit()
+        logger.info(
+            f"CP-SAT Scheduler: Saved solution #{solution.number} "
+            f"(objective={solution.objective:.0f}, gap={solution.gap:.2%}, {scheduled} scheduled)"
+        )
+
+    def _export_snapshot(self, model, run):
+        """Save the model for solver tuning when CPSAT_SNAPSHOT_DIR is set."""
+        from flask import current_app
+        directory = current_app.config.get('CPSAT_SNAPSHOT_DIR') if current_app else None
+        if not directory:
+            return None
+
+        from app.services.cpsat_tuning import export_snapshot
+        name = f"run_{run.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return export_snapshot(model, directory, name)
+
     # ------------------------------------------------------------------
     # Solution extraction
     # ------------------------------------------------------------------
@@ -2048,6 +1905,20 @@ class CPSATSchedulingEngine:
         Returns:
             SchedulerRunHistory record with results
         """
+        self.profiler = profiler = RunProfiler()
+        try:
+            profiler.start()
+            return self._run(run_type, time_limit_seconds, profiler)
+        finally:
+            # Detach the profiler (and tracemalloc) even if the run failed early
+            profiler.stop()
+
+    def _run(self, run_type, time_limit_seconds, profiler):
+        """Create the run record, then load, build, solve and extract (see run_auto_scheduler)"""
+        # Fail runs whose process died mid-solve so their proposals stop
+        # holding employees' days
+        self.SchedulerRunHistory.fail_stale_runs()
+
         # Create run history record
         run = self.SchedulerRunHistory(
             run_type=run_type,
@@ -2055,16 +1926,19 @@ class CPSATSchedulingEngine:
             solver_type='cpsat',
         )
         self.db.add(run)
-        self.db.flush()
+        # Committed so the run can be watched and stopped while it solves
+        self.db.commit()
 
         try:
             logger.info("CP-SAT Scheduler: Loading data...")
-            self._load_data()
+            with profiler.phase('load'):
+                self._load_data()
 
             total_events = len(self.events)
             # Count paired events that will also be scheduled
             paired_sup = len(self.core_sup_pairs)
             paired_survey = len(self.juicer_prod_survey_pairs)
+            self.total_events_processed = total_events + paired_sup + paired_survey
 
             logger.info(
                 f"CP-SAT Scheduler: {total_events} events to schedule, "
@@ -2081,14 +1955,28 @@ class CPSATSchedulingEngine:
                 run.events_scheduled = 0
                 run.events_failed = 0
                 run.events_requiring_swaps = 0
+                profiler.save(run)
                 self.db.commit()
                 return run
 
             logger.info("CP-SAT Scheduler: Building model...")
-            model = self._build_model()
+            with profiler.phase('build') as build:
+                model = self._build_model()
+                build['triples'] = len(self.domains)
+                build['pruned'] = dict(self.domains.pruned)
+            self._export_snapshot(model, run)
+            logger.info(
+                f"CP-SAT Scheduler: {len(self.domains)} feasible assignments "
+                f"(pruned: {self.domains.pruned})"
+            )
 
             logger.info(f"CP-SAT Scheduler: Solving (time limit: {time_limit_seconds}s)...")
-            solver, status = self._solve(model, time_limit_seconds)
+            with profiler.phase('solve'):
+                solver, status = self._solve(model, time_limit_seconds, run=run)
+            solver_stats = profiler.record_solver(solver, status, model)
+            solver_stats['parameters'] = self.solver_parameters
+            if self.solve_monitor is not None:
+                solver_stats.update(self.solve_monitor.summary())
 
             if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
                 quality = "optimal" if status == cp_model.OPTIMAL else "feasible"
@@ -2097,13 +1985,16 @@ class CPSATSchedulingEngine:
                     f"objective={solver.ObjectiveValue():.0f}"
                 )
 
-                scheduled, failed, swaps = self._extract_solution(solver, run)
+                with profiler.phase('extract'):
+                    # Replace any intermediate proposal saved while solving
+                    self._clear_pending(run)
+                    scheduled, failed, swaps = self._extract_solution(solver, run)
 
-                # Post-solve explainability logging
-                self._log_solution_explanations(solver)
+                    # Post-solve explainability logging
+                    self._log_solution_explanations(solver)
 
-                # Post-solve validation: catch any remaining double-bookings
-                removed = self._post_solve_review(run)
+                    # Post-solve validation: catch any remaining double-bookings
+                    removed = self._post_solve_review(run)
                 if removed > 0:
                     scheduled -= removed
                     failed += removed
@@ -2111,16 +2002,18 @@ class CPSATSchedulingEngine:
 
                 run.status = 'completed'
                 run.completed_at = datetime.utcnow()
-                run.total_events_processed = total_events + paired_sup + paired_survey
+                run.total_events_processed = self.total_events_processed
                 run.events_scheduled = scheduled
                 run.events_failed = failed
                 run.events_requiring_swaps = swaps
+                profiler.save(run)
                 self.db.commit()
 
                 logger.info(
                     f"CP-SAT Scheduler: Done. Scheduled={scheduled}, "
                     f"Failed={failed}, Swaps={swaps}"
                 )
+                profiler.log_summary('CP-SAT scheduler')
 
             elif status == cp_model.INFEASIBLE:
                 logger.warning("CP-SAT Scheduler: Model is infeasible — no valid solution exists")
@@ -2131,17 +2024,22 @@ class CPSATSchedulingEngine:
                 run.events_scheduled = 0
                 run.events_failed = total_events
                 run.events_requiring_swaps = 0
+                profiler.save(run)
                 self.db.commit()
 
             else:
                 logger.warning(f"CP-SAT Scheduler: Solver returned status {status}")
                 run.status = 'failed'
                 run.completed_at = datetime.utcnow()
-                run.error_message = f'CP-SAT solver did not find a solution (status: {status})'
+                if self.solve_monitor is not None and self.solve_monitor.stop_reason == STOP_USER:
+                    run.error_message = 'Run stopped before the solver found a solution'
+                else:
+                    run.error_message = f'CP-SAT solver did not find a solution (status: {status})'
                 run.total_events_processed = total_events
                 run.events_scheduled = 0
                 run.events_failed = total_events
                 run.events_requiring_swaps = 0
+                profiler.save(run)
                 self.db.commit()
 
         except Exception as e:
@@ -2153,6 +2051,7 @@ class CPSATSchedulingEngine:
             run.events_scheduled = 0
             run.events_failed = 0
             run.events_requiring_swaps = 0
+            profiler.save(run)
             self.db.commit()
             raise
 
@@ -0,0 +1,143 @@
+"""
+CP-SAT Anytime Solving
+======================
+
+Lets a CP-SAT run finish as soon as its answer is good enough instead of
+always running to the time limit.
+
+SolutionMonitor is the solution callback: it captures the values of the
+variables the scheduler extracts for every improving solution and tracks the
+objective bound. The scheduler polls it while the solver runs in a worker
+thread, saves each new best solution as the run's current proposal, and
+stops the search when
+
+- the relative gap between the best objective and the bound is at or below
+  CPSAT_STOP_GAP,
+- no better solution has appeared for CPSAT_STALL_SECONDS, or
+- a user asked to stop the run (the run's status becomes 'stopping'),
+
+keeping the best solution found so far.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from ortools.sat.python import cp_model
+
+DEFAULT_STOP_GAP = 0.01          # Stop within 1% of the objective bound
+DEFAULT_STALL_SECONDS = 10       # Stop after this long without improvement
+POLL_SECONDS = 0.25              # How often the scheduler checks the monitor
+SAVE_INTERVAL_SECONDS = 2.0      # Minimum time between saving intermediate solutions
+
+STOP_GAP = 'gap'
+STOP_STALL = 'stall'
+STOP_USER = 'user'
+
+
+def relative_gap(objective: float, bound: float) -> float:
+    """|bound - objective| relative to the objective (same as the run profile)"""
+    return abs(bound - objective) / max(1.0, abs(objective))
+
+
+class SolutionValues:
+    """Variable values of one solution, read like a solver: values.Value(var)"""
+
+    def __init__(self, values: Dict[int, int], objective: float, bound: float, seconds: float, number: int):
+        self.values = values
+        self.objective = objective
+        self.bound = bound
+        self.seconds = seconds
+        self.number = number
+
+    def Value(self, var) -> int:
+        return self.values[var.Index()]
+
+    @property
+    def gap(self) -> float:
+        return relative_gap(self.objective, self.bound)
+
+
+class SolutionMonitor(cp_model.CpSolverSolutionCallback):
+    """Captures improving solutions and decides when the search may stop"""
+
+    def __init__(self, variables: Iterable, stop_gap: Optional[float] = DEFAULT_STOP_GAP,
+                 stall_seconds: Optional[float] = DEFAULT_STALL_SECONDS):
+        """
+        Args:
+            variables: Variables whose values each captured solution keeps
+            stop_gap: Stop at or below this relative gap (None/0 disables)
+            stall_seconds: Stop after this long without a better solution
+                           (None/0 disables)
+        """
+        super().__init__()
+        self.variables = list(variables)
+        self.stop_gap = stop_gap or None
+        self.stall_seconds = stall_seconds or None
+        self.started = time.perf_counter()
+        self.last_improvement = self.started
+        self.best: Optional[SolutionValues] = None
+        self.bound: Optional[float] = None
+        self.solutions = 0
+        self.first_seconds: Optional[float] = None
+        self.stop_reason: Optional[str] = None
+        self._taken = 0
+        self._lock = threading.Lock()
+
+    def on_solution_callback(self):
+        values = {var.Index(): self.Value(var) for var in self.variables}
+        now = time.perf_counter()
+        objective = self.ObjectiveValue()
+        bound = self.BestObjectiveBound()
+        with self._lock:
+            self.solutions += 1
+            self.bound = bound
+            self.best = SolutionValues(values, objective, bound, now - self.started, self.solutions)
+            if self.first_seconds is None:
+                self.first_seconds = self.best.seconds
+            self.last_improvement = now
+
+    def on_bound(self, bound: float):
+        """CpSolver.best_bound_callback: the bound tightened"""
+        with self._lock:
+            self.bound = bound
+            if self.best is not None:
+                self.best.bound = bound
+
+    @property
+    def gap(self) -> Optional[float]:
+        best = self.best
+        return best.gap if best is not None else None
+
+    def check(self, now: Optional[float] = None) -> Optional[str]:
+        """Reason to stop now (STOP_GAP / STOP_STALL), or None to keep searching"""
+        with self._lock:
+            best = self.best
+            last_improvement = self.last_improvement
+        if best is None:
+            return None
+        if self.stop_gap is not None and best.gap <= self.stop_gap:
+            return STOP_GAP
+        now = time.perf_counter() if now is None else now
+        if self.stall_seconds is not None and now - last_improvement >= self.stall_seconds:
+            return STOP_STALL
+        return None
+
+    def take_new_best(self) -> Optional[SolutionValues]:
+        """The best solution if it has not been taken yet"""
+        with self._lock:
+            best = self.best
+            if best is None or best.number == self._taken:
+                return None
+            self._taken = best.number
+            return best
+
+    def summary(self) -> Dict:
+        """Figures for the run profile"""
+        best = self.best
+        return {
+            'solutions': self.solutions,
+            'stop_reason': self.stop_reason,
+            'first_solution_seconds': None if self.first_seconds is None else round(self.first_seconds, 4),
+            'best_solution_seconds': None if best is None else round(best.seconds, 4),
+        }
@@ -0,0 +1,270 @@
+"""
+CP-SAT Solver Tuning
+====================
+
+Chooses CP-SAT search parameters for our own instances and hardware.
+
+- Scheduler runs export their model (CpModel.ExportToFile) to
+  CPSAT_SNAPSHOT_DIR when it is set.
+- TuningHarness replays those snapshots across a grid of solver parameters
+  (workers, linearization level, search branching, symmetry, presolve),
+  recording for each combination the time to the first feasible solution
+  and the time to reach within a gap of the best objective any combination
+  found for that snapshot.
+- The winning combination is saved as the solver profile in
+  system_settings; CPSATSchedulingEngine applies it to every solve (the time
+  limit still comes from CPSAT_TIME_LIMIT).
+
+Usage:
+    python scripts/tune_cpsat.py --snapshots instance/cpsat_snapshots --time-limit 20 --save
+"""
+
+import glob
+import itertools
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from ortools.sat.python import cp_model
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SETTING_KEY = 'cpsat_solver_profile'
+
+# Used when no profile has been saved (the engine's historical settings)
+DEFAULT_PARAMETERS = {'num_workers': 4}
+
+DEFAULT_GRID = {
+    'num_workers': [4, 8],
+    'linearization_level': [0, 1, 2],
+    'search_branching': ['AUTOMATIC_SEARCH', 'PORTFOLIO_SEARCH', 'FIXED_SEARCH'],
+    'symmetry_level': [0, 2],
+    'max_presolve_iterations': [1, 3],
+}
+
+SNAPSHOT_PATTERNS = ('*.pb', '*.pbtxt', '*.txt')
+
+
+# ----------------------------------------------------------------------
+# Parameters
+# ----------------------------------------------------------------------
+
+def _text_value(value) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def parameters_text(parameters: Dict) -> str:
+    """SatParameters text format for a {field: value} dict (enums by name)"""
+    return ' '.join(f'{name}: {_text_value(value)}' for name, value in parameters.items())
+
+
+def apply_parameters(solver: cp_model.CpSolver, parameters: Dict) -> None:
+    """
+    Set SatParameters fields on a solver
+
+    Raises:
+        ValueError: Unknown field or invalid value
+    """
+    if parameters and not solver.parameters.merge_text_format(parameters_text(parameters)):
+        raise ValueError(f"Invalid CP-SAT parameters: {parameters}")
+
+
+def expand_grid(grid: Dict[str, List]) -> List[Dict]:
+    """Every combination of the grid's values, as parameter dicts"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def load_solver_profile(SystemSetting=None) -> Dict:
+    """
+    Solver parameters for scheduler runs: the saved profile, or the defaults
+
+    Args:
+        SystemSetting: SystemSetting model (None -> defaults)
+    """
+    if SystemSetting is None:
+        return dict(DEFAULT_PARAMETERS)
+    try:
+        stored = SystemSetting.get_setting(PROFILE_SETTING_KEY)
+        if not stored:
+            return dict(DEFAULT_PARAMETERS)
+        profile = json.loads(stored)
+        parameters = profile.get('parameters') if isinstance(profile, dict) else None
+        if not isinstance(parameters, dict):
+            raise ValueError('profile has no parameters')
+        apply_parameters(cp_model.CpSolver(), parameters)
+        return parameters
+    except Exception as e:
+        logger.warning(f"Ignoring saved CP-SAT solver profile: {e}")
+        return dict(DEFAULT_PARAMETERS)
+
+
+def save_solver_profile(SystemSetting, parameters: Dict, summary: Optional[Dict] = None,
+                        user: str = 'solver_tuning') -> None:
+    """Store the parameters the engine should use, with the tuning summary"""
+    apply_parameters(cp_model.CpSolver(), parameters)
+    profile = {'parameters': parameters, 'summary': summary or {}}
+    SystemSetting.set_setting(
+        PROFILE_SETTING_KEY, json.dumps(profile), user=user,
+        description='CP-SAT search parameters chosen by scripts/tune_cpsat.py',
+    )
+
+
+# ----------------------------------------------------------------------
+# Snapshots
+# ----------------------------------------------------------------------
+
+def export_snapshot(model: cp_model.CpModel, directory: str, name: str) -> Optional[str]:
+    """Write a model to <directory>/<name>.pb; returns the path (None on failure)"""
+    try:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{name}.pb')
+        if model.ExportToFile(path):
+            return path
+        logger.warning(f"CP-SAT could not export the model to {path}")
+    except OSError as e:
+        logger.warning(f"Could not write CP-SAT snapshot to {directory}: {e}")
+    return None
+
+
+def load_snapshot(path: str) -> cp_model.CpModel:
+    """Read a model written by CpModel.ExportToFile (binary or text format)"""
+    if path.endswith(('.pbtxt', '.txt')):
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+    else:
+        from google.protobuf import text_format
+        from ortools.sat import cp_model_pb2
+
+        proto = cp_model_pb2.CpModelProto()
+        with open(path, 'rb') as f:
+            proto.ParseFromString(f.read())
+        text = text_format.MessageToString(proto)
+
+    model = cp_model.CpModel()
+    if not model.Proto().parse_text_format(text):
+        raise ValueError(f"{path} is not a CP-SAT model")
+    return model
+
+
+def find_snapshots(directory: str, limit: Optional[int] = None) -> List[str]:
+    """Snapshot files in a directory, newest first"""
+    paths = {path for pattern in SNAPSHOT_PATTERNS for path in glob.glob(os.path.join(directory, pattern))}
+    paths = sorted(paths, key=os.path.getmtime, reverse=True)
+    return paths[:limit] if limit else paths
+
+
+# ----------------------------------------------------------------------
+# Harness
+# ----------------------------------------------------------------------
+
+class _SolutionTimer(cp_model.CpSolverSolutionCallback):
+    """Records (seconds, objective) for every improving solution"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = time.perf_counter()
+        self.solutions = []
+
+    def on_solution_callback(self):
+        self.solutions.append((time.perf_counter() - self.started, self.ObjectiveValue()))
+
+
+class TuningHarness:
+    """Replays model snapshots across a grid of solver parameters"""
+
+    def __init__(self, snapshots: Iterable[str], grid: Optional[Dict[str, List]] = None,
+                 time_limit: float = 20.0, gap: float = 0.01):
+        """
+        Args:
+            snapshots: Paths of exported models
+            grid: Parameter name -> values to try (default DEFAULT_GRID)
+            time_limit: Seconds per solve
+            gap: Relative distance from the best objective that counts as
+                 "near best" (0.01 = within 1%)
+        """
+        self.snapshots = list(snapshots)
+        self.candidates = expand_grid(grid or DEFAULT_GRID)
+        self.time_limit = time_limit
+        self.gap = gap
+
+    def _solve(self, model: cp_model.CpModel, parameters: Dict) -> Dict:
+        solver = cp_model.CpSolver()
+        apply_parameters(solver, parameters)
+        solver.parameters.max_time_in_seconds = self.time_limit
+        solver.parameters.log_search_progress = False
+
+        timer = _SolutionTimer()
+        status = solver.Solve(model, timer)
+        return {
+            'status': solver.StatusName(status),
+            'seconds': round(solver.WallTime(), 4),
+            'solutions': timer.solutions,
+        }
+
+    def _near_best_seconds(self, solutions, best: float, maximize: bool) -> Optional[float]:
+        tolerance = self.gap * max(1.0, abs(best))
+        for seconds, objective in solutions:
+            if (objective >= best - tolerance) if maximize else (objective <= best + tolerance):
+                return seconds
+        return None
+
+    def run(self) -> Dict:
+        """
+        Solve every snapshot with every candidate
+
+        Returns:
+            dict: 'results' (one row per candidate, best first), 'best'
+                  (winning parameters) and 'snapshots'
+        """
+        # Unsolved snapshots/candidates are charged twice the time limit
+        penalty = 2 * self.time_limit
+        rows = [{'parameters': parameters, 'runs': []} for parameters in self.candidates]
+
+        for path in self.snapshots:
+            model = load_snapshot(path)
+            # Objectives are stored minimized; a negative scaling factor means maximize
+            maximize = model.Proto().objective.scaling_factor < 0
+            outcomes = []
+            for parameters in self.candidates:
+                logger.info(f"Tuning {os.path.basename(path)} with {parameters}")
+                outcomes.append(self._solve(model, parameters))
+
+            objectives = [o['solutions'][-1][1] for o in outcomes if o['solutions']]
+            best = (max(objectives) if maximize else min(objectives)) if objectives else None
+
+            for row, outcome in zip(rows, outcomes):
+                solutions = outcome['solutions']
+                first = solutions[0][0] if solutions else None
+                near_best = self._near_best_seconds(solutions, best, maximize) if solutions else None
+                row['runs'].append({
+                    'snapshot': os.path.basename(path),
+                    'status': outcome['status'],
+                    'seconds': outcome['seconds'],
+                    'first_feasible': round(first, 4) if first is not None else None,
+                    'near_best': round(near_best, 4) if near_best is not None else None,
+                    'objective': solutions[-1][1] if solutions else None,
+                    'best_objective': best,
+                })
+
+        for row in rows:
+            runs = row['runs']
+            count = max(1, len(runs))
+            row['mean_first_feasible'] = round(sum(
+                penalty if r['first_feasible'] is None else r['first_feasible'] for r in runs) / count, 4)
+            row['mean_near_best'] = round(sum(
+                penalty if r['near_best'] is None else r['near_best'] for r in runs) / count, 4)
+            row['unsolved'] = sum(1 for r in runs if r['first_feasible'] is None)
+
+        rows.sort(key=lambda r: (r['unsolved'], r['mean_near_best'], r['mean_first_feasible']))
+        return {
+            'snapshots': [os.path.basename(path) for path in self.snapshots],
+            'gap': self.gap,
+            'time_limit': self.time_limit,
+            'results': rows,
+            'best': rows[0]['parameters'] if rows and self.snapshots else None,
+        }
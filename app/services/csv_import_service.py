@@ -0,0 +1,459 @@
+"""
+CSV Import Service
+Bulk import of WorkBankVisits.csv (unscheduled events) and scheduled-event
+CSV exports.
+
+Rows are streamed from the file in chunks. Existing event and employee keys
+are preloaded once, new rows are written with bulk INSERTs and each chunk is
+committed on its own, so large exports neither issue two lookups per row nor
+hold the write lock for the whole file. Rows that fail to parse are reported
+with their line number and skipped instead of aborting the import.
+"""
+import csv
+import logging
+import os
+import secrets
+from datetime import datetime
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import insert, select, update
+
+from app.services.calendar_summary import mark_days
+
+logger = logging.getLogger(__name__)
+
+DATETIME_FORMAT = '%m/%d/%Y %I:%M:%S %p'
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+EVENT_HEADERS = {
+    'Project Name', 'Project Reference Number', 'Location MVID',
+    'Store Number', 'Store Name', 'Start Date/Time', 'Due Date/Time',
+    'Estimated Time', 'Employee ID', 'Rep Name'
+}
+SCHEDULED_HEADERS = EVENT_HEADERS | {'Schedule Date/Time'}
+
+IMPORT_KINDS = ('events', 'scheduled')
+
+
+class CSVImportError(ValueError):
+    """The file cannot be imported at all (e.g. missing headers)"""
+
+
+def _text(row, column) -> str:
+    value = row.get(column)
+    return value.strip() if value else ''
+
+
+def _optional_int(row, column) -> Optional[int]:
+    value = _text(row, column)
+    return int(value) if value else None
+
+
+class CSVImportService:
+    """Chunked bulk importer for event CSV files"""
+
+    def __init__(self, db_session, models, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 progress: Callable[[int], None] = None):
+        """
+        Initialize the service
+
+        Args:
+            db_session: SQLAlchemy database session
+            models: Model registry from get_models()
+            chunk_size: Rows written and committed per chunk
+            progress: Optional callback called with the number of rows processed
+        """
+        self.db = db_session
+        self.models = models
+        self.chunk_size = max(1, chunk_size)
+        self.progress = progress
+        self._reset()
+
+    def _reset(self):
+        self.imported = 0
+        self.skipped = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.error_count = 0
+        self.employees_added = 0
+        self.processed = 0
+        self.event_types: Dict[int, str] = {}
+        self.employee_ids: set = set()
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def import_events(self, stream: IO[str]) -> Dict[str, Any]:
+        """
+        Import unscheduled events (WorkBankVisits.csv)
+
+        Events whose project reference number already exists are skipped.
+        Employees named in the file are created if missing.
+
+        Args:
+            stream: Text stream of the CSV file
+
+        Returns:
+            dict: Import summary (see _result)
+
+        Raises:
+            CSVImportError: If required headers are missing
+        """
+        self._reset()
+        reader = self._reader(stream, EVENT_HEADERS)
+        self._load_keys()
+
+        for chunk in self._chunks(reader):
+            parsed = []
+            for line, row in chunk:
+                try:
+                    parsed.append((line, self._parse_event(row)))
+                except (KeyError, ValueError, TypeError) as e:
+                    self._error(line, e)
+            self._write_chunk(chunk, lambda: self._write_events(parsed))
+
+        return self._result('events')
+
+    def import_scheduled_events(self, stream: IO[str]) -> Dict[str, Any]:
+        """
+        Import already scheduled events
+
+        Missing events and employees are created, existing events are marked
+        scheduled, and a schedule is added unless the event is already
+        assigned to that employee. Core schedules get a shift block and their
+        Supervisor event is auto-scheduled. Rows that add a schedule are
+        counted as imported; rows already assigned (in the database or earlier
+        in the file) or without an Employee ID are counted as skipped.
+
+        Args:
+            stream: Text stream of the CSV file
+
+        Returns:
+            dict: Import summary (see _result)
+
+        Raises:
+            CSVImportError: If required headers are missing
+        """
+        self._reset()
+        reader = self._reader(stream, SCHEDULED_HEADERS)
+        self._load_keys()
+
+        for chunk in self._chunks(reader):
+            parsed = []
+            for line, row in chunk:
+                try:
+                    event = self._parse_event(row)
+                    event['schedule_datetime'] = datetime.strptime(_text(row, 'Schedule Date/Time'), DATETIME_FORMAT)
+                    parsed.append((line, event))
+                except (KeyError, ValueError, TypeError) as e:
+                    self._error(line, e)
+            self._write_chunk(chunk, lambda: self._write_scheduled(parsed))
+
+        return self._result('scheduled events', skip_reason='already scheduled or without an employee')
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def _reader(self, stream: IO[str], required: set) -> csv.DictReader:
+        reader = csv.DictReader(stream)
+        headers = set(reader.fieldnames or [])
+        missing = required - headers
+        if missing:
+            raise CSVImportError(f'Missing required CSV headers: {", ".join(sorted(missing))}')
+        return reader
+
+    def _chunks(self, reader: csv.DictReader) -> Iterator[List[Tuple[int, dict]]]:
+        """Yield lists of (line number, row), chunk_size rows at a time"""
+        chunk = []
+        for row in reader:
+            chunk.append((reader.line_num, row))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _parse_event(self, row: dict) -> Dict[str, Any]:
+        """Event column values for a row (raises on invalid values)"""
+        Event = self.models['Event']
+        event = Event(
+            project_name=_text(row, 'Project Name'),
+            project_ref_num=int(_text(row, 'Project Reference Number')),
+            location_mvid=_text(row, 'Location MVID') or None,
+            store_number=_optional_int(row, 'Store Number'),
+            store_name=_text(row, 'Store Name') or None,
+            start_datetime=datetime.strptime(_text(row, 'Start Date/Time'), DATETIME_FORMAT),
+            due_datetime=datetime.strptime(_text(row, 'Due Date/Time'), DATETIME_FORMAT),
+            estimated_time=_optional_int(row, 'Estimated Time'),
+        )
+        # Same type detection and default duration as events created one by one
+        event.event_type = event.detect_event_type()
+        event.set_default_duration()
+        return {
+            'project_name': event.project_name,
+            'project_ref_num': event.project_ref_num,
+            'location_mvid': event.location_mvid,
+            'store_number': event.store_number,
+            'store_name': event.store_name,
+            'start_datetime': event.start_datetime,
+            'due_datetime': event.due_datetime,
+            'estimated_time': event.estimated_time,
+            'event_type': event.event_type,
+            'employee_id': _text(row, 'Employee ID'),
+            'rep_name': _text(row, 'Rep Name'),
+        }
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def _load_keys(self) -> None:
+        """Preload existing event numbers (with types) and employee IDs"""
+        Event = self.models['Event']
+        Employee = self.models['Employee']
+        self.event_types = dict(self.db.execute(select(Event.project_ref_num, Event.event_type)).all())
+        self.employee_ids = set(self.db.execute(select(Employee.id)).scalars())
+
+    def _write_chunk(self, chunk, write: Callable[[], Tuple[int, int]]) -> None:
+        """Run one chunk's writes and commit; a failure only loses that chunk"""
+        try:
+            imported, skipped = write()
+            self.db.commit()
+            self.imported += imported
+            self.skipped += skipped
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f'CSV import chunk at line {chunk[0][0]} failed: {e}')
+            self._error(chunk[0][0], f'Rows {chunk[0][0]}-{chunk[-1][0]} not imported: {e}')
+            # Keys added to the preloaded sets during this chunk were rolled back
+            self._load_keys()
+        self.processed += len(chunk)
+        if self.progress:
+            self.progress(self.processed)
+
+    def _new_events(self, parsed, is_scheduled) -> Tuple[List[dict], List[Tuple[int, dict]]]:
+        """Split parsed rows into new event rows and rows for known events"""
+        new_rows, known = [], []
+        for line, event in parsed:
+            ref_num = event['project_ref_num']
+            if ref_num in self.event_types:
+                known.append((line, event))
+                continue
+            new_rows.append({
+                key: event[key] for key in (
+                    'project_name', 'project_ref_num', 'location_mvid', 'store_number',
+                    'store_name', 'start_datetime', 'due_datetime', 'estimated_time', 'event_type'
+                )
+            } | {'is_scheduled': is_scheduled})
+            self.event_types[ref_num] = event['event_type']
+        return new_rows, known
+
+    def _add_employees(self, parsed, require_name: bool, defaults: dict = None,
+                       with_availability: bool = False) -> None:
+        """Bulk insert employees referenced by the chunk that do not exist yet"""
+        Employee = self.models['Employee']
+        new_employees = {}
+        for _line, event in parsed:
+            employee_id = event['employee_id']
+            if not employee_id or employee_id in self.employee_ids or employee_id in new_employees:
+                continue
+            if require_name and not event['rep_name']:
+                continue
+            new_employees[employee_id] = {
+                'id': employee_id,
+                'name': event['rep_name'] or f'Employee {employee_id}',
+                **(defaults or {})
+            }
+        if not new_employees:
+            return
+
+        self.db.execute(insert(Employee), list(new_employees.values()))
+        if with_availability:
+            EmployeeWeeklyAvailability = self.models['EmployeeWeeklyAvailability']
+            everyday = {day: True for day in (
+                'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'
+            )}
+            self.db.execute(insert(EmployeeWeeklyAvailability), [
+                {'employee_id': employee_id, **everyday} for employee_id in new_employees
+            ])
+        self.employee_ids.update(new_employees)
+        self.employees_added += len(new_employees)
+
+    def _write_events(self, parsed) -> Tuple[int, int]:
+        Event = self.models['Event']
+        self._add_employees(parsed, require_name=True)
+
+        new_rows, known = self._new_events(parsed, is_scheduled=False)
+        if new_rows:
+            self.db.execute(insert(Event), new_rows)
+            # New events are Unstaffed: refresh the warning days on the calendar
+            mark_days(self.db, [row['due_datetime'].date() for row in new_rows])
+        return len(new_rows), len(known)
+
+    def _write_scheduled(self, parsed) -> Tuple[int, int]:
+        Event = self.models['Event']
+        Schedule = self.models['Schedule']
+
+        self._add_employees(
+            parsed, require_name=False, with_availability=True,
+            defaults={'is_active': True, 'is_supervisor': False,
+                      'job_title': 'Event Specialist', 'adult_beverage_trained': False}
+        )
+
+        new_rows, known = self._new_events(parsed, is_scheduled=True)
+        if new_rows:
+            self.db.execute(insert(Event), new_rows)
+        known_refs = {event['project_ref_num'] for _line, event in known}
+        if known_refs:
+            self.db.execute(
+                update(Event).where(Event.project_ref_num.in_(known_refs)).values(is_scheduled=True),
+                execution_options={'synchronize_session': False}
+            )
+
+        # Existing assignments for this chunk's events in one query
+        ref_nums = {event['project_ref_num'] for _line, event in parsed}
+        assigned = set(self.db.execute(
+            select(Schedule.event_ref_num, Schedule.employee_id).where(Schedule.event_ref_num.in_(ref_nums))
+        ).all()) if ref_nums else set()
+
+        schedule_rows, core_schedules = [], []
+        skipped = 0
+        for _line, event in parsed:
+            employee_id = event['employee_id']
+            key = (event['project_ref_num'], employee_id)
+            if not employee_id or key in assigned:
+                skipped += 1
+                continue
+            assigned.add(key)
+            row = {
+                'event_ref_num': event['project_ref_num'],
+                'employee_id': employee_id,
+                'schedule_datetime': event['schedule_datetime'],
+            }
+            if self.event_types.get(event['project_ref_num']) == 'Core':
+                core_schedules.append(row)
+            else:
+                schedule_rows.append(row)
+
+        if schedule_rows:
+            self.db.execute(insert(Schedule), schedule_rows)
+            mark_days(self.db, [row['schedule_datetime'].date() for row in schedule_rows])
+        for row in core_schedules:
+            self._add_core_schedule(row)
+
+        return len(schedule_rows) + len(core_schedules), skipped
+
+    def _add_core_schedule(self, row: dict) -> None:
+        """Core schedules go through the ORM for shift blocks and Supervisor pairing"""
+        from app.services.shift_block_config import ShiftBlockConfig
+        from app.routes.scheduling import auto_schedule_supervisor_event
+
+        Schedule = self.models['Schedule']
+        schedule = Schedule(**row)
+        self.db.add(schedule)
+        self.db.flush()
+
+        scheduled_date = row['schedule_datetime'].date()
+        try:
+            ShiftBlockConfig.assign_next_available_block(schedule, scheduled_date)
+        except Exception as e:
+            logger.warning(f"Could not assign shift block during import: {e}")
+
+        db = current_app.extensions['sqlalchemy']
+        auto_schedule_supervisor_event(
+            db, self.models['Event'], Schedule, self.models['Employee'],
+            row['event_ref_num'], scheduled_date, row['employee_id']
+        )
+
+    # -------------------------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------------------------
+
+    def _error(self, line: int, error) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': line, 'error': str(error)})
+
+    def _result(self, label: str, skip_reason: str = 'already imported') -> Dict[str, Any]:
+        """
+        Import summary
+
+        Args:
+            label: What was imported, for the message
+            skip_reason: Why rows were skipped, for the message
+
+        Returns:
+            dict: imported_count, skipped_count, error_count, errors
+                  ([{'row': line, 'error': message}], first 100),
+                  employees_added, processed, message
+        """
+        message = f'Successfully imported {self.imported} {label}'
+        if self.skipped:
+            message += f', skipped {self.skipped} {skip_reason}'
+        if self.error_count:
+            message += f', {self.error_count} rows with errors'
+        return {
+            'success': True,
+            'imported_count': self.imported,
+            'skipped_count': self.skipped,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'employees_added': self.employees_added,
+            'processed': self.processed,
+            'message': message,
+        }
+
+
+# =============================================================================
+# Entry points for routes and background jobs
+# =============================================================================
+
+def run_import(kind: str, stream: IO[str], progress: Callable[[int], None] = None) -> Dict[str, Any]:
+    """
+    Run an import with the app's database session
+
+    Args:
+        kind: 'events' (WorkBankVisits.csv) or 'scheduled'
+        stream: Text stream of the CSV file
+        progress: Optional callback called with the number of rows processed
+
+    Returns:
+        dict: Import summary
+    """
+    from app.models import get_models
+
+    if kind not in IMPORT_KINDS:
+        raise ValueError(f'Unknown import kind: {kind}')
+    db = current_app.extensions['sqlalchemy']
+    service = CSVImportService(
+        db.session, get_models(),
+        chunk_size=current_app.config.get('CSV_IMPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE),
+        progress=progress
+    )
+    if kind == 'events':
+        return service.import_events(stream)
+    return service.import_scheduled_events(stream)
+
+
+def save_upload(file) -> str:
+    """Save an uploaded CSV under instance/imports for a background import"""
+    directory = os.path.join(current_app.instance_path, 'imports')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{secrets.token_urlsafe(12)}.csv')
+    file.save(path)
+    return path
+
+
+def import_file(kind: str, path: str, progress: Callable[[int], None] = None) -> Dict[str, Any]:
+    """Import a saved upload, then remove it"""
+    try:
+        with open(path, encoding='utf-8-sig', newline='') as stream:
+            return run_import(kind, stream, progress)
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
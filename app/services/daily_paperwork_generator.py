@@ -1019,10 +1019,42 @@ class DailyPaperworkGenerator:
             logger.error(f" Error fetching salesToolUrl from API: {e}")
             return None
 
+    def _document_fetcher(self):
+        """Shared cached document fetcher (uncached outside an app context)"""
+        from app.services.document_fetcher import DocumentFetcher, get_document_fetcher
+        try:
+            return get_document_fetcher()
+        except RuntimeError:
+            if not hasattr(self, '_fallback_fetcher'):
+                self._fallback_fetcher = DocumentFetcher()
+            return self._fallback_fetcher
+
+    def _download_session(self):
+        """Authenticated session for Crossmark URLs, if available"""
+        if self.session_api_service and hasattr(self.session_api_service, 'session'):
+            return self.session_api_service.session
+        return None
+
+    def prefetch_salestools(self, salestool_urls: List[str]) -> None:
+        """
+        Download SalesTool PDFs in parallel ahead of get_salestool_pdf calls
+
+        Results land in the document cache, so the per-event calls made while
+        assembling the paperwork in order are served from disk.
+        """
+        urls = [url for url in dict.fromkeys(salestool_urls) if url]
+        if not urls:
+            return
+        fetcher = self._document_fetcher()
+        logger.info(f" Prefetching {len(urls)} SalesTool PDFs ({fetcher.max_workers} at a time)...")
+        fetcher.fetch_many(urls, session=self._download_session())
+
     def get_salestool_pdf(self, salestool_url: str, event_ref: str) -> Optional[str]:
         """
         Download SalesTool PDF from URL using authenticated session if available
 
+        Downloads go through the shared document cache (see prefetch_salestools).
+
         Returns:
             Path to downloaded PDF or None if failed
         """
@@ -1030,37 +1062,34 @@ class DailyPaperworkGenerator:
             return None
 
         try:
-            # Use authenticated session if available (for Crossmark URLs)
-            if self.session_api_service and hasattr(self.session_api_service, 'session'):
-                logger.info(f" Downloading SalesTool with authenticated session: {salestool_url}")
-                response = self.session_api_service.session.get(salestool_url, timeout=30)
-            else:
-                logger.info(f" Downloading SalesTool (no auth): {salestool_url}")
-                response = requests.get(salestool_url, timeout=30)
-
-            response.raise_for_status()
+            session = self._download_session()
+            logger.info(f" Downloading SalesTool{' with authenticated session' if session else ' (no auth)'}: {salestool_url}")
+            document = self._document_fetcher().fetch(salestool_url, session=session)
+            if not document.ok:
+                logger.warning(f" Failed to download SalesTool from {salestool_url}: {document.error}")
+                return None
 
             # Check if response is actually a PDF
-            content_type = response.headers.get('Content-Type', '')
+            content_type = document.content_type
             if 'pdf' not in content_type.lower() and 'application/octet-stream' not in content_type.lower():
                 logger.warning(f" URL {salestool_url} did not return PDF (Content-Type: {content_type})")
-                logger.debug(f"Response size: {len(response.content)} bytes")
-                if len(response.content) < 10000:  # Likely an error page
-                    logger.debug(f"Response preview: {response.text[:500]}")
+                logger.debug(f"Response size: {len(document.content)} bytes")
+                if len(document.content) < 10000:  # Likely an error page
+                    logger.debug(f"Response preview: {document.content[:500]!r}")
                 return None
 
             # Verify content is actually PDF by checking magic bytes
-            if len(response.content) > 4:
-                pdf_magic = response.content[:4]
+            if len(document.content) > 4:
+                pdf_magic = document.content[:4]
                 if pdf_magic != b'%PDF':
                     logger.warning(f" Response does not start with PDF magic bytes: {pdf_magic}")
                     return None
 
             output_path = os.path.join(tempfile.gettempdir(), f'salestool_{event_ref}_{datetime.now().strftime("%Y%m%d%H%M%S")}.pdf')
             with open(output_path, 'wb') as f:
-                f.write(response.content)
+                f.write(document.content)
 
-            file_size = len(response.content)
+            file_size = len(document.content)
             logger.info(f" Downloaded SalesTool PDF ({file_size:,} bytes)")
 
             self.temp_files.append(output_path)
@@ -1255,6 +1284,17 @@ class DailyPaperworkGenerator:
         items_pdf = self.generate_item_numbers_pdf(edr_data_list, target_date)
         all_pdfs.append(items_pdf)
 
+        # Download every SalesTool manual used below in parallel before assembling in order
+        salestool_urls = []
+        for schedule, event, employee in schedules:
+            if not getattr(event, 'sales_tools_url', None):
+                continue
+            if (event.event_type == 'Core'
+                    or (target_date.weekday() == 4 and event.event_type == 'Freeosk' and 'LKD-FSK' in (event.project_name or ''))
+                    or (target_date.weekday() == 5 and event.event_type == 'Digitals' and 'Setup' in (event.project_name or ''))):
+                salestool_urls.append(event.sales_tools_url)
+        self.prefetch_salestools(salestool_urls)
+
         # 3b. Add Freeosk Setup manuals (Fridays) or Digital Setup manuals (Saturdays) after items list
         if target_date.weekday() == 4:  # Friday - add Freeosk Setup manuals
             logger.info(" Friday detected - looking for Freeosk Setup (LKD-FSK) manuals...")
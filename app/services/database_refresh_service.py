@@ -21,6 +21,13 @@ class DatabaseRefreshService:
     STEP_FINALIZING = 6
     TOTAL_STEPS = 6
 
+    # API-owned Event fields overwritten by a delta refresh
+    DELTA_FIELDS = (
+        'project_name', 'location_mvid', 'store_name', 'store_number',
+        'start_datetime', 'due_datetime', 'is_scheduled', 'condition',
+        'sales_tools_url', 'last_synced', 'sync_status',
+    )
+
     def __init__(self, progress_callback=None):
         """
         Initialize the service with optional progress callback
@@ -289,24 +296,12 @@ class DatabaseRefreshService:
                 current_app.logger.info(f"Reapplied {overrides_applied} event type overrides")
 
             # Reconcile: mark events with Schedule records as scheduled
-            # The planning API may report condition='Unstaffed' even for events
-            # that have schedules (created via the scheduling API).
+            reconciled = self._reconcile_scheduled_events(Event, Schedule)
+            if reconciled:
+                db.session.commit()
+
             from sqlalchemy import select
             scheduled_event_refs = select(Schedule.event_ref_num).distinct()
-            unstaffed_with_schedule = Event.query.filter(
-                Event.condition == 'Unstaffed',
-                Event.is_scheduled == False,
-                Event.project_ref_num.in_(scheduled_event_refs)
-            ).all()
-
-            if unstaffed_with_schedule:
-                for event in unstaffed_with_schedule:
-                    event.is_scheduled = True
-                    event.condition = 'Scheduled'
-                db.session.commit()
-                current_app.logger.info(
-                    f"Reconciled {len(unstaffed_with_schedule)} events: had schedules but were marked Unstaffed"
-                )
 
             # Check for staffed events without schedules
             staffed_without_schedule = Event.query.filter(
@@ -352,6 +347,7 @@ class DatabaseRefreshService:
                 f"Database refresh completed: Cleared {existing_count}, created {created_count} events, "
                 f"{schedule_count} API schedules, {restored_count} restored local schedules"
             )
+            record_refresh_success(REFRESH_MODE_FULL)
 
             self._update_progress(
                 self.STEP_FINALIZING,
@@ -393,7 +389,198 @@ class DatabaseRefreshService:
                 'message': f'Database refresh failed: {error_msg}'
             }
 
-    def _fetch_estimated_times(self, external_api):
+    def refresh_delta(self, start_date=None, end_date=None):
+        """
+        Refresh only the near-term window, updating events in place
+
+        Unlike refresh(), nothing is cleared: events returned by the API are
+        updated (or created if new), API schedules missing locally are added,
+        and schedules of events that became cancelled/expired are removed.
+        Event types and overrides of existing events are left untouched.
+
+        Args:
+            start_date: Window start (defaults to LOGIN_REFRESH_DELTA_PAST_DAYS ago)
+            end_date: Window end (defaults to LOGIN_REFRESH_DELTA_DAYS ahead)
+
+        Returns:
+            dict: Result with success status, message, and stats
+        """
+        from datetime import timedelta
+
+        try:
+            from app.integrations.external_api.session_api_service import session_api as external_api
+            from app.models import get_models
+
+            db = current_app.extensions['sqlalchemy']
+            models = get_models()
+            Event = models['Event']
+            Schedule = models['Schedule']
+            Employee = models['Employee']
+
+            config = current_app.config
+            today = datetime.combine(datetime.now().date(), datetime.min.time())
+            start_date = start_date or today - timedelta(days=config.get('LOGIN_REFRESH_DELTA_PAST_DAYS', 2))
+            end_date = end_date or today + timedelta(days=config.get('LOGIN_REFRESH_DELTA_DAYS', 14))
+
+            self._update_progress(self.STEP_FETCHING, 'Pulling recent changes', processed=0, total=100)
+
+            def api_progress_callback(percent, status):
+                self._update_progress(self.STEP_FETCHING, 'Pulling recent changes', processed=percent, total=100)
+
+            events_data = external_api.get_all_planning_events_parallel(
+                start_date=start_date, end_date=end_date, progress_callback=api_progress_callback
+            )
+            if not events_data:
+                self._update_progress(
+                    self.STEP_FETCHING,
+                    'Failed to fetch events',
+                    status='error',
+                    error='Failed to fetch events from Crossmark API'
+                )
+                return {'success': False, 'message': 'Failed to fetch events from Crossmark API'}
+
+            records = (events_data.get('mplans') or
+                       events_data.get('events') or
+                       events_data.get('records') or [])
+            total_fetched = len(records)
+
+            self._update_progress(self.STEP_FETCHING_TIMES, 'Fetching event times from scheduling API')
+            estimated_time_map = self._fetch_estimated_times(external_api, start_date, end_date)
+
+            self._update_progress(self.STEP_PROCESSING, 'Updating events', processed=0, total=total_fetched)
+
+            ref_nums = [int(r['mPlanID']) for r in records if str(r.get('mPlanID', '')).isdigit()]
+            existing_events = {
+                event.project_ref_num: event
+                for event in Event.query.filter(Event.project_ref_num.in_(ref_nums)).all()
+            } if ref_nums else {}
+            scheduled_refs = {
+                ref for (ref,) in db.session.query(Schedule.event_ref_num).filter(
+                    Schedule.event_ref_num.in_(ref_nums)
+                ).distinct()
+            } if ref_nums else set()
+
+            created_count = updated_count = schedule_count = unscheduled_count = 0
+
+            for i, event_record in enumerate(records):
+                try:
+                    fresh, schedule_date = self._build_event(event_record, Event, estimated_time_map)
+                    if fresh is None:
+                        continue
+
+                    event = existing_events.get(fresh.project_ref_num)
+                    if event is None:
+                        db.session.add(fresh)
+                        event = fresh
+                        created_count += 1
+                    else:
+                        for field in self.DELTA_FIELDS:
+                            setattr(event, field, getattr(fresh, field))
+                        if fresh.estimated_time is not None:
+                            event.estimated_time = fresh.estimated_time
+                        updated_count += 1
+
+                    if event.condition in INACTIVE_CONDITIONS and event.project_ref_num in scheduled_refs:
+                        Schedule.query.filter_by(event_ref_num=event.project_ref_num).delete()
+                        scheduled_refs.discard(event.project_ref_num)
+                        unscheduled_count += 1
+                    elif (schedule_date and event.is_scheduled
+                          and event.project_ref_num not in scheduled_refs):
+                        if self._create_api_schedule(
+                            event_record, event.project_ref_num, schedule_date, db, Schedule, Employee
+                        ):
+                            scheduled_refs.add(event.project_ref_num)
+                            schedule_count += 1
+
+                except Exception as e:
+                    current_app.logger.error(
+                        f"Error updating event {event_record.get('mPlanID', 'unknown')}: {e}"
+                    )
+                    continue
+
+                if (i + 1) % 10 == 0 or i == len(records) - 1:
+                    self._update_progress(
+                        self.STEP_PROCESSING, 'Updating events', processed=i + 1, total=total_fetched
+                    )
+
+            # The API reports 'Unstaffed' for events scheduled here; keep them scheduled
+            reconciled_count = self._reconcile_scheduled_events(Event, Schedule, ref_nums)
+
+            self._update_progress(self.STEP_FINALIZING, 'Finalizing')
+            db.session.commit()
+
+            if created_count:
+                self._fix_truncated_event_types(db, Event)
+                self._reapply_event_type_overrides(db, Event)
+
+            stats = {
+                'mode': REFRESH_MODE_DELTA,
+                'window': f"{start_date.date()} to {end_date.date()}",
+                'total_fetched': total_fetched,
+                'created': created_count,
+                'updated': updated_count,
+                'schedules': schedule_count,
+                'unscheduled': unscheduled_count,
+                'reconciled': reconciled_count,
+            }
+            current_app.logger.info(f"Delta refresh completed: {stats}")
+            record_refresh_success(REFRESH_MODE_DELTA)
+
+            self._update_progress(
+                self.STEP_FINALIZING,
+                'Complete',
+                processed=total_fetched,
+                total=total_fetched,
+                status='completed',
+                stats=stats
+            )
+            return {'success': True, 'message': 'Recent events refreshed', 'stats': stats}
+
+        except Exception as e:
+            current_app.logger.error(f"Delta refresh failed: {e}", exc_info=True)
+            try:
+                current_app.extensions['sqlalchemy'].session.rollback()
+            except Exception:
+                pass
+            self._update_progress(self.STEP_PROCESSING, 'Error occurred', status='error', error=str(e))
+            return {'success': False, 'message': f'Delta refresh failed: {e}'}
+
+    def _reconcile_scheduled_events(self, Event, Schedule, ref_nums=None):
+        """
+        Mark Unstaffed events that have Schedule records as scheduled
+
+        The planning API may report condition='Unstaffed' even for events
+        that have schedules (created via the scheduling API or approved
+        locally). Does not commit.
+
+        Args:
+            ref_nums: Only reconcile these events (default: all)
+
+        Returns:
+            int: Number of events reconciled
+        """
+        from sqlalchemy import select
+        query = Event.query.filter(
+            Event.condition == 'Unstaffed',
+            Event.is_scheduled == False,
+            Event.project_ref_num.in_(select(Schedule.event_ref_num).distinct())
+        )
+        if ref_nums is not None:
+            if not ref_nums:
+                return 0
+            query = query.filter(Event.project_ref_num.in_(ref_nums))
+
+        unstaffed_with_schedule = query.all()
+        for event in unstaffed_with_schedule:
+            event.is_scheduled = True
+            event.condition = 'Scheduled'
+        if unstaffed_with_schedule:
+            current_app.logger.info(
+                f"Reconciled {len(unstaffed_with_schedule)} events: had schedules but were marked Unstaffed"
+            )
+        return len(unstaffed_with_schedule)
+
+    def _fetch_estimated_times(self, external_api, start_date=None, end_date=None):
         """
         Fetch EstimatedTime values from scheduling endpoints.
         
@@ -401,6 +588,10 @@ class DatabaseRefreshService:
         endpoints do. We fetch both scheduled and non-scheduled visits
         and build a lookup map.
         
+        Args:
+            start_date: Window start (defaults to 30 days ago)
+            end_date: Window end (defaults to 120 days ahead)
+
         Returns:
             dict: Mapping of mPlanID -> EstimatedTime (in minutes)
         """
@@ -409,9 +600,9 @@ class DatabaseRefreshService:
         estimated_time_map = {}
         
         try:
-            # Fetch from scheduled events (4 month window)
-            start_date = datetime.now() - timedelta(days=30)
-            end_date = datetime.now() + timedelta(days=120)
+            # Fetch from scheduled events (4 month window by default)
+            start_date = start_date or datetime.now() - timedelta(days=30)
+            end_date = end_date or datetime.now() + timedelta(days=120)
             
             # Get scheduled events with EstimatedTime
             scheduled = external_api.get_scheduled_events(start_date, end_date)
@@ -456,9 +647,34 @@ class DatabaseRefreshService:
         Returns:
             tuple: (event_created, schedule_created) booleans
         """
+        new_event, schedule_date = self._build_event(event_record, Event, estimated_time_map)
+        if new_event is None:
+            return None, False
+
+        db.session.add(new_event)
+
+        # Create schedule if applicable
+        schedule_created = False
+        if schedule_date and new_event.is_scheduled:
+            schedule_created = self._create_api_schedule(
+                event_record, new_event.project_ref_num, schedule_date, db, Schedule, Employee
+            )
+
+        return new_event, schedule_created
+
+    def _build_event(self, event_record, Event, estimated_time_map=None):
+        """
+        Build an (unsaved) Event from an API record
+
+        Args:
+            estimated_time_map: Dict mapping mPlanID -> EstimatedTime from scheduling API
+
+        Returns:
+            tuple: (Event or None, schedule_date or None)
+        """
         mplan_id = event_record.get('mPlanID')
         if not mplan_id:
-            return None, False
+            return None, None
 
         # Parse dates - API uses multiple field naming conventions
         # Check mPlanStartDate/mPlanDueDate first (raw API), then startDate/endDate (transformed)
@@ -579,27 +795,26 @@ class DatabaseRefreshService:
              new_event.event_type = extracted_type
         else:
              new_event.event_type = new_event.detect_event_type()
-             
-        db.session.add(new_event)
 
-        # Create schedule if applicable
-        schedule_created = False
-        if schedule_date and is_event_scheduled:
-            employee = self._find_employee(event_record, Employee)
-            if employee:
-                scheduled_event_id = event_record.get('scheduleEventID')
-                schedule = Schedule(
-                    event_ref_num=int(mplan_id) if str(mplan_id).isdigit() else 0,
-                    employee_id=employee.id,
-                    schedule_datetime=schedule_date,
-                    external_id=str(scheduled_event_id) if scheduled_event_id else None,
-                    last_synced=datetime.utcnow(),
-                    sync_status='synced'
-                )
-                db.session.add(schedule)
-                schedule_created = True
+        return new_event, schedule_date
 
-        return new_event, schedule_created
+    def _create_api_schedule(self, event_record, event_ref_num, schedule_date, db, Schedule, Employee):
+        """Create the Schedule reported by the API for an event, if the employee is known"""
+        employee = self._find_employee(event_record, Employee)
+        if not employee:
+            return False
+
+        scheduled_event_id = event_record.get('scheduleEventID')
+        schedule = Schedule(
+            event_ref_num=event_ref_num,
+            employee_id=employee.id,
+            schedule_datetime=schedule_date,
+            external_id=str(scheduled_event_id) if scheduled_event_id else None,
+            last_synced=datetime.utcnow(),
+            sync_status='synced'
+        )
+        db.session.add(schedule)
+        return True
 
     def _parse_date(self, date_str, format_str):
         """Parse date string, return None on failure"""
@@ -817,12 +1032,136 @@ class DatabaseRefreshService:
         return None
 
 
-def refresh_database_with_progress(task_id):
+# =============================================================================
+# Refresh freshness & single-flight lock
+# =============================================================================
+
+REFRESH_MODE_FULL = 'full'
+REFRESH_MODE_DELTA = 'delta'
+REFRESH_MODE_SKIP = 'skip'
+
+LAST_REFRESH_SETTING = 'crossmark_last_refresh_at'
+LAST_FULL_REFRESH_SETTING = 'crossmark_last_full_refresh_at'
+
+REFRESH_LOCK_KEY = 'db_refresh_lock'
+
+
+def _get_setting_datetime(key):
+    from app.models import get_models
+    value = get_models()['SystemSetting'].get_setting(key)
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def get_last_refresh_times():
+    """
+    Get the last successful refresh timestamps (UTC)
+
+    Returns:
+        tuple: (last refresh of any kind, last full refresh) - either may be None
+    """
+    try:
+        return _get_setting_datetime(LAST_REFRESH_SETTING), _get_setting_datetime(LAST_FULL_REFRESH_SETTING)
+    except Exception as e:
+        logger.warning(f"Could not read last refresh time: {e}")
+        return None, None
+
+
+def record_refresh_success(mode):
+    """Record a successful refresh (login, manual or the hourly beat task)"""
+    from app.models import get_models
+    try:
+        SystemSetting = get_models()['SystemSetting']
+        now = datetime.utcnow().isoformat()
+        SystemSetting.set_setting(LAST_REFRESH_SETTING, now, description='Last successful Crossmark refresh (UTC)')
+        if mode == REFRESH_MODE_FULL:
+            SystemSetting.set_setting(LAST_FULL_REFRESH_SETTING, now,
+                                      description='Last successful full Crossmark refresh (UTC)')
+    except Exception as e:
+        logger.warning(f"Could not record refresh time: {e}")
+
+
+def plan_login_refresh(now=None):
+    """
+    Decide how much a login refresh needs to pull
+
+    - skip:  any refresh finished within LOGIN_REFRESH_SKIP_MINUTES
+    - delta: a full refresh finished within LOGIN_REFRESH_FULL_MAX_AGE_HOURS
+    - full:  otherwise
+
+    Returns:
+        str: REFRESH_MODE_SKIP, REFRESH_MODE_DELTA or REFRESH_MODE_FULL
+    """
+    from datetime import timedelta
+
+    now = now or datetime.utcnow()
+    config = current_app.config
+    last_any, last_full = get_last_refresh_times()
+
+    if last_any and now - last_any < timedelta(minutes=config.get('LOGIN_REFRESH_SKIP_MINUTES', 15)):
+        return REFRESH_MODE_SKIP
+    if last_full and now - last_full < timedelta(hours=config.get('LOGIN_REFRESH_FULL_MAX_AGE_HOURS', 24)):
+        return REFRESH_MODE_DELTA
+    return REFRESH_MODE_FULL
+
+
+def acquire_refresh_lock(owner):
+    """
+    Take the shared refresh lock
+
+    Args:
+        owner: Task ID (or other identifier) of the refresh taking the lock
+
+    Returns:
+        tuple: (acquired, current_owner). If Redis is unavailable the lock is
+        treated as acquired so refreshes still run.
+    """
+    from app.routes.auth import get_redis_client
+    try:
+        client = get_redis_client()
+        ttl = current_app.config.get('REFRESH_LOCK_TTL', 900)
+        if client.set(REFRESH_LOCK_KEY, owner, nx=True, ex=ttl):
+            return True, owner
+        return False, client.get(REFRESH_LOCK_KEY)
+    except Exception as e:
+        logger.warning(f"Refresh lock unavailable, proceeding without it: {e}")
+        return True, owner
+
+
+def get_refresh_lock_owner():
+    """Get the owner of the in-flight refresh, or None"""
+    from app.routes.auth import get_redis_client
+    try:
+        return get_redis_client().get(REFRESH_LOCK_KEY)
+    except Exception:
+        return None
+
+
+def release_refresh_lock(owner):
+    """Release the refresh lock if it is still held by owner"""
+    from app.routes.auth import get_redis_client
+    try:
+        client = get_redis_client()
+        if client.get(REFRESH_LOCK_KEY) == owner:
+            client.delete(REFRESH_LOCK_KEY)
+    except Exception as e:
+        logger.warning(f"Could not release refresh lock: {e}")
+
+
+def refresh_database_with_progress(task_id, mode=None):
     """
     Convenience function to refresh database with Redis progress tracking
 
+    The refresh runs under the shared refresh lock. With no explicit mode the
+    amount of work is chosen by plan_login_refresh(): a recent refresh is
+    skipped, a recent full refresh gets a near-term delta, otherwise a full
+    refresh runs.
+
     Args:
         task_id: Redis task ID for progress storage
+        mode: Force REFRESH_MODE_FULL / REFRESH_MODE_DELTA / REFRESH_MODE_SKIP
 
     Returns:
         dict: Refresh result
@@ -832,5 +1171,26 @@ def refresh_database_with_progress(task_id):
     def progress_callback(**kwargs):
         update_refresh_progress(task_id, **kwargs)
 
-    service = DatabaseRefreshService(progress_callback=progress_callback)
-    return service.refresh()
+    acquired, owner = acquire_refresh_lock(task_id)
+    if not acquired:
+        update_refresh_progress(task_id, status='running', attached_to=owner,
+                                step_label='Waiting for refresh in progress')
+        return {'success': True, 'message': 'Refresh already in progress', 'attached_to': owner}
+
+    try:
+        mode = mode or plan_login_refresh()
+        service = DatabaseRefreshService(progress_callback=progress_callback)
+
+        if mode == REFRESH_MODE_SKIP:
+            current_app.logger.info("Skipping login refresh: data refreshed recently")
+            service._update_progress(
+                service.STEP_FINALIZING, 'Data is up to date',
+                status='completed', stats={'mode': REFRESH_MODE_SKIP}
+            )
+            return {'success': True, 'message': 'Data is up to date', 'stats': {'mode': REFRESH_MODE_SKIP}}
+
+        if mode == REFRESH_MODE_DELTA:
+            return service.refresh_delta()
+        return service.refresh()
+    finally:
+        release_refresh_lock(task_id)
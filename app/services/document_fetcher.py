@@ -0,0 +1,275 @@
+"""
+Document Fetcher
+Concurrent, cached downloads of instruction / SalesTool PDFs.
+
+Printing instruction manuals and daily paperwork used to download every PDF
+one after another with a fresh connection each time. DocumentFetcher shares a
+pooled requests session, downloads up to DOCUMENT_FETCH_WORKERS documents in
+parallel, and keeps an on-disk cache of PDF responses keyed by URL. Cached
+documents younger than DOCUMENT_CACHE_MAX_AGE are served directly; older ones
+are revalidated with If-None-Match / If-Modified-Since so an unchanged manual
+costs a 304 instead of a full download.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_AGE = 3600           # Serve cached copies without revalidating for an hour
+DEFAULT_CACHE_TTL = 7 * 86400    # Remove cache entries unused for a week
+
+
+@dataclass
+class FetchedDocument:
+    """Result of fetching one URL"""
+    url: str
+    content: Optional[bytes] = None
+    content_type: str = ''
+    from_cache: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.content is not None
+
+    @property
+    def is_pdf(self) -> bool:
+        return self.ok and self.content[:4] == b'%PDF'
+
+
+class DocumentFetcher:
+    """Pooled, bounded-concurrency downloader with an on-disk cache"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_workers: int = DEFAULT_WORKERS,
+                 timeout: int = DEFAULT_TIMEOUT, max_age: int = DEFAULT_MAX_AGE,
+                 cache_ttl: int = DEFAULT_CACHE_TTL):
+        """
+        Initialize the fetcher
+
+        Args:
+            cache_dir: Directory for cached documents (None disables caching)
+            max_workers: Maximum parallel downloads
+            timeout: Per-request timeout in seconds
+            max_age: Seconds a cached document is served without revalidation
+            cache_ttl: Seconds after which unused cache entries are removed
+        """
+        self.cache_dir = cache_dir
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.max_age = max_age
+        self.cache_ttl = cache_ttl
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='docfetch')
+        self._url_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.prune_cache()
+
+    # -------------------------------------------------------------------------
+    # Fetching
+    # -------------------------------------------------------------------------
+
+    def fetch(self, url: str, session: Optional[requests.Session] = None) -> FetchedDocument:
+        """
+        Fetch one URL through the cache
+
+        Args:
+            url: Document URL
+            session: Session to use instead of the pooled one (e.g. an
+                     authenticated Crossmark session)
+
+        Returns:
+            FetchedDocument: content is None and error is set on failure
+        """
+        # One download per URL at a time; concurrent callers share the result
+        with self._lock_for(url):
+            cached = self._read_cache(url)
+            if cached and time.time() - cached[1].get('fetched_at', 0) < self.max_age:
+                return FetchedDocument(url, cached[0], cached[1].get('content_type', ''), from_cache=True)
+
+            headers = {}
+            if cached:
+                if cached[1].get('etag'):
+                    headers['If-None-Match'] = cached[1]['etag']
+                if cached[1].get('last_modified'):
+                    headers['If-Modified-Since'] = cached[1]['last_modified']
+
+            try:
+                response = (session or self.session).get(url, headers=headers, timeout=self.timeout)
+                if response.status_code == 304 and cached:
+                    meta = dict(cached[1], fetched_at=time.time())
+                    self._write_meta(url, meta)
+                    os.utime(self._paths(url)[0])
+                    return FetchedDocument(url, cached[0], meta.get('content_type', ''), from_cache=True)
+                response.raise_for_status()
+            except Exception as e:
+                logger.warning(f"Failed to fetch {url}: {e}")
+                return FetchedDocument(url, error=str(e))
+
+            content_type = response.headers.get('Content-Type', '')
+            if response.content[:4] != b'%PDF':
+                # Login/error pages are returned to the caller but never cached
+                return FetchedDocument(url, response.content, content_type)
+            self._write_cache(url, response.content, {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'content_type': content_type,
+                'fetched_at': time.time(),
+            })
+            return FetchedDocument(url, response.content, content_type)
+
+    def iter_fetch(self, urls: Iterable[str],
+                   session: Optional[requests.Session] = None) -> Iterator[FetchedDocument]:
+        """
+        Fetch URLs in parallel, yielding results in input order
+
+        Each result is yielded as soon as it (and everything before it) is
+        ready, so callers can merge incrementally while later downloads run.
+        """
+        futures = [self._executor.submit(self.fetch, url, session) for url in urls]
+        for future in futures:
+            yield future.result()
+
+    def fetch_many(self, urls: Iterable[str],
+                   session: Optional[requests.Session] = None) -> Dict[str, FetchedDocument]:
+        """Fetch distinct URLs in parallel; returns {url: FetchedDocument}"""
+        unique = list(dict.fromkeys(url for url in urls if url))
+        return {doc.url: doc for doc in self.iter_fetch(unique, session)}
+
+    # -------------------------------------------------------------------------
+    # Cache
+    # -------------------------------------------------------------------------
+
+    def _lock_for(self, url: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'{key}.bin'), os.path.join(self.cache_dir, f'{key}.json')
+
+    def _read_cache(self, url: str) -> Optional[Tuple[bytes, dict]]:
+        if not self.cache_dir:
+            return None
+        content_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta.get('url') != url:
+                return None
+            with open(content_path, 'rb') as f:
+                return f.read(), meta
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, url: str, meta: dict) -> None:
+        _content_path, meta_path = self._paths(url)
+        tmp_path = f'{meta_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _write_cache(self, url: str, content: bytes, meta: dict) -> None:
+        if not self.cache_dir:
+            return
+        content_path, _meta_path = self._paths(url)
+        try:
+            tmp_path = f'{content_path}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, content_path)
+            self._write_meta(url, meta)
+        except OSError as e:
+            logger.warning(f"Could not cache {url}: {e}")
+
+    def prune_cache(self) -> int:
+        """Remove cache files not refreshed within cache_ttl; returns the count"""
+        if not self.cache_dir:
+            return 0
+        cutoff = time.time() - self.cache_ttl
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.unlink(path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+_fetcher: Optional[DocumentFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_document_fetcher() -> DocumentFetcher:
+    """Shared fetcher configured from the app config (cache under instance/)"""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            from flask import current_app
+            config = current_app.config
+            _fetcher = DocumentFetcher(
+                cache_dir=os.path.join(current_app.instance_path, 'document_cache'),
+                max_workers=config.get('DOCUMENT_FETCH_WORKERS', DEFAULT_WORKERS),
+                timeout=config.get('DOCUMENT_FETCH_TIMEOUT', DEFAULT_TIMEOUT),
+                max_age=config.get('DOCUMENT_CACHE_MAX_AGE', DEFAULT_MAX_AGE),
+            )
+        return _fetcher
+
+
+def merge_pdf_documents(documents: Iterable[FetchedDocument], writer=None,
+                        labels: Optional[List[str]] = None):
+    """
+    Append the pages of fetched PDFs to a PdfWriter as they arrive
+
+    Args:
+        documents: FetchedDocuments (e.g. from iter_fetch), in merge order
+        writer: PdfWriter to append to (a new one by default)
+        labels: Optional display names for logging, parallel to documents
+
+    Returns:
+        tuple: (writer, pages added, list of URLs that failed)
+    """
+    from io import BytesIO
+    from PyPDF2 import PdfReader, PdfWriter
+
+    writer = writer or PdfWriter()
+    pages = 0
+    failed = []
+    for idx, doc in enumerate(documents):
+        label = labels[idx] if labels and idx < len(labels) else doc.url
+        if not doc.ok:
+            failed.append(doc.url)
+            continue
+        try:
+            reader = PdfReader(BytesIO(doc.content))
+            for page in reader.pages:
+                writer.add_page(page)
+            pages += len(reader.pages)
+            logger.info(f"Added {len(reader.pages)} pages from {label}{' (cached)' if doc.from_cache else ''}")
+        except Exception as e:
+            logger.error(f"Error processing PDF from {doc.url}: {e}")
+            failed.append(doc.url)
+    return writer, pages, failed
@@ -0,0 +1,560 @@
+"""
+Background Job Runner
+Runs long-running work (database refresh, paperwork, instruction merges, EDR
+batch downloads, scheduler runs, large CSV imports)
+as typed jobs with progress, results, deduplication and per-type concurrency
+limits, instead of ad-hoc daemon threads and inline request handling.
+
+Job records live in Redis (the same store the loading page already used for
+refresh progress) so any web worker can report progress and results, and a
+recycled gunicorn worker does not lose them. Jobs are executed by the Celery
+worker when JOB_RUNNER_BACKEND is 'celery', or by a small in-process thread
+pool otherwise. Job types that depend on in-memory state of the web process
+(e.g. an authenticated EDR session) always run in-process.
+"""
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+JOB_PREFIX = 'job:'
+JOB_KEY_PREFIX = 'job_key:'
+JOB_SLOTS_PREFIX = 'job_slots:'
+
+JOB_STATUS_PENDING = 'pending'
+JOB_STATUS_QUEUED = 'queued'
+JOB_STATUS_RUNNING = 'running'
+JOB_STATUS_COMPLETED = 'completed'
+JOB_STATUS_ERROR = 'error'
+FINISHED_STATUSES = (JOB_STATUS_COMPLETED, JOB_STATUS_ERROR)
+
+DEFAULT_JOB_TTL = 86400          # Keep finished job records for a day
+DEFAULT_ACTIVE_TTL = 3600        # Dedup keys expire if a worker dies
+SLOT_WAIT_SECONDS = 2            # Retry interval of a job waiting for a slot
+SLOT_HEARTBEAT_SECONDS = 30      # Running jobs refresh their slot this often
+SLOT_STALE_SECONDS = 120         # Slots not refreshed for this long are reclaimed
+
+
+# =============================================================================
+# Job types
+# =============================================================================
+
+@dataclass
+class JobType:
+    """A kind of background job"""
+    name: str
+    handler: Callable[..., Dict[str, Any]]
+    max_concurrent: int = 1
+    total_steps: int = 1
+    in_process: bool = False       # Must run in the web process (in-memory state)
+    persist_params: bool = True    # False for params that must not be stored (e.g. MFA codes)
+
+
+JOB_TYPES: Dict[str, JobType] = {}
+
+
+def job_type(name, max_concurrent=1, total_steps=1, in_process=False, persist_params=True):
+    """
+    Register a job handler
+
+    The handler is called as handler(ctx, **params) inside an app context and
+    returns a JSON-serializable result dict. Raising marks the job as failed.
+    """
+    def decorator(func):
+        JOB_TYPES[name] = JobType(
+            name=name,
+            handler=func,
+            max_concurrent=max_concurrent,
+            total_steps=total_steps,
+            in_process=in_process,
+            persist_params=persist_params,
+        )
+        return func
+    return decorator
+
+
+# =============================================================================
+# Job store
+# =============================================================================
+
+class JobStore:
+    """Redis-backed job records, dedup keys and concurrency slots"""
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is not None:
+            return self._client
+        from app.routes.auth import get_redis_client
+        return get_redis_client()
+
+    def _ttl(self):
+        return current_app.config.get('JOB_RESULT_TTL', DEFAULT_JOB_TTL)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            data = self.client.get(f"{JOB_PREFIX}{job_id}")
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.error(f"Job store read error: {e}")
+            return None
+
+    def save(self, job_id: str, record: Dict[str, Any]) -> None:
+        try:
+            self.client.setex(f"{JOB_PREFIX}{job_id}", self._ttl(), json.dumps(record, default=str))
+        except Exception as e:
+            logger.error(f"Job store write error: {e}")
+
+    def update(self, job_id: str, **fields) -> Dict[str, Any]:
+        record = self.get(job_id) or new_job_record(job_id, fields.get('type'))
+        record.update(fields)
+        self.save(job_id, record)
+        return record
+
+    def delete(self, job_id: str) -> None:
+        try:
+            self.client.delete(f"{JOB_PREFIX}{job_id}")
+        except Exception as e:
+            logger.error(f"Job store delete error: {e}")
+
+    # Deduplication -------------------------------------------------------
+
+    def claim_key(self, type_name: str, job_key: str, job_id: str) -> Tuple[bool, Optional[str]]:
+        """Claim a dedup key; returns (claimed, job_id holding the key)"""
+        redis_key = f"{JOB_KEY_PREFIX}{type_name}:{job_key}"
+        try:
+            if self.client.set(redis_key, job_id, nx=True, ex=DEFAULT_ACTIVE_TTL):
+                return True, job_id
+            holder = self.client.get(redis_key)
+            holder_record = self.get(holder) if holder else None
+            if holder_record is None or holder_record.get('status') in FINISHED_STATUSES:
+                # Stale key left by a finished or vanished job
+                self.client.set(redis_key, job_id, ex=DEFAULT_ACTIVE_TTL)
+                return True, job_id
+            return False, holder
+        except Exception as e:
+            logger.warning(f"Job dedup unavailable, running without it: {e}")
+            return True, job_id
+
+    def release_key(self, type_name: str, job_key: str, job_id: str) -> None:
+        redis_key = f"{JOB_KEY_PREFIX}{type_name}:{job_key}"
+        try:
+            if self.client.get(redis_key) == job_id:
+                self.client.delete(redis_key)
+        except Exception as e:
+            logger.warning(f"Could not release job key {redis_key}: {e}")
+
+    # Concurrency slots ---------------------------------------------------
+    #
+    # The slots of a job type are a sorted set of the job IDs holding them,
+    # scored by their last heartbeat. A slot whose job died (worker killed,
+    # process recycled) stops being refreshed and is reclaimed by the next
+    # acquire, so it cannot block the type indefinitely.
+
+    def acquire_slot(self, type_name: str, limit: int, job_id: str) -> bool:
+        redis_key = f"{JOB_SLOTS_PREFIX}{type_name}"
+        now = time.time()
+        try:
+            self.client.zremrangebyscore(redis_key, '-inf', now - SLOT_STALE_SECONDS)
+            self.client.zadd(redis_key, {job_id: now})
+            if self.client.zcard(redis_key) > limit:
+                self.client.zrem(redis_key, job_id)
+                return False
+            return True
+        except Exception as e:
+            logger.warning(f"Job slots unavailable, running without limit: {e}")
+            return True
+
+    def heartbeat_slot(self, type_name: str, job_id: str) -> None:
+        redis_key = f"{JOB_SLOTS_PREFIX}{type_name}"
+        try:
+            self.client.zadd(redis_key, {job_id: time.time()}, xx=True)
+        except Exception as e:
+            logger.warning(f"Could not refresh job slot {redis_key}: {e}")
+
+    def release_slot(self, type_name: str, job_id: str) -> None:
+        redis_key = f"{JOB_SLOTS_PREFIX}{type_name}"
+        try:
+            self.client.zrem(redis_key, job_id)
+        except Exception as e:
+            logger.warning(f"Could not release job slot {redis_key}: {e}")
+
+
+job_store = JobStore()
+
+
+def new_job_record(job_id, type_name=None, total_steps=1, job_key=None, user=None):
+    """Initial job record (also the progress payload streamed to the browser)"""
+    return {
+        'id': job_id,
+        'type': type_name,
+        'key': job_key,
+        'user': user,
+        'status': JOB_STATUS_PENDING,
+        'current_step': 0,
+        'total_steps': total_steps,
+        'step_label': 'Initializing...',
+        'processed': 0,
+        'total': 0,
+        'error': None,
+        'stats': None,
+        'result': None,
+        'created_at': datetime.utcnow().isoformat(),
+        'started_at': None,
+        'finished_at': None,
+    }
+
+
+class JobContext:
+    """Handed to job handlers for progress reporting"""
+
+    def __init__(self, job_id: str, store: JobStore = None):
+        self.job_id = job_id
+        self.store = store or job_store
+
+    def update(self, **progress) -> None:
+        """Update progress fields (current_step, step_label, processed, total, ...)"""
+        self.store.update(self.job_id, **progress)
+
+
+# =============================================================================
+# Submission & execution
+# =============================================================================
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = current_app.config.get('JOB_RUNNER_THREADS', 4)
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        return _executor
+
+
+def submit_job(type_name: str, params: Dict[str, Any] = None, job_key: str = None,
+               job_id: str = None, user: str = None) -> Tuple[str, bool]:
+    """
+    Submit a background job
+
+    Args:
+        type_name: Registered job type
+        params: Keyword arguments for the handler
+        job_key: Deduplication key; while a job with the same type and key is
+                 unfinished, that job's ID is returned instead
+        job_id: Use this ID (e.g. a loading page task ID) instead of a new one
+        user: Submitting user, stored for display
+
+    Returns:
+        tuple: (job_id, created) - created is False when deduplicated
+    """
+    if type_name not in JOB_TYPES:
+        raise ValueError(f"Unknown job type: {type_name}")
+
+    spec = JOB_TYPES[type_name]
+    params = params or {}
+    job_id = job_id or secrets.token_urlsafe(16)
+
+    if job_key:
+        claimed, holder = job_store.claim_key(type_name, job_key, job_id)
+        if not claimed:
+            logger.info(f"Job {type_name}:{job_key} already running as {holder}")
+            return holder, False
+
+    record = new_job_record(job_id, type_name, spec.total_steps, job_key, user)
+    record['status'] = JOB_STATUS_QUEUED
+    record['step_label'] = 'Queued'
+    if spec.persist_params:
+        record['params'] = params
+    job_store.save(job_id, record)
+
+    backend = current_app.config.get('JOB_RUNNER_BACKEND', 'thread')
+    if backend == 'celery' and not spec.in_process and spec.persist_params:
+        from app.services.sync_service import run_background_job
+        run_background_job.delay(job_id)
+    else:
+        _submit_to_thread(current_app._get_current_object(), job_id, params)
+
+    logger.info(f"Submitted {type_name} job {job_id} ({backend})")
+    return job_id, True
+
+
+def _submit_to_thread(app, job_id, params):
+    """
+    Run a job on the thread pool
+
+    A job that finds no free slot is resubmitted after SLOT_WAIT_SECONDS
+    instead of holding a pool thread while it waits.
+    """
+    def run_in_thread():
+        with app.app_context():
+            if execute_job(job_id, params) is None and is_waiting_for_slot(job_id):
+                timer = threading.Timer(SLOT_WAIT_SECONDS, _submit_to_thread, (app, job_id, params))
+                timer.daemon = True
+                timer.start()
+
+    with app.app_context():
+        _get_executor().submit(run_in_thread)
+
+
+def is_waiting_for_slot(job_id: str) -> bool:
+    """True if the job is still queued (execute_job found no free slot)"""
+    record = job_store.get(job_id)
+    return record is not None and record.get('status') == JOB_STATUS_QUEUED
+
+
+def _heartbeat_slot(store, type_name, job_id, stop):
+    while not stop.wait(SLOT_HEARTBEAT_SECONDS):
+        store.heartbeat_slot(type_name, job_id)
+
+
+def execute_job(job_id: str, params: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+    """
+    Run a queued job in the current process (called by the thread pool or
+    the Celery task)
+
+    Does not wait for a concurrency slot: when none is free the job stays
+    queued and None is returned, and the caller retries later (see
+    is_waiting_for_slot).
+
+    Args:
+        job_id: Job ID
+        params: Handler params (defaults to the persisted params)
+
+    Returns:
+        dict: Final job record, or None if the job could not start
+    """
+    record = job_store.get(job_id)
+    if record is None:
+        logger.error(f"Job {job_id} not found")
+        return None
+
+    spec = JOB_TYPES.get(record.get('type'))
+    if spec is None:
+        return job_store.update(job_id, status=JOB_STATUS_ERROR, error=f"Unknown job type: {record.get('type')}")
+
+    if not job_store.acquire_slot(spec.name, spec.max_concurrent, job_id):
+        if record.get('step_label') != 'Waiting for a free slot':
+            job_store.update(job_id, step_label='Waiting for a free slot')
+        return None
+
+    # Keep the slot alive while the handler runs (the heartbeat thread has
+    # no app context, so it gets the Redis client directly)
+    stop_heartbeat = threading.Event()
+    threading.Thread(
+        target=_heartbeat_slot, args=(JobStore(job_store.client), spec.name, job_id, stop_heartbeat),
+        name=f'job-heartbeat-{job_id[:8]}', daemon=True
+    ).start()
+
+    try:
+        job_store.update(job_id, status=JOB_STATUS_RUNNING, step_label='Starting...',
+                         started_at=datetime.utcnow().isoformat())
+        try:
+            result = spec.handler(JobContext(job_id), **(params if params is not None else record.get('params') or {}))
+        except Exception as e:
+            logger.error(f"Job {job_id} ({spec.name}) failed: {e}", exc_info=True)
+            return job_store.update(job_id, status=JOB_STATUS_ERROR, error=str(e),
+                                    finished_at=datetime.utcnow().isoformat())
+
+        result = result or {}
+        final = {
+            'result': result,
+            'finished_at': datetime.utcnow().isoformat(),
+        }
+        current = job_store.get(job_id) or {}
+        if current.get('status') not in FINISHED_STATUSES:
+            # Handlers that did not report a final status
+            final['status'] = JOB_STATUS_COMPLETED if result.get('success', True) else JOB_STATUS_ERROR
+            final['step_label'] = 'Complete'
+            if final['status'] == JOB_STATUS_ERROR:
+                final['error'] = result.get('message') or result.get('error')
+        return job_store.update(job_id, **final)
+    finally:
+        stop_heartbeat.set()
+        job_store.release_slot(spec.name, job_id)
+        if record.get('key'):
+            job_store.release_key(spec.name, record['key'], job_id)
+
+
+def job_results_dir() -> str:
+    """
+    Directory for file results (instance/job_results)
+
+    Files older than JOB_RESULT_TTL are removed, matching the lifetime of
+    the job records that reference them.
+    """
+    path = os.path.join(current_app.instance_path, 'job_results')
+    os.makedirs(path, exist_ok=True)
+
+    cutoff = time.time() - current_app.config.get('JOB_RESULT_TTL', DEFAULT_JOB_TTL)
+    for name in os.listdir(path):
+        file_path = os.path.join(path, name)
+        try:
+            if os.path.getmtime(file_path) < cutoff:
+                os.unlink(file_path)
+        except OSError:
+            pass
+    return path
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Get a job record"""
+    return job_store.get(job_id)
+
+
+def _follow_attached(progress):
+    """Default resolver: report the job this one was deduplicated onto"""
+    attached = job_store.get(progress['attached_to'])
+    return attached or progress
+
+
+def iter_job_progress(job_id: str, resolve: Callable = None,
+                      timeout_seconds: float = 300, interval: float = 0.1):
+    """
+    Yield job progress snapshots until the job finishes (for SSE endpoints)
+
+    Args:
+        job_id: Job ID
+        resolve: Called with a record that has 'attached_to' to get the
+                 progress to report instead (defaults to the attached job)
+        timeout_seconds: Stop streaming after this long
+        interval: Seconds between polls
+
+    Yields:
+        dict: Progress records; {'error': 'Task not found', 'status': 'error'}
+              if the job does not exist
+    """
+    resolve = resolve or _follow_attached
+    deadline = time.monotonic() + timeout_seconds
+
+    while True:
+        progress = job_store.get(job_id)
+        if progress and progress.get('attached_to'):
+            progress = resolve(progress)
+
+        if not progress:
+            yield {'error': 'Task not found', 'status': 'error'}
+            return
+
+        yield progress
+
+        if progress.get('status') in FINISHED_STATUSES or time.monotonic() >= deadline:
+            return
+        time.sleep(interval)
+
+
+# =============================================================================
+# Job handlers
+# =============================================================================
+
+@job_type('db_refresh', max_concurrent=1, total_steps=6)
+def _db_refresh_job(ctx, mode=None):
+    """Crossmark database refresh (login loading page / manual)"""
+    from app.services.database_refresh_service import refresh_database_with_progress
+    return refresh_database_with_progress(ctx.job_id, mode=mode)
+
+
+@job_type('scheduler_run', max_concurrent=1)
+def _scheduler_run_job(ctx, use_cpsat=None, emergency_mode=False):
+    """Auto-scheduler run"""
+    from app.routes.auto_scheduler import execute_scheduler_run
+    ctx.update(step_label='Running scheduler')
+    run, solver_used = execute_scheduler_run(use_cpsat=use_cpsat, emergency_mode=emergency_mode)
+    return {
+        'success': True,
+        'run_id': run.id,
+        'solver': solver_used,
+        'stats': {
+            'total_events_processed': run.total_events_processed,
+            'events_scheduled': run.events_scheduled,
+            'events_requiring_swaps': run.events_requiring_swaps,
+            'events_failed': run.events_failed
+        }
+    }
+
+
+@job_type('paperwork', max_concurrent=1, in_process=True)
+def _paperwork_job(ctx, date):
+    """Complete daily paperwork PDF (uses the web process's EDR session)"""
+    from app.routes.printing import generate_complete_paperwork_file
+    from app.services.daily_paperwork_generator import CancelledEventError
+    ctx.update(step_label=f'Generating paperwork for {date}')
+    try:
+        path, filename = generate_complete_paperwork_file(datetime.strptime(date, '%Y-%m-%d').date(), ctx.job_id)
+    except CancelledEventError as e:
+        # Reported like the synchronous endpoint's 409 so the page can list the events
+        return {'success': False, 'error_type': 'cancelled_events', 'message': e.message,
+                'cancelled_events': e.cancelled_events}
+    return {'success': True, 'path': path, 'filename': filename, 'mimetype': 'application/pdf'}
+
+
+@job_type('instructions_merge', max_concurrent=2)
+def _instructions_merge_job(ctx, urls, event_names=None):
+    """Merged instruction manuals PDF"""
+    from app.routes.printing import merge_instruction_pdfs
+    ctx.update(step_label=f'Fetching {len(urls)} instruction manuals', total=len(urls))
+    path, filename, pages, failed = merge_instruction_pdfs(urls, event_names, ctx.job_id)
+    return {'success': True, 'path': path, 'filename': filename, 'mimetype': 'application/pdf',
+            'pages': pages, 'failed_urls': failed}
+
+
+@job_type('edr_batch', max_concurrent=1, in_process=True)
+def _edr_batch_job(ctx, date=None, user_id=None, event_ids=None):
+    """
+    EDR batch download (uses the web process's authenticated EDR session)
+
+    With a date: the merged EDR PDF of the date's CORE events (printing page).
+    With user_id and event_ids: one PDF per event through that user's Walmart
+    session, saved under uploads/walmart_edrs.
+    """
+    def progress(processed, total, label=None):
+        ctx.update(processed=processed, total=total,
+                   step_label=f'Downloading EDR {processed + 1} of {total}' + (f': {label}' if label else ''))
+
+    if user_id is None:
+        from app.routes.printing import generate_edr_batch_file
+        path, filename, merged, failed = generate_edr_batch_file(
+            datetime.strptime(date, '%Y-%m-%d').date(), ctx.job_id, progress=progress
+        )
+        return {'success': True, 'path': path, 'filename': filename, 'mimetype': 'application/pdf',
+                'merged': merged, 'failed': failed}
+
+    from app.integrations.walmart_api.routes import download_edrs
+    from app.integrations.walmart_api.session_manager import session_manager
+    session = session_manager.get_session(user_id)
+    if not session or not session.is_authenticated:
+        return {'success': False, 'message': 'Walmart session expired. Please authenticate again.'}
+    return download_edrs(session.authenticator, event_ids, progress=progress)
+
+
+@job_type('approved_events_refresh', max_concurrent=2, in_process=True)
+def _approved_events_refresh_job(ctx, user_id, club, start_date, end_date):
+    """Refresh a club's cached Walmart approved events (uses the in-memory Walmart session)"""
+    from app.integrations.walmart_api.routes import refresh_approved_events
+    ctx.update(step_label=f'Fetching approved events for club {club}')
+    events, _auth_source = refresh_approved_events(user_id, club, start_date, end_date)
+    if events is None:
+        return {'success': False, 'message': 'Failed to fetch approved events from Walmart'}
+    return {'success': True, 'events': len(events)}
+
+
+@job_type('csv_import', max_concurrent=1)
+def _csv_import_job(ctx, kind, path):
+    """Large WorkBankVisits / scheduled-event CSV import"""
+    from app.services.csv_import_service import import_file
+    ctx.update(step_label='Importing CSV rows')
+    return import_file(kind, path, progress=lambda processed: ctx.update(processed=processed))
@@ -0,0 +1,261 @@
+"""
+Request Profiler
+Per-request SQL query profiling and slow-endpoint instrumentation.
+
+SQLAlchemy before/after_cursor_execute events time every statement issued
+while a request is being handled; Flask request hooks attribute them to the
+endpoint. For each request we record:
+
+- query count and total SQL time
+- total latency
+- N+1 patterns: the same statement text executed QUERY_PROFILER_N_PLUS_ONE
+  or more times (with different parameters) in one request
+
+Per-endpoint histograms are rendered in Prometheus text format by
+/health/metrics. Requests slower than QUERY_PROFILER_SLOW_MS are logged with
+their most expensive statements.
+
+Metrics are kept per process (each gunicorn worker reports its own series).
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from flask import g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500)
+TOP_STATEMENTS = 5
+STATEMENT_LOG_CHARS = 200
+
+
+class RequestProfile:
+    """Statements executed while handling one request"""
+
+    __slots__ = ('started', 'query_count', 'sql_seconds', 'statements')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.sql_seconds = 0.0
+        self.statements: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])  # text -> [count, seconds]
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.query_count += 1
+        self.sql_seconds += seconds
+        entry = self.statements[statement]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least threshold times (N+1 candidates)"""
+        return sorted(
+            ((text, entry[0]) for text, entry in self.statements.items() if entry[0] >= threshold),
+            key=lambda item: -item[1]
+        )
+
+    def top(self, limit: int = TOP_STATEMENTS) -> List[Tuple[str, int, float]]:
+        """Most expensive statements by total time: (text, count, seconds)"""
+        ranked = sorted(self.statements.items(), key=lambda item: -item[1][1])[:limit]
+        return [(text, entry[0], entry[1]) for text, entry in ranked]
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class EndpointMetrics:
+    """Per-endpoint histograms and counters for this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.sql_time: Dict[Tuple[str, str], Histogram] = {}
+        self.queries: Dict[Tuple[str, str], Histogram] = {}
+        self.n_plus_one: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.slow: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def observe(self, endpoint: str, method: str, profile: RequestProfile, seconds: float,
+                n_plus_one: int, slow: bool) -> None:
+        key = (endpoint, method)
+        with self._lock:
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.sql_time.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(profile.sql_seconds)
+            self.queries.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(profile.query_count)
+            if n_plus_one:
+                self.n_plus_one[key] += n_plus_one
+            if slow:
+                self.slow[key] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latency.clear()
+            self.sql_time.clear()
+            self.queries.clear()
+            self.n_plus_one.clear()
+            self.slow.clear()
+
+    def render(self) -> List[str]:
+        """Prometheus text exposition lines"""
+        lines = []
+        with self._lock:
+            self._render_histograms(lines, 'scheduler_request_duration_seconds',
+                                    'Request latency by endpoint', self.latency)
+            self._render_histograms(lines, 'scheduler_request_sql_seconds',
+                                    'SQL time per request by endpoint', self.sql_time)
+            self._render_histograms(lines, 'scheduler_request_sql_queries',
+                                    'SQL queries per request by endpoint', self.queries)
+            self._render_counter(lines, 'scheduler_request_n_plus_one_total',
+                                 'Repeated-statement (N+1) patterns detected by endpoint', self.n_plus_one)
+            self._render_counter(lines, 'scheduler_request_slow_total',
+                                 'Requests over the slow threshold by endpoint', self.slow)
+        return lines
+
+    @staticmethod
+    def _labels(key) -> str:
+        endpoint, method = key
+        endpoint = endpoint.replace('\\', '\\\\').replace('"', '\\"')
+        return f'endpoint="{endpoint}",method="{method}"'
+
+    def _render_histograms(self, lines, name, help_text, histograms) -> None:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for key in sorted(histograms):
+            histogram = histograms[key]
+            labels = self._labels(key)
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{{labels}}} {round(histogram.sum, 6)}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+    def _render_counter(self, lines, name, help_text, counters) -> None:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for key in sorted(counters):
+            lines.append(f'{name}{{{self._labels(key)}}} {counters[key]}')
+
+
+endpoint_metrics = EndpointMetrics()
+
+
+def _summarize(statement: str) -> str:
+    """One-line statement for logs, with long SELECT column lists elided"""
+    text = ' '.join(statement.split())
+    if text.upper().startswith('SELECT '):
+        from_at = text.upper().find(' FROM ')
+        if from_at > 60:
+            text = f'SELECT ... {text[from_at + 1:]}'
+    return text[:STATEMENT_LOG_CHARS]
+
+
+def _current_profile():
+    if not has_app_context():
+        return None
+    return g.get('_request_profile')
+
+
+# =============================================================================
+# SQLAlchemy hooks
+# =============================================================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_profile() is not None:
+        context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_profile_started', None)
+    profile = _current_profile()
+    if started is None or profile is None:
+        return
+    profile.record(statement, time.perf_counter() - started)
+
+
+# =============================================================================
+# Flask hooks
+# =============================================================================
+
+def _start_profile():
+    if request.endpoint and request.endpoint != 'static':
+        g._request_profile = RequestProfile()
+
+
+def _finish_profile(response, app):
+    profile = g.pop('_request_profile', None)
+    if profile is None:
+        return response
+
+    elapsed = time.perf_counter() - profile.started
+    endpoint = request.endpoint or 'unknown'
+    repeated = profile.repeated(app.config.get('QUERY_PROFILER_N_PLUS_ONE', 10))
+    slow = elapsed * 1000 >= app.config.get('QUERY_PROFILER_SLOW_MS', 1000)
+    endpoint_metrics.observe(endpoint, request.method, profile, elapsed, len(repeated), slow)
+
+    if repeated:
+        statement, count = repeated[0]
+        logger.info(
+            f"Possible N+1 in {endpoint}: statement ran {count}x - {_summarize(statement)}"
+        )
+    if slow:
+        top = '\n'.join(
+            f"    {count}x {seconds * 1000:.1f}ms  {_summarize(text)}"
+            for text, count, seconds in profile.top()
+        )
+        logger.warning(
+            f"Slow request {request.method} {request.path} ({endpoint}): {elapsed * 1000:.0f}ms, "
+            f"{profile.query_count} queries, {profile.sql_seconds * 1000:.0f}ms SQL"
+            + (f"\n  Top statements:\n{top}" if top else '')
+        )
+    return response
+
+
+_engine_hooks_installed = False
+
+
+def init_request_profiler(app) -> None:
+    """
+    Install the profiler on an app (no-op when QUERY_PROFILER_ENABLED is off)
+
+    Args:
+        app: Flask application
+    """
+    global _engine_hooks_installed
+    if not app.config.get('QUERY_PROFILER_ENABLED', True):
+        return
+
+    if not _engine_hooks_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _engine_hooks_installed = True
+
+    # Registered first so the profile covers the other request hooks too
+    # (after_request handlers run in reverse order)
+    @app.before_request
+    def start_request_profile():
+        _start_profile()
+
+    @app.after_request
+    def record_request_profile(response):
+        return _finish_profile(response, app)
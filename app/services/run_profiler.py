@@ -0,0 +1,238 @@
+"""
+Scheduler Run Profiler
+Per-wave / per-phase instrumentation for auto-scheduler runs.
+
+Both engines wrap their stages in RunProfiler.phase(); each phase records:
+
+- wall time
+- SQL statements executed on the profiling thread
+- peak Python memory allocated during the phase (tracemalloc, when enabled)
+
+The CP-SAT engine also records solver statistics (branches, conflicts,
+objective, bound and gap, model size). The profile is stored as JSON on
+SchedulerRunHistory.profile and shown on the run history page.
+"""
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_active = threading.local()
+_engine_hooks_installed = False
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    profiler = getattr(_active, 'profiler', None)
+    if profiler is not None:
+        profiler._count_statement()
+
+
+def _install_engine_hooks() -> None:
+    global _engine_hooks_installed
+    if not _engine_hooks_installed:
+        event.listen(Engine, 'after_cursor_execute', _count_statement)
+        _engine_hooks_installed = True
+
+
+def _memory_enabled() -> bool:
+    """SCHEDULER_PROFILE_MEMORY from the app config (off outside an app)"""
+    try:
+        from flask import current_app, has_app_context
+        if has_app_context():
+            return bool(current_app.config.get('SCHEDULER_PROFILE_MEMORY', False))
+    except ImportError:
+        pass
+    return False
+
+
+class _Phase:
+    """Counters for one open phase"""
+
+    __slots__ = ('record', 'started', 'sql_start', 'memory_start', 'peak')
+
+    def __init__(self, record, started, sql_start, memory_start):
+        self.record = record
+        self.started = started
+        self.sql_start = sql_start
+        self.memory_start = memory_start
+        self.peak = memory_start
+
+
+class RunProfiler:
+    """Collects phase timings and solver statistics for one scheduler run"""
+
+    def __init__(self):
+        self.phases: List[dict] = []
+        self.solver: Optional[dict] = None
+        self.sql_count = 0
+        self.started = None
+        self.finished = None
+        self._stack: List[_Phase] = []
+        self._track_memory = False
+        self._owns_tracemalloc = False
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self, track_memory: Optional[bool] = None) -> 'RunProfiler':
+        """
+        Begin profiling on the current thread
+
+        Args:
+            track_memory: Record peak memory per phase (defaults to
+                          SCHEDULER_PROFILE_MEMORY)
+        """
+        _install_engine_hooks()
+        _active.profiler = self
+        self.started = time.perf_counter()
+        self._track_memory = _memory_enabled() if track_memory is None else track_memory
+        if self._track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        return self
+
+    def stop(self) -> None:
+        """Finish profiling (idempotent); open phases are closed"""
+        while self._stack:
+            self._close(self._stack[-1])
+        if getattr(_active, 'profiler', None) is self:
+            _active.profiler = None
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        if self.started is not None and self.finished is None:
+            self.finished = time.perf_counter()
+
+    def _count_statement(self) -> None:
+        self.sql_count += 1
+
+    # -------------------------------------------------------------------------
+    # Phases
+    # -------------------------------------------------------------------------
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time a wave or phase
+
+        Phases may nest (e.g. precompute inside load); nested phases are
+        listed with a greater depth and their figures are included in the
+        enclosing phase.
+        """
+        record = {'name': name, 'depth': len(self._stack)}
+        self.phases.append(record)
+
+        memory_start = 0
+        if self._memory_active():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            memory_start = current
+
+        frame = _Phase(record, time.perf_counter(), self.sql_count, memory_start)
+        self._stack.append(frame)
+        try:
+            yield record
+        finally:
+            if frame in self._stack:
+                self._close(frame)
+
+    def _memory_active(self) -> bool:
+        return self._track_memory and tracemalloc.is_tracing()
+
+    def _close(self, frame: _Phase) -> None:
+        # Close anything opened inside this phase first
+        while self._stack and self._stack[-1] is not frame:
+            self._close(self._stack[-1])
+        self._stack.pop()
+
+        record = frame.record
+        record['seconds'] = round(time.perf_counter() - frame.started, 4)
+        record['sql'] = self.sql_count - frame.sql_start
+        if self._memory_active():
+            frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            record['peak_kb'] = max(0, frame.peak - frame.memory_start) // 1024
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, frame.peak)
+            tracemalloc.reset_peak()
+
+    # -------------------------------------------------------------------------
+    # Solver statistics
+    # -------------------------------------------------------------------------
+
+    def record_solver(self, solver, status, model=None) -> dict:
+        """
+        Record CP-SAT statistics after a solve
+
+        Args:
+            solver: cp_model.CpSolver that ran
+            status: Status returned by Solve()
+            model: The solved cp_model.CpModel (for variable/constraint counts)
+
+        Returns:
+            dict: The recorded statistics
+        """
+        from ortools.sat.python import cp_model
+
+        stats = {
+            'status': solver.StatusName(status),
+            'wall_seconds': round(solver.WallTime(), 4),
+            'branches': solver.NumBranches(),
+            'conflicts': solver.NumConflicts(),
+        }
+        if model is not None:
+            proto = model.Proto()
+            stats['variables'] = len(proto.variables)
+            stats['constraints'] = len(proto.constraints)
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            objective = solver.ObjectiveValue()
+            bound = solver.BestObjectiveBound()
+            stats['objective'] = objective
+            stats['bound'] = bound
+            stats['gap'] = round(abs(bound - objective) / max(1.0, abs(objective)), 6)
+        self.solver = stats
+        return stats
+
+    # -------------------------------------------------------------------------
+    # Output
+    # -------------------------------------------------------------------------
+
+    def to_dict(self) -> dict:
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return {
+            'total_seconds': round(end - self.started, 4) if self.started is not None else None,
+            'sql': self.sql_count,
+            'memory_tracked': self._track_memory,
+            'phases': self.phases,
+            'solver': self.solver,
+        }
+
+    def save(self, run) -> None:
+        """Stop profiling and store the profile on a SchedulerRunHistory row"""
+        self.stop()
+        try:
+            run.profile = json.dumps(self.to_dict())
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Could not serialize scheduler run profile: {e}")
+
+    def log_summary(self, label: str) -> None:
+        """Log one line per phase (slowest first)"""
+        timed = [p for p in self.phases if 'seconds' in p and p['depth'] == 0]
+        if not timed:
+            return
+        lines = '\n'.join(
+            f"    {p['name']}: {p['seconds']:.2f}s, {p['sql']} queries"
+            + (f", peak {p['peak_kb']} KB" if 'peak_kb' in p else '')
+            for p in sorted(timed, key=lambda p: -p['seconds'])
+        )
+        logger.info(f"{label} profile ({self.sql_count} queries):\n{lines}")
@@ -12,15 +12,27 @@ from app.constants import INACTIVE_CONDITIONS
 from .rotation_manager import RotationManager
 from .constraint_validator import ConstraintValidator
 from .conflict_resolver import ConflictResolver
+from .availability_matrix import AvailabilityMatrix, AvailabilityService
+from .run_profiler import RunProfiler
 from .validation_types import SchedulingDecision
 
-# Optional ML integration (gracefully handles import failure)
-try:
-    from app.ml.inference.ml_scheduler_adapter import MLSchedulerAdapter
-    ML_AVAILABLE = True
-except ImportError as e:
-    MLSchedulerAdapter = None
-    ML_AVAILABLE = False
+# Optional ML integration, imported on first use with ML_ENABLED so that
+# pandas/NumPy/XGBoost stay out of workers that never rank with ML
+MLSchedulerAdapter = None
+ML_AVAILABLE = None  # Unknown until the adapter is first requested
+
+
+def _ml_adapter_class():
+    """MLSchedulerAdapter, or None when the ML stack cannot be imported"""
+    global MLSchedulerAdapter, ML_AVAILABLE
+    if MLSchedulerAdapter is None and ML_AVAILABLE is None:
+        try:
+            from app.ml.inference.ml_scheduler_adapter import MLSchedulerAdapter as adapter_class
+            MLSchedulerAdapter = adapter_class
+            ML_AVAILABLE = True
+        except ImportError:
+            ML_AVAILABLE = False
+    return MLSchedulerAdapter
 
 
 class SchedulingEngine:
@@ -181,16 +193,20 @@ class SchedulingEngine:
         self.rotation_manager = RotationManager(db_session, models)
         self.validator = ConstraintValidator(db_session, models)
         self.conflict_resolver = ConflictResolver(db_session, models)
+        self.availability_service = AvailabilityService(db_session, models)
+        self.availability = None  # AvailabilityMatrix for the run window
 
         # Initialize ML adapter (optional, with graceful fallback)
         self.ml_adapter = None
-        if ML_AVAILABLE:
+        config = current_app.config if current_app else {}
+        if config.get('ML_ENABLED', False):
             try:
-                # Pass Flask app config if available
-                config = current_app.config if current_app else {}
-                self.ml_adapter = MLSchedulerAdapter(db_session, models, config)
-                if self.ml_adapter.use_ml:
-                    current_app.logger.info("ML Scheduler Adapter initialized successfully")
+                adapter_class = _ml_adapter_class()
+                if adapter_class is not None:
+                    # Pass Flask app config if available
+                    self.ml_adapter = adapter_class(db_session, models, config)
+                    if self.ml_adapter.use_ml:
+                        current_app.logger.info("ML Scheduler Adapter initialized successfully")
             except Exception as e:
                 current_app.logger.warning(f"ML adapter initialization failed: {e}. Using rule-based scheduling.")
                 self.ml_adapter = None
@@ -347,26 +363,37 @@ class SchedulingEngine:
         Returns:
             SchedulerRunHistory object
         """
+        profiler = RunProfiler()
+        try:
+            profiler.start()
+            return self._run_waves(run_type, profiler)
+        finally:
+            # Detach the profiler (and tracemalloc) even if the run failed early
+            profiler.stop()
+
+    def _run_waves(self, run_type: str, profiler: RunProfiler) -> object:
+        """Refresh, create the run record and schedule every wave (see run_auto_scheduler)"""
         # AUTO-REFRESH: Sync database from external API before scheduling
         # This ensures we have the latest event data before making scheduling decisions
-        current_app.logger.info("=== PRE-SCHEDULER DATABASE REFRESH ===")
-        try:
-            from app.services.database_refresh_service import DatabaseRefreshService
-            refresh_service = DatabaseRefreshService()
-            refresh_result = refresh_service.refresh()
-            if refresh_result.get('success'):
-                current_app.logger.info(
-                    f"Database refresh completed: {refresh_result.get('stats', {}).get('total_processed', 0)} events processed"
-                )
-            else:
+        with profiler.phase('refresh'):
+            current_app.logger.info("=== PRE-SCHEDULER DATABASE REFRESH ===")
+            try:
+                from app.services.database_refresh_service import DatabaseRefreshService
+                refresh_service = DatabaseRefreshService()
+                refresh_result = refresh_service.refresh()
+                if refresh_result.get('success'):
+                    current_app.logger.info(
+                        f"Database refresh completed: {refresh_result.get('stats', {}).get('total_processed', 0)} events processed"
+                    )
+                else:
+                    current_app.logger.warning(
+                        f"Database refresh failed: {refresh_result.get('message', 'Unknown error')}. "
+                        f"Proceeding with existing data."
+                    )
+            except Exception as refresh_error:
                 current_app.logger.warning(
-                    f"Database refresh failed: {refresh_result.get('message', 'Unknown error')}. "
-                    f"Proceeding with existing data."
+                    f"Database refresh error: {refresh_error}. Proceeding with existing data."
                 )
-        except Exception as refresh_error:
-            current_app.logger.warning(
-                f"Database refresh error: {refresh_error}. Proceeding with existing data."
-            )
 
         # Create run history record
         run = self.SchedulerRunHistory(
@@ -386,50 +413,64 @@ class SchedulingEngine:
 
         try:
             # Get events to schedule
-            events = self._get_unscheduled_events()
-            run.total_events_processed = len(events)
+            with profiler.phase('load'):
+                events = self._get_unscheduled_events()
+                run.total_events_processed = len(events)
+
+                # Sort by priority (due date first, then event type)
+                events = self._sort_events_by_priority(events)
 
-            # Sort by priority (due date first, then event type)
-            events = self._sort_events_by_priority(events)
+                # Availability / time off for every employee over the run window
+                self._load_availability(events)
 
             # CORRECTED WAVE ORDER (per user requirements - Juicer FIRST, then Core):
 
             # Wave 1: Juicer events (HIGHEST PRIORITY - can bump Core events if assigned)
             #         Uses _schedule_juicer_events_wave1() which has bumping logic
-            self._schedule_juicer_events_wave1(run, events)
+            with profiler.phase('juicer'):
+                self._schedule_juicer_events_wave1(run, events)
 
             # Wave 2: Core events (NEW day-by-day bump-first logic with cascading)
             #         Supervisor events are scheduled INLINE with Core events
-            failed_core_events = self._schedule_core_events_wave2_new(run, events)
+            with profiler.phase('core'):
+                failed_core_events = self._schedule_core_events_wave2_new(run, events)
 
             # ORPHANED SUPERVISOR PASS: Schedule Supervisor events whose Core was scheduled previously
             current_app.logger.info("=== ORPHANED SUPERVISOR PASS: Scheduling remaining Supervisor events ===")
-            self._schedule_orphaned_supervisor_events(run, events)
+            with profiler.phase('supervisor'):
+                self._schedule_orphaned_supervisor_events(run, events)
 
             # Wave 3: Freeosk events (9:00 AM to Leads)
-            self._schedule_freeosk_events_wave3(run, events)
+            with profiler.phase('freeosk'):
+                self._schedule_freeosk_events_wave3(run, events)
 
             # Wave 4: Digital events (Setup/Refresh at 9:15-10:00, Teardown at 5:00 PM+)
-            self._schedule_digital_events_wave4(run, events)
+            with profiler.phase('digital'):
+                self._schedule_digital_events_wave4(run, events)
 
             # Full-Day Events: Schedule 8+ hour Other events BEFORE regular Other events
             # These have Core-like constraints (one per employee per day, no Core/Juicer same day)
-            self._schedule_full_day_events(run, events)
+            with profiler.phase('full_day'):
+                self._schedule_full_day_events(run, events)
 
             # Wave 5: Other events (Noon to Club Supervisor or Lead)
             # Note: Full-day events are skipped here as they were scheduled above
-            self._schedule_other_events_wave5(run, events)
+            with profiler.phase('other'):
+                self._schedule_other_events_wave5(run, events)
 
             # RESCUE PASS: Give failed urgent Core events another chance to bump less urgent ones
             # This handles the case where an urgent event was processed first (before less urgent
             # events were scheduled) and couldn't find anything to bump
             current_app.logger.info("=== RESCUE PASS: Attempting to schedule failed urgent Core events ===")
-            self._rescue_pass_for_urgent_events(run, events)
+            with profiler.phase('rescue'):
+                self._rescue_pass_for_urgent_events(run, events)
 
             # Mark run as completed
             run.completed_at = datetime.utcnow()
             run.status = 'completed'
+            profiler.save(run)
             self.db.commit()
+            profiler.log_summary('Greedy scheduler')
 
             return run
 
@@ -437,6 +478,7 @@ class SchedulingEngine:
             run.status = 'failed'
             run.error_message = str(e)
             run.completed_at = datetime.utcnow()
+            profiler.save(run)
             self.db.commit()
             raise
 
@@ -466,6 +508,29 @@ class SchedulingEngine:
         current_app.logger.info(f"Found {len(events)} unscheduled events (expired events filtered out)")
         return events
 
+    def _load_availability(self, events: List[object]) -> None:
+        """Build the run's availability matrix: today through the latest due date"""
+        today = date.today()
+        due_dates = [event.due_datetime.date() for event in events if event.due_datetime]
+        self.availability = None
+        self._availability_on(today, max(due_dates + [today + timedelta(weeks=3)]))
+
+    def _availability_on(self, target_date: date, end_date: Optional[date] = None) -> AvailabilityMatrix:
+        """
+        Availability matrix covering target_date
+
+        The run's matrix is widened (and shared with the validator again) when
+        a wave looks at a day outside it.
+        """
+        matrix = self.availability
+        if matrix is None or not matrix.covers(target_date) or (end_date and end_date > matrix.end):
+            start = min(target_date, matrix.start) if matrix else target_date
+            end = max(target_date, end_date or target_date, matrix.end if matrix else target_date)
+            matrix = self.availability_service.matrix(start, end)
+            self.availability = matrix
+            self.validator.use_availability(matrix)
+        return matrix
+
     def _sort_events_by_priority(self, events: List[object]) -> List[object]:
         """
         Sort events by priority (due date first, then event type)
@@ -1462,10 +1527,6 @@ class SchedulingEngine:
             )
             return
         
-        day_of_week = target_date.weekday()
-        day_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        day_column = day_names[day_of_week]
-        
         # Build employee pool: Leads → Specialists → Juicers (like Core events)
         employee_pool = []
         
@@ -1522,22 +1583,13 @@ class SchedulingEngine:
                 continue
             
             # Check time off
-            time_off = self.db.query(self.EmployeeTimeOff).filter(
-                self.EmployeeTimeOff.employee_id == employee.id,
-                self.EmployeeTimeOff.start_date <= target_date,
-                self.EmployeeTimeOff.end_date >= target_date
-            ).first()
+            time_off = self._availability_on(target_date).has_time_off(employee.id, target_date)
             if time_off:
                 continue
             
             # Check weekly availability
-            weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                employee_id=employee.id
-            ).first()
-            if weekly_avail:
-                is_available = getattr(weekly_avail, day_column, True)
-                if not is_available:
-                    continue
+            if not self._availability_on(target_date).is_available(employee.id, target_date):
+                continue
             
             # Found an available employee!
             self._create_pending_schedule(run, event, employee, schedule_datetime, False, None, None)
@@ -1589,9 +1641,6 @@ class SchedulingEngine:
         schedule_time = time(12, 0)
         schedule_datetime = datetime.combine(current_date.date(), schedule_time)
         target_date = schedule_datetime.date()
-        day_of_week = target_date.weekday()
-        day_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        day_column = day_names[day_of_week]
 
         # Try Club Supervisor first
         club_supervisor = self.db.query(self.Employee).filter_by(
@@ -1604,21 +1653,11 @@ class SchedulingEngine:
             # Time conflicts are ignored for Club Supervisor
 
             # Check time off
-            time_off = self.db.query(self.EmployeeTimeOff).filter(
-                self.EmployeeTimeOff.employee_id == club_supervisor.id,
-                self.EmployeeTimeOff.start_date <= target_date,
-                self.EmployeeTimeOff.end_date >= target_date
-            ).first()
+            time_off = self._availability_on(target_date).has_time_off(club_supervisor.id, target_date)
 
             if not time_off:
                 # Check weekly availability
-                weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                    employee_id=club_supervisor.id
-                ).first()
-
-                is_available = True
-                if weekly_avail:
-                    is_available = getattr(weekly_avail, day_column, True)
+                is_available = self._availability_on(target_date).is_available(club_supervisor.id, target_date)
 
                 if is_available:
                     # Schedule to Club Supervisor (no time conflict checks)
@@ -1635,21 +1674,11 @@ class SchedulingEngine:
 
         for lead in leads:
             # Check time off
-            time_off = self.db.query(self.EmployeeTimeOff).filter(
-                self.EmployeeTimeOff.employee_id == lead.id,
-                self.EmployeeTimeOff.start_date <= target_date,
-                self.EmployeeTimeOff.end_date >= target_date
-            ).first()
+            time_off = self._availability_on(target_date).has_time_off(lead.id, target_date)
 
             if not time_off:
                 # Check weekly availability
-                weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                    employee_id=lead.id
-                ).first()
-
-                is_available = True
-                if weekly_avail:
-                    is_available = getattr(weekly_avail, day_column, True)
+                is_available = self._availability_on(target_date).is_available(lead.id, target_date)
 
                 if is_available:
                     # Schedule to this Lead (no time conflict checks for Other events)
@@ -2553,21 +2582,11 @@ class SchedulingEngine:
         primary_lead = self.rotation_manager.get_rotation_employee(schedule_date, 'primary_lead')
         if primary_lead:
             # Check time off
-            time_off = self.db.query(self.EmployeeTimeOff).filter(
-                self.EmployeeTimeOff.employee_id == primary_lead.id,
-                self.EmployeeTimeOff.start_date <= target_date,
-                self.EmployeeTimeOff.end_date >= target_date
-            ).first()
+            time_off = self._availability_on(target_date).has_time_off(primary_lead.id, target_date)
 
             if not time_off:
                 # Check weekly availability
-                weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                    employee_id=primary_lead.id
-                ).first()
-
-                is_available = True
-                if weekly_avail:
-                    is_available = getattr(weekly_avail, day_column, True)
+                is_available = self._availability_on(target_date).is_available(primary_lead.id, target_date)
 
                 if is_available:
                     self._create_pending_schedule(run, event, primary_lead, schedule_datetime, False, None, None)
@@ -2588,21 +2607,11 @@ class SchedulingEngine:
                 continue  # Skip primary lead (already tried)
 
             # Check time off
-            time_off = self.db.query(self.EmployeeTimeOff).filter(
-                self.EmployeeTimeOff.employee_id == lead.id,
-                self.EmployeeTimeOff.start_date <= target_date,
-                self.EmployeeTimeOff.end_date >= target_date
-            ).first()
+            time_off = self._availability_on(target_date).has_time_off(lead.id, target_date)
 
             if not time_off:
                 # Check weekly availability
-                weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                    employee_id=lead.id
-                ).first()
-
-                is_available = True
-                if weekly_avail:
-                    is_available = getattr(weekly_avail, day_column, True)
+                is_available = self._availability_on(target_date).is_available(lead.id, target_date)
 
                 if is_available:
                     self._create_pending_schedule(run, event, lead, schedule_datetime, False, None, None)
@@ -2620,21 +2629,11 @@ class SchedulingEngine:
 
         if club_supervisor:
             # Check time off
-            time_off = self.db.query(self.EmployeeTimeOff).filter(
-                self.EmployeeTimeOff.employee_id == club_supervisor.id,
-                self.EmployeeTimeOff.start_date <= target_date,
-                self.EmployeeTimeOff.end_date >= target_date
-            ).first()
+            time_off = self._availability_on(target_date).has_time_off(club_supervisor.id, target_date)
 
             if not time_off:
                 # Check weekly availability
-                weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                    employee_id=club_supervisor.id
-                ).first()
-
-                is_available = True
-                if weekly_avail:
-                    is_available = getattr(weekly_avail, day_column, True)
+                is_available = self._availability_on(target_date).is_available(club_supervisor.id, target_date)
 
                 if is_available:
                     self._create_pending_schedule(run, event, club_supervisor, schedule_datetime, False, None, None)
@@ -2694,21 +2693,11 @@ class SchedulingEngine:
         secondary_lead = self.rotation_manager.get_secondary_lead(schedule_date)
         if secondary_lead:
             # Check time off
-            time_off = self.db.query(self.EmployeeTimeOff).filter(
-                self.EmployeeTimeOff.employee_id == secondary_lead.id,
-                self.EmployeeTimeOff.start_date <= target_date,
-                self.EmployeeTimeOff.end_date >= target_date
-            ).first()
+            time_off = self._availability_on(target_date).has_time_off(secondary_lead.id, target_date)
 
             if not time_off:
                 # Check weekly availability
-                weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                    employee_id=secondary_lead.id
-                ).first()
-
-                is_available = True
-                if weekly_avail:
-                    is_available = getattr(weekly_avail, day_column, True)
+                is_available = self._availability_on(target_date).is_available(secondary_lead.id, target_date)
 
                 if is_available:
                     self._create_pending_schedule(run, event, secondary_lead, schedule_datetime, False, None, None)
@@ -2726,21 +2715,11 @@ class SchedulingEngine:
 
         if club_supervisor:
             # Check time off
-            time_off = self.db.query(self.EmployeeTimeOff).filter(
-                self.EmployeeTimeOff.employee_id == club_supervisor.id,
-                self.EmployeeTimeOff.start_date <= target_date,
-                self.EmployeeTimeOff.end_date >= target_date
-            ).first()
+            time_off = self._availability_on(target_date).has_time_off(club_supervisor.id, target_date)
 
             if not time_off:
                 # Check weekly availability
-                weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                    employee_id=club_supervisor.id
-                ).first()
-
-                is_available = True
-                if weekly_avail:
-                    is_available = getattr(weekly_avail, day_column, True)
+                is_available = self._availability_on(target_date).is_available(club_supervisor.id, target_date)
 
                 if is_available:
                     self._create_pending_schedule(run, event, club_supervisor, schedule_datetime, False, None, None)
@@ -2952,9 +2931,6 @@ class SchedulingEngine:
         # Schedule Supervisor event at noon on the same date as the Core event
         supervisor_datetime = datetime.combine(scheduled_date, time(12, 0))
         target_date = supervisor_datetime.date()
-        day_of_week = target_date.weekday()
-        day_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        day_column = day_names[day_of_week]
 
         # Try Club Supervisor first (ignore time conflicts, only check day availability)
         club_supervisor = self.db.query(self.Employee).filter_by(
@@ -2966,25 +2942,15 @@ class SchedulingEngine:
             day_available = True
 
             # Check time off
-            time_off = self.db.query(self.EmployeeTimeOff).filter(
-                self.EmployeeTimeOff.employee_id == club_supervisor.id,
-                self.EmployeeTimeOff.start_date <= target_date,
-                self.EmployeeTimeOff.end_date >= target_date
-            ).first()
+            time_off = self._availability_on(target_date).has_time_off(club_supervisor.id, target_date)
 
             if time_off:
                 day_available = False
 
             # Check weekly availability
             if day_available:
-                weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                    employee_id=club_supervisor.id
-                ).first()
-
-                if weekly_avail:
-                    is_available = getattr(weekly_avail, day_column, True)
-                    if not is_available:
-                        day_available = False
+                if not self._availability_on(target_date).is_available(club_supervisor.id, target_date):
+                    day_available = False
 
             if day_available:
                 self._create_pending_schedule(run, supervisor_event, club_supervisor, supervisor_datetime, False, None, None)
@@ -3003,25 +2969,15 @@ class SchedulingEngine:
                 day_available = True
 
                 # Check time off
-                time_off = self.db.query(self.EmployeeTimeOff).filter(
-                    self.EmployeeTimeOff.employee_id == primary_lead.id,
-                    self.EmployeeTimeOff.start_date <= target_date,
-                    self.EmployeeTimeOff.end_date >= target_date
-                ).first()
+                time_off = self._availability_on(target_date).has_time_off(primary_lead.id, target_date)
 
                 if time_off:
                     day_available = False
 
                 # Check weekly availability
                 if day_available:
-                    weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                        employee_id=primary_lead.id
-                    ).first()
-
-                    if weekly_avail:
-                        is_available = getattr(weekly_avail, day_column, True)
-                        if not is_available:
-                            day_available = False
+                    if not self._availability_on(target_date).is_available(primary_lead.id, target_date):
+                        day_available = False
 
                 if day_available:
                     self._create_pending_schedule(run, supervisor_event, primary_lead, supervisor_datetime, False, None, None)
@@ -3127,9 +3083,6 @@ class SchedulingEngine:
         2. Primary Lead Event Specialist (fallback if Club Supervisor unavailable)
         """
         supervisor_datetime = datetime.combine(target_date, time(12, 0))
-        day_of_week = target_date.weekday()
-        day_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        day_column = day_names[day_of_week]
 
         # Try Club Supervisor first (preferred for Supervisor events)
         club_supervisor = self.db.query(self.Employee).filter_by(
@@ -3141,25 +3094,15 @@ class SchedulingEngine:
             day_available = True
 
             # Check time off
-            time_off = self.db.query(self.EmployeeTimeOff).filter(
-                self.EmployeeTimeOff.employee_id == club_supervisor.id,
-                self.EmployeeTimeOff.start_date <= target_date,
-                self.EmployeeTimeOff.end_date >= target_date
-            ).first()
+            time_off = self._availability_on(target_date).has_time_off(club_supervisor.id, target_date)
 
             if time_off:
                 day_available = False
 
             # Check weekly availability
             if day_available:
-                weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                    employee_id=club_supervisor.id
-                ).first()
-
-                if weekly_avail:
-                    is_available = getattr(weekly_avail, day_column, True)
-                    if not is_available:
-                        day_available = False
+                if not self._availability_on(target_date).is_available(club_supervisor.id, target_date):
+                    day_available = False
 
             if day_available:
                 self._create_pending_schedule(run, supervisor_event, club_supervisor, supervisor_datetime, False, None, None)
@@ -3176,25 +3119,15 @@ class SchedulingEngine:
             day_available = True
 
             # Check time off
-            time_off = self.db.query(self.EmployeeTimeOff).filter(
-                self.EmployeeTimeOff.employee_id == primary_lead.id,
-                self.EmployeeTimeOff.start_date <= target_date,
-                self.EmployeeTimeOff.end_date >= target_date
-            ).first()
+            time_off = self._availability_on(target_date).has_time_off(primary_lead.id, target_date)
 
             if time_off:
                 day_available = False
 
             # Check weekly availability
             if day_available:
-                weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                    employee_id=primary_lead.id
-                ).first()
-
-                if weekly_avail:
-                    is_available = getattr(weekly_avail, day_column, True)
-                    if not is_available:
-                        day_available = False
+                if not self._availability_on(target_date).is_available(primary_lead.id, target_date):
+                    day_available = False
 
             if day_available:
                 self._create_pending_schedule(run, supervisor_event, primary_lead, supervisor_datetime, False, None, None)
@@ -3296,29 +3229,15 @@ class SchedulingEngine:
                 day_available = True
 
                 # Check time off
-                time_off = self.db.query(self.EmployeeTimeOff).filter(
-                    self.EmployeeTimeOff.employee_id == club_supervisor.id,
-                    self.EmployeeTimeOff.start_date <= target_date,
-                    self.EmployeeTimeOff.end_date >= target_date
-                ).first()
+                time_off = self._availability_on(target_date).has_time_off(club_supervisor.id, target_date)
 
                 if time_off:
                     day_available = False
 
                 # Check weekly availability
                 if day_available:
-                    day_of_week = supervisor_datetime.weekday()  # 0=Monday, 6=Sunday
-                    day_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-                    day_column = day_names[day_of_week]
-
-                    weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                        employee_id=club_supervisor.id
-                    ).first()
-
-                    if weekly_avail:
-                        is_available = getattr(weekly_avail, day_column, True)
-                        if not is_available:
-                            day_available = False
+                    if not self._availability_on(target_date).is_available(club_supervisor.id, target_date):
+                        day_available = False
 
                 if day_available:
                     self._create_pending_schedule(run, supervisor_event, club_supervisor, supervisor_datetime, False, None, None)
@@ -3334,29 +3253,15 @@ class SchedulingEngine:
                     day_available = True
 
                     # Check time off
-                    time_off = self.db.query(self.EmployeeTimeOff).filter(
-                        self.EmployeeTimeOff.employee_id == primary_lead.id,
-                        self.EmployeeTimeOff.start_date <= target_date,
-                        self.EmployeeTimeOff.end_date >= target_date
-                    ).first()
+                    time_off = self._availability_on(target_date).has_time_off(primary_lead.id, target_date)
 
                     if time_off:
                         day_available = False
 
                     # Check weekly availability
                     if day_available:
-                        day_of_week = supervisor_datetime.weekday()
-                        day_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-                        day_column = day_names[day_of_week]
-
-                        weekly_avail = self.db.query(self.EmployeeWeeklyAvailability).filter_by(
-                            employee_id=primary_lead.id
-                        ).first()
-
-                        if weekly_avail:
-                            is_available = getattr(weekly_avail, day_column, True)
-                            if not is_available:
-                                day_available = False
+                        if not self._availability_on(target_date).is_available(primary_lead.id, target_date):
+                            day_available = False
 
                     if day_available:
                         self._create_pending_schedule(run, supervisor_event, primary_lead, supervisor_datetime, False, None, None)
@@ -3613,6 +3518,19 @@ class SchedulingEngine:
         
         schedule_datetime = datetime.combine(schedule_date, schedule_time)
 
+        # Evaluate the whole roster once; candidates are then picked from it
+        from .what_if_service import WhatIfService
+        what_if = WhatIfService(self.db, self.models)
+        what_if.use_availability(self.availability)
+        candidates = what_if.evaluate(event, schedule_datetime)
+
+        def first_available(job_title):
+            employees = self.db.query(self.Employee).filter(
+                self.Employee.job_title == job_title,
+                self.Employee.is_active == True
+            ).all()
+            return next((emp for emp in employees if candidates.is_available(emp.id)), None)
+
         # Try to find an available employee based on event type
         employee = None
 
@@ -3627,15 +3545,7 @@ class SchedulingEngine:
             employee = self.rotation_manager.get_secondary_lead(schedule_datetime)
         elif event.event_type == 'Core':
             # Try Lead Event Specialists
-            leads = self.db.query(self.Employee).filter(
-                self.Employee.job_title == 'Lead Event Specialist',
-                self.Employee.is_active == True
-            ).all()
-            for lead in leads:
-                validation = self.validator.validate_assignment(event, lead, schedule_datetime)
-                if validation.is_valid:
-                    employee = lead
-                    break
+            employee = first_available('Lead Event Specialist')
         elif event.event_type == 'Supervisor':
             # Try Club Supervisor
             employee = self.db.query(self.Employee).filter_by(
@@ -3645,27 +3555,11 @@ class SchedulingEngine:
 
         # Fallback: Try any Lead Event Specialist
         if not employee:
-            leads = self.db.query(self.Employee).filter(
-                self.Employee.job_title == 'Lead Event Specialist',
-                self.Employee.is_active == True
-            ).all()
-            for lead in leads:
-                validation = self.validator.validate_assignment(event, lead, schedule_datetime)
-                if validation.is_valid:
-                    employee = lead
-                    break
+            employee = first_available('Lead Event Specialist')
 
         # Fallback: Try any Event Specialist
         if not employee:
-            specialists = self.db.query(self.Employee).filter(
-                self.Employee.job_title == 'Event Specialist',
-                self.Employee.is_active == True
-            ).all()
-            for specialist in specialists:
-                validation = self.validator.validate_assignment(event, specialist, schedule_datetime)
-                if validation.is_valid:
-                    employee = specialist
-                    break
+            employee = first_available('Event Specialist')
 
         if employee:
             return {
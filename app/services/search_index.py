@@ -0,0 +1,347 @@
+"""
+Full-Text Search Index
+
+Ranked prefix search over events and employees for universal search and the
+/events smart search, replacing leading-wildcard ILIKE scans that cannot use
+an index.
+
+Backends:
+- SQLite: FTS5 tables (events_fts, employees_fts) kept in sync by triggers,
+  so bulk SQL and Crossmark refreshes are indexed too. Ranked with bm25().
+- PostgreSQL: GIN expression indexes over to_tsvector('simple', ...),
+  matched with prefix tsqueries and ranked with ts_rank().
+- Anything else (or SQLite built without FTS5): ILIKE fallback.
+
+Schedules are searched through the event and employee indexes (a schedule
+matches when its event or employee does), so there is no third index to
+keep in sync.
+"""
+import logging
+import re
+from typing import Dict, Iterable, List, Sequence
+
+from sqlalchemy import Text, cast, event as sa_event, func, literal, literal_column, or_, select, table, text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+BACKEND_FTS5 = 'fts5'
+BACKEND_TSVECTOR = 'tsvector'
+BACKEND_LIKE = 'like'
+
+# Indexed columns
+EVENT_FIELDS = ('project_name', 'project_ref_num', 'store_name', 'location_mvid')
+EMPLOYEE_FIELDS = ('name', 'emp_id', 'email')
+EMPLOYEE_COLUMN_MAP = {'name': 'name', 'emp_id': 'id', 'email': 'email'}
+
+# Column groups with their own PostgreSQL expression index (column-restricted
+# searches must use the same expression as an index to be fast)
+PG_EVENT_GROUPS = (EVENT_FIELDS, ('project_name',), ('store_name', 'location_mvid'))
+PG_EMPLOYEE_GROUPS = (('name', 'id', 'email'), ('name',))
+
+MAX_TERMS = 8
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Backend per engine URL, detected on first search
+_backend_cache: Dict[str, str] = {}
+
+
+# =============================================================================
+# DDL
+# =============================================================================
+
+_SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        project_name, project_ref_num, store_name, location_mvid,
+        tokenize="unicode61 remove_diacritics 2", prefix='2 3')""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5(
+        emp_id, name, email,
+        tokenize="unicode61 remove_diacritics 2", prefix='2 3')""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, project_name, project_ref_num, store_name, location_mvid)
+        VALUES (new.id, new.project_name, new.project_ref_num, new.store_name, new.location_mvid);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+        DELETE FROM events_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_au
+        AFTER UPDATE OF id, project_name, project_ref_num, store_name, location_mvid ON events BEGIN
+        DELETE FROM events_fts WHERE rowid = old.id;
+        INSERT INTO events_fts(rowid, project_name, project_ref_num, store_name, location_mvid)
+        VALUES (new.id, new.project_name, new.project_ref_num, new.store_name, new.location_mvid);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employees_fts_ai AFTER INSERT ON employees BEGIN
+        INSERT INTO employees_fts(emp_id, name, email) VALUES (new.id, new.name, new.email);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employees_fts_ad AFTER DELETE ON employees BEGIN
+        DELETE FROM employees_fts WHERE emp_id = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employees_fts_au AFTER UPDATE OF id, name, email ON employees BEGIN
+        DELETE FROM employees_fts WHERE emp_id = old.id;
+        INSERT INTO employees_fts(emp_id, name, email) VALUES (new.id, new.name, new.email);
+    END""",
+]
+
+_SQLITE_POPULATE = [
+    "DELETE FROM events_fts",
+    """INSERT INTO events_fts(rowid, project_name, project_ref_num, store_name, location_mvid)
+        SELECT id, project_name, project_ref_num, store_name, location_mvid FROM events""",
+    "DELETE FROM employees_fts",
+    "INSERT INTO employees_fts(emp_id, name, email) SELECT id, name, email FROM employees",
+]
+
+_SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS events_fts_ai",
+    "DROP TRIGGER IF EXISTS events_fts_ad",
+    "DROP TRIGGER IF EXISTS events_fts_au",
+    "DROP TRIGGER IF EXISTS employees_fts_ai",
+    "DROP TRIGGER IF EXISTS employees_fts_ad",
+    "DROP TRIGGER IF EXISTS employees_fts_au",
+    "DROP TABLE IF EXISTS events_fts",
+    "DROP TABLE IF EXISTS employees_fts",
+]
+
+
+def _pg_vector_sql(columns: Sequence[str]) -> str:
+    """tsvector expression over columns (identical in index DDL and queries)"""
+    parts = " || ' ' || ".join(f"coalesce({col}::text, '')" for col in columns)
+    return f"to_tsvector('simple', {parts})"
+
+
+def _pg_index_name(table_name: str, columns: Sequence[str]) -> str:
+    return f"ix_{table_name}_fts_{'_'.join(columns)}"
+
+
+def _pg_ddl() -> List[str]:
+    statements = []
+    for table_name, groups in (('events', PG_EVENT_GROUPS), ('employees', PG_EMPLOYEE_GROUPS)):
+        for columns in groups:
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {_pg_index_name(table_name, columns)} "
+                f"ON {table_name} USING gin (({_pg_vector_sql(columns)}))"
+            )
+    return statements
+
+
+def _pg_drop() -> List[str]:
+    return [
+        f"DROP INDEX IF EXISTS {_pg_index_name(table_name, columns)}"
+        for table_name, groups in (('events', PG_EVENT_GROUPS), ('employees', PG_EMPLOYEE_GROUPS))
+        for columns in groups
+    ]
+
+
+def install_search_index(connection, rebuild: bool = False) -> str:
+    """
+    Create the search index for the connection's database (idempotent)
+
+    Args:
+        connection: SQLAlchemy connection
+        rebuild: Repopulate the SQLite FTS tables from the source tables
+
+    Returns:
+        str: Backend that will be used for searches
+    """
+    dialect = connection.dialect.name
+    _backend_cache.pop(str(connection.engine.url), None)
+
+    if dialect == 'sqlite':
+        existed = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_fts'"
+        )).first() is not None
+        try:
+            for statement in _SQLITE_DDL:
+                connection.execute(text(statement))
+        except OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable, search falls back to LIKE: {e}")
+            return BACKEND_LIKE
+        if rebuild or not existed:
+            for statement in _SQLITE_POPULATE:
+                connection.execute(text(statement))
+        return BACKEND_FTS5
+
+    if dialect == 'postgresql':
+        for statement in _pg_ddl():
+            connection.execute(text(statement))
+        return BACKEND_TSVECTOR
+
+    return BACKEND_LIKE
+
+
+def drop_search_index(connection) -> None:
+    """Drop the search index objects"""
+    dialect = connection.dialect.name
+    _backend_cache.pop(str(connection.engine.url), None)
+    if dialect == 'sqlite':
+        for statement in _SQLITE_DROP:
+            connection.execute(text(statement))
+    elif dialect == 'postgresql':
+        for statement in _pg_drop():
+            connection.execute(text(statement))
+
+
+def _after_create(target, connection, **kw):
+    install_search_index(connection)
+
+
+def _before_drop(target, connection, **kw):
+    drop_search_index(connection)
+
+
+def register_search_index(metadata) -> None:
+    """Install/drop the search index with create_all()/drop_all() (idempotent)"""
+    if not sa_event.contains(metadata, 'after_create', _after_create):
+        sa_event.listen(metadata, 'after_create', _after_create)
+        sa_event.listen(metadata, 'before_drop', _before_drop)
+
+
+# =============================================================================
+# Queries
+# =============================================================================
+
+def search_terms(query: str) -> List[str]:
+    """Split user input into index tokens (punctuation dropped)"""
+    return _TOKEN_RE.findall(query or '')[:MAX_TERMS]
+
+
+class SearchIndex:
+    """
+    Builds ranked match subqueries for events and employees
+
+    Each search method returns a subquery with columns (id, rank) - lower
+    rank is a better match - to join or IN-filter against, or None when the
+    query has no searchable terms.
+
+    Usage:
+        search = SearchIndex(db.session, models)
+        matches = search.events('acme 123')
+        events = Event.query.join(matches, Event.id == matches.c.id).order_by(matches.c.rank)
+    """
+
+    def __init__(self, db_session, models):
+        """
+        Initialize the search index
+
+        Args:
+            db_session: SQLAlchemy database session
+            models: Model registry from get_models()
+        """
+        self.db = db_session
+        self.models = models
+
+    @property
+    def backend(self) -> str:
+        """Backend in use for this database"""
+        bind = self.db.get_bind()
+        key = str(bind.url)
+        backend = _backend_cache.get(key)
+        if backend is None:
+            backend = self._detect_backend(bind)
+            _backend_cache[key] = backend
+        return backend
+
+    def _detect_backend(self, bind) -> str:
+        if bind.dialect.name == 'sqlite':
+            found = self.db.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_fts'"
+            )).first()
+            if found is not None:
+                return BACKEND_FTS5
+            logger.warning("events_fts missing - run migrations; search falls back to LIKE")
+            return BACKEND_LIKE
+        if bind.dialect.name == 'postgresql':
+            return BACKEND_TSVECTOR
+        return BACKEND_LIKE
+
+    # Public API -----------------------------------------------------------
+
+    def events(self, query: str, fields: Iterable[str] = None):
+        """
+        Events matching every term as a word prefix
+
+        Args:
+            query: User search text
+            fields: Restrict to these EVENT_FIELDS (default: all)
+
+        Returns:
+            Subquery (id, rank) or None
+        """
+        terms = search_terms(query)
+        if not terms:
+            return None
+        fields = tuple(fields or EVENT_FIELDS)
+        Event = self.models['Event']
+
+        backend = self.backend
+        if backend == BACKEND_FTS5:
+            return self._fts5_subquery('events_fts', literal_column('events_fts.rowid'), terms, fields)
+        if backend == BACKEND_TSVECTOR:
+            return self._tsvector_subquery(Event, Event.id, terms, fields)
+        return self._like_subquery(Event, Event.id, terms, [getattr(Event, f) for f in fields])
+
+    def employees(self, query: str, fields: Iterable[str] = None):
+        """
+        Employees matching every term as a word prefix
+
+        Args:
+            query: User search text
+            fields: Restrict to these EMPLOYEE_FIELDS (default: all)
+
+        Returns:
+            Subquery (id, rank) or None
+        """
+        terms = search_terms(query)
+        if not terms:
+            return None
+        fields = tuple(fields or EMPLOYEE_FIELDS)
+        Employee = self.models['Employee']
+
+        backend = self.backend
+        if backend == BACKEND_FTS5:
+            return self._fts5_subquery('employees_fts', literal_column('employees_fts.emp_id'), terms, fields)
+        columns = [EMPLOYEE_COLUMN_MAP[f] for f in fields]
+        if backend == BACKEND_TSVECTOR:
+            return self._tsvector_subquery(Employee, Employee.id, terms, columns)
+        return self._like_subquery(Employee, Employee.id, terms, [getattr(Employee, c) for c in columns])
+
+    # Backends -------------------------------------------------------------
+
+    def _fts5_subquery(self, fts_table: str, id_column, terms: List[str], fields: Sequence[str]):
+        """FTS5 MATCH with quoted prefix terms, ranked by bm25"""
+        column_filter = '{' + ' '.join(fields) + '} : '
+        expression = ' AND '.join(f'{column_filter}"{term}"*' for term in terms)
+        return select(
+            id_column.label('id'),
+            literal_column(f'bm25({fts_table})').label('rank')
+        ).select_from(table(fts_table)).where(
+            literal_column(fts_table).op('MATCH')(literal(expression))
+        ).subquery()
+
+    def _tsvector_subquery(self, model, id_column, terms: List[str], columns: Sequence[str]):
+        """tsvector @@ prefix tsquery, ranked by ts_rank"""
+        vector = literal_column(_pg_vector_sql(columns))
+        tsquery = func.to_tsquery('simple', ' & '.join(f'{term}:*' for term in terms))
+        return select(
+            id_column.label('id'),
+            (-func.ts_rank(vector, tsquery)).label('rank')
+        ).where(vector.op('@@')(tsquery)).subquery()
+
+    def _like_subquery(self, model, id_column, terms: List[str], columns):
+        """ILIKE fallback (every term in any column, unranked)"""
+        conditions = [
+            or_(*[cast(column, Text).ilike(f'%{term}%') for column in columns])
+            for term in terms
+        ]
+        return select(id_column.label('id'), literal(0).label('rank')).where(*conditions).subquery()
+
+
+def get_search_index(db_session=None, models=None) -> SearchIndex:
+    """Get a SearchIndex bound to the app's session and models"""
+    if db_session is None:
+        from flask import current_app
+        db_session = current_app.extensions['sqlalchemy'].session
+    if models is None:
+        from app.models import get_models
+        models = get_models()
+    return SearchIndex(db_session, models)
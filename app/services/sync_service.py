@@ -5,6 +5,7 @@ Handles asynchronous synchronization of schedules, employees, and events
 import logging
 from datetime import datetime, timedelta
 from celery import Celery, Task
+from celery.schedules import crontab
 from flask import Flask
 
 # Configure logging
@@ -37,8 +38,8 @@ class FlaskTask(Task):
 
     def __call__(self, *args, **kwargs):
         if self._app is None:
-            from app import app as flask_app
-            self._app = flask_app
+            from app import create_app
+            FlaskTask._app = create_app()
 
         with self._app.app_context():
             return super().__call__(*args, **kwargs)
@@ -324,62 +325,106 @@ def refresh_events_from_crossmark():
     Periodic task to refresh events from Crossmark API
     This should be run periodically (e.g., every hour) to keep data fresh
 
+    Runs a near-term delta refresh under the shared refresh lock and records
+    the refresh time, so logins shortly afterwards can skip their own pull.
+
     Returns:
         dict: Result of the refresh operation
     """
     try:
-        from app import app, db, Event
-        from app.integrations.external_api.session_api_service import session_api as external_api
+        from app.services.database_refresh_service import (
+            DatabaseRefreshService, acquire_refresh_lock, release_refresh_lock
+        )
 
-        logger.info("Starting periodic event refresh from Crossmark")
+        owner = f"beat:{refresh_events_from_crossmark.request.id or 'local'}"
+        acquired, current_owner = acquire_refresh_lock(owner)
+        if not acquired:
+            logger.info(f"Skipping periodic event refresh: refresh {current_owner} in progress")
+            return {'success': True, 'message': 'Refresh already in progress'}
 
-        # Get all planning events
-        events_data = external_api.get_all_planning_events()
+        try:
+            logger.info("Starting periodic event refresh from Crossmark")
+            result = DatabaseRefreshService().refresh_delta()
+        finally:
+            release_refresh_lock(owner)
+
+        logger.info(f"Event refresh completed: {result.get('stats') or result.get('message')}")
+        return {
+            'success': result.get('success', False),
+            'message': result.get('message'),
+            'stats': result.get('stats')
+        }
 
-        if not events_data:
-            logger.warning("No events data received from Crossmark API")
-            return {'success': False, 'message': 'No events data received'}
+    except Exception as exc:
+        logger.error(f"Exception during event refresh: {str(exc)}")
+        return {'success': False, 'message': str(exc)}
 
-        # Process events
-        records = events_data.get('mplans', [])
-        created_count = 0
-        updated_count = 0
 
-        for record in records:
-            try:
-                external_id = str(record.get('mPlanID', ''))
+@celery_app.task
+def refresh_ml_feature_store():
+    """
+    Nightly task to incrementally update the ML feature store
+    Re-aggregates the last week plus new days and saves the snapshot to
+    ML_FEATURE_STORE_PATH for training and online inference
 
-                # Check if event already exists
-                existing_event = Event.query.filter_by(external_id=external_id).first()
+    Returns:
+        dict: Result of the refresh operation
+    """
+    try:
+        from flask import current_app
+        from app.models import get_models, get_db
+        from app.ml.features.feature_store import refresh_feature_store
 
-                if existing_event:
-                    # Update existing event if needed
-                    # (Add update logic here if needed)
-                    updated_count += 1
-                else:
-                    # Create new event
-                    # (Add creation logic here using sync_engine methods)
-                    created_count += 1
+        if not current_app.config.get('ML_FEATURE_STORE_ENABLED', False):
+            return {'success': True, 'message': 'Feature store disabled'}
 
-            except Exception as e:
-                logger.error(f"Error processing event: {str(e)}")
-                continue
+        store = refresh_feature_store(get_db().session, get_models(), current_app.config)
 
-        logger.info(f"Event refresh completed: {created_count} created, {updated_count} updated")
+        logger.info(f"ML feature store refreshed through {store.built_through}")
         return {
             'success': True,
-            'message': f'Refreshed events: {created_count} created, {updated_count} updated'
+            'message': f'Feature store refreshed: {len(store.employee_index)} employees, {store.num_days} days'
         }
 
     except Exception as exc:
-        logger.error(f"Exception during event refresh: {str(exc)}")
+        logger.error(f"Exception during feature store refresh: {str(exc)}")
         return {'success': False, 'message': str(exc)}
 
 
+@celery_app.task(bind=True, max_retries=None)
+def run_background_job(self, job_id):
+    """
+    Execute a job submitted through app.services.job_runner
+
+    Used when JOB_RUNNER_BACKEND is 'celery'; progress and the result are
+    written to the job record, which the web process streams to the browser.
+    A job whose type has no free concurrency slot is retried after
+    SLOT_WAIT_SECONDS rather than blocking the worker.
+
+    Args:
+        job_id: Job ID returned by submit_job()
+
+    Returns:
+        dict: Final job status
+    """
+    from app.services.job_runner import execute_job, is_waiting_for_slot, SLOT_WAIT_SECONDS
+
+    record = execute_job(job_id)
+    if record is None and is_waiting_for_slot(job_id):
+        raise self.retry(countdown=SLOT_WAIT_SECONDS)
+    if record is None:
+        return {'success': False, 'message': f'Job {job_id} not found'}
+    return {'success': record.get('status') == 'completed', 'status': record.get('status')}
+
+
 # Periodic task schedule configuration
 celery_app.conf.beat_schedule = {
     'refresh-events-every-hour': {
-        'task': 'services.sync_service.refresh_events_from_crossmark',
+        'task': 'app.services.sync_service.refresh_events_from_crossmark',
         'schedule': 3600.0,  # Run every hour
     },
+    'refresh-ml-feature-store-nightly': {
+        'task': 'app.services.sync_service.refresh_ml_feature_store',
+        'schedule': crontab(hour=2, minute=30),  # Run nightly after the day closes
+    },
 }
@@ -5,6 +5,8 @@ Provides availability data for the Employee Availability and Available Schedule
 from datetime import date, timedelta
 from sqlalchemy import func, and_, or_
 
+from .availability_matrix import AvailabilityService
+
 
 # Event types that are always considered "main events" regardless of duration
 MAIN_EVENT_TYPES = {'Core', 'Juicer Production', 'Juicer Deep Clean'}
@@ -12,8 +14,6 @@ MAIN_EVENT_TYPES = {'Core', 'Juicer Production', 'Juicer Deep Clean'}
 # Minimum duration (minutes) for an event to be considered a "main event"
 MAIN_EVENT_MIN_DURATION = 240
 
-DAY_NAMES = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-
 
 class WeeklyPlanningService:
     """Service for computing employee availability and schedule block data."""
@@ -27,6 +27,7 @@ class WeeklyPlanningService:
         self.CompanyHoliday = models['CompanyHoliday']
         self.Event = models['Event']
         self.Schedule = models['Schedule']
+        self.availability = AvailabilityService(db_session, models)
 
     def _get_holidays_in_range(self, start, end):
         """Return set of dates that are company holidays in the range."""
@@ -38,56 +39,6 @@ class WeeklyPlanningService:
             self.Employee.is_active == True
         ).order_by(self.Employee.name).all()
 
-    def _get_weekly_availability_map(self, employee_ids):
-        """Return dict of employee_id -> EmployeeWeeklyAvailability record."""
-        records = self.session.query(self.EmployeeWeeklyAvailability).filter(
-            self.EmployeeWeeklyAvailability.employee_id.in_(employee_ids)
-        ).all()
-        return {r.employee_id: r for r in records}
-
-    def _get_overrides_in_range(self, employee_ids, start, end):
-        """Return list of EmployeeAvailabilityOverride records active in the range."""
-        return self.session.query(self.EmployeeAvailabilityOverride).filter(
-            self.EmployeeAvailabilityOverride.employee_id.in_(employee_ids),
-            self.EmployeeAvailabilityOverride.start_date <= end,
-            self.EmployeeAvailabilityOverride.end_date >= start
-        ).all()
-
-    def _get_time_off_in_range(self, employee_ids, start, end):
-        """Return list of EmployeeTimeOff records overlapping the range."""
-        return self.session.query(self.EmployeeTimeOff).filter(
-            self.EmployeeTimeOff.employee_id.in_(employee_ids),
-            self.EmployeeTimeOff.start_date <= end,
-            self.EmployeeTimeOff.end_date >= start
-        ).all()
-
-    def _is_employee_available_on_date(self, emp_id, check_date, weekly_map, overrides_by_emp, time_off_by_emp):
-        """Check if a single employee is available on a specific date."""
-        weekday = check_date.weekday()  # 0=Mon, 6=Sun
-        day_name = DAY_NAMES[weekday]
-
-        # Check overrides first (highest priority)
-        for override in overrides_by_emp.get(emp_id, []):
-            if override.start_date <= check_date <= override.end_date:
-                override_val = override.get_day_availability(weekday)
-                if override_val is not None:
-                    if not override_val:
-                        return False
-                    # override_val is True, skip weekly check for this day
-                    break
-        else:
-            # No active override found - check weekly availability
-            weekly = weekly_map.get(emp_id)
-            if weekly and not getattr(weekly, day_name, True):
-                return False
-
-        # Check time off
-        for to in time_off_by_emp.get(emp_id, []):
-            if to.start_date <= check_date <= to.end_date:
-                return False
-
-        return True
-
     def get_available_employees(self, start, end):
         """
         Get available employees for each day in the date range.
@@ -109,18 +60,9 @@ class WeeklyPlanningService:
             result['_holidays'] = holidays
             return result
 
-        weekly_map = self._get_weekly_availability_map(emp_ids)
-        overrides = self._get_overrides_in_range(emp_ids, start, end)
-        time_offs = self._get_time_off_in_range(emp_ids, start, end)
-
-        # Index overrides and time_off by employee_id
-        overrides_by_emp = {}
-        for o in overrides:
-            overrides_by_emp.setdefault(o.employee_id, []).append(o)
-
-        time_off_by_emp = {}
-        for to in time_offs:
-            time_off_by_emp.setdefault(to.employee_id, []).append(to)
+        # Weekly availability, overrides and time off as an employees x days matrix
+        matrix = self.availability.matrix(start, end)
+        names = {emp.id: emp.name for emp in employees}
 
         result = {}
         current = start
@@ -128,13 +70,10 @@ class WeeklyPlanningService:
             if current in holidays:
                 result[current] = []
             else:
-                available = []
-                for emp in employees:
-                    if self._is_employee_available_on_date(
-                        emp.id, current, weekly_map, overrides_by_emp, time_off_by_emp
-                    ):
-                        available.append({'id': emp.id, 'name': emp.name})
-                result[current] = available
+                result[current] = [
+                    {'id': emp_id, 'name': names[emp_id]}
+                    for emp_id in matrix.free_employees(current, emp_ids)
+                ]
             current += timedelta(days=1)
 
         result['_holidays'] = holidays
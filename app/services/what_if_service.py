@@ -0,0 +1,388 @@
+"""
+What-If Assignment Service
+Answers "which employees can take this event at this time?" for the whole
+roster in one vectorized evaluation, for the employee pickers and single-event
+scheduling.
+
+A WeekConstraintState holds everything the ConstraintValidator rules need for
+one Sunday-Saturday week, loaded with a handful of set-based queries:
+
+- the roster (ids, names, job titles, active flags)
+- the week's AvailabilityMatrix (weekly pattern, overrides, time off)
+- company holidays and per-date unavailability marks
+- bookings: posted schedules and pending schedules from unapproved runs,
+  with their start/end times and event types
+
+WhatIfService.evaluate() then applies the validator's hard rules (past date,
+holiday, time off, availability, role, daily/weekly Core limits, overlaps,
+due date) as boolean arrays over the roster. States are cached per week on
+the service instance; book() and release() apply a change to the cached
+state instead of reloading it.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .availability_matrix import AvailabilityMatrix, AvailabilityService
+from .constraint_validator import ConstraintValidator
+
+JUICER_EVENT_TYPES = ('Juicer Production', 'Juicer Survey', 'Juicer Deep Clean')
+BLOCKING_EVENT_TYPES = ('Core', 'Juicer Production')  # Event types that cause overlap conflicts
+
+
+def week_start_of(day: date) -> date:
+    """Sunday of the Sunday-Saturday week containing day"""
+    return day - timedelta(days=(day.weekday() + 1) % 7)
+
+
+class WhatIfResult:
+    """Outcome of one evaluation: a pass/fail mask per rule over the roster"""
+
+    def __init__(self, state: 'WeekConstraintState', masks: Dict[str, np.ndarray]):
+        self.state = state
+        self.masks = masks
+        ok = np.ones(len(state.employee_ids), dtype=bool)
+        for mask in masks.values():
+            ok &= mask
+        self.ok = ok
+
+    def available_ids(self, active_only: bool = True) -> List[str]:
+        """Employee ids passing every rule, in roster order (by name)"""
+        mask = self.ok & self.state.is_active if active_only else self.ok
+        return [self.state.employee_ids[row] for row in np.flatnonzero(mask)]
+
+    def is_available(self, employee_id: str) -> bool:
+        row = self.state.index.get(employee_id)
+        return row is not None and bool(self.ok[row])
+
+    def reasons(self, employee_id: str) -> List[str]:
+        """Names of the rules the employee fails"""
+        row = self.state.index.get(employee_id)
+        if row is None:
+            return ['unknown_employee']
+        return [rule for rule, mask in self.masks.items() if not mask[row]]
+
+
+class WeekConstraintState:
+    """Roster, availability and bookings for one Sunday-Saturday week"""
+
+    def __init__(self, week_start: date, employees: Sequence[tuple], matrix: AvailabilityMatrix,
+                 holidays: Iterable[date], marked_unavailable, bookings: Dict[str, np.ndarray]):
+        """
+        Args:
+            week_start: Sunday of the week
+            employees: (id, name, job_title, is_active, juicer_trained) rows
+            matrix: AvailabilityMatrix covering the week
+            holidays: Company holiday dates in the week
+            marked_unavailable: Boolean array [employee, day] from per-date
+                                EmployeeAvailability rows
+            bookings: Parallel arrays row, start, end (datetime64[m]),
+                      event_type, schedule_id (-1 for pending schedules)
+        """
+        self.week_start = week_start
+        self.days = [week_start + timedelta(days=i) for i in range(7)]
+        self.employee_ids = [row[0] for row in employees]
+        self.names = [row[1] for row in employees]
+        self.index = {emp_id: i for i, emp_id in enumerate(self.employee_ids)}
+        self.job_titles = np.array([row[2] or '' for row in employees], dtype=object)
+        self.is_active = np.array([bool(row[3]) for row in employees], dtype=bool)
+        self.juicer_trained = np.array([bool(row[4]) for row in employees], dtype=bool)
+        self.holidays = set(holidays)
+        self.marked_unavailable = marked_unavailable
+
+        # Matrix rows in roster order; employees missing from it are free
+        rows = np.array([matrix.index.get(emp_id, -1) for emp_id in self.employee_ids], dtype=np.int64)
+        known = rows >= 0
+        columns = [matrix.days.index(d) for d in self.days]
+        self.available = np.ones((len(rows), 7), dtype=bool)
+        self.time_off = np.zeros((len(rows), 7), dtype=bool)
+        self.available[known] = matrix.available[np.ix_(rows[known], columns)]
+        self.time_off[known] = matrix.time_off[np.ix_(rows[known], columns)]
+
+        self.row = bookings['row']
+        self.start = bookings['start']
+        self.end = bookings['end']
+        self.event_type = bookings['event_type']
+        self.schedule_id = bookings['schedule_id']
+
+    def column(self, day: date) -> int:
+        return (day - self.week_start).days
+
+    # ------------------------------------------------------------------
+    # Deltas
+    # ------------------------------------------------------------------
+
+    def book(self, employee_id: str, event_type: str, start: datetime, duration_minutes: int,
+             schedule_id: Optional[int] = None) -> None:
+        """Add an assignment made after the state was loaded"""
+        row = self.index.get(employee_id)
+        if row is None:
+            return
+        begin = np.datetime64(start, 'm')
+        self.row = np.append(self.row, row)
+        self.start = np.append(self.start, begin)
+        self.end = np.append(self.end, begin + np.timedelta64(int(duration_minutes), 'm'))
+        self.event_type = np.append(self.event_type, np.array([event_type], dtype=object))
+        self.schedule_id = np.append(self.schedule_id, -1 if schedule_id is None else schedule_id)
+
+    def release(self, schedule_id: int) -> None:
+        """Drop a posted schedule that was moved or removed"""
+        keep = self.schedule_id != schedule_id
+        self.row = self.row[keep]
+        self.start = self.start[keep]
+        self.end = self.end[keep]
+        self.event_type = self.event_type[keep]
+        self.schedule_id = self.schedule_id[keep]
+
+    # ------------------------------------------------------------------
+    # Counts
+    # ------------------------------------------------------------------
+
+    def _kept(self, exclude_schedule_ids: Optional[Iterable[int]]) -> np.ndarray:
+        if not exclude_schedule_ids:
+            return np.ones(len(self.row), dtype=bool)
+        return ~np.isin(self.schedule_id, list(exclude_schedule_ids))
+
+    def core_counts(self, day: Optional[date] = None,
+                    exclude_schedule_ids: Optional[Iterable[int]] = None,
+                    posted_only: bool = False) -> np.ndarray:
+        """Core bookings per employee on a day (or in the whole week)"""
+        mask = self._kept(exclude_schedule_ids) & (self.event_type == 'Core')
+        if posted_only:
+            mask &= self.schedule_id >= 0
+        days = self.start.astype('datetime64[D]')
+        if day is None:
+            first = np.datetime64(self.week_start, 'D')
+            mask &= (days >= first) & (days <= first + np.timedelta64(6, 'D'))
+        else:
+            mask &= days == np.datetime64(day, 'D')
+        return np.bincount(self.row[mask], minlength=len(self.employee_ids))
+
+    def overlapping(self, start: datetime, duration_minutes: int,
+                    exclude_schedule_ids: Optional[Iterable[int]] = None) -> np.ndarray:
+        """Employees with a Core/Juicer Production booking overlapping [start, start + duration)"""
+        begin = np.datetime64(start, 'm')
+        finish = begin + np.timedelta64(int(duration_minutes), 'm')
+        mask = (self._kept(exclude_schedule_ids) & np.isin(self.event_type, BLOCKING_EVENT_TYPES)
+                & (self.start < finish) & (self.end > begin))
+        blocked = np.zeros(len(self.employee_ids), dtype=bool)
+        blocked[self.row[mask]] = True
+        return blocked
+
+    def role_mask(self, event_type: str) -> np.ndarray:
+        """Employees whose job title passes ConstraintValidator's hard role rules"""
+        titles = self.job_titles
+        ok = np.ones(len(titles), dtype=bool)
+        if event_type in JUICER_EVENT_TYPES:
+            ok &= np.isin(titles, ['Juicer Barista', 'Club Supervisor'])
+        if event_type in ConstraintValidator.LEAD_ONLY_EVENT_TYPES:
+            ok &= np.isin(titles, ['Lead Event Specialist', 'Club Supervisor'])
+        return ok
+
+    def can_work_mask(self, event_type: str) -> np.ndarray:
+        """Employee.can_work_event_type over the roster"""
+        titles = self.job_titles
+        if event_type in ['Supervisor', 'Freeosk', 'Digitals', 'Digital Setup', 'Digital Refresh', 'Digital Teardown']:
+            return np.isin(titles, ['Club Supervisor', 'Lead Event Specialist'])
+        if event_type in JUICER_EVENT_TYPES:
+            return np.isin(titles, ['Club Supervisor', 'Juicer Barista']) | self.juicer_trained
+        return np.ones(len(titles), dtype=bool)
+
+
+class WhatIfService:
+    """Roster-wide what-if evaluation of assignments against cached week states"""
+
+    def __init__(self, db_session, models: dict):
+        """
+        Initialize WhatIfService
+
+        Args:
+            db_session: SQLAlchemy database session
+            models: Dictionary of model classes (get_models())
+        """
+        self.db = db_session
+        self.Employee = models['Employee']
+        self.Event = models['Event']
+        self.Schedule = models['Schedule']
+        self.PendingSchedule = models.get('PendingSchedule')
+        self.SchedulerRunHistory = models.get('SchedulerRunHistory')
+        self.CompanyHoliday = models.get('CompanyHoliday')
+        self.EmployeeAvailability = models.get('EmployeeAvailability')
+        self.availability_service = AvailabilityService(db_session, models)
+        self.availability_matrix = None  # Shared matrix supplied by the caller
+        self._states: Dict[date, WeekConstraintState] = {}
+
+    def use_availability(self, matrix: Optional[AvailabilityMatrix]) -> None:
+        """Answer availability checks from a precomputed matrix where it covers the week"""
+        self.availability_matrix = matrix
+        self._states.clear()
+
+    def invalidate(self, day: Optional[date] = None) -> None:
+        """Forget the cached state of day's week (or of every week)"""
+        if day is None:
+            self._states.clear()
+        else:
+            self._states.pop(week_start_of(day), None)
+
+    def state(self, day: date) -> WeekConstraintState:
+        """Constraint state of the week containing day (cached)"""
+        week_start = week_start_of(day)
+        state = self._states.get(week_start)
+        if state is None:
+            state = self._states[week_start] = self._load(week_start)
+        return state
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _matrix(self, start: date, end: date) -> AvailabilityMatrix:
+        matrix = self.availability_matrix
+        if matrix is not None and matrix.covers(start) and matrix.covers(end):
+            return matrix
+        return self.availability_service.matrix(start, end)
+
+    def _event_duration(self, event_type: str, estimated_time: Optional[int]) -> int:
+        return estimated_time or self.Event.get_default_duration(event_type)
+
+    def _load(self, week_start: date) -> WeekConstraintState:
+        week_end = week_start + timedelta(days=6)
+        Employee = self.Employee
+
+        employees = self.db.query(
+            Employee.id, Employee.name, Employee.job_title, Employee.is_active, Employee.juicer_trained
+        ).order_by(Employee.name, Employee.id).all()
+        index = {row[0]: i for i, row in enumerate(employees)}
+
+        holidays = set()
+        if self.CompanyHoliday is not None:
+            holidays = set(self.CompanyHoliday.get_holidays_in_range(week_start, week_end))
+
+        marked_unavailable = np.zeros((len(employees), 7), dtype=bool)
+        if self.EmployeeAvailability is not None:
+            model = self.EmployeeAvailability
+            query = self.db.query(model.employee_id, model.date).filter(
+                model.date >= week_start, model.date <= week_end, model.is_available == False
+            )
+            for emp_id, day in query:
+                row = index.get(emp_id)
+                if row is not None:
+                    marked_unavailable[row, (day - week_start).days] = True
+
+        # Bookings starting from the day before the week so overnight events still overlap
+        window_start = datetime.combine(week_start - timedelta(days=1), datetime.min.time())
+        window_end = datetime.combine(week_end + timedelta(days=1), datetime.min.time())
+        rows, starts, durations, event_types, schedule_ids = [], [], [], [], []
+
+        def collect(query, posted):
+            for emp_id, start, event_type, estimated_time, schedule_id in query:
+                row = index.get(emp_id)
+                if row is None or start is None:
+                    continue
+                rows.append(row)
+                starts.append(start)
+                durations.append(self._event_duration(event_type, estimated_time))
+                event_types.append(event_type)
+                schedule_ids.append(schedule_id if posted else -1)
+
+        Schedule, Event = self.Schedule, self.Event
+        collect(self.db.query(
+            Schedule.employee_id, Schedule.schedule_datetime, Event.event_type, Event.estimated_time, Schedule.id
+        ).join(
+            Event, Schedule.event_ref_num == Event.project_ref_num
+        ).filter(
+            Schedule.schedule_datetime >= window_start,
+            Schedule.schedule_datetime < window_end
+        ), posted=True)
+
+        if self.PendingSchedule is not None and self.SchedulerRunHistory is not None:
+            Pending, Run = self.PendingSchedule, self.SchedulerRunHistory
+            active_runs = self.db.query(Run.id).filter(
+                Run.approved_at.is_(None),
+                Run.active_condition()
+            )
+            collect(self.db.query(
+                Pending.employee_id, Pending.schedule_datetime, Event.event_type, Event.estimated_time, Pending.id
+            ).join(
+                Event, Pending.event_ref_num == Event.project_ref_num
+            ).filter(
+                Pending.scheduler_run_id.in_(active_runs.scalar_subquery()),
+                Pending.failure_reason.is_(None),
+                Pending.status != 'superseded',
+                Pending.schedule_datetime >= window_start,
+                Pending.schedule_datetime < window_end
+            ), posted=False)
+
+        start = np.array(starts, dtype='datetime64[m]')
+        bookings = {
+            'row': np.array(rows, dtype=np.int64),
+            'start': start,
+            'end': start + np.array(durations, dtype='timedelta64[m]'),
+            'event_type': np.array(event_types, dtype=object),
+            'schedule_id': np.array(schedule_ids, dtype=np.int64),
+        }
+        return WeekConstraintState(week_start, employees, self._matrix(week_start, week_end),
+                                   holidays, marked_unavailable, bookings)
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _local_today() -> date:
+        from zoneinfo import ZoneInfo
+        from flask import current_app
+        tz_name = current_app.config.get(
+            'EXTERNAL_API_TIMEZONE', 'America/Indiana/Indianapolis'
+        )
+        return datetime.now(ZoneInfo(tz_name)).date()
+
+    def evaluate(self, event: object, schedule_datetime: datetime, duration_minutes: int = None,
+                 exclude_schedule_ids: Optional[Iterable[int]] = None) -> WhatIfResult:
+        """
+        Apply ConstraintValidator's hard rules to every employee at once
+
+        Args:
+            event: Event to assign
+            schedule_datetime: Proposed start
+            duration_minutes: Duration (default: the event's)
+            exclude_schedule_ids: Posted schedules to ignore (being moved or traded)
+
+        Returns:
+            WhatIfResult; employees passing every mask are those
+            ConstraintValidator.validate_assignment() accepts
+        """
+        if duration_minutes is None:
+            duration_minutes = self._event_duration(event.event_type, event.estimated_time)
+        day = schedule_datetime.date()
+        state = self.state(day)
+        column = state.column(day)
+        size = len(state.employee_ids)
+        exclude = list(exclude_schedule_ids or ())
+
+        def every(value: bool) -> np.ndarray:
+            return np.full(size, value, dtype=bool)
+
+        masks = {
+            'past_date': every(day >= self._local_today()),
+            'company_holiday': every(day not in state.holidays),
+            'time_off': ~state.time_off[:, column],
+            'availability': state.available[:, column],
+            'role': state.role_mask(event.event_type),
+        }
+        if event.event_type == 'Core':
+            masks['daily_limit'] = state.core_counts(day, exclude) < ConstraintValidator.MAX_CORE_EVENTS_PER_DAY
+            masks['weekly_limit'] = state.core_counts(None, exclude) < ConstraintValidator.MAX_CORE_EVENTS_PER_WEEK
+        if event.event_type != 'Supervisor':
+            masks['already_scheduled'] = ~state.overlapping(schedule_datetime, duration_minutes, exclude)
+        masks['due_date'] = every(day < event.due_datetime.date())
+        return WhatIfResult(state, masks)
+
+    def available_employee_ids(self, event: object, schedule_datetime: datetime,
+                               duration_minutes: int = None,
+                               exclude_schedule_ids: Optional[Iterable[int]] = None,
+                               active_only: bool = True) -> List[str]:
+        """Ids of employees who can take the event at schedule_datetime"""
+        result = self.evaluate(event, schedule_datetime, duration_minutes, exclude_schedule_ids)
+        return result.available_ids(active_only=active_only)
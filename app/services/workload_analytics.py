@@ -4,14 +4,19 @@ Workload Analytics Service
 Provides workload data aggregation for employee scheduling dashboard.
 Calculates event counts, total hours, and workload status per employee.
 
+Totals are summed from the EmployeeDailyStats rollup (one row per employee
+per working day, maintained by app.services.calendar_summary), so a report
+costs O(employees x days) instead of scanning every schedule in the range.
+
 Epic 2, Story 2.5: Create Workload Dashboard Backend API
 
 Author: BMAD System
 Created: 2025-10-14
 """
 
-from sqlalchemy import func, and_
-from datetime import datetime, date
+import json
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional
 
 
 class WorkloadAnalytics:
@@ -23,14 +28,70 @@ class WorkloadAnalytics:
     fairly across their team.
     """
 
-    def __init__(self, db_session):
+    def __init__(self, db_session, models=None):
         """
         Initialize WorkloadAnalytics service.
 
         Args:
             db_session: SQLAlchemy database session
+            models: Model registry (defaults to get_models())
         """
+        if models is None:
+            from app.models import get_models
+            models = get_models()
         self.db = db_session
+        self.models = models
+
+    def employee_totals(self, start_date, end_date,
+                        employee_ids: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        """
+        Per-employee totals for a date range from the daily rollup.
+
+        Missing days are built first, so results always reflect current
+        schedules.
+
+        Args:
+            start_date (date): Start of date range (inclusive)
+            end_date (date): End of date range (inclusive)
+            employee_ids: Restrict to these employees (default: all)
+
+        Returns:
+            dict: {employee_id: {
+                      "event_count": 15,
+                      "days_worked": 5,
+                      "minutes": 2550,
+                      "type_counts": {"Core": 5, "Supervisor": 5, ...}
+                  }}
+                  Employees with nothing scheduled are omitted.
+        """
+        from app.services.calendar_summary import CalendarSummaryService
+
+        EmployeeDailyStats = self.models['EmployeeDailyStats']
+        CalendarSummaryService(self.db, self.models).ensure_range(start_date, end_date + timedelta(days=1))
+
+        query = self.db.query(
+            EmployeeDailyStats.employee_id,
+            EmployeeDailyStats.event_count,
+            EmployeeDailyStats.scheduled_minutes,
+            EmployeeDailyStats.type_counts
+        ).filter(
+            EmployeeDailyStats.stat_date >= start_date,
+            EmployeeDailyStats.stat_date <= end_date
+        )
+        if employee_ids is not None:
+            query = query.filter(EmployeeDailyStats.employee_id.in_(list(employee_ids)))
+
+        totals = {}
+        for employee_id, event_count, minutes, type_counts in query:
+            entry = totals.setdefault(employee_id, {
+                'event_count': 0, 'days_worked': 0, 'minutes': 0, 'type_counts': {}
+            })
+            entry['event_count'] += event_count
+            entry['days_worked'] += 1
+            entry['minutes'] += minutes
+            for event_type, count in json.loads(type_counts or '{}').items():
+                entry['type_counts'][event_type] = entry['type_counts'].get(event_type, 0) + count
+        return totals
 
     def get_workload_data(self, start_date, end_date):
         """
@@ -67,41 +128,28 @@ class WorkloadAnalytics:
                     }
                 }
         """
-        from models import Employee, Schedule, Event
-
-        # Query: Group schedules by employee, count events, sum hours
-        workload_query = self.db.session.query(
-            Employee.id,
-            Employee.name,
-            func.count(Schedule.id).label('event_count'),
-            func.sum(Event.estimated_time / 60.0).label('total_hours')  # Convert minutes to hours
-        ).join(
-            Schedule, Employee.id == Schedule.employee_id
-        ).join(
-            Event, Schedule.event_ref_num == Event.project_ref_num
-        ).filter(
-            and_(
+        Employee = self.models['Employee']
+
+        totals = self.employee_totals(start_date, end_date)
+        names = dict(
+            self.db.query(Employee.id, Employee.name).filter(
                 Employee.is_active == True,
-                func.date(Schedule.schedule_datetime) >= start_date,
-                func.date(Schedule.schedule_datetime) <= end_date
+                Employee.id.in_(list(totals))
             )
-        ).group_by(
-            Employee.id, Employee.name
-        ).order_by(
-            func.count(Schedule.id).desc()  # Sort by event count descending
-        ).all()
+        ) if totals else {}
 
         # Calculate status for each employee
         employees = []
-        for emp_id, emp_name, event_count, total_hours in workload_query:
-            status = self._calculate_status(event_count)
+        for emp_id, emp_name in names.items():
+            entry = totals[emp_id]
             employees.append({
                 'id': emp_id,
                 'name': emp_name,
-                'event_count': event_count,
-                'total_hours': round(total_hours or 0, 1),  # Handle null, round to 1 decimal
-                'status': status
+                'event_count': entry['event_count'],
+                'total_hours': round(entry['minutes'] / 60.0, 1),  # Convert minutes to hours
+                'status': self._calculate_status(entry['event_count'])
             })
+        employees.sort(key=lambda e: -e['event_count'])  # Sort by event count descending
 
         return {
             'employees': employees,
@@ -119,6 +119,14 @@ function handleFileImport(file, apiUrl, button, buttonText) {
         body: formData
     })
         .then(response => response.json())
+        .then(data => {
+            if (data.job_id) {
+                // Large files are imported by a background job
+                showImportStatus('Importing in the background...', 'loading');
+                return waitForImportJob(data.job_id);
+            }
+            return data;
+        })
         .then(data => {
             if (data.error) {
                 showImportStatus(`Error: ${data.error}`, 'error');
@@ -147,6 +155,38 @@ function handleFileImport(file, apiUrl, button, buttonText) {
         });
 }
 
+/**
+ * Poll a background import job until it finishes.
+ *
+ * @param {string} jobId - Job ID returned by the import endpoint
+ * @returns {Promise<Object>} The import result, or an object with an error
+ */
+function waitForImportJob(jobId) {
+    return new Promise(resolve => {
+        const poll = () => {
+            fetch(`/api/jobs/${jobId}`)
+                .then(response => response.json())
+                .then(data => {
+                    const job = data.job;
+                    if (!job) {
+                        resolve({ error: data.error || 'Import job not found' });
+                    } else if (job.status === 'completed') {
+                        resolve(job.result || {});
+                    } else if (job.status === 'error') {
+                        resolve({ error: job.error || 'Import failed' });
+                    } else {
+                        if (job.processed) {
+                            showImportStatus(`Importing... ${job.processed} rows processed`, 'loading');
+                        }
+                        setTimeout(poll, 2000);
+                    }
+                })
+                .catch(() => resolve({ error: 'Lost contact with import job' }));
+        };
+        poll();
+    });
+}
+
 /**
  * Display a status message in the import status area.
  * Success and error messages auto-hide after 5 seconds.
@@ -0,0 +1,112 @@
+"""
+Boot timing
+Startup phase timings for create_app, and optional preloading of the heavy
+subsystems that are otherwise imported on first use.
+
+Heavy subsystems (ML ranking: pandas/NumPy/XGBoost; CP-SAT: OR-Tools; the
+PDF stack: PyPDF2/reportlab/xhtml2pdf; AI assistant) are not imported while
+the app boots, so workers start quickly and stay small until a request needs
+them. With gunicorn preload_app, set PRELOAD_HEAVY_MODULES to import them
+once in the master instead, where forked workers share them copy-on-write.
+"""
+import importlib
+import logging
+import sys
+import time
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Subsystem -> modules imported by preload_heavy_modules()
+HEAVY_MODULES: Dict[str, tuple] = {
+    'ml': ('app.ml.inference.ml_scheduler_adapter',),
+    'cpsat': ('app.services.cpsat_scheduler',),
+    'pdf': ('app.services.daily_paperwork_generator', 'app.integrations.edr.pdf_generator'),
+    'ai': ('app.services.ai_assistant',),
+}
+
+
+def _rss_bytes():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+class BootTimer:
+    """Wall time and modules imported per create_app phase"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[dict] = []
+        self._last = self.started
+        self._last_modules = len(sys.modules)
+
+    def mark(self, name: str) -> None:
+        """Close a phase: everything since the previous mark (or start)"""
+        now = time.perf_counter()
+        modules = len(sys.modules)
+        self.phases.append({
+            'name': name,
+            'seconds': round(now - self._last, 4),
+            'modules': modules - self._last_modules,
+        })
+        self._last = now
+        self._last_modules = modules
+
+    def report(self) -> dict:
+        """Summary stored in app.config['BOOT_TIMINGS']"""
+        return {
+            'total_seconds': round(time.perf_counter() - self.started, 4),
+            'modules_loaded': len(sys.modules),
+            'rss_bytes': _rss_bytes(),
+            'phases': self.phases,
+        }
+
+    def log(self, app, report: dict) -> None:
+        phases = ', '.join(
+            f"{p['name']} {p['seconds']:.2f}s/{p['modules']} modules"
+            for p in sorted(self.phases, key=lambda p: -p['seconds'])
+        )
+        rss = f", RSS {report['rss_bytes'] / 1048576:.0f} MB" if report['rss_bytes'] else ''
+        app.logger.info(f"App boot {report['total_seconds']:.2f}s{rss}: {phases}")
+
+
+def preload_heavy_modules(subsystems=None) -> Dict[str, float]:
+    """
+    Import heavy subsystems now instead of on first use
+
+    Args:
+        subsystems: Names from HEAVY_MODULES (default: all)
+
+    Returns:
+        dict: {subsystem: seconds spent importing}
+    """
+    timings = {}
+    for name in subsystems or HEAVY_MODULES:
+        started = time.perf_counter()
+        for module in HEAVY_MODULES.get(name, ()):
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                logger.warning(f"Could not preload {module}: {e}")
+        timings[name] = round(time.perf_counter() - started, 4)
+    return timings
+
+
+def render_boot_metrics(report: dict) -> List[str]:
+    """Prometheus text lines for the boot report"""
+    if not report:
+        return []
+    lines = [
+        '# HELP scheduler_boot_seconds Application factory wall time at process start',
+        '# TYPE scheduler_boot_seconds gauge',
+        f"scheduler_boot_seconds {report['total_seconds']}",
+        '# HELP scheduler_boot_phase_seconds Application factory wall time by phase',
+        '# TYPE scheduler_boot_phase_seconds gauge',
+    ]
+    lines.extend(
+        f'scheduler_boot_phase_seconds{{phase="{p["name"]}"}} {p["seconds"]}' for p in report['phases']
+    )
+    return lines
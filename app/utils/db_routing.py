@@ -0,0 +1,225 @@
+"""
+Database read routing
+Sends reads of read-only work (dashboards, validation, exports, printing, AI
+context retrieval) to a separate 'read' engine, keeping writes on the primary.
+
+- PostgreSQL: set DATABASE_READ_URL to a read replica.
+- SQLite (file database): a second connection pool on the same file. The
+  database runs in WAL mode, so these readers never block, or wait for, the
+  scheduler's writes; their connections are query_only.
+
+Routing is per session: inside read_only_session() (or a view wrapped with
+read_only_view / a blueprint passed to route_reads()), SELECTs use the read
+engine until the session writes; flushes, DML, raw SQL and everything after a
+write in the same transaction stay on the primary. Without a read engine
+(in-memory SQLite, DB_READ_ROUTING off) everything uses the primary.
+
+Each role's connections get their own SQLite pragmas (synchronous,
+cache_size, mmap_size, busy_timeout).
+"""
+import logging
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Optional
+
+from flask import current_app
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event
+from werkzeug.wrappers import Response
+
+logger = logging.getLogger(__name__)
+
+READ_BIND = 'read'
+
+_READ_ONLY_KEY = 'db_read_only'
+_WROTE_KEY = 'db_wrote'
+
+# Per-role SQLite pragmas; overridden by SQLITE_* config keys
+SQLITE_PRAGMAS = {
+    'primary': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',     # Durable with WAL except on power loss
+        'busy_timeout': 5000,        # ms to wait for the write lock
+        'cache_size': -16384,        # 16 MB page cache (negative = KiB)
+        'mmap_size': 0,
+    },
+    'read': {
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -65536,        # 64 MB page cache for reports
+        'mmap_size': 268435456,      # 256 MB memory-mapped reads
+        'query_only': 'ON',
+    },
+}
+
+
+class RoutingSession(FlaskSession):
+    """Flask-SQLAlchemy session that sends read-only SELECTs to the read engine"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and self.info.get(_READ_ONLY_KEY) and not self.info.get(_WROTE_KEY)
+                and not self._flushing and getattr(clause, 'is_select', False)):
+            engine = self._db.engines.get(READ_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_wrote(session, flush_context):
+    session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _mark_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+@event.listens_for(RoutingSession, 'after_rollback')
+def _clear_wrote(session):
+    session.info.pop(_WROTE_KEY, None)
+
+
+# =============================================================================
+# Read-only scopes
+# =============================================================================
+
+def _default_session():
+    """Scoped session of the SQLAlchemy extension bound to the current app"""
+    return current_app.extensions['sqlalchemy'].session
+
+
+@contextmanager
+def read_only_session(session=None):
+    """Route the session's SELECTs to the read engine inside the block"""
+    session = session if session is not None else _default_session()
+    info = session.info
+    previous = info.get(_READ_ONLY_KEY)
+    info[_READ_ONLY_KEY] = True
+    try:
+        yield session
+    finally:
+        if previous:
+            info[_READ_ONLY_KEY] = previous
+        else:
+            info.pop(_READ_ONLY_KEY, None)
+
+
+def _hold_read_only(session, body):
+    """Keep the session read-only while a streamed response body is consumed"""
+    with read_only_session(session):
+        yield from body
+
+
+def read_only_view(view):
+    """
+    View decorator: the request's reads use the read engine
+
+    A streamed response (e.g. an export generator) runs its queries after the
+    view returns, so its body is iterated inside the read-only scope too.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        session = _default_session()()
+        with read_only_session(session):
+            response = view(*args, **kwargs)
+        if isinstance(response, Response) and response.is_streamed:
+            response.response = _hold_read_only(session, response.response)
+        return response
+    return wrapper
+
+
+def route_reads(blueprint) -> None:
+    """Send the reads of a blueprint's GET requests to the read engine"""
+    from flask import request
+
+    @blueprint.before_request
+    def _start_read_only():
+        if request.method in ('GET', 'HEAD'):
+            _default_session().info[_READ_ONLY_KEY] = True
+
+    @blueprint.teardown_request
+    def _end_read_only(exc=None):
+        _default_session().info.pop(_READ_ONLY_KEY, None)
+
+
+def is_read_only(session=None) -> bool:
+    session = session if session is not None else _default_session()
+    return bool(session.info.get(_READ_ONLY_KEY))
+
+
+def has_written(session=None) -> bool:
+    """True if the session has flushed or executed writes in its current transaction"""
+    session = session if session is not None else _default_session()
+    return bool(session.info.get(_WROTE_KEY))
+
+
+# =============================================================================
+# Engine setup
+# =============================================================================
+
+def _is_file_sqlite(uri: str) -> bool:
+    return uri.startswith('sqlite:') and ':memory:' not in uri and uri not in ('sqlite://', 'sqlite:///')
+
+
+def configure_read_bind(app) -> Optional[str]:
+    """
+    Add the 'read' bind to SQLALCHEMY_BINDS (call before db.init_app)
+
+    Returns:
+        The read URL, or None when reads stay on the primary
+    """
+    if not app.config.get('DB_READ_ROUTING', True):
+        return None
+    primary = app.config['SQLALCHEMY_DATABASE_URI']
+    read_url = app.config.get('DATABASE_READ_URL') or (primary if _is_file_sqlite(primary) else None)
+    if not read_url:
+        return None
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    binds.setdefault(READ_BIND, read_url)
+    app.config['SQLALCHEMY_BINDS'] = binds
+    return read_url
+
+
+def sqlite_pragmas(app, role: str) -> Dict[str, object]:
+    """Pragmas for a role's SQLite connections, with config overrides applied"""
+    pragmas = dict(SQLITE_PRAGMAS[role])
+    prefix = 'SQLITE_READ_' if role == 'read' else 'SQLITE_'
+    for name in ('synchronous', 'busy_timeout', 'cache_size', 'mmap_size'):
+        value = app.config.get(f'{prefix}{name.upper()}')
+        if value not in (None, ''):
+            pragmas[name] = value
+    return pragmas
+
+
+def _apply_pragmas(pragmas: Dict[str, object]):
+    def on_connect(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+    return on_connect
+
+
+def init_db_routing(app, db) -> None:
+    """Apply per-role SQLite pragmas to the app's engines (call after db.init_app)"""
+    with app.app_context():
+        engines = db.engines
+        for key, role in ((None, 'primary'), (READ_BIND, 'read')):
+            engine = engines.get(key)
+            if engine is None or engine.dialect.name != 'sqlite':
+                continue
+            pragmas = sqlite_pragmas(app, role)
+            if not _is_file_sqlite(str(engine.url)):
+                pragmas.pop('journal_mode', None)
+            event.listen(engine, 'connect', _apply_pragmas(pragmas))
+        if READ_BIND in engines:
+            # WAL is a property of the database file: switch it before any reader connects
+            if engines[None].dialect.name == 'sqlite':
+                with engines[None].connect():
+                    pass
+            logger.info(f"Read routing enabled ({engines[READ_BIND].url.render_as_string(hide_password=True)})")
@@ -0,0 +1,157 @@
+"""
+Streaming export responses
+Writes CSV (optionally gzip-encoded) or XLSX exports from a lazy row iterator
+so memory stays flat regardless of how many rows an export covers.
+
+Routes build a generator of rows from column-only queries with yield_per
+(server-side cursors on PostgreSQL) and hand it to export_response().
+"""
+import csv
+import io
+import logging
+import os
+import tempfile
+import zlib
+from typing import Iterable, Iterator, Optional, Sequence
+
+from flask import Response, request, stream_with_context
+
+try:
+    import xlsxwriter
+    XLSX_AVAILABLE = True
+except ImportError:
+    xlsxwriter = None
+    XLSX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('csv', 'xlsx')
+YIELD_PER = 1000             # Rows fetched per database round trip
+CSV_FLUSH_BYTES = 64 * 1024  # Buffered CSV text per response chunk
+FILE_CHUNK_BYTES = 64 * 1024
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class ExportFormatError(ValueError):
+    """Unsupported or unavailable export format"""
+
+
+def export_options():
+    """
+    Export format and compression requested by the client
+
+    Query args: format=csv|xlsx (default csv), gzip=true to gzip-encode CSV
+    (only applied when the client accepts gzip).
+
+    Returns:
+        tuple: (format, gzip)
+
+    Raises:
+        ExportFormatError: Unknown format, or xlsx without XlsxWriter installed
+    """
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ExportFormatError(f'Unsupported export format: {fmt}')
+    if fmt == 'xlsx' and not XLSX_AVAILABLE:
+        raise ExportFormatError('XLSX export requires the XlsxWriter package')
+    compress = (
+        fmt == 'csv'
+        and request.args.get('gzip') == 'true'
+        and 'gzip' in request.accept_encodings
+    )
+    return fmt, compress
+
+
+def iter_csv(rows: Iterable[Sequence]) -> Iterator[bytes]:
+    """Encode rows as CSV, yielding roughly CSV_FLUSH_BYTES at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CSV_FLUSH_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def iter_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """gzip-encode a stream of chunks"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_xlsx(rows: Iterable[Sequence], sheet_name: str = 'Export') -> Iterator[bytes]:
+    """
+    Write rows to an XLSX workbook in constant-memory mode and stream it
+
+    XlsxWriter flushes each row to a temporary file as it is written, so
+    only the finished workbook file is read back, in chunks.
+    """
+    handle, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(handle)
+    try:
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        worksheet = workbook.add_worksheet(sheet_name[:31])
+        for row_index, row in enumerate(rows):
+            worksheet.write_row(row_index, 0, ['' if value is None else value for value in row])
+        workbook.close()
+
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(FILE_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def export_response(rows: Iterable[Sequence], filename: str, fmt: str = 'csv',
+                    compress: bool = False, sheet_name: Optional[str] = None) -> Response:
+    """
+    Streaming download response for an export
+
+    Args:
+        rows: Lazy iterable of rows (header rows included); it is consumed
+              while the response is sent, inside the request context
+        filename: Download name without extension
+        fmt: 'csv' or 'xlsx'
+        compress: gzip-encode the CSV body (Content-Encoding: gzip)
+        sheet_name: XLSX worksheet name (defaults to the filename)
+
+    Returns:
+        Response: Streamed file download
+    """
+    def logged(chunks):
+        # Headers are already sent once streaming starts; log instead of 500
+        try:
+            yield from chunks
+        except Exception as e:
+            logger.error(f'Error streaming export {filename}: {e}', exc_info=True)
+            raise
+
+    if fmt == 'xlsx':
+        body = iter_xlsx(rows, sheet_name or filename)
+        mimetype = XLSX_MIMETYPE
+    else:
+        body = iter_csv(rows)
+        if compress:
+            body = iter_gzip(body)
+        mimetype = 'text/csv'
+
+    response = Response(stream_with_context(logged(body)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}.{fmt}'
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+    return response
@@ -0,0 +1,154 @@
+"""
+Reference data
+Indexed lookups over the mapping tables in app.constants (demo class,
+department and event status codes, Walmart fiscal weeks, club details).
+
+app.constants stores these as lists of dicts, which consumers used to scan on
+every lookup. Here they are loaded once, on first use, from a compact JSON
+snapshot (reference_data.json, next to this module) into code -> description
+dicts and a sorted array of week start dates for O(log n) date -> fiscal week
+lookups. If the snapshot is missing or unreadable the tables are built from
+app.constants instead.
+
+Regenerate the snapshot after editing the tables in app.constants:
+
+    python -m app.utils.reference_data
+"""
+import json
+import logging
+import os
+import threading
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), 'reference_data.json')
+SNAPSHOT_VERSION = 1
+
+CLUB_FIELDS = ('store_name', 'state_desc', 'postal_code', 'market_nbr', 'region_name', 'sub_div_name')
+
+
+def _iso_date(value: str) -> str:
+    """'2025-02-01T00:00:00.000Z' -> '2025-02-01'"""
+    return value[:10]
+
+
+def build_payload() -> dict:
+    """Serializable form of the app.constants tables"""
+    from app.constants import (
+        CLUB_DETAILS, DEMO_CLASS_CODES, DEPARTMENT_CODES, EVENT_STATUS_CODES, WALMART_WEEKS
+    )
+
+    # DEMO_CLASS_CODES is a tuple containing a list
+    demo_classes = DEMO_CLASS_CODES[0] if isinstance(DEMO_CLASS_CODES, tuple) else DEMO_CLASS_CODES
+    weeks = sorted(
+        [_iso_date(week['start_date']), _iso_date(week['end_date']), week['WMWeek']]
+        for week in WALMART_WEEKS
+    )
+    return {
+        'version': SNAPSHOT_VERSION,
+        'event_types': {str(item['DEMO_CLASS_CODE']): item['DEMO_CLASS_DESC'].strip() for item in demo_classes},
+        'departments': {str(item['DEPT_NO']): item['DESCRIPTION'].strip() for item in DEPARTMENT_CODES},
+        'event_statuses': {str(item['DEMO_STATUS_CODE']): item['DEMO_STATUS_DESC'].strip()
+                           for item in EVENT_STATUS_CODES},
+        'weeks': weeks,
+        'club_fields': list(CLUB_FIELDS),
+        'clubs': {str(club['store_number']): [club.get(field) for field in CLUB_FIELDS] for club in CLUB_DETAILS},
+    }
+
+
+def write_snapshot(path: str = SNAPSHOT_PATH) -> dict:
+    """Write the JSON snapshot from app.constants; returns the payload"""
+    payload = build_payload()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, separators=(',', ':'), sort_keys=True)
+        f.write('\n')
+    return payload
+
+
+class ReferenceData:
+    """Dict- and bisect-indexed reference tables"""
+
+    def __init__(self, payload: dict):
+        self.event_types: Dict[str, str] = payload['event_types']
+        self.departments: Dict[str, str] = payload['departments']
+        self.event_statuses: Dict[str, str] = payload['event_statuses']
+
+        weeks = payload['weeks']
+        self.week_starts: List[date] = [date.fromisoformat(start) for start, _end, _label in weeks]
+        self.week_ends: List[date] = [date.fromisoformat(end) for _start, end, _label in weeks]
+        self.week_labels: List[str] = [label for _start, _end, label in weeks]
+
+        fields = payload['club_fields']
+        self.clubs: Dict[str, dict] = {
+            store: dict(zip(fields, values), store_number=int(store))
+            for store, values in payload['clubs'].items()
+        }
+
+    def event_type(self, code) -> Optional[str]:
+        """Description for a demo class (event type) code"""
+        return self.event_types.get(str(code))
+
+    def department(self, code) -> Optional[str]:
+        """Description for a department number"""
+        return self.departments.get(str(code))
+
+    def event_status(self, code) -> Optional[str]:
+        """Description for a demo status code"""
+        return self.event_statuses.get(str(code))
+
+    def club(self, store_number) -> Optional[dict]:
+        """Club details for a store number"""
+        return self.clubs.get(str(store_number))
+
+    def walmart_week(self, target_date) -> Optional[str]:
+        """
+        Walmart fiscal week containing a date
+
+        Args:
+            target_date: date (or datetime)
+
+        Returns:
+            str: Week label (e.g., "Week 36") or None outside the mapped range
+        """
+        if isinstance(target_date, datetime):
+            target_date = target_date.date()
+        index = bisect_right(self.week_starts, target_date) - 1
+        if index >= 0 and target_date <= self.week_ends[index]:
+            return self.week_labels[index]
+        return None
+
+
+_reference_data: Optional[ReferenceData] = None
+_reference_lock = threading.Lock()
+
+
+def _load_payload(path: str) -> dict:
+    try:
+        with open(path, encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get('version') == SNAPSHOT_VERSION:
+            return payload
+        logger.warning(f"Reference data snapshot {path} has an unknown version; using app.constants")
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read reference data snapshot {path}: {e}; using app.constants")
+    return build_payload()
+
+
+def get_reference_data() -> ReferenceData:
+    """Shared ReferenceData, loaded on first use"""
+    global _reference_data
+    if _reference_data is None:
+        with _reference_lock:
+            if _reference_data is None:
+                _reference_data = ReferenceData(_load_payload(SNAPSHOT_PATH))
+    return _reference_data
+
+
+if __name__ == '__main__':
+    written = write_snapshot()
+    print(f"Wrote {SNAPSHOT_PATH}: {len(written['event_types'])} event types, "
+          f"{len(written['departments'])} departments, {len(written['event_statuses'])} statuses, "
+          f"{len(written['weeks'])} weeks, {len(written['clubs'])} clubs")
@@ -2,11 +2,12 @@
 Celery worker configuration
 Run this to start the Celery worker for background task processing
 """
-from app.services.sync_service import celery_app
+from app.services.sync_service import celery_app, FlaskTask
 from app import create_app
 
-# Create Flask app instance
+# Create Flask app instance (shared by all tasks for their app context)
 app = create_app()
+FlaskTask._app = app
 
 # Import Flask app context for Celery tasks
 celery_app.conf.update(app.config)
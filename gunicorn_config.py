@@ -23,6 +23,10 @@ worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')  # gevent for async
 worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
 max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '10000'))
 max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '1000'))
+# Heavy subsystems (ML, CP-SAT, PDF, AI) load on first use, so workers boot fast
+# and recycle cheaply. To import them once and share them copy-on-write instead,
+# enable preload_app together with PRELOAD_HEAVY_MODULES=true.
+preload_app = os.getenv('GUNICORN_PRELOAD_APP', 'false').lower() == 'true'
 timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
 keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
 
@@ -0,0 +1,37 @@
+"""Add employee_daily_stats table
+
+Revision ID: a7b2c3d4e5f6
+Revises: f6a1b2c3d4e5
+Create Date: 2026-10-18 16:00:00.000000
+
+Employee rows are written when a calendar day summary is (re)built, so the
+existing summaries are cleared and rebuilt with their employee rows on first
+read.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7b2c3d4e5f6'
+down_revision = 'f6a1b2c3d4e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('employee_daily_stats',
+        sa.Column('stat_date', sa.Date(), nullable=False),
+        sa.Column('employee_id', sa.String(), nullable=False),
+        sa.Column('event_count', sa.Integer(), nullable=False),
+        sa.Column('scheduled_minutes', sa.Integer(), nullable=False),
+        sa.Column('type_counts', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('stat_date', 'employee_id')
+    )
+    op.create_index('ix_employee_daily_stats_employee_id', 'employee_daily_stats', ['employee_id'])
+    op.execute('DELETE FROM calendar_day_summaries')
+
+
+def downgrade():
+    op.drop_index('ix_employee_daily_stats_employee_id', table_name='employee_daily_stats')
+    op.drop_table('employee_daily_stats')
@@ -0,0 +1,39 @@
+"""Allow 'stopping' status on scheduler_run_history
+
+Revision ID: b8c3d4e5f6a7
+Revises: a7b2c3d4e5f6
+Create Date: 2026-10-18 18:00:00.000000
+
+POST /auto-schedule/stop marks a running CP-SAT run 'stopping'; the run
+ends its search and keeps the best solution found so far.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8c3d4e5f6a7'
+down_revision = 'a7b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('scheduler_run_history', schema=None) as batch_op:
+        batch_op.drop_constraint('ck_valid_status', type_='check')
+        batch_op.create_check_constraint(
+            'ck_valid_status',
+            "status IN ('running', 'stopping', 'completed', 'failed', 'crashed', 'rejected')"
+        )
+
+
+def downgrade():
+    op.execute(sa.text(
+        "UPDATE scheduler_run_history SET status = 'running' WHERE status = 'stopping'"
+    ))
+    with op.batch_alter_table('scheduler_run_history', schema=None) as batch_op:
+        batch_op.drop_constraint('ck_valid_status', type_='check')
+        batch_op.create_check_constraint(
+            'ck_valid_status',
+            "status IN ('running', 'completed', 'failed', 'crashed', 'rejected')"
+        )
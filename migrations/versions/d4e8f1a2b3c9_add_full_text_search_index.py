@@ -0,0 +1,27 @@
+"""Add full-text search index for events and employees
+
+Revision ID: d4e8f1a2b3c9
+Revises: c3c5508b5ab7
+Create Date: 2026-10-18 10:00:00.000000
+
+SQLite: FTS5 tables events_fts / employees_fts with sync triggers.
+PostgreSQL: GIN indexes on to_tsvector('simple', ...) expressions.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e8f1a2b3c9'
+down_revision = 'c3c5508b5ab7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.services.search_index import install_search_index
+    install_search_index(op.get_bind(), rebuild=True)
+
+
+def downgrade():
+    from app.services.search_index import drop_search_index
+    drop_search_index(op.get_bind())
@@ -0,0 +1,32 @@
+"""Add calendar_day_summaries table
+
+Revision ID: e5f9a2b3c4d0
+Revises: d4e8f1a2b3c9
+Create Date: 2026-10-18 11:00:00.000000
+
+Rows are built on first read of each calendar day, so no backfill is needed.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5f9a2b3c4d0'
+down_revision = 'd4e8f1a2b3c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('calendar_day_summaries',
+        sa.Column('summary_date', sa.Date(), nullable=False),
+        sa.Column('type_counts', sa.Text(), nullable=False),
+        sa.Column('scheduled_count', sa.Integer(), nullable=False),
+        sa.Column('unscheduled_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('summary_date')
+    )
+
+
+def downgrade():
+    op.drop_table('calendar_day_summaries')
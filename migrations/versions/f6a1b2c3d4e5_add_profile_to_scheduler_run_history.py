@@ -0,0 +1,26 @@
+"""Add profile to scheduler_run_history
+
+Revision ID: f6a1b2c3d4e5
+Revises: e5f9a2b3c4d0
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6a1b2c3d4e5'
+down_revision = 'e5f9a2b3c4d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('scheduler_run_history', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('profile', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('scheduler_run_history', schema=None) as batch_op:
+        batch_op.drop_column('profile')
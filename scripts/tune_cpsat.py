@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tune CP-SAT Solver Parameters
+
+Replays CP-SAT model snapshots exported by scheduler runs (set
+CPSAT_SNAPSHOT_DIR) across a grid of solver parameters and reports, per
+combination, the mean time to the first feasible solution and to within
+--gap of the best objective found. With --save the winning combination is
+stored in system_settings and used by every following scheduler run.
+
+Usage:
+    python scripts/tune_cpsat.py [--snapshots instance/cpsat_snapshots] [--limit 5]
+                                 [--time-limit 20] [--gap 0.01] [--grid grid.json]
+                                 [--output tuning.json] [--save]
+"""
+
+import sys
+import os
+import json
+import argparse
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.cpsat_tuning import DEFAULT_GRID, TuningHarness, find_snapshots
+
+
+def print_report(report, top=10):
+    """Print the best combinations as a table"""
+    print("=" * 80)
+    print(f"CP-SAT TUNING: {len(report['snapshots'])} snapshots, "
+          f"{len(report['results'])} combinations, {report['time_limit']}s each, "
+          f"near best = within {report['gap']:.1%}")
+    print("=" * 80)
+    print(f"{'first feasible':>15} {'near best':>10} {'unsolved':>9}  parameters")
+    for row in report['results'][:top]:
+        print(f"{row['mean_first_feasible']:>14.2f}s {row['mean_near_best']:>9.2f}s "
+              f"{row['unsolved']:>9}  {json.dumps(row['parameters'])}")
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Tune CP-SAT solver parameters on saved models')
+    parser.add_argument('--snapshots', type=str, default=None,
+                        help='Snapshot directory (default: CPSAT_SNAPSHOT_DIR)')
+    parser.add_argument('--limit', type=int, default=5,
+                        help='Use the N newest snapshots (default: 5)')
+    parser.add_argument('--time-limit', type=float, default=20.0,
+                        help='Seconds per solve (default: 20)')
+    parser.add_argument('--gap', type=float, default=0.01,
+                        help='Relative gap to the best objective counted as near best (default: 0.01)')
+    parser.add_argument('--grid', type=str, default=None,
+                        help='JSON file of {parameter: [values]} (default: built-in grid)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write the full report to this JSON file')
+    parser.add_argument('--save', action='store_true',
+                        help='Store the winning parameters as the scheduler solver profile')
+
+    args = parser.parse_args()
+
+    from app import create_app
+    from app.models import get_models
+    from app.services.cpsat_tuning import save_solver_profile
+
+    app = create_app()
+    with app.app_context():
+        directory = args.snapshots or app.config.get('CPSAT_SNAPSHOT_DIR')
+        if not directory:
+            print("No snapshot directory: pass --snapshots or set CPSAT_SNAPSHOT_DIR")
+            sys.exit(1)
+
+        snapshots = find_snapshots(directory, args.limit)
+        if not snapshots:
+            print(f"No snapshots found in {directory}")
+            sys.exit(1)
+
+        grid = DEFAULT_GRID
+        if args.grid:
+            with open(args.grid) as f:
+                grid = json.load(f)
+
+        report = TuningHarness(snapshots, grid, time_limit=args.time_limit, gap=args.gap).run()
+        print_report(report)
+
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"\nReport saved to: {args.output}")
+
+        if args.save:
+            best = report['results'][0]
+            save_solver_profile(get_models()['SystemSetting'], best['parameters'], summary={
+                'snapshots': report['snapshots'],
+                'time_limit': report['time_limit'],
+                'gap': report['gap'],
+                'mean_first_feasible': best['mean_first_feasible'],
+                'mean_near_best': best['mean_near_best'],
+            })
+            print(f"\nSaved solver profile: {json.dumps(best['parameters'])}")
+
+
+if __name__ == '__main__':
+    main()
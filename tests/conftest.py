@@ -3,6 +3,7 @@ from app import create_app
 from app.extensions import db as _db
 from app.models import get_models
 import os
+from unittest.mock import patch
 
 @pytest.fixture(scope='session')
 def app():
@@ -53,3 +54,63 @@ def runner(app):
 def models(app):
     """Get models from registry."""
     return get_models()
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis commands the app uses"""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def expire(self, key, ttl):
+        return key in self.data
+
+    def zadd(self, key, mapping, xx=False):
+        members = self.data.setdefault(key, {})
+        added = 0
+        for member, score in mapping.items():
+            if xx and member not in members:
+                continue
+            added += member not in members
+            members[member] = float(score)
+        return added
+
+    def zrem(self, key, *members):
+        zset = self.data.get(key, {})
+        return sum(zset.pop(member, None) is not None for member in members)
+
+    def zcard(self, key):
+        return len(self.data.get(key, {}))
+
+    def zscore(self, key, member):
+        return self.data.get(key, {}).get(member)
+
+    def zremrangebyscore(self, key, min_score, max_score):
+        zset = self.data.get(key, {})
+        stale = [m for m, score in zset.items() if float(min_score) <= score <= float(max_score)]
+        for member in stale:
+            del zset[member]
+        return len(stale)
+
+
+@pytest.fixture(scope='function')
+def fake_redis():
+    """Patch the app's Redis client with an in-memory fake."""
+    client = FakeRedis()
+    with patch('app.routes.auth.get_redis_client', return_value=client):
+        yield client
@@ -0,0 +1,121 @@
+"""
+Test AI Context Retrieval
+
+Verifies:
+1. Prompt context stops at the token budget
+2. Mentioned entities are rendered first
+3. Workload questions use aggregate summaries instead of 30 days of rows
+4. Summaries are cached per date range
+"""
+
+from datetime import datetime, date, timedelta
+
+import pytest
+
+from app.ai.context.classifier import QueryAnalysis, QueryType
+from app.ai.context.retriever import (
+    ContextRetriever, SchedulingContext, estimate_tokens, summary_cache
+)
+
+_TODAY = date.today()
+
+
+def _context(**overrides):
+    values = dict(
+        employees=[], events=[], schedules=[], availability={}, time_off=[],
+        rotations=[], holidays=[], date_range=(_TODAY, _TODAY + timedelta(days=7)),
+        query_type='general', retrieved_at=datetime.now(),
+    )
+    values.update(overrides)
+    return SchedulingContext(**values)
+
+
+@pytest.fixture
+def history(db_session, models):
+    """Two employees with shifts over the last three weeks."""
+    Employee = models['Employee']
+    Event = models['Event']
+    Schedule = models['Schedule']
+
+    db_session.add(Employee(id='emp_a', name='Alice Smith', job_title='Event Specialist'))
+    db_session.add(Employee(id='emp_b', name='Bob Jones', job_title='Lead Event Specialist'))
+    for i in range(20):
+        when = datetime.combine(_TODAY - timedelta(days=i), datetime.min.time()) + timedelta(hours=10)
+        db_session.add(Event(
+            project_name=f'Demo {i}', project_ref_num=8000 + i, event_type='Core',
+            start_datetime=when, due_datetime=when + timedelta(days=2), is_scheduled=True
+        ))
+        db_session.add(Schedule(
+            event_ref_num=8000 + i, employee_id='emp_a' if i % 4 else 'emp_b', schedule_datetime=when
+        ))
+    db_session.commit()
+    summary_cache.clear()
+    yield models
+    summary_cache.clear()
+
+
+class TestPromptBudget:
+    """Test budgeted rendering"""
+
+    def test_stops_at_budget(self):
+        employees = [
+            {'id': f'e{i}', 'name': f'Employee Number {i}', 'job_title': 'Event Specialist'}
+            for i in range(40)
+        ]
+        text = _context(employees=employees).to_prompt_context(token_budget=150)
+
+        assert estimate_tokens(text) <= 170
+        assert 'more' in text
+        assert 'Employee Number 0 ' in text
+        assert 'Employee Number 39 ' not in text
+
+    def test_mentioned_entities_first(self):
+        schedules = [
+            {'employee_name': f'Person {i}', 'event_name': 'Demo', 'date': '2026-01-01'}
+            for i in range(30)
+        ]
+        text = _context(
+            schedules=schedules, mentioned_employees=['Person 29']
+        ).to_prompt_context(token_budget=80)
+
+        assert 'Person 29 ->' in text
+        assert 'Person 28 ->' not in text
+
+
+class TestContextRetriever:
+    """Test aggregate retrieval"""
+
+    def test_workload_uses_summaries(self, db_session, history):
+        analysis = QueryAnalysis(
+            query_type=QueryType.WORKLOAD_ANALYSIS,
+            date_range=(_TODAY, _TODAY + timedelta(days=7)),
+            mentioned_employees=[], mentioned_events=[], keywords=[], confidence=0.8
+        )
+        context = ContextRetriever(db_session).retrieve(analysis)
+
+        assert len(context.schedules) == 1  # only today's shift, not the trailing 30 days
+        workload = [line for line in context.summaries if 'shifts on' in line]
+        assert any(line.startswith('Alice Smith: 15 shifts') for line in workload)
+        assert any(line.startswith('Bob Jones: 5 shifts') for line in workload)
+
+    def test_schedules_prioritize_mentioned(self, db_session, history):
+        analysis = QueryAnalysis(
+            query_type=QueryType.SCHEDULE_VIEW,
+            date_range=(_TODAY - timedelta(days=19), _TODAY),
+            mentioned_employees=['Bob Jones'], mentioned_events=[], keywords=[], confidence=0.8
+        )
+        context = ContextRetriever(db_session).retrieve(analysis)
+
+        assert len(context.schedules) == 20
+        assert [s['employee_name'] for s in context.schedules[:5]] == ['Bob Jones'] * 5
+        assert any('scheduled shifts' in line for line in context.summaries)
+
+    def test_summary_cached_per_range(self, db_session, history):
+        retriever = ContextRetriever(db_session)
+        first = retriever._get_day_summary(_TODAY - timedelta(days=3), _TODAY)
+
+        history['Schedule'].query.delete()
+        db_session.commit()
+
+        assert retriever._get_day_summary(_TODAY - timedelta(days=3), _TODAY) == first
+        assert retriever._get_day_summary(_TODAY - timedelta(days=2), _TODAY) != first
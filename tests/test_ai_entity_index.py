@@ -0,0 +1,109 @@
+"""
+Test AI Chat Entity Index
+
+Verifies:
+1. Aho-Corasick matching finds whole-word, case-insensitive mentions
+2. Event numbers and product names resolve to the event name
+3. Committed Employee/Event changes update the index incrementally
+4. Rolled-back changes are discarded
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.ai.context.classifier import QueryClassifier
+from app.ai.context.entity_index import AhoCorasickMatcher, EntityIndex
+
+
+@pytest.fixture
+def index(db_session, models):
+    """Index built from two employees and one enriched event."""
+    Employee = models['Employee']
+    Event = models['Event']
+
+    db_session.add(Employee(id='emp_a', name='Alice Smith', job_title='Event Specialist'))
+    db_session.add(Employee(id='emp_b', name='Al Jones', job_title='Event Specialist', is_active=False))
+    db_session.add(Event(
+        project_name='Super Snack Demo', project_ref_num=606034, event_type='Core',
+        start_datetime=datetime.now(), due_datetime=datetime.now() + timedelta(days=3),
+        walmart_event_id='12345',
+        walmart_items=json.dumps([{'itemNumber': '1', 'itemDesc': 'Cheddar Crackers', 'vendorNbr': None}])
+    ))
+    db_session.commit()
+
+    index = EntityIndex()
+    index.ensure_built(db_session, models)
+    yield index
+    index.reset()
+
+
+class TestAhoCorasickMatcher:
+    """Test the multi-pattern matcher"""
+
+    def test_whole_word_matches(self):
+        matcher = AhoCorasickMatcher()
+        matcher.add('Al', 'al')
+        matcher.add('Alice', 'alice')
+        matcher.add('ice cream', 'ice cream')
+        matcher.build()
+
+        assert matcher.find('Is ALICE available?') == ['alice']
+        assert matcher.find('Al and alice want ice cream') == ['al', 'alice', 'ice cream']
+        assert matcher.find('totally unrelated') == []
+
+    def test_overlapping_patterns(self):
+        matcher = AhoCorasickMatcher()
+        for pattern in ('he', 'she', 'his', 'hers'):
+            matcher.add(pattern, pattern)
+        matcher.build()
+
+        assert matcher.find('she said hers') == ['she', 'hers']
+
+
+class TestEntityIndex:
+    """Test DB-backed entity extraction"""
+
+    def test_extracts_employees_and_events(self, index):
+        employees, events = index.match('Can alice smith work the super snack demo?')
+        assert employees == ['Alice Smith']
+        assert events == ['Super Snack Demo']
+
+    def test_inactive_employees_not_indexed(self, index):
+        assert index.match('What about Al Jones?') == ([], [])
+
+    def test_event_numbers_and_products(self, index):
+        assert index.match('Who is on 606034?')[1] == ['Super Snack Demo']
+        assert index.match('Walmart event 12345 status')[1] == ['Super Snack Demo']
+        assert index.match('Who demos the cheddar crackers?')[1] == ['Super Snack Demo']
+
+    def test_commit_updates_index(self, db_session, models, index):
+        Employee = models['Employee']
+        db_session.add(Employee(id='emp_c', name='Carmen Diaz', job_title='Event Specialist'))
+        db_session.commit()
+        assert index.match('Is Carmen Diaz free?')[0] == ['Carmen Diaz']
+
+        employee = Employee.query.get('emp_a')
+        employee.is_active = False
+        db_session.commit()
+        assert index.match('Is Alice Smith free?')[0] == []
+
+    def test_rollback_discards_changes(self, db_session, models, index):
+        Employee = models['Employee']
+        db_session.add(Employee(id='emp_d', name='Dana Lee', job_title='Event Specialist'))
+        db_session.flush()
+        db_session.rollback()
+        db_session.commit()
+
+        assert index.match('Dana Lee')[0] == []
+
+    def test_classifier_uses_index(self, index):
+        analysis = QueryClassifier(entity_index=index).analyze('Is Alice Smith available tomorrow?')
+        assert analysis.mentioned_employees == ['Alice Smith']
+
+    def test_classifier_from_name_lists(self):
+        classifier = QueryClassifier(employees=['Bob'], events=['Core Demo'])
+        analysis = classifier.analyze('Can bob cover the core demo?')
+        assert analysis.mentioned_employees == ['Bob']
+        assert analysis.mentioned_events == ['Core Demo']
@@ -0,0 +1,102 @@
+"""
+Test Schedule Approval
+
+Verifies:
+1. Approving a swap removes the bumped event's posted, superseded and
+   Supervisor schedules and schedules the new event
+2. A locked bump source day blocks approval, checked with one locked-day query
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event as sa_event
+
+from app.routes.auth import save_session
+
+
+def _login(client):
+    save_session('approve-session', {
+        'user_info': {'username': 'tester'},
+        'created_at': datetime.utcnow().isoformat(),
+        'last_activity': datetime.utcnow().isoformat()
+    })
+    client.set_cookie('session_id', 'approve-session')
+
+
+def _setup_swap(db_session, models):
+    """Core 200002 takes the slot of Core 100001, which is posted (with its Supervisor) on bumped_day"""
+    Event, Schedule, PendingSchedule = models['Event'], models['Schedule'], models['PendingSchedule']
+    now = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    bumped_day = now + timedelta(days=3)
+    target_day = now + timedelta(days=4)
+
+    db_session.add(models['Employee'](id='appr1', name='Approver', job_title='Lead Event Specialist'))
+    for ref, name, event_type in ((100001, '100001-Bumped Core', 'Core'),
+                                  (100002, '100001-Bumped Supervisor', 'Supervisor'),
+                                  (200002, '200002-New Core', 'Core')):
+        db_session.add(Event(
+            project_ref_num=ref, project_name=name, event_type=event_type, condition='Scheduled',
+            is_scheduled=ref != 200002, start_datetime=now, due_datetime=now + timedelta(days=10),
+        ))
+    db_session.add(Schedule(event_ref_num=100001, employee_id='appr1',
+                            schedule_datetime=bumped_day + timedelta(hours=10)))
+    db_session.add(Schedule(event_ref_num=100002, employee_id='appr1',
+                            schedule_datetime=bumped_day + timedelta(hours=12)))
+
+    run = models['SchedulerRunHistory'](run_type='manual', status='completed', started_at=datetime.utcnow())
+    db_session.add(run)
+    db_session.flush()
+    db_session.add(PendingSchedule(
+        scheduler_run_id=run.id, event_ref_num=200002, employee_id='appr1',
+        schedule_datetime=target_day + timedelta(hours=10), status='proposed',
+        is_swap=True, bumped_event_ref_num=100001,
+    ))
+    db_session.add(PendingSchedule(
+        scheduler_run_id=run.id, event_ref_num=100001, employee_id='appr1',
+        schedule_datetime=bumped_day + timedelta(hours=10), status='superseded',
+    ))
+    db_session.commit()
+    return run, bumped_day
+
+
+def test_swap_approval_removes_bumped_schedules(client, db_session, models, fake_redis):
+    run, bumped_day = _setup_swap(db_session, models)
+    Schedule, PendingSchedule = models['Schedule'], models['PendingSchedule']
+
+    _login(client)
+    response = client.post('/auto-schedule/approve', json={'run_id': run.id})
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()['api_submitted'] == 1
+
+    db_session.expire_all()
+    assert [s.event_ref_num for s in Schedule.query.all()] == [200002]
+    assert PendingSchedule.query.filter_by(status='superseded').count() == 0
+    Event = models['Event']
+    assert Event.query.filter_by(project_ref_num=100001).one().is_scheduled is False
+    assert Event.query.filter_by(project_ref_num=200002).one().condition == 'Scheduled'
+
+
+def test_locked_bump_source_blocks_approval(app, client, db_session, models, fake_redis):
+    run, bumped_day = _setup_swap(db_session, models)
+    models['LockedDay'].lock_day(bumped_day.date(), locked_by='tester', reason='Paperwork printed')
+    db_session.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = app.extensions['sqlalchemy'].engine
+    sa_event.listen(engine, 'before_cursor_execute', record)
+    try:
+        _login(client)
+        response = client.post('/auto-schedule/approve', json={'run_id': run.id})
+    finally:
+        sa_event.remove(engine, 'before_cursor_execute', record)
+
+    assert response.status_code == 409
+    conflict, = response.get_json()['locked_dates']
+    assert conflict['date'] == bumped_day.date().isoformat()
+    assert conflict['type'] == 'bump_source' and conflict['event_ref'] == 100001
+    assert sum('FROM locked_days' in statement for statement in statements) == 1
+    assert models['Schedule'].query.count() == 2
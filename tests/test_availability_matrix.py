@@ -0,0 +1,104 @@
+"""
+Test Employee Availability Matrix
+
+Verifies:
+1. Weekly pattern, overrides (newest wins) and time off combine per day
+2. Matrices are cached until availability data changes
+3. ConstraintValidator answers from the matrix (overrides included)
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from app.services.availability_matrix import AvailabilityService
+
+# 2026-02-23 is a Monday
+MONDAY = date(2026, 2, 23)
+SUNDAY = MONDAY + timedelta(days=6)
+
+
+def _setup(db_session, models):
+    Employee = models['Employee']
+    db_session.add_all([
+        Employee(id='AV1', name='Weekly Off Monday', is_active=True),
+        Employee(id='AV2', name='Time Off', is_active=True),
+        Employee(id='AV3', name='No Rows', is_active=True),
+    ])
+    db_session.flush()
+    db_session.add_all([
+        models['EmployeeWeeklyAvailability'](employee_id='AV1', monday=False, tuesday=False),
+        # Older override makes Monday available, newer one takes Monday back
+        models['EmployeeAvailabilityOverride'](employee_id='AV1', start_date=MONDAY, end_date=SUNDAY,
+                                               monday=True, tuesday=True),
+        models['EmployeeAvailabilityOverride'](employee_id='AV1', start_date=MONDAY, end_date=MONDAY,
+                                               monday=False),
+        models['EmployeeTimeOff'](employee_id='AV2', start_date=MONDAY - timedelta(days=3),
+                                  end_date=MONDAY + timedelta(days=1), reason='Vacation'),
+    ])
+    db_session.commit()
+
+
+def test_matrix_combines_sources(db_session, models):
+    _setup(db_session, models)
+    matrix = AvailabilityService(db_session, models).matrix(MONDAY, SUNDAY)
+    tuesday = MONDAY + timedelta(days=1)
+
+    assert not matrix.is_free('AV1', MONDAY)
+    assert matrix.is_free('AV1', tuesday)  # weekly off, override on
+    assert matrix.has_time_off('AV2', tuesday) and matrix.is_available('AV2', tuesday)
+    assert matrix.is_free('UNKNOWN', MONDAY)
+
+    assert matrix.free_employees(MONDAY) == ['AV3']
+    assert matrix.free_employees(MONDAY, ['AV3', 'AV2', 'NEW']) == ['AV3', 'NEW']
+    assert matrix.free_days('AV2') == [MONDAY + timedelta(days=i) for i in range(2, 7)]
+    assert matrix.unavailable_pairs(['AV1', 'AV2'], [MONDAY, tuesday]) == {
+        ('AV1', MONDAY), ('AV2', MONDAY), ('AV2', tuesday)
+    }
+
+
+def test_matrix_cached_until_data_changes(db_session, models):
+    _setup(db_session, models)
+    service = AvailabilityService(db_session, models)
+    first = service.matrix(MONDAY, SUNDAY)
+    assert service.matrix(MONDAY, SUNDAY) is first
+
+    # Uncommitted changes bypass the cache
+    time_off = models['EmployeeTimeOff'](employee_id='AV3', start_date=SUNDAY, end_date=SUNDAY)
+    db_session.add(time_off)
+    assert not service.matrix(MONDAY, SUNDAY).is_free('AV3', SUNDAY)
+
+    version = service.data_version()
+    db_session.commit()
+    assert service.data_version() != version
+    rebuilt = service.matrix(MONDAY, SUNDAY)
+    assert rebuilt is not first and not rebuilt.is_free('AV3', SUNDAY)
+
+
+def test_validator_uses_matrix(db_session, models):
+    from app.services.constraint_validator import ConstraintValidator
+    from app.services.validation_types import ConstraintType
+
+    today = date.today()
+    monday = today + timedelta(days=14 - today.weekday())
+    Employee = models['Employee']
+    emp = Employee(id='AV4', name='Override Monday', job_title='Event Specialist', is_active=True)
+    db_session.add(emp)
+    db_session.flush()
+    db_session.add_all([
+        models['EmployeeWeeklyAvailability'](employee_id='AV4', monday=False),
+        models['EmployeeAvailabilityOverride'](employee_id='AV4', start_date=monday, end_date=monday, monday=True),
+        models['EmployeeTimeOff'](employee_id='AV4', start_date=monday + timedelta(days=1),
+                                  end_date=monday + timedelta(days=1)),
+    ])
+    event = models['Event'](project_ref_num=4343, project_name='Matrix Event', event_type='Core',
+                            estimated_time=60, start_datetime=datetime.combine(monday, time(0, 0)),
+                            due_datetime=datetime.combine(monday + timedelta(days=7), time(0, 0)))
+    db_session.add(event)
+    db_session.commit()
+
+    validator = ConstraintValidator(db_session, models)
+    validator.use_availability(AvailabilityService(db_session, models).matrix(monday, monday + timedelta(days=6)))
+    assert validator.validate_assignment(event, emp, datetime.combine(monday, time(10, 0))).is_valid
+
+    result = validator.validate_assignment(event, emp, datetime.combine(monday + timedelta(days=1), time(10, 0)))
+    assert [v.constraint_type for v in result.violations] == [ConstraintType.TIME_OFF]
+    assert 'time_off_id' in result.violations[0].details
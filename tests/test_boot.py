@@ -0,0 +1,54 @@
+"""
+Test Lazy Boot
+
+Verifies:
+1. create_app does not import the ML, CP-SAT, PDF or AI stacks
+2. Lazily exported names still resolve on first access
+3. Startup timings are recorded and exported by /health/metrics
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+HEAVY = ['pandas', 'numpy', 'xgboost', 'sklearn', 'ortools', 'PyPDF2', 'reportlab', 'xhtml2pdf',
+         'app.ml.inference.ml_scheduler_adapter', 'app.services.cpsat_scheduler',
+         'app.services.daily_paperwork_generator', 'app.services.ai_assistant']
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_boot_skips_heavy_modules():
+    script = (
+        'import json, sys\n'
+        'from app import create_app\n'
+        "create_app('testing')\n"
+        f'print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))\n'
+    )
+    env = dict(os.environ, FLASK_ENV='testing', PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_lazy_exports_resolve():
+    from app.services import SchedulingEngine
+    from app.services.scheduling_engine import SchedulingEngine as engine_class
+    assert SchedulingEngine is engine_class
+
+    from app.integrations.edr import EDRPDFGenerator
+    from app.integrations.edr.pdf_generator import EDRPDFGenerator as generator_class
+    assert EDRPDFGenerator is generator_class
+
+
+def test_boot_timings(app, client, db_session):
+    report = app.config['BOOT_TIMINGS']
+    names = [phase['name'] for phase in report['phases']]
+    assert names == ['config', 'extensions', 'models', 'blueprints', 'background_tasks', 'ml_and_preload']
+    assert report['total_seconds'] >= sum(phase['seconds'] for phase in report['phases']) - 0.01
+
+    body = client.get('/health/metrics').get_data(as_text=True)
+    assert 'scheduler_boot_seconds ' in body
+    assert 'scheduler_boot_phase_seconds{phase="blueprints"}' in body
@@ -0,0 +1,179 @@
+"""
+Test Calendar Day Summaries
+
+Verifies:
+1. Summaries match the per-day counts the calendar used to compute
+2. Schedule and event changes update the affected days on commit
+3. Bulk deletes invalidate the summaries of the days they touch; missing
+   days are rebuilt on read without committing the reader's session
+"""
+
+import json
+from datetime import datetime, date, timedelta
+
+import pytest
+
+from app.services.calendar_summary import CalendarSummaryService
+
+_DAY = date.today() + timedelta(days=10)
+
+
+def _at(day, hour=10):
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=hour)
+
+
+@pytest.fixture
+def month(db_session, models):
+    """Events and schedules around _DAY"""
+    Employee = models['Employee']
+    Event = models['Event']
+    Schedule = models['Schedule']
+
+    db_session.add(Employee(id='emp1', name='Alice'))
+    rows = [
+        (700001, 'Core', _DAY),
+        (700002, 'Core', _DAY),
+        (700003, 'Juicer Production', _DAY),
+        (700004, 'Juicer Survey', _DAY),
+        (700005, 'Mystery', _DAY + timedelta(days=1)),
+    ]
+    for ref_num, event_type, day in rows:
+        db_session.add(Event(
+            project_name=f'{ref_num}-Test', project_ref_num=ref_num, event_type=event_type,
+            start_datetime=_at(day - timedelta(days=2)), due_datetime=_at(day + timedelta(days=2)),
+            is_scheduled=True, condition='Scheduled'
+        ))
+        db_session.add(Schedule(event_ref_num=ref_num, employee_id='emp1', schedule_datetime=_at(day)))
+
+    # Unstaffed event flagged on its due date
+    db_session.add(Event(
+        project_name='700006-Unstaffed', project_ref_num=700006, event_type='Core',
+        start_datetime=_at(_DAY - timedelta(days=3)), due_datetime=_at(_DAY + timedelta(days=3)),
+        condition='Unstaffed'
+    ))
+    db_session.commit()
+    return models
+
+
+def _summary(db_session, models, day):
+    CalendarDaySummary = models['CalendarDaySummary']
+    row = db_session.get(CalendarDaySummary, day)
+    return row.to_dict() if row else None
+
+
+class TestCalendarSummary:
+    """Test summary maintenance"""
+
+    def test_counts(self, db_session, month):
+        summaries = CalendarSummaryService(db_session, month).get_range(_DAY, _DAY + timedelta(days=4))
+
+        day = summaries[_DAY]
+        assert day['scheduled_count'] == 4
+        assert day['counts']['Core'] == 2
+        assert day['counts']['Juicer'] == 2
+        assert day['counts']['Juicer Production'] == 1
+
+        assert summaries[_DAY + timedelta(days=1)]['counts']['Other'] == 1
+        assert summaries[_DAY + timedelta(days=3)]['unscheduled_count'] == 1
+        assert summaries[_DAY + timedelta(days=2)]['scheduled_count'] == 0
+
+    def test_schedule_changes_update_days(self, db_session, month):
+        Schedule = month['Schedule']
+        service = CalendarSummaryService(db_session, month)
+        service.get_range(_DAY, _DAY + timedelta(days=7))
+
+        # Move a Core schedule two days later
+        schedule = Schedule.query.filter_by(event_ref_num=700001).one()
+        schedule.schedule_datetime = _at(_DAY + timedelta(days=5))
+        db_session.commit()
+
+        assert _summary(db_session, month, _DAY)['counts']['Core'] == 1
+        assert _summary(db_session, month, _DAY + timedelta(days=5))['counts']['Core'] == 1
+
+        # Delete it
+        db_session.delete(schedule)
+        db_session.commit()
+        assert _summary(db_session, month, _DAY + timedelta(days=5))['scheduled_count'] == 0
+
+    def test_event_changes_update_days(self, db_session, month):
+        Event = month['Event']
+        CalendarSummaryService(db_session, month).get_range(_DAY, _DAY + timedelta(days=7))
+
+        # Retyping an event moves its scheduled count between badges
+        event = Event.query.filter_by(project_ref_num=700002).one()
+        event.event_type = 'Freeosk'
+        # Staffing the unscheduled event clears its warning
+        unstaffed = Event.query.filter_by(project_ref_num=700006).one()
+        unstaffed.condition = 'Scheduled'
+        db_session.commit()
+
+        day = _summary(db_session, month, _DAY)
+        assert day['counts']['Core'] == 1
+        assert day['counts']['Freeosk'] == 1
+        assert _summary(db_session, month, _DAY + timedelta(days=3))['unscheduled_count'] == 0
+
+    def test_rollback_discards_changes(self, db_session, month):
+        Schedule = month['Schedule']
+        CalendarSummaryService(db_session, month).get_range(_DAY, _DAY + timedelta(days=1))
+
+        schedule = Schedule.query.filter_by(event_ref_num=700001).one()
+        schedule.schedule_datetime = _at(_DAY + timedelta(days=5))
+        db_session.flush()
+        db_session.rollback()
+
+        assert _summary(db_session, month, _DAY)['scheduled_count'] == 4
+
+    def test_bulk_delete_invalidates(self, db_session, month):
+        Schedule = month['Schedule']
+        CalendarSummaryService(db_session, month).get_range(_DAY, _DAY + timedelta(days=2))
+
+        Schedule.query.filter(Schedule.event_ref_num.in_([700001, 700002])).delete(synchronize_session='fetch')
+        db_session.commit()
+        assert _summary(db_session, month, _DAY) is None
+        assert _summary(db_session, month, _DAY + timedelta(days=1))['scheduled_count'] == 1
+
+        summaries = CalendarSummaryService(db_session, month).get_range(_DAY, _DAY + timedelta(days=1))
+        assert summaries[_DAY]['counts']['Core'] == 0
+        assert _summary(db_session, month, _DAY)['scheduled_count'] == 2
+
+    def test_bulk_update_invalidates_touched_days(self, db_session, month):
+        Event = month['Event']
+        CalendarSummaryService(db_session, month).get_range(_DAY, _DAY + timedelta(days=4))
+
+        Event.query.filter(Event.project_ref_num == 700006).update(
+            {'condition': 'Scheduled'}, synchronize_session=False)
+        db_session.commit()
+        assert _summary(db_session, month, _DAY + timedelta(days=3)) is None
+        assert _summary(db_session, month, _DAY)['scheduled_count'] == 4
+
+        # Moving rows to unknown days clears everything
+        Event.query.filter(Event.project_ref_num == 700005).update(
+            {'due_datetime': _at(_DAY + timedelta(days=20))}, synchronize_session=False)
+        db_session.commit()
+        assert _summary(db_session, month, _DAY) is None
+
+    def test_rebuild_leaves_reader_transaction_alone(self, db_session, month):
+        Employee = month['Employee']
+        service = CalendarSummaryService(db_session, month)
+
+        # A reader that has not written: the built days are stored on their own
+        service.get_range(_DAY, _DAY + timedelta(days=1))
+        db_session.rollback()
+        assert _summary(db_session, month, _DAY)['scheduled_count'] == 4
+
+        # A caller with uncommitted writes is neither committed nor rolled back
+        db_session.add(Employee(id='emp2', name='Bob'))
+        db_session.flush()
+        service.ensure_range(_DAY + timedelta(days=1), _DAY + timedelta(days=2))
+        assert db_session.get(Employee, 'emp2') is not None
+        db_session.rollback()
+        assert db_session.get(Employee, 'emp2') is None
+
+    def test_calendar_view(self, client, db_session, month):
+        response = client.get(f'/calendar?date={_DAY.isoformat()}')
+        assert response.status_code == 200
+
+        page = response.get_data(as_text=True)
+        counts = json.loads(page.split('let eventCountsData = ')[1].split(';\n')[0].split(';\r\n')[0])
+        assert counts[_DAY.isoformat()]['total'] == 4
+        assert counts[_DAY.isoformat()]['Juicer'] == 2
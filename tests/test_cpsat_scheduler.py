@@ -475,6 +475,86 @@ class TestRunLifecycle:
         # At least one PendingSchedule per event
         assert len(pending) >= 2
 
+    def test_run_records_profile(self, db_session, models):
+        """Phase timings and solver statistics are stored with the run."""
+        _make_employee(models, db_session, 'emp1', 'Alice')
+        _make_event(models, db_session, 100013, 'Core')
+        db_session.commit()
+
+        run = _run_cpsat(db_session, models)
+        profile = run.profile_data
+        assert profile is not None
+
+        names = [phase['name'] for phase in profile['phases']]
+        assert names == ['load', 'precompute', 'build', 'solve', 'extract']
+        precompute = profile['phases'][1]
+        assert precompute['depth'] == 1
+        assert profile['phases'][2]['triples'] > 0
+        assert all('seconds' in phase and 'sql' in phase for phase in profile['phases'])
+        assert profile['phases'][0]['sql'] > 0
+
+        solver = profile['solver']
+        assert solver['status'] in ('OPTIMAL', 'FEASIBLE')
+        assert solver['variables'] > 0
+        assert solver['constraints'] > 0
+        assert solver['gap'] >= 0
+
+
+# ---------------------------------------------------------------------------
+# Model domains
+# ---------------------------------------------------------------------------
+
+class TestModelDomains:
+    """Variables are created only for feasible (event, employee, day) triples."""
+
+    def test_infeasible_triples_pruned(self, db_session, models):
+        from app.services.cpsat_scheduler import CPSATSchedulingEngine
+
+        _make_employee(models, db_session, 'emp1', 'Alice')
+        _make_employee(models, db_session, 'emp2', 'Bob')
+        _make_employee(models, db_session, 'lead1', 'Lena', job_title='Lead Event Specialist')
+        db_session.flush()
+        db_session.add(models['EmployeeTimeOff'](
+            employee_id='emp2', start_date=_future_date(0), end_date=_future_date(30),
+        ))
+        core = _make_event(models, db_session, 700001, 'Core', start_days=5, due_days=8)
+        freeosk = _make_event(models, db_session, 700002, 'Freeosk', start_days=3, due_days=14)
+        db_session.commit()
+
+        engine = CPSATSchedulingEngine(db_session, models)
+        engine._load_data()
+        core_days = engine._valid_days_for_event(core)
+        engine.existing_core_count_by_emp_day[('emp1', core_days[0])] = 1
+        engine._build_model()
+
+        triples = set(engine.v_assign)
+        assert len(engine.v_triple) == len(triples) == len(engine.domains)
+        assert not any(emp_id == 'emp2' for _, emp_id, _ in triples)
+        assert (core.id, 'emp1', core_days[0]) not in triples
+        assert (core.id, 'emp1', core_days[1]) in triples
+        # Freeosk (support) only where the lead could also take the Core event
+        assert {d for eid, _, d in triples if eid == freeosk.id} == set(core_days)
+        assert engine.domains.pruned['core_limit'] == 1
+        assert engine.domains.pruned['support_without_base'] > 0
+        assert engine.domains.pruned['unavailable'] > 0
+
+        grouped = engine.domains.group_map(('event', 'employee'))
+        assert set(grouped) == set(engine.v_assign_emp)
+        assert sum(len(p) for p in grouped.values()) == len(triples)
+
+    def test_support_only_run_keeps_support_triples(self, db_session, models):
+        """Without base events in the run, H18 neither prunes nor constrains."""
+        _make_employee(models, db_session, 'lead1', 'Lena', job_title='Lead Event Specialist')
+        _make_event(models, db_session, 700011, 'Freeosk', start_days=3, due_days=14)
+        db_session.commit()
+
+        run = _run_cpsat(db_session, models)
+        assert run.status == 'completed'
+        assert run.events_scheduled == 1
+        profile = run.profile_data
+        assert profile['phases'][2]['triples'] > 0
+        assert 'support_without_base' not in profile['phases'][2]['pruned']
+
 
 # ---------------------------------------------------------------------------
 # Integration with route
@@ -0,0 +1,117 @@
+"""
+Test CP-SAT Anytime Solving
+
+Verifies:
+1. The solution monitor captures improving solutions and stops on gap/stall
+2. Engine runs record how the search ended in the run profile
+3. POST /auto-schedule/stop flags a running run and the engine sees it
+4. Runs left running by a dead process stop counting as active and are failed
+"""
+
+from datetime import datetime, timedelta
+
+from ortools.sat.python import cp_model
+
+from app.routes.auth import save_session
+from app.services.cpsat_streaming import STOP_GAP, STOP_STALL, SolutionMonitor
+
+
+def _knapsack():
+    model = cp_model.CpModel()
+    weights = [12, 7, 11, 8, 9, 6, 14, 5]
+    values = [24, 13, 23, 15, 16, 11, 27, 9]
+    take = [model.NewBoolVar(f'take_{i}') for i in range(len(weights))]
+    model.Add(sum(w * t for w, t in zip(weights, take)) <= 30)
+    model.Maximize(sum(v * t for v, t in zip(values, take)))
+    return model, take
+
+
+def _login(client):
+    save_session('stop-session', {
+        'user_info': {'username': 'tester'},
+        'created_at': datetime.utcnow().isoformat(),
+        'last_activity': datetime.utcnow().isoformat()
+    })
+    client.set_cookie('session_id', 'stop-session')
+
+
+def test_monitor_captures_solutions_and_stops():
+    model, take = _knapsack()
+    monitor = SolutionMonitor(take, stop_gap=0.01, stall_seconds=None)
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    assert solver.Solve(model, monitor) == cp_model.OPTIMAL
+
+    best = monitor.take_new_best()
+    assert best.objective == 60 and monitor.take_new_best() is None
+    assert [best.Value(t) for t in take] == [solver.Value(t) for t in take]
+    assert monitor.solutions >= 1 and monitor.check() == STOP_GAP
+
+    monitor.stop_gap = None
+    monitor.stall_seconds = 5
+    assert monitor.check(now=monitor.last_improvement + 1) is None
+    assert monitor.check(now=monitor.last_improvement + 5) == STOP_STALL
+
+
+def test_run_records_stop_reason(db_session, models):
+    from app.services.cpsat_scheduler import CPSATSchedulingEngine
+
+    db_session.add(models['Employee'](id='stream1', name='Streamed', job_title='Event Specialist'))
+    db_session.add(models['Event'](
+        project_ref_num=920001, project_name='920001-Core-Stream', event_type='Core',
+        condition='Unstaffed', start_datetime=datetime.now() + timedelta(days=3),
+        due_datetime=datetime.now() + timedelta(days=10),
+    ))
+    db_session.commit()
+
+    run = CPSATSchedulingEngine(db_session, models).run_auto_scheduler(time_limit_seconds=10)
+    solver = run.profile_data['solver']
+    assert run.status == 'completed'
+    assert solver['solutions'] >= 1
+    assert solver['stop_reason'] in (None, STOP_GAP)
+    assert solver['first_solution_seconds'] is not None
+
+    pending = models['PendingSchedule'].query.filter_by(scheduler_run_id=run.id).all()
+    assert len(pending) == 1 and pending[0].employee_id == 'stream1'
+
+
+def test_stop_route_flags_running_run(client, db_session, models, fake_redis):
+    from app.services.cpsat_scheduler import CPSATSchedulingEngine
+
+    SchedulerRunHistory = models['SchedulerRunHistory']
+    run = SchedulerRunHistory(run_type='manual', status='running', started_at=datetime.utcnow())
+    db_session.add(run)
+    db_session.commit()
+
+    engine = CPSATSchedulingEngine(db_session, models)
+    assert not engine._stop_requested(run)
+
+    _login(client)
+    response = client.post('/auto-schedule/stop')
+    assert response.status_code == 200
+    assert response.get_json()['run_id'] == run.id
+    assert engine._stop_requested(run)
+
+    # Nothing left running
+    assert client.post('/auto-schedule/stop', json={'run_id': run.id}).status_code == 404
+
+
+def test_stale_running_run_is_not_active(app, db_session, models):
+    from app.services.constraint_validator import ConstraintValidator
+
+    SchedulerRunHistory = models['SchedulerRunHistory']
+    stale = SchedulerRunHistory(run_type='manual', status='running',
+                                started_at=datetime.utcnow() - timedelta(hours=2))
+    stopping = SchedulerRunHistory(run_type='manual', status='stopping',
+                                   started_at=datetime.utcnow() - timedelta(hours=2))
+    fresh = SchedulerRunHistory(run_type='manual', status='running', started_at=datetime.utcnow())
+    db_session.add_all([stale, stopping, fresh])
+    db_session.commit()
+
+    assert ConstraintValidator(db_session, models)._get_active_run_ids() == [fresh.id]
+
+    assert SchedulerRunHistory.fail_stale_runs() == 2
+    db_session.commit()
+    db_session.expire_all()
+    assert (stale.status, stopping.status, fresh.status) == ('failed', 'failed', 'running')
+    assert stale.completed_at is not None
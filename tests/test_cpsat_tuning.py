@@ -0,0 +1,89 @@
+"""
+Test CP-SAT Solver Tuning
+
+Verifies:
+1. Snapshots round-trip and the harness ranks parameter combinations
+2. Saved solver profiles are applied by the engine (invalid ones ignored)
+3. Scheduler runs export snapshots when CPSAT_SNAPSHOT_DIR is set
+"""
+
+import json
+from datetime import datetime, timedelta
+
+from ortools.sat.python import cp_model
+
+from app.services.cpsat_tuning import (
+    DEFAULT_PARAMETERS, PROFILE_SETTING_KEY, TuningHarness, export_snapshot, find_snapshots,
+    load_snapshot, load_solver_profile, save_solver_profile,
+)
+
+
+def _knapsack():
+    model = cp_model.CpModel()
+    weights = [12, 7, 11, 8, 9, 6, 14, 5]
+    values = [24, 13, 23, 15, 16, 11, 27, 9]
+    take = [model.NewBoolVar(f'take_{i}') for i in range(len(weights))]
+    model.Add(sum(w * t for w, t in zip(weights, take)) <= 30)
+    model.Maximize(sum(v * t for v, t in zip(values, take)))
+    return model
+
+
+def _setup_run(db_session, models):
+    db_session.add(models['Employee'](id='tune1', name='Tuned', job_title='Event Specialist'))
+    db_session.add(models['Event'](
+        project_ref_num=910001, project_name='910001-Core-Tune', event_type='Core',
+        condition='Unstaffed', start_datetime=datetime.now() + timedelta(days=3),
+        due_datetime=datetime.now() + timedelta(days=10),
+    ))
+    db_session.commit()
+
+
+def test_harness_ranks_candidates(tmp_path):
+    path = export_snapshot(_knapsack(), str(tmp_path), 'knapsack')
+    assert find_snapshots(str(tmp_path)) == [path]
+    assert len(load_snapshot(path).Proto().variables) == 8
+
+    grid = {'num_workers': [1, 2], 'search_branching': ['FIXED_SEARCH']}
+    report = TuningHarness([path], grid, time_limit=5).run()
+
+    assert len(report['results']) == 2
+    assert report['best'] == report['results'][0]['parameters']
+    for row in report['results']:
+        run, = row['runs']
+        assert run['status'] == 'OPTIMAL'
+        assert run['objective'] == run['best_objective'] == 60
+        assert run['first_feasible'] is not None and run['near_best'] >= run['first_feasible']
+        assert row['unsolved'] == 0
+
+
+def test_engine_uses_saved_profile(db_session, models):
+    from app.services.cpsat_scheduler import CPSATSchedulingEngine
+
+    SystemSetting = models['SystemSetting']
+    assert load_solver_profile(SystemSetting) == DEFAULT_PARAMETERS
+
+    parameters = {'num_workers': 2, 'linearization_level': 2, 'search_branching': 'PORTFOLIO_SEARCH'}
+    save_solver_profile(SystemSetting, parameters, summary={'mean_near_best': 0.5})
+    assert load_solver_profile(SystemSetting) == parameters
+
+    _setup_run(db_session, models)
+    run = CPSATSchedulingEngine(db_session, models).run_auto_scheduler(time_limit_seconds=10)
+    assert run.profile_data['solver']['parameters'] == parameters
+
+    SystemSetting.set_setting(PROFILE_SETTING_KEY, json.dumps({'parameters': {'no_such_field': 1}}))
+    assert load_solver_profile(SystemSetting) == DEFAULT_PARAMETERS
+
+
+def test_run_exports_snapshot(app, db_session, models, tmp_path):
+    from app.services.cpsat_scheduler import CPSATSchedulingEngine
+
+    _setup_run(db_session, models)
+    app.config['CPSAT_SNAPSHOT_DIR'] = str(tmp_path)
+    try:
+        run = CPSATSchedulingEngine(db_session, models).run_auto_scheduler(time_limit_seconds=10)
+    finally:
+        app.config['CPSAT_SNAPSHOT_DIR'] = ''
+
+    snapshot, = find_snapshots(str(tmp_path))
+    assert f'run_{run.id}_' in snapshot
+    assert len(load_snapshot(snapshot).Proto().variables) == run.profile_data['solver']['variables']
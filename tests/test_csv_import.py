@@ -0,0 +1,189 @@
+"""
+Test CSV Import Engine
+
+Verifies:
+1. WorkBankVisits rows are bulk inserted, duplicates skipped, employees created
+2. Bad rows are reported with their line number without aborting the import
+3. Scheduled imports create schedules once, mark existing events scheduled
+   and count only the schedules they add
+4. Chunking and the import endpoints (inline and background job)
+"""
+
+import io
+import time
+from datetime import datetime
+
+import pytest
+
+from app.services.csv_import_service import CSVImportService, CSVImportError
+from app.services.job_runner import get_job, JOB_STATUS_COMPLETED, JOB_STATUS_ERROR
+
+_WHEN = datetime(2026, 10, 1, 9, 0)
+HEADER = ('Project Name,Project Reference Number,Location MVID,Store Number,Store Name,'
+          'Start Date/Time,Due Date/Time,Estimated Time,Employee ID,Rep Name')
+
+
+def _row(ref_num, name='Demo', employee_id='', rep_name='', start='10/01/2026 09:00:00 AM',
+         due='10/07/2026 05:00:00 PM', estimated=''):
+    return f'{ref_num}-{name},{ref_num},MV1,8135,Store 8135,{start},{due},{estimated},{employee_id},{rep_name}'
+
+
+def _csv(*rows, header=HEADER):
+    return io.StringIO('\n'.join((header,) + rows) + '\n')
+
+
+def _scheduled_row(ref_num, name, employee_id, rep_name, scheduled='10/03/2026 10:15:00 AM'):
+    return _row(ref_num, name, employee_id, rep_name) + f',{scheduled}'
+
+
+class TestEventImport:
+    """Test WorkBankVisits.csv imports"""
+
+    def test_bulk_insert_and_skip_duplicates(self, db_session, models):
+        Event = models['Event']
+        Employee = models['Employee']
+        db_session.add(Event(project_name='Existing', project_ref_num=800001,
+                             start_datetime=_WHEN, due_datetime=_WHEN))
+        db_session.commit()
+
+        result = CSVImportService(db_session, models, chunk_size=2).import_events(_csv(
+            _row(800001),
+            _row(800002, 'Core Demo', 'E1', 'Alice'),
+            _row(800003, 'Supervisor Demo', 'E1', 'Alice'),
+            _row(800002, 'Core Demo'),
+            _row(800004, 'Juice Production-SPCLTY'),
+        ))
+
+        assert result['imported_count'] == 3
+        assert result['skipped_count'] == 2
+        assert result['error_count'] == 0
+        assert result['employees_added'] == 1
+        assert result['processed'] == 5
+
+        event = Event.query.filter_by(project_ref_num=800002).one()
+        assert event.event_type == 'Core'
+        assert event.estimated_time == Event.get_default_duration('Core')
+        assert event.is_scheduled is False
+        assert event.condition == 'Unstaffed'
+        assert Event.query.filter_by(project_ref_num=800004).one().event_type == 'Juicer Production'
+        assert db_session.get(Employee, 'E1').name == 'Alice'
+
+    def test_bad_rows_reported(self, db_session, models):
+        Event = models['Event']
+
+        result = CSVImportService(db_session, models).import_events(_csv(
+            _row(800011),
+            _row('not-a-number'),
+            _row(800012, start='2026-10-01'),
+            _row(800013),
+        ))
+
+        assert result['imported_count'] == 2
+        assert result['error_count'] == 2
+        assert [error['row'] for error in result['errors']] == [3, 4]
+        assert Event.query.filter(Event.project_ref_num.in_([800011, 800013])).count() == 2
+
+    def test_missing_headers(self, db_session, models):
+        with pytest.raises(CSVImportError, match='Rep Name'):
+            CSVImportService(db_session, models).import_events(
+                _csv(header=HEADER.replace(',Rep Name', ''))
+            )
+
+
+class TestScheduledImport:
+    """Test scheduled event imports"""
+
+    def test_creates_schedules_once(self, db_session, models):
+        Event = models['Event']
+        Schedule = models['Schedule']
+        Employee = models['Employee']
+        EmployeeWeeklyAvailability = models['EmployeeWeeklyAvailability']
+        db_session.add(Event(project_name='800022-Demo', project_ref_num=800022,
+                             start_datetime=_WHEN, due_datetime=_WHEN))
+        db_session.commit()
+
+        header = HEADER + ',Schedule Date/Time'
+        rows = (
+            _scheduled_row(800021, 'Core Demo', 'E2', 'Bob'),
+            _scheduled_row(800022, 'Demo', 'E2', 'Bob'),
+            _scheduled_row(800022, 'Demo', 'E2', 'Bob'),
+        )
+        result = CSVImportService(db_session, models).import_scheduled_events(_csv(*rows, header=header))
+
+        assert result['imported_count'] == 2
+        assert result['skipped_count'] == 1
+        assert result['employees_added'] == 1
+        assert Schedule.query.filter_by(employee_id='E2').count() == 2
+        assert Event.query.filter_by(project_ref_num=800022).one().is_scheduled is True
+        assert db_session.get(Employee, 'E2').job_title == 'Event Specialist'
+        assert EmployeeWeeklyAvailability.query.filter_by(employee_id='E2').count() == 1
+
+        core = Schedule.query.filter_by(event_ref_num=800021).one()
+        assert core.shift_block is not None
+
+        # Re-importing the same file adds nothing
+        result = CSVImportService(db_session, models).import_scheduled_events(_csv(*rows, header=header))
+        assert (result['imported_count'], result['skipped_count']) == (0, 3)
+        assert Schedule.query.filter_by(employee_id='E2').count() == 2
+
+    def test_counts_inserted_and_skipped(self, db_session, models):
+        Event = models['Event']
+        Schedule = models['Schedule']
+        db_session.add(Event(project_name='800052-Demo', project_ref_num=800052,
+                             start_datetime=_WHEN, due_datetime=_WHEN))
+        db_session.commit()
+
+        result = CSVImportService(db_session, models).import_scheduled_events(_csv(
+            _scheduled_row(800052, 'Demo', 'E5', 'Eve'),
+            _scheduled_row(800052, 'Demo', 'E5', 'Eve'),   # Duplicate row
+            _scheduled_row(800053, 'Demo', 'E5', 'Eve'),   # Event not in the database yet
+            _scheduled_row(800054, 'Demo', '', ''),        # No employee
+            header=HEADER + ',Schedule Date/Time'
+        ))
+
+        assert result['imported_count'] == 2
+        assert result['skipped_count'] == 2
+        assert result['processed'] == 4
+        assert 'skipped 2 already scheduled or without an employee' in result['message']
+        assert {s.event_ref_num for s in Schedule.query.filter_by(employee_id='E5')} == {800052, 800053}
+        assert Event.query.filter_by(project_ref_num=800054).one().is_scheduled is True
+
+
+class TestImportEndpoints:
+    """Test the import API endpoints"""
+
+    def test_inline_import(self, client, db_session, models):
+        data = {'file': (io.BytesIO(_csv(_row(800031), _row(800032)).getvalue().encode()), 'WorkBankVisits.csv')}
+        response = client.post('/api/import/events', data=data, content_type='multipart/form-data')
+
+        assert response.status_code == 200
+        assert response.get_json()['imported_count'] == 2
+
+    def test_missing_headers_rejected(self, client, db_session):
+        data = {'file': (io.BytesIO(b'Project Name\nDemo\n'), 'bad.csv')}
+        response = client.post('/api/import/events', data=data, content_type='multipart/form-data')
+
+        assert response.status_code == 400
+        assert 'Missing required CSV headers' in response.get_json()['error']
+
+    def test_background_import(self, client, db_session, models, fake_redis):
+        Event = models['Event']
+        data = {
+            'file': (io.BytesIO(_csv(_row(800041)).getvalue().encode()), 'WorkBankVisits.csv'),
+            'async': 'true'
+        }
+        response = client.post('/api/import/events', data=data, content_type='multipart/form-data')
+
+        assert response.status_code == 202
+        job_id = response.get_json()['job_id']
+        deadline = time.monotonic() + 5
+        record = get_job(job_id)
+        while record['status'] not in (JOB_STATUS_COMPLETED, JOB_STATUS_ERROR) and time.monotonic() < deadline:
+            time.sleep(0.05)
+            record = get_job(job_id)
+
+        assert record['status'] == JOB_STATUS_COMPLETED
+        assert record['result']['imported_count'] == 1
+        db_session.expire_all()
+        assert Event.query.filter_by(project_ref_num=800041).count() == 1
+
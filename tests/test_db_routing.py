@@ -0,0 +1,120 @@
+"""
+Test Database Read Routing
+
+Verifies:
+1. Read-only sessions send SELECTs to the read engine of a SQLite file database
+2. Writes, and reads after a write in the same transaction, stay on the primary
+3. Streamed export responses keep their reads on the read engine
+4. Per-role SQLite pragmas (WAL, query_only readers) and config overrides
+5. In-memory SQLite (the test configuration) keeps everything on the primary
+"""
+
+import pytest
+from flask import Flask, current_app
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, text
+
+from app.utils.db_routing import (
+    READ_BIND, RoutingSession, configure_read_bind, init_db_routing, read_only_session, read_only_view,
+)
+from app.utils.export_stream import export_response
+
+
+@pytest.fixture
+def routed(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'routing.db'}"
+    app.config['SQLITE_READ_CACHE_SIZE'] = -2048
+    db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+    class Item(db.Model):
+        id = db.Column(db.Integer, primary_key=True)
+        name = db.Column(db.String(20))
+
+    assert configure_read_bind(app) == app.config['SQLALCHEMY_DATABASE_URI']
+    db.init_app(app)
+    init_db_routing(app, db)
+
+    with app.app_context():
+        db.create_all()
+        used = []
+        for key, engine in db.engines.items():
+            event.listen(engine, 'before_cursor_execute',
+                         lambda conn, cursor, statement, *args, key=key: used.append(key))
+        yield db, Item, used
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def test_read_only_selects_use_read_engine(routed):
+    db, Item, used = routed
+    db.session.add(Item(name='a'))
+    db.session.commit()
+
+    used.clear()
+    assert Item.query.count() == 1
+    assert set(used) == {None}
+
+    used.clear()
+    with read_only_session(db.session):
+        assert [item.name for item in Item.query.all()] == ['a']
+    assert set(used) == {READ_BIND}
+
+
+def test_writes_and_reads_after_write_stay_on_primary(routed):
+    db, Item, used = routed
+    with read_only_session(db.session):
+        db.session.add(Item(name='b'))
+        db.session.flush()
+        used.clear()
+        assert Item.query.filter_by(name='b').count() == 1  # Uncommitted row is only visible on the primary
+        assert set(used) == {None}
+        db.session.commit()
+
+        used.clear()
+        assert Item.query.count() == 1
+        assert set(used) == {READ_BIND}
+
+
+def test_streamed_export_reads_use_read_engine(routed):
+    db, Item, used = routed
+    db.session.add_all([Item(name='a'), Item(name='b')])
+    db.session.commit()
+    app = current_app._get_current_object()
+
+    @app.route('/export')
+    @read_only_view
+    def export():
+        def rows():
+            yield ('name',)
+            for (name,) in db.session.query(Item.name).order_by(Item.id).yield_per(1):
+                yield (name,)
+        return export_response(rows(), 'items')
+
+    used.clear()
+    response = app.test_client().get('/export')
+    assert response.get_data(as_text=True).split() == ['name', 'a', 'b']
+    assert used and set(used) == {READ_BIND}
+
+
+def test_role_pragmas(routed):
+    db, Item, used = routed
+    with db.engines[None].connect() as conn:
+        assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert conn.execute(text('PRAGMA query_only')).scalar() == 0
+    with db.engines[READ_BIND].connect() as conn:
+        assert conn.execute(text('PRAGMA query_only')).scalar() == 1
+        assert conn.execute(text('PRAGMA cache_size')).scalar() == -2048
+        with pytest.raises(Exception):
+            conn.execute(text("INSERT INTO item (name) VALUES ('c')"))
+
+
+def test_in_memory_database_has_no_read_engine(app, db_session, models):
+    from app.extensions import db
+
+    assert READ_BIND not in db.engines
+    with read_only_session():
+        db_session.add(models['Employee'](id='route1', name='Routed', job_title='Event Specialist'))
+        db_session.commit()
+        assert models['Employee'].query.get('route1').name == 'Routed'
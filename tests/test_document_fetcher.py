@@ -0,0 +1,143 @@
+"""
+Test Document Fetcher
+
+Verifies:
+1. Cached PDFs are served without a request, then revalidated with ETag / Last-Modified
+2. Non-PDF responses are not cached
+3. Parallel fetches keep input order
+4. Instruction manual merge uses the fetcher
+"""
+
+import threading
+import time
+from datetime import datetime
+from io import BytesIO
+
+import pytest
+from PyPDF2 import PdfReader, PdfWriter
+
+from app.routes.auth import save_session
+from app.services import document_fetcher
+from app.services.document_fetcher import DocumentFetcher
+
+
+def _pdf(pages=1):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f'HTTP {self.status_code}')
+
+
+class FakeSession:
+    """Serves documents by URL and records request headers"""
+
+    def __init__(self, documents, delay=0):
+        self.documents = documents
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None):
+        with self.lock:
+            self.requests.append((url, dict(headers or {})))
+        time.sleep(self.delay)
+        document = self.documents.get(url)
+        if document is None:
+            return FakeResponse(404)
+        if headers and headers.get('If-None-Match') == document.get('etag'):
+            return FakeResponse(304)
+        return FakeResponse(200, document['content'], {
+            'Content-Type': document.get('content_type', 'application/pdf'),
+            'ETag': document.get('etag'),
+        })
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    return DocumentFetcher(cache_dir=str(tmp_path), max_workers=4, max_age=3600)
+
+
+class TestDocumentFetcher:
+    """Test caching and concurrency"""
+
+    def test_cache_hit_and_revalidation(self, fetcher):
+        session = FakeSession({'http://docs/a.pdf': {'content': _pdf(), 'etag': '"v1"'}})
+
+        first = fetcher.fetch('http://docs/a.pdf', session=session)
+        second = fetcher.fetch('http://docs/a.pdf', session=session)
+        assert first.is_pdf and not first.from_cache
+        assert second.from_cache
+        assert len(session.requests) == 1
+
+        # Once stale, a conditional request returns the cached bytes on 304
+        fetcher.max_age = 0
+        third = fetcher.fetch('http://docs/a.pdf', session=session)
+        assert third.from_cache
+        assert third.content == first.content
+        assert session.requests[-1][1]['If-None-Match'] == '"v1"'
+
+    def test_error_pages_not_cached(self, fetcher):
+        session = FakeSession({'http://docs/login': {'content': b'<html>login</html>', 'content_type': 'text/html'}})
+
+        document = fetcher.fetch('http://docs/login', session=session)
+        assert document.ok and not document.is_pdf
+        fetcher.fetch('http://docs/login', session=session)
+        assert len(session.requests) == 2
+
+        missing = fetcher.fetch('http://docs/missing', session=session)
+        assert not missing.ok
+        assert 'HTTP 404' in missing.error
+
+    def test_parallel_fetch_keeps_order(self, fetcher):
+        urls = [f'http://docs/{i}.pdf' for i in range(4)]
+        session = FakeSession({url: {'content': _pdf(i + 1)} for i, url in enumerate(urls)}, delay=0.2)
+
+        started = time.monotonic()
+        documents = list(fetcher.iter_fetch(urls, session=session))
+        elapsed = time.monotonic() - started
+
+        assert [doc.url for doc in documents] == urls
+        assert [len(PdfReader(BytesIO(doc.content)).pages) for doc in documents] == [1, 2, 3, 4]
+        assert elapsed < 0.6
+
+
+class TestInstructionMerge:
+    """Test /printing/event-instructions/merge"""
+
+    def test_merge(self, client, fake_redis, tmp_path, monkeypatch):
+        session = FakeSession({
+            'http://docs/a.pdf': {'content': _pdf(2)},
+            'http://docs/b.pdf': {'content': _pdf(1)},
+        })
+        fetcher = DocumentFetcher(cache_dir=str(tmp_path))
+        fetcher.session = session
+        monkeypatch.setattr(document_fetcher, 'get_document_fetcher', lambda: fetcher)
+
+        save_session('merge-session', {
+            'user_info': {'username': 'tester'},
+            'created_at': datetime.utcnow().isoformat(),
+            'last_activity': datetime.utcnow().isoformat()
+        })
+        client.set_cookie('session_id', 'merge-session')
+
+        response = client.post('/printing/event-instructions/merge', json={
+            'urls': ['http://docs/a.pdf', 'http://docs/missing.pdf', 'http://docs/b.pdf'],
+            'event_names': ['A', 'Missing', 'B']
+        })
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/pdf'
+        assert len(PdfReader(BytesIO(response.get_data())).pages) == 3
@@ -0,0 +1,130 @@
+"""
+Test Streaming Exports
+
+Verifies:
+1. Schedule, events and corporate report exports stream the same rows as before
+2. Optional gzip encoding and format validation
+"""
+
+import csv
+import gzip
+import io
+from datetime import datetime, date, timedelta
+
+import pytest
+
+from app.routes.auth import save_session
+from app.utils import export_stream
+
+_DAY = date.today() + timedelta(days=3)
+
+
+def _at(day, hour=10):
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=hour)
+
+
+def _rows(response):
+    body = response.get_data()
+    if response.headers.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return list(csv.reader(io.StringIO(body.decode('utf-8'))))
+
+
+@pytest.fixture
+def export_data(db_session, models):
+    """Two scheduled events (one outside its date range) and one unscheduled"""
+    Employee = models['Employee']
+    Event = models['Event']
+    Schedule = models['Schedule']
+
+    db_session.add(Employee(id='exp1', name='Export Tester'))
+    db_session.add(Event(
+        project_name='900001-Core Demo', project_ref_num=900001, event_type='Core', condition='Scheduled',
+        start_datetime=_at(_DAY - timedelta(days=1)), due_datetime=_at(_DAY + timedelta(days=5))
+    ))
+    db_session.add(Event(
+        project_name='900002-Late Demo', project_ref_num=900002, event_type='Other', condition='Scheduled',
+        start_datetime=_at(_DAY - timedelta(days=5)), due_datetime=_at(_DAY - timedelta(days=1))
+    ))
+    db_session.add(Event(
+        project_name='900003-Open Demo', project_ref_num=900003, event_type='Other', condition='Unstaffed',
+        start_datetime=_at(_DAY), due_datetime=_at(_DAY + timedelta(days=5))
+    ))
+    db_session.add(Schedule(event_ref_num=900001, employee_id='exp1', schedule_datetime=_at(_DAY)))
+    db_session.add(Schedule(event_ref_num=900002, employee_id='exp1', schedule_datetime=_at(_DAY)))
+    db_session.commit()
+    return models
+
+
+class TestScheduleExport:
+    """Test /api/export/schedule"""
+
+    def test_valid_rows_and_warnings(self, client, export_data):
+        response = client.get('/api/export/schedule')
+        assert response.status_code == 200
+        assert 'CalendarSchedule.csv' in response.headers['Content-Disposition']
+
+        rows = _rows(response)
+        assert rows[0][0] == 'Project Name'
+        data_rows = [row for row in rows[1:] if row and not row[0].startswith('#')]
+        assert [row[1] for row in data_rows] == ['900001']
+        assert any(row and row[0].startswith('# 900002-Late Demo') for row in rows)
+
+    def test_valid_only_gzip(self, client, export_data):
+        response = client.get('/api/export/schedule?valid_only=true&gzip=true',
+                              headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+
+        rows = _rows(response)
+        assert len(rows) == 2
+        assert rows[1][8] == 'Export Tester'
+
+    def test_unknown_format(self, client, export_data):
+        assert client.get('/api/export/schedule?format=pdf').status_code == 400
+
+    def test_xlsx_unavailable(self, client, export_data, monkeypatch):
+        monkeypatch.setattr(export_stream, 'XLSX_AVAILABLE', False)
+        response = client.get('/api/export/schedule?format=xlsx')
+        assert response.status_code == 400
+        assert 'XlsxWriter' in response.get_json()['error']
+
+
+class TestEventsExport:
+    """Test /api/export/events"""
+
+    def test_rows_per_schedule(self, client, export_data):
+        response = client.get('/api/export/events?search=Demo')
+        assert response.status_code == 200
+        assert 'Events.csv' in response.headers['Content-Disposition']
+
+        rows = {row[0]: row for row in _rows(response)[1:]}
+        assert rows['900001'][10] == 'Export Tester'
+        assert rows['900003'][10] == ''
+        assert rows['900003'][3] == 'Unstaffed'
+
+
+class TestCorporateReport:
+    """Test /api/export/corporate-report"""
+
+    def test_summary_and_weeks(self, client, export_data, fake_redis):
+        save_session('export-session', {
+            'user_info': {'username': 'tester'},
+            'created_at': datetime.utcnow().isoformat(),
+            'last_activity': datetime.utcnow().isoformat()
+        })
+        client.set_cookie('session_id', 'export-session')
+
+        date_from = (_DAY - timedelta(days=10)).isoformat()
+        date_to = (_DAY + timedelta(days=10)).isoformat()
+        response = client.get(f'/api/export/corporate-report?date_from={date_from}&date_to={date_to}')
+        assert response.status_code == 200
+
+        rows = _rows(response)
+        assert ['Total Events: 3'] in rows
+        assert ['  Scheduled: 2'] in rows
+        week_headers = [row[0] for row in rows if row and row[0].startswith('Week of')]
+        assert sum(int(header.split('(')[1].split()[0]) for header in week_headers) == 3
+        details = {row[0]: row for row in rows if row and row[0].isdigit()}
+        assert details['900001'][6] == 'Export Tester'
+        assert details['900001'][8] == '6'
+        assert details['900003'][6] == ''
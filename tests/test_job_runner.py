@@ -0,0 +1,279 @@
+"""
+Test Background Job Runner
+
+Verifies:
+1. Jobs run in the background and persist progress and results
+2. Jobs with the same key are deduplicated while unfinished
+3. Per-type concurrency limits; slots of dead jobs are reclaimed
+4. Login refresh progress is a job record served by the generic endpoints
+5. EDR batch downloads run as edr_batch jobs
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from app.routes.auth import save_session, save_refresh_progress, get_refresh_progress
+from app.services import job_runner
+from app.services.job_runner import (
+    JOB_TYPES, job_type, job_store, submit_job, execute_job, get_job, iter_job_progress,
+    new_job_record, JOB_STATUS_COMPLETED, JOB_STATUS_ERROR, JOB_STATUS_QUEUED, JOB_SLOTS_PREFIX,
+    SLOT_STALE_SECONDS
+)
+
+
+@pytest.fixture
+def test_jobs(app, fake_redis):
+    """Register throwaway job types"""
+    release = threading.Event()
+
+    @job_type('test_echo', total_steps=2)
+    def echo(ctx, value=None):
+        ctx.update(current_step=1, step_label='Echoing')
+        return {'success': True, 'value': value}
+
+    @job_type('test_blocking', max_concurrent=1)
+    def blocking(ctx):
+        release.wait(5)
+        return {'success': True}
+
+    @job_type('test_failing')
+    def failing(ctx):
+        raise RuntimeError('boom')
+
+    yield release
+
+    release.set()
+    for name in ('test_echo', 'test_blocking', 'test_failing'):
+        JOB_TYPES.pop(name, None)
+
+
+def _wait_for(job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        record = get_job(job_id)
+        if record and record['status'] in (JOB_STATUS_COMPLETED, JOB_STATUS_ERROR):
+            return record
+        time.sleep(0.02)
+    raise AssertionError(f'Job {job_id} did not finish')
+
+
+class TestJobRunner:
+    """Test submission and execution"""
+
+    def test_runs_and_persists_result(self, app, test_jobs):
+        job_id, created = submit_job('test_echo', params={'value': 42}, user='tester')
+        record = _wait_for(job_id)
+
+        assert created is True
+        assert record['status'] == JOB_STATUS_COMPLETED
+        assert record['result'] == {'success': True, 'value': 42}
+        assert record['type'] == 'test_echo'
+        assert record['user'] == 'tester'
+        assert record['finished_at'] is not None
+
+    def test_failure_recorded(self, app, test_jobs):
+        job_id, _ = submit_job('test_failing')
+        record = _wait_for(job_id)
+
+        assert record['status'] == JOB_STATUS_ERROR
+        assert record['error'] == 'boom'
+
+    def test_unknown_type_rejected(self, app, test_jobs):
+        with pytest.raises(ValueError):
+            submit_job('no_such_job')
+
+    def test_dedup_by_key(self, app, test_jobs):
+        first, created_first = submit_job('test_blocking', job_key='only-one')
+        second, created_second = submit_job('test_blocking', job_key='only-one')
+
+        assert created_first is True
+        assert created_second is False
+        assert second == first
+
+        test_jobs.set()
+        _wait_for(first)
+
+        # Key is released once the job finishes
+        third, created_third = submit_job('test_blocking', job_key='only-one')
+        assert created_third is True
+        assert third != first
+        _wait_for(third)
+
+    def test_concurrency_limit(self, app, test_jobs):
+        running, _ = submit_job('test_blocking')
+        deadline = time.monotonic() + 5
+        while get_job(running)['status'] == JOB_STATUS_QUEUED and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        # A second job of the same type cannot take a slot while the first runs
+        waiting = 'waiting-job'
+        job_store.save(waiting, dict(new_job_record(waiting, 'test_blocking'), status=JOB_STATUS_QUEUED))
+        assert execute_job(waiting, params={}) is None
+        assert get_job(waiting)['status'] == JOB_STATUS_QUEUED
+
+        test_jobs.set()
+        _wait_for(running)
+        assert execute_job(waiting, params={})['status'] == JOB_STATUS_COMPLETED
+        assert job_store.client.zcard(f'{JOB_SLOTS_PREFIX}test_blocking') == 0
+
+    def test_waiting_job_runs_when_slot_frees(self, app, test_jobs, monkeypatch):
+        monkeypatch.setattr(job_runner, 'SLOT_WAIT_SECONDS', 0.05)
+        first, _ = submit_job('test_blocking')
+        second, _ = submit_job('test_blocking')
+
+        time.sleep(0.2)
+        assert get_job(second)['status'] == JOB_STATUS_QUEUED
+        test_jobs.set()
+        assert _wait_for(first)['status'] == JOB_STATUS_COMPLETED
+        assert _wait_for(second)['status'] == JOB_STATUS_COMPLETED
+
+    def test_stale_slot_is_reclaimed(self, app, test_jobs, fake_redis):
+        # A job that died holding the only slot stopped heartbeating
+        slots = f'{JOB_SLOTS_PREFIX}test_echo'
+        fake_redis.zadd(slots, {'dead-job': time.time() - SLOT_STALE_SECONDS - 1})
+        job_store.save('next-job', new_job_record('next-job', 'test_echo'))
+
+        assert execute_job('next-job', params={})['status'] == JOB_STATUS_COMPLETED
+        assert fake_redis.zscore(slots, 'dead-job') is None
+
+        # A live holder keeps its slot
+        fake_redis.zadd(slots, {'live-job': time.time()})
+        job_store.save('blocked-job', new_job_record('blocked-job', 'test_echo'))
+        assert execute_job('blocked-job', params={}) is None
+
+    def test_progress_stream_follows_attached_job(self, app, test_jobs):
+        job_store.save('owner', dict(new_job_record('owner', 'test_echo'), status=JOB_STATUS_COMPLETED))
+        job_store.save('follower', dict(new_job_record('follower', 'test_echo'), attached_to='owner'))
+
+        snapshots = list(iter_job_progress('follower', interval=0))
+
+        assert snapshots[-1]['id'] == 'owner'
+        assert snapshots[-1]['status'] == JOB_STATUS_COMPLETED
+        assert list(iter_job_progress('missing'))[0]['status'] == 'error'
+
+
+class TestJobEndpoints:
+    """Test the generic job API"""
+
+    @pytest.fixture
+    def logged_in(self, client, fake_redis):
+        save_session('sess-1', {
+            'user_info': {'username': 'tester'},
+            'created_at': job_runner.datetime.utcnow().isoformat(),
+            'last_activity': job_runner.datetime.utcnow().isoformat()
+        })
+        client.set_cookie('session_id', 'sess-1')
+        return client
+
+    def test_refresh_progress_is_job_record(self, app, logged_in):
+        save_refresh_progress('task-1', dict(new_job_record('task-1', 'db_refresh', total_steps=6),
+                                             status=JOB_STATUS_COMPLETED))
+
+        response = logged_in.get('/api/jobs/task-1')
+        assert response.status_code == 200
+        assert response.get_json()['job']['type'] == 'db_refresh'
+        assert get_refresh_progress('task-1')['total_steps'] == 6
+
+        stream = logged_in.get('/api/jobs/task-1/progress').get_data(as_text=True)
+        payload = json.loads(stream.strip().split('data: ')[-1])
+        assert payload['status'] == JOB_STATUS_COMPLETED
+
+    def test_status_hides_params_and_paths(self, app, logged_in):
+        record = new_job_record('job-1', 'paperwork')
+        record.update(status=JOB_STATUS_COMPLETED, params={'date': '2026-01-01'},
+                      result={'success': True, 'path': '/tmp/secret.pdf', 'filename': 'x.pdf'})
+        job_store.save('job-1', record)
+
+        job = logged_in.get('/api/jobs/job-1').get_json()['job']
+
+        assert 'params' not in job
+        assert 'path' not in job['result']
+        assert job['download'] is True
+        assert logged_in.get('/api/jobs/job-1/download').status_code == 404
+        assert logged_in.get('/api/jobs/nope').status_code == 404
+
+
+class TestEdrBatchJob:
+    """EDR batch downloads are queued as edr_batch jobs"""
+
+    class FakeAuthenticator:
+        auth_token = 'token'
+
+        def get_edr_report(self, event_number):
+            return {'event_number': event_number} if event_number != '999999' else None
+
+    class FakePdfGenerator:
+        def generate_pdf(self, edr_data, path, employee_name, schedule_info=None):
+            from PyPDF2 import PdfWriter
+            writer = PdfWriter()
+            writer.add_blank_page(width=72, height=72)
+            with open(path, 'wb') as f:
+                writer.write(f)
+            return True
+
+    @pytest.fixture
+    def logged_in(self, client, fake_redis):
+        save_session('sess-edr', {
+            'user_info': {'username': 'tester'},
+            'created_at': job_runner.datetime.utcnow().isoformat(),
+            'last_activity': job_runner.datetime.utcnow().isoformat()
+        })
+        client.set_cookie('session_id', 'sess-edr')
+        return client
+
+    def test_printing_batch_is_merged_by_job(self, app, db_session, models, logged_in, tmp_path, monkeypatch):
+        from app.routes import printing
+
+        monkeypatch.setattr(app, 'instance_path', str(tmp_path))
+
+        when = job_runner.datetime(2026, 11, 2, 10, 0)
+        db_session.add(models['Employee'](id='edr1', name='Edna', job_title='Event Specialist'))
+        for ref, name in ((910001, '910001-Core A'), (910002, '999999-Core B')):
+            db_session.add(models['Event'](project_ref_num=ref, project_name=name, event_type='Core',
+                                           start_datetime=when, due_datetime=when))
+            db_session.add(models['Schedule'](event_ref_num=ref, employee_id='edr1', schedule_datetime=when))
+        db_session.commit()
+
+        monkeypatch.setattr(printing, 'edr_available', True)
+        monkeypatch.setattr(printing, 'edr_authenticator', self.FakeAuthenticator())
+        monkeypatch.setattr(printing, 'get_edr_pdf_generator', self.FakePdfGenerator)
+
+        response = logged_in.post('/printing/edr/batch-download', json={'date': '2026-11-02'})
+        assert response.status_code == 202
+        record = _wait_for(response.get_json()['job_id'])
+
+        assert record['type'] == 'edr_batch'
+        assert record['status'] == JOB_STATUS_COMPLETED
+        assert record['result']['merged'] == 1
+        assert [f['event_number'] for f in record['result']['failed']] == ['999999']
+        download = logged_in.get(f"/api/jobs/{record['id']}/download")
+        assert download.status_code == 200
+        assert download.mimetype == 'application/pdf'
+        assert len(list(tmp_path.glob('job_results/*.pdf'))) == 1
+
+    def test_walmart_batch_runs_as_job(self, app, db_session, logged_in, tmp_path, monkeypatch):
+        from app.integrations.walmart_api import routes as walmart_routes
+        from app.integrations.walmart_api.session_manager import session_manager
+
+        class FakeSession:
+            is_authenticated = True
+            authenticator = self.FakeAuthenticator()
+
+            def refresh(self):
+                pass
+
+        monkeypatch.setattr(session_manager, 'get_session', lambda user_id: FakeSession())
+        monkeypatch.setattr(walmart_routes, 'get_pdf_generator', self.FakePdfGenerator)
+        monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path))
+
+        response = logged_in.post('/api/walmart/edr/batch-download', json={'event_ids': ['123456', '999999']})
+        assert response.status_code == 202
+        record = _wait_for(response.get_json()['job_id'])
+
+        assert record['type'] == 'edr_batch'
+        result = record['result']
+        assert (result['total'], result['successful'], result['failed']) == (2, 1, 1)
+        assert len(list(tmp_path.glob('walmart_edrs/*/EDR_123456_*.pdf'))) == 1
@@ -0,0 +1,165 @@
+"""
+Test Freshness-Aware Login Refresh
+
+Verifies:
+1. Refresh planning from the last refresh timestamps
+2. Delta refresh updates events in place and reconciles schedules
+3. Only one refresh holds the shared lock; others attach to it
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app.services import database_refresh_service as refresh_module
+from app.services.database_refresh_service import (
+    DatabaseRefreshService, plan_login_refresh, record_refresh_success,
+    acquire_refresh_lock, release_refresh_lock, refresh_database_with_progress,
+    LAST_REFRESH_SETTING, LAST_FULL_REFRESH_SETTING,
+    REFRESH_MODE_FULL, REFRESH_MODE_DELTA, REFRESH_MODE_SKIP
+)
+
+
+def _set_time(models, key, when):
+    models['SystemSetting'].set_setting(key, when.isoformat())
+
+
+def _api_record(ref_num, name, condition='Unstaffed', start=None):
+    start = start or datetime.now() + timedelta(days=2)
+    return {
+        'mPlanID': str(ref_num),
+        'mPlanName': name,
+        'mPlanStartDate': start.strftime('%m/%d/%Y'),
+        'mPlanDueDate': (start + timedelta(days=3)).strftime('%m/%d/%Y'),
+        'condition': condition,
+    }
+
+
+class TestRefreshPlanning:
+    """Test skip/delta/full decisions"""
+
+    def test_full_when_never_refreshed(self, app, db_session, models):
+        assert plan_login_refresh() == REFRESH_MODE_FULL
+
+    def test_skip_when_recent(self, app, db_session, models):
+        now = datetime.utcnow()
+        _set_time(models, LAST_REFRESH_SETTING, now - timedelta(minutes=5))
+        _set_time(models, LAST_FULL_REFRESH_SETTING, now - timedelta(hours=3))
+        assert plan_login_refresh(now) == REFRESH_MODE_SKIP
+
+    def test_delta_when_full_refresh_recent(self, app, db_session, models):
+        now = datetime.utcnow()
+        _set_time(models, LAST_REFRESH_SETTING, now - timedelta(hours=2))
+        _set_time(models, LAST_FULL_REFRESH_SETTING, now - timedelta(hours=2))
+        assert plan_login_refresh(now) == REFRESH_MODE_DELTA
+        assert plan_login_refresh(now + timedelta(days=2)) == REFRESH_MODE_FULL
+
+    def test_record_success(self, app, db_session, models):
+        record_refresh_success(REFRESH_MODE_DELTA)
+        SystemSetting = models['SystemSetting']
+        assert SystemSetting.get_setting(LAST_REFRESH_SETTING)
+        assert SystemSetting.get_setting(LAST_FULL_REFRESH_SETTING) is None
+
+
+class TestDeltaRefresh:
+    """Test in-place near-term refresh"""
+
+    def test_updates_creates_and_unschedules(self, app, db_session, models):
+        Event = models['Event']
+        Schedule = models['Schedule']
+        Employee = models['Employee']
+
+        start = datetime.now() + timedelta(days=2)
+        db_session.add(Employee(id='emp_a', name='Alice', job_title='Event Specialist'))
+        db_session.add(Event(
+            project_name='Old Name', project_ref_num=900001, event_type='Juicer Production',
+            start_datetime=start, due_datetime=start + timedelta(days=3), condition='Unstaffed'
+        ))
+        db_session.add(Event(
+            project_name='Soon Cancelled', project_ref_num=900002, event_type='Core',
+            start_datetime=start, due_datetime=start + timedelta(days=3),
+            condition='Scheduled', is_scheduled=True
+        ))
+        db_session.add(Schedule(event_ref_num=900002, employee_id='emp_a', schedule_datetime=start))
+        db_session.commit()
+
+        records = {'mplans': [
+            _api_record(900001, 'New Name'),
+            _api_record(900002, 'Soon Cancelled', condition='Canceled'),
+            _api_record(900003, 'Brand New Core'),
+        ]}
+        service = DatabaseRefreshService()
+        with patch('app.integrations.external_api.session_api_service.session_api.get_all_planning_events_parallel',
+                   return_value=records), \
+                patch.object(DatabaseRefreshService, '_fetch_estimated_times', return_value={}):
+            result = service.refresh_delta()
+
+        assert result['success'], result
+        assert result['stats']['created'] == 1
+        assert result['stats']['updated'] == 2
+
+        renamed = Event.query.filter_by(project_ref_num=900001).one()
+        assert renamed.project_name == 'New Name'
+        assert renamed.event_type == 'Juicer Production'  # local type kept
+        assert Schedule.query.filter_by(event_ref_num=900002).count() == 0
+        assert Event.query.filter_by(project_ref_num=900003).count() == 1
+        assert models['SystemSetting'].get_setting(LAST_REFRESH_SETTING)
+
+    def test_keeps_locally_scheduled_event_scheduled(self, app, db_session, models):
+        Event = models['Event']
+        Schedule = models['Schedule']
+
+        start = datetime.now() + timedelta(days=2)
+        db_session.add(models['Employee'](id='emp_b', name='Bob', job_title='Event Specialist'))
+        db_session.add(Event(
+            project_name='Approved Here', project_ref_num=900011, event_type='Core',
+            start_datetime=start, due_datetime=start + timedelta(days=3),
+            condition='Scheduled', is_scheduled=True
+        ))
+        db_session.add(Schedule(event_ref_num=900011, employee_id='emp_b', schedule_datetime=start))
+        db_session.commit()
+
+        records = {'mplans': [_api_record(900011, 'Approved Here', condition='Unstaffed')]}
+        with patch('app.integrations.external_api.session_api_service.session_api.get_all_planning_events_parallel',
+                   return_value=records), \
+                patch.object(DatabaseRefreshService, '_fetch_estimated_times', return_value={}):
+            result = DatabaseRefreshService().refresh_delta()
+
+        assert result['success'], result
+        assert result['stats']['reconciled'] == 1
+        event = Event.query.filter_by(project_ref_num=900011).one()
+        assert event.is_scheduled is True
+        assert event.condition == 'Scheduled'
+        assert Schedule.query.filter_by(event_ref_num=900011).count() == 1
+
+
+class TestRefreshLock:
+    """Test single-flight refresh"""
+
+    def test_second_owner_blocked(self, app, fake_redis):
+        assert acquire_refresh_lock('task-1') == (True, 'task-1')
+        assert acquire_refresh_lock('task-2') == (False, 'task-1')
+
+        release_refresh_lock('task-2')  # not the owner - no effect
+        assert acquire_refresh_lock('task-3')[0] is False
+
+        release_refresh_lock('task-1')
+        assert acquire_refresh_lock('task-3')[0] is True
+
+    def test_login_attaches_to_running_refresh(self, app, db_session, fake_redis):
+        acquire_refresh_lock('task-1')
+        with patch.object(DatabaseRefreshService, 'refresh') as full, \
+                patch.object(DatabaseRefreshService, 'refresh_delta') as delta:
+            result = refresh_database_with_progress('task-2')
+
+        assert result['attached_to'] == 'task-1'
+        full.assert_not_called()
+        delta.assert_not_called()
+
+    def test_skip_completes_immediately(self, app, db_session, fake_redis):
+        with patch.object(refresh_module, 'plan_login_refresh', return_value=REFRESH_MODE_SKIP), \
+                patch.object(DatabaseRefreshService, 'refresh') as full:
+            result = refresh_database_with_progress('task-1')
+
+        assert result['stats']['mode'] == REFRESH_MODE_SKIP
+        full.assert_not_called()
+        assert acquire_refresh_lock('task-2')[0] is True  # lock released
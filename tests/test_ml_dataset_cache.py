@@ -0,0 +1,159 @@
+"""
+Test ML Dataset Cache
+
+Verifies:
+1. Partitions are week-aligned and cover the window
+2. Unchanged partitions are reused on the next load
+3. New pending rows invalidate only their partition; edits outside the rows
+   a partition's features read reuse it, edits inside rebuild it
+4. Cached output matches direct data preparation
+"""
+
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.ml.training.dataset_cache import PartitionedDatasetCache, week_partitions
+from app.ml.training.data_preparation import TrainingDataPreparation
+
+_NOW = datetime.combine(datetime.now().date(), datetime.min.time())
+
+
+@pytest.fixture
+def cache_dir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _add_pending(models, db_session, ref_num, created_at, status='api_submitted', new_event=True):
+    Event = models['Event']
+    PendingSchedule = models['PendingSchedule']
+    run = models['SchedulerRunHistory'].query.first()
+    if new_event:
+        db_session.add(Event(
+            project_name=f'Event {ref_num}', project_ref_num=ref_num, event_type='Core',
+            start_datetime=created_at, due_datetime=created_at + timedelta(days=5)
+        ))
+    db_session.add(PendingSchedule(
+        scheduler_run_id=run.id, event_ref_num=ref_num, employee_id='emp_a',
+        schedule_datetime=created_at + timedelta(days=1),
+        status=status, created_at=created_at
+    ))
+
+
+@pytest.fixture
+def history(db_session, models):
+    """Pending schedules spread over the last four weeks."""
+    db_session.add(models['Employee'](id='emp_a', name='Alice', job_title='Event Specialist'))
+    db_session.add(models['SchedulerRunHistory'](run_type='manual'))
+    db_session.flush()
+    for i in range(8):
+        _add_pending(models, db_session, 7000 + i, _NOW - timedelta(days=2 + i * 3))
+    db_session.commit()
+    return models
+
+
+class TestWeekPartitions:
+    """Test partition boundaries"""
+
+    def test_monday_aligned(self):
+        start = datetime(2025, 3, 5, 15, 30)   # Wednesday
+        end = datetime(2025, 3, 20)
+        partitions = week_partitions(start, end)
+
+        assert partitions[0][0] == datetime(2025, 3, 3)
+        assert all(s.weekday() == 0 for s, _ in partitions)
+        assert all(e - s == timedelta(days=7) for s, e in partitions)
+        assert partitions[-1][1] >= end
+
+
+class TestPartitionedDatasetCache:
+    """Test partition reuse and invalidation"""
+
+    def test_second_load_reuses_partitions(self, db_session, history, cache_dir):
+        start = _NOW - timedelta(days=28)
+        cache = PartitionedDatasetCache(db_session, history, cache_dir=cache_dir)
+
+        first = cache.load('employee_ranking', start, _NOW)
+        assert cache.last_run_stats['built'] == cache.last_run_stats['partitions']
+
+        second = cache.load('employee_ranking', start, _NOW)
+        assert cache.last_run_stats['built'] == 0
+        assert len(second) == len(first)
+
+    def test_new_rows_rebuild_affected_partition(self, db_session, history, cache_dir):
+        start = _NOW - timedelta(days=28)
+        cache = PartitionedDatasetCache(db_session, history, cache_dir=cache_dir)
+        first = cache.load('employee_ranking', start, _NOW)
+
+        # Another proposal for an existing event
+        _add_pending(history, db_session, 7000, _NOW - timedelta(days=1), new_event=False)
+        db_session.commit()
+
+        second = cache.load('employee_ranking', start, _NOW)
+        assert 1 <= cache.last_run_stats['built'] <= 2
+        assert len(second) == len(first) + 1
+
+    def test_unrelated_edits_reuse_partitions(self, db_session, history, cache_dir):
+        Schedule = history['Schedule']
+        start = _NOW - timedelta(days=28)
+        db_session.add(Schedule(event_ref_num=7000, employee_id='emp_a',
+                                schedule_datetime=start - timedelta(days=200)))
+        db_session.commit()
+        cache = PartitionedDatasetCache(db_session, history, cache_dir=cache_dir)
+        cache.load('employee_ranking', start, _NOW)
+        partitions = cache.last_run_stats['partitions']
+
+        # Older than the 90-day lookback, and another employee's work
+        db_session.add(Schedule(event_ref_num=7000, employee_id='emp_a',
+                                schedule_datetime=start - timedelta(days=365)))
+        db_session.add(history['Employee'](id='emp_b', name='Bob', job_title='Event Specialist'))
+        db_session.add(Schedule(event_ref_num=7001, employee_id='emp_b', schedule_datetime=_NOW - timedelta(days=5)))
+        db_session.commit()
+        cache.load('employee_ranking', start, _NOW)
+        assert cache.last_run_stats['reused'] == partitions
+
+        # Inside the lookback of the proposals' schedule dates
+        db_session.add(Schedule(event_ref_num=7001, employee_id='emp_a', schedule_datetime=_NOW - timedelta(days=5)))
+        db_session.commit()
+        cache.load('employee_ranking', start, _NOW)
+        assert cache.last_run_stats['built'] >= 1
+
+        # An employee attribute the features read
+        history['Employee'].query.get('emp_a').is_supervisor = True
+        db_session.commit()
+        cache.load('employee_ranking', start, _NOW)
+        assert cache.last_run_stats['built'] >= 1
+
+    def test_other_dataset_fingerprints(self, db_session, history, cache_dir):
+        cache = PartitionedDatasetCache(db_session, history, cache_dir=cache_dir)
+        start, end = _NOW - timedelta(days=7), _NOW
+        for dataset in ('bumping', 'feasibility'):
+            assert cache.fingerprint(dataset, start, end) == cache.fingerprint(dataset, start, end)
+
+        before = cache.fingerprint('feasibility', start, end)
+        history['Event'].query.filter_by(project_ref_num=7000).one().condition = 'Canceled'
+        db_session.commit()
+        assert cache.fingerprint('feasibility', start, end) != before
+
+    def test_matches_direct_preparation(self, db_session, history, cache_dir):
+        start = _NOW - timedelta(days=28)
+        cached = PartitionedDatasetCache(db_session, history, cache_dir=cache_dir).load(
+            'employee_ranking', start, _NOW
+        )
+        direct = TrainingDataPreparation(db_session, history).prepare_employee_ranking_data(
+            start, _NOW, min_lookback_days=0
+        )
+
+        assert len(cached) == len(direct)
+        assert sorted(cached['event_ref_num']) == sorted(direct['event_ref_num'])
+
+    def test_force_rebuild(self, db_session, history, cache_dir):
+        start = _NOW - timedelta(days=14)
+        cache = PartitionedDatasetCache(db_session, history, cache_dir=cache_dir)
+        cache.load('employee_ranking', start, _NOW)
+        cache.load('employee_ranking', start, _NOW, force_rebuild=True)
+        assert cache.last_run_stats['reused'] == 0
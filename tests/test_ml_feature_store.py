@@ -0,0 +1,182 @@
+"""
+Test ML Feature Store
+
+Verifies:
+1. Rolling window counts match the SQL queries they replace
+2. Store-backed feature extraction matches SQL-backed extraction
+3. Windows past built_through extend the arrays once, and stale live days refresh
+4. Incremental updates pick up new days
+5. Save/load round trip
+6. The shared store is not rebound to callers' sessions
+"""
+
+import os
+import tempfile
+from datetime import datetime, date, timedelta
+
+import pytest
+
+from app.ml.features import feature_store
+from app.ml.features.feature_store import EmployeeFeatureStore, get_feature_store
+from app.ml.features.simple_employee_features import SimpleEmployeeFeatureExtractor
+
+_TODAY = date.today()
+
+
+@pytest.fixture
+def history(db_session, models):
+    """Two employees with posted schedules spread over the last 100 days."""
+    Employee = models['Employee']
+    Event = models['Event']
+    Schedule = models['Schedule']
+
+    db_session.add(Employee(id='emp_a', name='Alice', job_title='Lead Event Specialist'))
+    db_session.add(Employee(id='emp_b', name='Bob', job_title='Event Specialist'))
+
+    for i in range(40):
+        day = datetime.combine(_TODAY - timedelta(days=1 + i * 2), datetime.min.time()) + timedelta(hours=10)
+        event_type = 'Core' if i % 3 else 'Juicer'
+        db_session.add(Event(
+            project_name=f'Event {i}', project_ref_num=5000 + i, event_type=event_type,
+            start_datetime=day - timedelta(days=3), due_datetime=day + timedelta(days=3),
+            is_scheduled=True
+        ))
+        db_session.add(Schedule(
+            event_ref_num=5000 + i,
+            employee_id='emp_a' if i % 2 else 'emp_b',
+            schedule_datetime=day
+        ))
+    db_session.commit()
+    return models
+
+
+class TestEmployeeFeatureStore:
+    """Test rolling aggregates"""
+
+    def test_rolling_counts_match_sql(self, db_session, history):
+        """30/90-day counts equal the equivalent COUNT queries"""
+        Schedule = history['Schedule']
+        store = EmployeeFeatureStore(db_session, history).build(_TODAY - timedelta(days=120), _TODAY)
+        as_of = datetime.combine(_TODAY, datetime.min.time())
+
+        for emp_id in ('emp_a', 'emp_b'):
+            for days in (30, 90):
+                expected = Schedule.query.filter(
+                    Schedule.employee_id == emp_id,
+                    Schedule.schedule_datetime >= as_of - timedelta(days=days),
+                    Schedule.schedule_datetime < as_of
+                ).count()
+                assert store.rolling_count('schedules', emp_id, as_of, days) == expected
+
+        counts = store.window_counts('schedules', ['emp_a', 'emp_b', 'unknown'],
+                                     _TODAY - timedelta(days=30), _TODAY)
+        assert counts[2] == 0
+        assert counts[0] + counts[1] == Schedule.query.filter(
+            Schedule.schedule_datetime >= as_of - timedelta(days=30)
+        ).count()
+
+    def test_store_features_match_sql_features(self, db_session, history):
+        """Extractor output is identical with and without the store"""
+        Employee = history['Employee']
+        Event = history['Event']
+        store = EmployeeFeatureStore(db_session, history).build(_TODAY - timedelta(days=200), _TODAY)
+
+        employee = Employee.query.get('emp_a')
+        event = Event.query.filter_by(project_ref_num=5010).first()
+        when = datetime.combine(_TODAY - timedelta(days=14), datetime.min.time())
+
+        sql_features = SimpleEmployeeFeatureExtractor(db_session, history).extract(employee, event, when)
+        store_features = SimpleEmployeeFeatureExtractor(
+            db_session, history, feature_store=store
+        ).extract(employee, event, when)
+
+        assert store_features == sql_features
+
+    def test_window_past_built_through_extends_store(self, db_session, history):
+        """Windows reaching past built_through append the missing days to the arrays"""
+        Schedule = history['Schedule']
+        store = EmployeeFeatureStore(db_session, history).build(_TODAY - timedelta(days=30), _TODAY)
+        assert store.covers(_TODAY - timedelta(days=7), _TODAY + timedelta(days=14))
+        assert not store.covers(_TODAY - timedelta(days=90), _TODAY)
+
+        # Scheduled after the store was built, and in the future
+        db_session.add(Schedule(event_ref_num=5000, employee_id='emp_a',
+                                schedule_datetime=datetime.combine(_TODAY + timedelta(days=3), datetime.min.time())))
+        db_session.commit()
+
+        as_of = datetime.combine(_TODAY + timedelta(days=7), datetime.min.time())
+        expected = Schedule.query.filter(
+            Schedule.employee_id == 'emp_a',
+            Schedule.schedule_datetime >= as_of - timedelta(days=30),
+            Schedule.schedule_datetime < as_of
+        ).count()
+        assert store.rolling_count('schedules', 'emp_a', as_of, 30) == expected
+        assert store.built_through >= as_of.date()
+
+        # Served from the extended arrays without another aggregation
+        built_through = store.built_through
+        assert store.window_counts('schedules', ['emp_a'], as_of - timedelta(days=30), as_of)[0] == expected
+        assert store.built_through == built_through
+
+    def test_live_days_refresh_when_stale(self, db_session, history, monkeypatch):
+        """Days from the extension date on are re-aggregated once they go stale"""
+        Schedule = history['Schedule']
+        store = EmployeeFeatureStore(db_session, history).build(_TODAY - timedelta(days=30), _TODAY)
+        week_later = _TODAY + timedelta(days=7)
+        before = store.window_count('schedules', 'emp_b', _TODAY, week_later)
+
+        db_session.add(Schedule(event_ref_num=5001, employee_id='emp_b',
+                                schedule_datetime=datetime.combine(_TODAY + timedelta(days=2), datetime.min.time())))
+        db_session.commit()
+
+        assert store.window_count('schedules', 'emp_b', _TODAY, week_later) == before
+        monkeypatch.setattr(feature_store, 'LIVE_REFRESH_SECONDS', -1)
+        assert store.window_count('schedules', 'emp_b', _TODAY, week_later) == before + 1
+
+    def test_incremental_update(self, db_session, history):
+        """update() extends the day axis and includes new schedules"""
+        Schedule = history['Schedule']
+        store = EmployeeFeatureStore(db_session, history).build(
+            _TODAY - timedelta(days=60), _TODAY - timedelta(days=10)
+        )
+        before = store.window_count('schedules', 'emp_a', _TODAY - timedelta(days=60), _TODAY - timedelta(days=10))
+
+        store.update(_TODAY)
+
+        assert store.built_through == _TODAY
+        expected = Schedule.query.filter(
+            Schedule.employee_id == 'emp_a',
+            Schedule.schedule_datetime >= datetime.combine(_TODAY - timedelta(days=60), datetime.min.time())
+        ).count()
+        assert store.window_count('schedules', 'emp_a', _TODAY - timedelta(days=60), _TODAY) == expected
+        assert expected >= before
+
+    def test_save_load_round_trip(self, db_session, history):
+        """A saved store answers the same queries after loading"""
+        store = EmployeeFeatureStore(db_session, history).build(_TODAY - timedelta(days=90), _TODAY)
+
+        path = os.path.join(tempfile.mkdtemp(), 'store.npz')
+        store.save(path)
+        loaded = EmployeeFeatureStore.load(path, db_session, history)
+
+        assert loaded.built_through == store.built_through
+        assert loaded.has_worked_event_type('emp_a', 'Core') == store.has_worked_event_type('emp_a', 'Core')
+        for emp_id in ('emp_a', 'emp_b'):
+            assert loaded.rolling_count('schedules', emp_id, _TODAY, 90) == \
+                store.rolling_count('schedules', emp_id, _TODAY, 90)
+
+    def test_shared_store_takes_session_per_call(self, db_session, history, tmp_path, monkeypatch):
+        """get_feature_store does not bind the shared store to a caller's session"""
+        path = str(tmp_path / 'store.npz')
+        EmployeeFeatureStore(db_session, history).build(_TODAY - timedelta(days=90), _TODAY).save(path)
+        monkeypatch.setattr(feature_store, '_shared_store', None)
+        config = {'ML_FEATURE_STORE_ENABLED': True, 'ML_FEATURE_STORE_PATH': path}
+
+        shared = get_feature_store(db_session, history, config)
+        assert shared is get_feature_store(object(), history, config)
+        assert shared.db is None
+
+        as_of = _TODAY + timedelta(days=7)
+        expected = EmployeeFeatureStore(db_session, history).build(_TODAY - timedelta(days=90), as_of)
+        assert shared.rolling_count('schedules', 'emp_a', as_of, 30, db_session=db_session) == \
+            expected.rolling_count('schedules', 'emp_a', as_of, 30)
@@ -0,0 +1,176 @@
+"""
+Test ML Model Registry & Model Server
+
+Verifies:
+1. Artifacts are loaded once per process and shared
+2. Changed artifacts are hot-swapped with a new version
+3. Failed reloads keep the previous model serving
+4. Adapters share the registry model
+5. Unix-socket model server round trip
+6. Model server connections require the shared authkey
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+
+import pytest
+
+from app.ml.inference.model_registry import MLModelRegistry, ml_model_registry
+from app.ml.inference.model_server import ModelServer, RemoteEmployeeRanker, ModelServerError, authkey_path
+from app.ml.inference.ml_scheduler_adapter import MLSchedulerAdapter
+
+ARTIFACT = 'app/ml/models/artifacts/employee_ranker_latest.pkl'
+
+
+@pytest.fixture
+def tmp_dir():
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+class TestMLModelRegistry:
+    """Test process-wide model caching"""
+
+    def test_loads_once(self, tmp_dir):
+        """Repeated gets return the same object without reloading"""
+        path = os.path.join(tmp_dir, 'model.bin')
+        with open(path, 'w') as f:
+            f.write('v1')
+
+        calls = []
+
+        def loader(p):
+            calls.append(p)
+            return object()
+
+        registry = MLModelRegistry(check_interval=0)
+        first = registry.get(path, loader)
+        second = registry.get(path, loader)
+
+        assert first is second
+        assert len(calls) == 1
+        assert registry.get_versions()[os.path.abspath(path)]['version'] == 1
+
+    def test_hot_swap_on_change(self, tmp_dir):
+        """A changed file is reloaded and the version increments"""
+        path = os.path.join(tmp_dir, 'model.bin')
+        with open(path, 'w') as f:
+            f.write('v1')
+
+        registry = MLModelRegistry(check_interval=0)
+        first = registry.get(path, lambda p: open(p).read())
+
+        with open(path, 'w') as f:
+            f.write('version-2')
+
+        second = registry.get(path, lambda p: open(p).read())
+
+        assert first == 'v1'
+        assert second == 'version-2'
+        assert registry.get_versions()[os.path.abspath(path)]['version'] == 2
+
+    def test_failed_reload_keeps_previous(self, tmp_dir):
+        """A broken replacement artifact does not take down the served model"""
+        path = os.path.join(tmp_dir, 'model.bin')
+        with open(path, 'w') as f:
+            f.write('v1')
+
+        registry = MLModelRegistry(check_interval=0)
+        registry.get(path, lambda p: 'good')
+
+        with open(path, 'w') as f:
+            f.write('corrupted!')
+
+        def broken(p):
+            raise ValueError('bad pickle')
+
+        assert registry.get(path, broken) == 'good'
+
+    def test_missing_path_returns_none(self):
+        """Missing artifacts return None instead of raising"""
+        registry = MLModelRegistry()
+        assert registry.get('/nonexistent/model.pkl', lambda p: object()) is None
+        assert registry.get(None, lambda p: object()) is None
+
+    def test_adapters_share_model(self, app, db_session, models):
+        """Two adapters get the same EmployeeRanker instance"""
+        if not os.path.exists(ARTIFACT):
+            pytest.skip('No trained model artifact')
+
+        config = {
+            'ML_ENABLED': True,
+            'ML_EMPLOYEE_RANKING_ENABLED': True,
+            'ML_EMPLOYEE_RANKER_PATH': ARTIFACT
+        }
+        ml_model_registry.clear()
+
+        first = MLSchedulerAdapter(db_session, models, config).employee_ranker
+        second = MLSchedulerAdapter(db_session, models, config).employee_ranker
+
+        assert first is not None
+        assert first is second
+
+
+class TestModelServer:
+    """Test the Unix-socket inference server"""
+
+    def test_rank_round_trip(self, tmp_dir):
+        """Remote ranking returns the same order as local ranking"""
+        if not os.path.exists(ARTIFACT):
+            pytest.skip('No trained model artifact')
+
+        socket_path = os.path.join(tmp_dir, 'ml.sock')
+        registry = MLModelRegistry()
+        server = ModelServer(socket_path, default_model_path=ARTIFACT, registry=registry)
+        server.start()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        try:
+            local = registry.get_employee_ranker(ARTIFACT)
+            features = [
+                {col: float(i) for col in local.feature_columns}
+                for i in range(3)
+            ]
+
+            remote = RemoteEmployeeRanker(socket_path, ARTIFACT)
+            assert remote.is_available()
+
+            remote_rank = remote.rank_employees(features)
+            local_rank = local.rank_employees(features)
+
+            assert [idx for idx, _ in remote_rank] == [idx for idx, _ in local_rank]
+            assert os.path.abspath(ARTIFACT) in remote.get_versions()
+        finally:
+            server.stop()
+
+    def test_authkey_required(self, tmp_dir):
+        """Clients need the configured or generated authkey"""
+        class StubRegistry:
+            def get_employee_ranker(self, path):
+                return None
+
+        for authkey in (None, 'configured-key'):
+            socket_path = os.path.join(tmp_dir, f'auth-{bool(authkey)}.sock')
+            server = ModelServer(socket_path, registry=StubRegistry(), authkey=authkey)
+            server.start()
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            try:
+                assert os.path.exists(authkey_path(socket_path)) is (authkey is None)
+                assert RemoteEmployeeRanker(socket_path, authkey=authkey).is_available()
+                assert not RemoteEmployeeRanker(socket_path, authkey='wrong-key').is_available()
+                # The server keeps serving after a rejected handshake
+                assert RemoteEmployeeRanker(socket_path, authkey=authkey).is_available()
+            finally:
+                server.stop()
+            assert not os.path.exists(authkey_path(socket_path))
+
+    def test_unreachable_server(self, tmp_dir):
+        """Client reports unavailability instead of hanging"""
+        remote = RemoteEmployeeRanker(os.path.join(tmp_dir, 'missing.sock'))
+        assert remote.is_available() is False
+        with pytest.raises(ModelServerError):
+            remote.rank_employees([{'a': 1}])
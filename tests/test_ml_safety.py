@@ -19,6 +19,7 @@ import pickle
 import os
 from app.services.scheduling_engine import SchedulingEngine
 from app.ml.inference.ml_scheduler_adapter import MLSchedulerAdapter
+from app.ml.inference.model_registry import ml_model_registry
 
 # Default datetime values for Event construction (NOT NULL fields)
 _EVT_START = datetime(2026, 3, 1, 8, 0, 0)
@@ -178,7 +179,8 @@ class TestCorruptedModelFallback:
 
             # Mock joblib.load to raise exception (model uses joblib, not pickle)
             with patch('app.ml.models.employee_ranker.joblib.load', side_effect=Exception("Unpickle error")):
-                # Force reload
+                # Force reload (bypass the process-wide model cache)
+                ml_model_registry.clear()
                 adapter._employee_ranker = None
                 model = adapter.employee_ranker
 
@@ -431,16 +433,13 @@ class TestImportFailureHandling:
                     'ML_EMPLOYEE_RANKING_ENABLED': True
                 }
 
-                # Mock MLSchedulerAdapter import to fail
-                with patch('app.services.scheduling_engine.MLSchedulerAdapter', side_effect=ImportError("ML module missing")):
-                    # Scheduler should handle this gracefully
-                    try:
-                        engine = SchedulingEngine(db_session, models)
-                        # If it initializes, ml_adapter should be None
-                        assert engine.ml_adapter is None
-                    except Exception:
-                        # Or it might handle it differently - just verify no crash
-                        pass
+                # Resolving the lazily imported adapter fails
+                with patch('app.services.scheduling_engine._ml_adapter_class',
+                           side_effect=ImportError("ML module missing")) as adapter_class:
+                    engine = SchedulingEngine(db_session, models)
+
+                adapter_class.assert_called_once()
+                assert engine.ml_adapter is None
 
 
 class TestConstraintValidationUnchanged:
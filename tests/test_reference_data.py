@@ -0,0 +1,60 @@
+"""
+Test Reference Data Lookups
+
+Verifies:
+1. The JSON snapshot matches the tables in app.constants
+2. Date -> Walmart week lookups agree with the week table, including edges
+3. EDR PDF description lookups use the indexed tables
+"""
+
+import json
+from datetime import date, datetime, timedelta
+
+from app.constants import DEPARTMENT_CODES, WALMART_WEEKS
+from app.utils.reference_data import SNAPSHOT_PATH, ReferenceData, build_payload, get_reference_data
+
+
+def test_snapshot_matches_constants():
+    with open(SNAPSHOT_PATH, encoding='utf-8') as f:
+        snapshot = json.load(f)
+    assert snapshot == build_payload(), 'Regenerate with: python -m app.utils.reference_data'
+
+
+def test_walmart_week_lookup():
+    ref = ReferenceData(build_payload())
+    first = datetime.fromisoformat(WALMART_WEEKS[0]['start_date'][:10]).date()
+    last = datetime.fromisoformat(WALMART_WEEKS[-1]['end_date'][:10]).date()
+
+    day = first
+    while day <= last:
+        expected = next(
+            week['WMWeek'] for week in WALMART_WEEKS
+            if week['start_date'][:10] <= day.isoformat() <= week['end_date'][:10]
+        )
+        assert ref.walmart_week(day) == expected
+        day += timedelta(days=1)
+
+    assert ref.walmart_week(first - timedelta(days=1)) is None
+    assert ref.walmart_week(last + timedelta(days=1)) is None
+    assert ref.walmart_week(datetime(2025, 2, 7, 18, 30)) == 'Week 1'
+
+    from app.routes.printing import get_walmart_week
+    assert get_walmart_week(date(2025, 2, 8)) == 'Week 2'
+
+
+def test_pdf_generator_descriptions():
+    from app.integrations.edr.pdf_generator import DailyItemsListPDFGenerator, EDRPDFGenerator
+
+    generator = EDRPDFGenerator()
+    assert generator.get_event_type_description('1') == 'UNMANNED DEMO'
+    assert generator.get_event_type_description(3) == 'STANDARD'
+    assert generator.get_event_type_description('99999') == 'Event Type 99999'
+    assert generator.get_event_status_description('0') == 'NEW'
+    assert generator.get_event_status_description('N/A') == 'N/A'
+
+    dept = DEPARTMENT_CODES[0]
+    assert generator.get_department_description(str(dept['DEPT_NO'])) == dept['DESCRIPTION']
+    assert generator.get_department_description('99999') == 'N/A'
+    assert DailyItemsListPDFGenerator().get_department_description(dept['DEPT_NO']) == dept['DESCRIPTION']
+
+    assert get_reference_data().club(4109)['store_name'] == 'BOSSIER CITY'
@@ -0,0 +1,80 @@
+"""
+Test Request Profiler
+
+Verifies:
+1. Queries issued during a request are counted and timed per endpoint
+2. Repeated statements are flagged as N+1 patterns
+3. Slow requests are logged with their top statements
+4. /health/metrics exposes the histograms in Prometheus format
+"""
+
+import logging
+
+import pytest
+from flask import g
+
+from app.services.request_profiler import RequestProfile, endpoint_metrics, _finish_profile
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    endpoint_metrics.reset()
+    yield
+    endpoint_metrics.reset()
+
+
+def _profiled_request(app, models, path, lookups):
+    """Run lookups inside a profiled request context for path"""
+    Employee = models['Employee']
+    with app.test_request_context(path):
+        g._request_profile = RequestProfile()
+        for employee_id in lookups:
+            Employee.query.filter_by(id=employee_id).first()
+        profile = g._request_profile
+        _finish_profile(app.response_class(), app)
+    return profile
+
+
+class TestRequestProfiler:
+    """Test profiling hooks"""
+
+    def test_counts_queries_per_endpoint(self, app, db_session, models):
+        profile = _profiled_request(app, models, '/health/ping', ['a', 'b', 'c'])
+
+        assert profile.query_count == 3
+        assert profile.sql_seconds > 0
+        histogram = endpoint_metrics.queries[('health.ping', 'GET')]
+        assert histogram.count == 1
+        assert histogram.sum == 3
+
+    def test_n_plus_one_detected(self, app, db_session, models, monkeypatch):
+        monkeypatch.setitem(app.config, 'QUERY_PROFILER_N_PLUS_ONE', 3)
+
+        _profiled_request(app, models, '/health/ping', ['a', 'b'])
+        assert ('health.ping', 'GET') not in endpoint_metrics.n_plus_one
+
+        _profiled_request(app, models, '/health/ping', ['a', 'b', 'c', 'd'])
+        assert endpoint_metrics.n_plus_one[('health.ping', 'GET')] == 1
+
+    def test_slow_request_logged(self, app, db_session, models, monkeypatch, caplog):
+        monkeypatch.setitem(app.config, 'QUERY_PROFILER_SLOW_MS', 0)
+
+        with caplog.at_level(logging.WARNING, logger='app.services.request_profiler'):
+            _profiled_request(app, models, '/health/ping', ['a'])
+
+        assert endpoint_metrics.slow[('health.ping', 'GET')] == 1
+        message = next(r.getMessage() for r in caplog.records if 'Slow request' in r.getMessage())
+        assert '1 queries' in message
+        assert 'Top statements' in message
+        assert 'FROM employees' in message
+
+    def test_metrics_endpoint(self, client, db_session):
+        client.get('/health/ping')
+        response = client.get('/health/metrics')
+        assert response.status_code == 200
+
+        body = response.get_data(as_text=True)
+        assert '# TYPE scheduler_request_duration_seconds histogram' in body
+        assert 'scheduler_request_duration_seconds_count{endpoint="health.ping",method="GET"} 1' in body
+        assert 'scheduler_request_sql_queries_bucket{endpoint="health.ping",method="GET",le="+Inf"} 1' in body
+        assert 'scheduler_events_total' in body
@@ -0,0 +1,106 @@
+"""
+Test Scheduler Run Profiler
+
+Verifies:
+1. Phases record wall time and the SQL statements executed inside them
+2. Nested phases are listed with their depth and counted in the parent
+3. Peak memory is tracked per phase when enabled
+4. The profile is stored on the run and returned by the history API
+5. Memory tracking is off by default and a run that fails early detaches its profiler
+"""
+
+import json
+import tracemalloc
+from datetime import datetime
+
+import pytest
+
+from app.routes.auth import save_session
+from app.services import run_profiler
+from app.services.cpsat_scheduler import CPSATSchedulingEngine
+from app.services.run_profiler import RunProfiler
+
+
+def test_phases_count_sql(db_session, models):
+    Employee = models['Employee']
+    profiler = RunProfiler().start(track_memory=False)
+    try:
+        with profiler.phase('load'):
+            db_session.query(Employee).all()
+            with profiler.phase('precompute'):
+                db_session.query(Employee).count()
+        with profiler.phase('idle'):
+            pass
+    finally:
+        profiler.stop()
+
+    load, precompute, idle = profiler.phases
+    assert (load['depth'], precompute['depth'], idle['depth']) == (0, 1, 0)
+    assert precompute['sql'] >= 1
+    assert load['sql'] >= precompute['sql'] + 1
+    assert idle['sql'] == 0
+    assert load['seconds'] >= precompute['seconds']
+    assert 'peak_kb' not in load
+
+    # Statements after stop() are not counted
+    count = profiler.sql_count
+    db_session.query(Employee).count()
+    assert profiler.sql_count == count
+
+
+def test_peak_memory_per_phase():
+    profiler = RunProfiler().start(track_memory=True)
+    try:
+        with profiler.phase('outer'):
+            with profiler.phase('allocate'):
+                data = [bytes(1024) for _ in range(2048)]
+                del data
+        with profiler.phase('small'):
+            pass
+    finally:
+        profiler.stop()
+
+    outer, allocate, small = profiler.phases
+    assert allocate['peak_kb'] >= 2048
+    assert outer['peak_kb'] >= allocate['peak_kb']
+    assert small['peak_kb'] < 1024
+
+
+def test_history_api_returns_profile(client, db_session, models, fake_redis):
+    run = models['SchedulerRunHistory'](run_type='manual', status='completed', solver_type='greedy')
+    profiler = RunProfiler().start(track_memory=False)
+    with profiler.phase('juicer'):
+        pass
+    profiler.save(run)
+    db_session.add(run)
+    db_session.commit()
+
+    stored = json.loads(run.profile)
+    assert stored['phases'][0]['name'] == 'juicer'
+    assert stored['total_seconds'] is not None
+
+    save_session('profile-session', {
+        'user_info': {'username': 'tester'},
+        'created_at': datetime.utcnow().isoformat(),
+        'last_activity': datetime.utcnow().isoformat()
+    })
+    client.set_cookie('session_id', 'profile-session')
+    response = client.get(f'/auto-schedule/api/history/{run.id}')
+    assert response.status_code == 200
+    assert response.get_json()['run']['profile']['phases'][0]['name'] == 'juicer'
+
+
+def test_memory_off_by_default_and_detached_on_early_failure(app, db_session, models, monkeypatch):
+    profiler = RunProfiler().start()
+    assert not profiler.to_dict()['memory_tracked']
+    profiler.stop()
+
+    def fail():
+        raise RuntimeError('database unavailable')
+
+    monkeypatch.setattr(models['SchedulerRunHistory'], 'fail_stale_runs', staticmethod(fail))
+    monkeypatch.setitem(app.config, 'SCHEDULER_PROFILE_MEMORY', True)
+    with pytest.raises(RuntimeError):
+        CPSATSchedulingEngine(db_session, models).run_auto_scheduler()
+    assert getattr(run_profiler._active, 'profiler', None) is None
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,119 @@
+"""
+Test Full-Text Search Index
+
+Verifies:
+1. Index is kept in sync with event/employee inserts, updates and deletes
+2. Ranked prefix matching with column restriction
+3. Universal search endpoint uses the index
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.search_index import (
+    SearchIndex, BACKEND_FTS5, BACKEND_LIKE, search_terms, install_search_index
+)
+
+
+@pytest.fixture
+def catalog(db_session, models):
+    """A few events and employees"""
+    Event = models['Event']
+    Employee = models['Employee']
+    now = datetime.now()
+
+    for ref_num, name, store in (
+        (606001, '606001-ACME Cola Demo', 'Walmart Supercenter'),
+        (606002, '606002-Juicer Production', 'Sams Club'),
+        (606003, '606003-Colander Kitchen Demo', 'Walmart Neighborhood'),
+    ):
+        db_session.add(Event(
+            project_name=name, project_ref_num=ref_num, store_name=store,
+            start_datetime=now, due_datetime=now + timedelta(days=5)
+        ))
+    db_session.add(Employee(id='EMP100', name='Maria Lopez', email='maria@example.com'))
+    db_session.add(Employee(id='EMP200', name='Colin Baker', email='colin@example.com'))
+    db_session.commit()
+    return models
+
+
+def _event_ids(db_session, models, query, fields=None):
+    Event = models['Event']
+    matches = SearchIndex(db_session, models).events(query, fields=fields)
+    rows = db_session.query(Event.project_ref_num).join(
+        matches, Event.id == matches.c.id
+    ).order_by(matches.c.rank).all()
+    return [r[0] for r in rows]
+
+
+def _employee_ids(db_session, models, query):
+    matches = SearchIndex(db_session, models).employees(query)
+    return sorted(r[0] for r in db_session.query(matches.c.id).all())
+
+
+class TestSearchIndex:
+    """Test index maintenance and matching"""
+
+    def test_uses_fts5(self, db_session, catalog):
+        assert SearchIndex(db_session, catalog).backend == BACKEND_FTS5
+
+    def test_prefix_matching(self, db_session, catalog):
+        assert sorted(_event_ids(db_session, catalog, 'col')) == [606001, 606003]
+        assert _event_ids(db_session, catalog, 'acme demo') == [606001]
+        assert _event_ids(db_session, catalog, '606002') == [606002]
+        assert _event_ids(db_session, catalog, 'sams') == [606002]
+        assert _event_ids(db_session, catalog, 'sams', fields=('project_name',)) == []
+
+    def test_employee_matching(self, db_session, catalog):
+        assert _employee_ids(db_session, catalog, 'mar') == ['EMP100']
+        assert _employee_ids(db_session, catalog, 'emp2') == ['EMP200']
+        assert _employee_ids(db_session, catalog, 'colin@example') == ['EMP200']
+
+    def test_triggers_track_changes(self, db_session, catalog):
+        Event = catalog['Event']
+        Employee = catalog['Employee']
+
+        event = Event.query.filter_by(project_ref_num=606002).one()
+        event.project_name = '606002-Pineapple Sampling'
+        Employee.query.get('EMP100').name = 'Maria Gonzalez'
+        db_session.commit()
+
+        assert _event_ids(db_session, catalog, 'juicer') == []
+        assert _event_ids(db_session, catalog, 'pineapple') == [606002]
+        assert _employee_ids(db_session, catalog, 'gonz') == ['EMP100']
+
+        db_session.delete(event)
+        db_session.commit()
+        assert _event_ids(db_session, catalog, 'pineapple') == []
+
+    def test_rebuild_indexes_existing_rows(self, db_session, catalog):
+        with db_session.get_bind().begin() as connection:
+            connection.exec_driver_sql('DELETE FROM events_fts')
+            install_search_index(connection, rebuild=True)
+        assert _event_ids(db_session, catalog, 'kitchen') == [606003]
+
+    def test_punctuation_only_query(self, db_session, catalog):
+        assert search_terms('"*:()') == []
+        assert SearchIndex(db_session, catalog).events('"*:()') is None
+
+    def test_like_fallback(self, db_session, catalog, monkeypatch):
+        monkeypatch.setattr(SearchIndex, 'backend', BACKEND_LIKE)
+        assert sorted(_event_ids(db_session, catalog, 'demo')) == [606001, 606003]
+
+
+class TestUniversalSearch:
+    """Test the search endpoint"""
+
+    def test_universal_search(self, client, db_session, catalog):
+        Schedule = catalog['Schedule']
+        db_session.add(Schedule(event_ref_num=606003, employee_id='EMP100',
+                                schedule_datetime=datetime.now() + timedelta(days=1)))
+        db_session.commit()
+
+        data = client.get('/api/universal_search?q=maria').get_json()
+        assert [e['id'] for e in data['employees']] == ['EMP100']
+        assert [s['event_ref_num'] for s in data['schedules']] == [606003]
+
+        data = client.get('/api/universal_search?q=acme').get_json()
+        assert [e['project_ref_num'] for e in data['events']] == [606001]
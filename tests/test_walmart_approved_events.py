@@ -0,0 +1,127 @@
+"""
+Test Walmart Approved Events Fetching
+
+Verifies:
+1. Report fetches are split per club and date chunk, merged in order, and
+   fail as a whole when one request fails
+2. Approved events are cached in the EDR cache with a TTL, stored outside the source tree
+3. The approved events page serves cached events without a Walmart session
+"""
+
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+from app.integrations.edr.db_manager import EDRDatabaseManager, default_db_path
+from app.integrations.walmart_api import event_fetcher
+from app.integrations.walmart_api.event_fetcher import (
+    ApprovedEventsCache, fetch_daily_schedule_report, split_date_range,
+)
+from app.routes.auth import save_session
+
+
+class FakeResponse:
+    def __init__(self, status_code, rows):
+        self.status_code = status_code
+        self.rows = rows
+        self.text = json.dumps(rows)
+
+    def json(self):
+        return self.rows
+
+
+class FakeSession:
+    """Answers each report request with one row per club and chunk"""
+
+    def __init__(self, fail_club=None):
+        self.fail_club = fail_club
+        self.payloads = []
+        self._lock = threading.Lock()
+
+    def post(self, url, headers=None, json=None, timeout=None):
+        with self._lock:
+            self.payloads.append(json)
+        club, = json['clubList']
+        if club == self.fail_club:
+            return FakeResponse(500, [])
+        return FakeResponse(200, [{'eventId': f"{club}-{json['startDate']}", 'status': 'APPROVED'}])
+
+
+def test_split_date_range():
+    assert split_date_range('2026-01-01', '2026-01-31', 14) == [
+        ('2026-01-01', '2026-01-14'), ('2026-01-15', '2026-01-28'), ('2026-01-29', '2026-01-31'),
+    ]
+    assert split_date_range('2026-01-05', '2026-01-05', 14) == [('2026-01-05', '2026-01-05')]
+    assert split_date_range('2026-01-06', '2026-01-05', 14) == []
+
+
+def test_fetch_splits_by_club_and_chunk():
+    session = FakeSession()
+    rows = fetch_daily_schedule_report(session, {}, [8135, 8136], '2026-01-01', '2026-01-20',
+                                       chunk_days=10, max_workers=3)
+
+    assert len(session.payloads) == 4
+    assert [row['eventId'] for row in rows] == [
+        '8135-2026-01-01', '8135-2026-01-11', '8136-2026-01-01', '8136-2026-01-11',
+    ]
+
+    assert fetch_daily_schedule_report(FakeSession(fail_club=8136), {}, [8135, 8136],
+                                       '2026-01-01', '2026-01-20', chunk_days=10) is None
+
+
+def test_cache_ttl(tmp_path):
+    db = EDRDatabaseManager(str(tmp_path / 'edr_cache.db'))
+    cache = ApprovedEventsCache(db, ttl_seconds=60)
+    assert cache.get('8135', '2026-01-01', '2026-01-31') is None
+
+    cache.put('8135', '2026-01-01', '2026-01-31', [{'eventId': 1}])
+    cached = cache.get('8135', '2026-01-01', '2026-01-31')
+    assert cached.events == [{'eventId': 1}] and cached.fresh
+    assert cache.get('8135', '2026-01-01', '2026-02-28') is None
+
+    # Old entries are served as stale, then not at all
+    old = (datetime.now() - timedelta(minutes=5)).isoformat()
+    db.conn.execute('UPDATE api_responses SET fetched_at = ?', (old,))
+    assert not cache.get('8135', '2026-01-01', '2026-01-31').fresh
+    cache.max_stale_seconds = 120
+    assert cache.get('8135', '2026-01-01', '2026-01-31') is None
+    db.close()
+
+
+def test_cache_db_path(app, tmp_path):
+    with app.app_context():
+        assert default_db_path() == os.path.join(app.instance_path, 'edr_cache.db')
+
+        app.config['EDR_CACHE_DB_PATH'] = str(tmp_path / 'cache' / 'edr.db')
+        try:
+            db = EDRDatabaseManager()
+            assert db.db_path == str(tmp_path / 'cache' / 'edr.db')
+            assert os.path.exists(db.db_path)
+            db.close()
+        finally:
+            app.config.pop('EDR_CACHE_DB_PATH')
+
+
+def test_page_serves_cached_events(client, db_session, fake_redis, tmp_path, monkeypatch):
+    db = EDRDatabaseManager(str(tmp_path / 'edr_cache.db'))
+    cache = ApprovedEventsCache(db)
+    monkeypatch.setattr(event_fetcher, '_approved_events_cache', cache)
+    today = date.today().isoformat()
+    cache.put('8135', today, today, [
+        {'eventId': 615801, 'eventName': '01.04-Cached Event', 'status': 'APPROVED', 'demoDate': today},
+    ])
+
+    save_session('walmart-session', {
+        'user_info': {'username': 'tester'},
+        'created_at': datetime.utcnow().isoformat(),
+        'last_activity': datetime.utcnow().isoformat()
+    })
+    client.set_cookie('session_id', 'walmart-session')
+
+    response = client.get(f'/api/walmart/events/approved?club=8135&start_date={today}&end_date={today}')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [event['event_id'] for event in data['events']] == [615801]
+    assert data['cache']['cached'] and not data['cache']['refreshing']
+    db.close()
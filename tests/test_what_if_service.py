@@ -0,0 +1,102 @@
+"""
+Test What-If Assignment Service
+
+Verifies:
+1. Roster-wide evaluation agrees with ConstraintValidator.validate_assignment
+2. book()/release() update the cached week state without reloading it
+3. The reschedule picker endpoint answers from the week state
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from app.services.what_if_service import WhatIfService, week_start_of
+
+# A Tuesday two to three weeks out (never in the past)
+TUESDAY = week_start_of(date.today() + timedelta(days=14)) + timedelta(days=2)
+
+
+def _event(models, ref, event_type, day=TUESDAY):
+    return models['Event'](
+        project_ref_num=ref, project_name=f'{ref}-{event_type}', event_type=event_type,
+        condition='Unstaffed', start_datetime=datetime.combine(day, time(0, 0)),
+        due_datetime=datetime.combine(day + timedelta(days=5), time(0, 0)),
+    )
+
+
+def _setup(db_session, models):
+    Employee = models['Employee']
+    db_session.add_all([
+        Employee(id='WI1', name='Alex Lead', job_title='Lead Event Specialist', is_active=True),
+        Employee(id='WI2', name='Blair Booked', job_title='Event Specialist', is_active=True),
+        Employee(id='WI3', name='Casey Off', job_title='Event Specialist', is_active=True),
+        Employee(id='WI4', name='Drew Juicer', job_title='Juicer Barista', is_active=True),
+        Employee(id='WI5', name='Emery Inactive', job_title='Event Specialist', is_active=False),
+    ])
+    booked, target, freeosk = _event(models, 930001, 'Core'), _event(models, 930002, 'Core'), _event(models, 930003, 'Freeosk')
+    db_session.add_all([booked, target, freeosk])
+    db_session.flush()
+    schedule = models['Schedule'](event_ref_num=booked.project_ref_num, employee_id='WI2',
+                                  schedule_datetime=datetime.combine(TUESDAY, time(10, 15)))
+    db_session.add_all([
+        schedule,
+        models['EmployeeTimeOff'](employee_id='WI3', start_date=TUESDAY, end_date=TUESDAY, reason='Trip'),
+    ])
+    db_session.commit()
+    return target, freeosk, schedule
+
+
+def test_evaluation_matches_validator(db_session, models):
+    from app.services.constraint_validator import ConstraintValidator
+
+    target, freeosk, schedule = _setup(db_session, models)
+    validator = ConstraintValidator(db_session, models)
+    service = WhatIfService(db_session, models)
+    employees = db_session.query(models['Employee']).all()
+
+    for event, at, exclude in [
+        (target, datetime.combine(TUESDAY, time(10, 15)), None),
+        (target, datetime.combine(TUESDAY, time(10, 15)), [schedule.id]),
+        (freeosk, datetime.combine(TUESDAY, time(10, 0)), None),
+        (target, datetime.combine(TUESDAY + timedelta(days=7), time(10, 15)), None),  # after due date
+    ]:
+        result = service.evaluate(event, at, exclude_schedule_ids=exclude)
+        for employee in employees:
+            expected = validator.validate_assignment(event, employee, at, exclude_schedule_ids=exclude).is_valid
+            assert result.is_available(employee.id) == expected, (event.event_type, at, exclude, employee.id)
+
+    result = service.evaluate(target, datetime.combine(TUESDAY, time(10, 15)))
+    assert result.available_ids() == ['WI1', 'WI4']
+    assert set(result.reasons('WI2')) == {'daily_limit', 'already_scheduled'}
+    assert result.reasons('WI3') == ['time_off']
+    assert [e.id for e in validator.get_available_employees(target, datetime.combine(TUESDAY, time(10, 15)))] \
+        == ['WI1', 'WI4', 'WI5']
+
+
+def test_deltas_update_cached_state(db_session, models):
+    target, _, schedule = _setup(db_session, models)
+    service = WhatIfService(db_session, models)
+    at = datetime.combine(TUESDAY, time(10, 15))
+    state = service.state(TUESDAY)
+
+    state.book('WI1', 'Core', at, 390)
+    assert service.state(TUESDAY + timedelta(days=1)) is state
+    assert service.evaluate(target, at).available_ids() == ['WI4']
+
+    state.release(schedule.id)
+    assert service.evaluate(target, at).available_ids() == ['WI2', 'WI4']
+
+    service.invalidate(TUESDAY)
+    assert service.evaluate(target, at).available_ids() == ['WI1', 'WI4']
+
+
+def test_picker_endpoint(client, db_session, models):
+    _setup(db_session, models)
+    url = f'/api/available_employees_for_change/{TUESDAY.isoformat()}/Core'
+
+    assert [e['id'] for e in client.get(url).get_json()] == ['WI1', 'WI4']
+    # The employee being rescheduled stays selectable on their own day
+    same_day = client.get(f'{url}?current_employee_id=WI2&current_date={TUESDAY.isoformat()}').get_json()
+    assert [e['id'] for e in same_day] == ['WI1', 'WI2', 'WI4']
+
+    freeosk = client.get(f'/api/available_employees_for_change/{TUESDAY.isoformat()}/Freeosk').get_json()
+    assert freeosk == [{'id': 'WI1', 'name': 'Alex Lead', 'job_title': 'Lead Event Specialist'}]
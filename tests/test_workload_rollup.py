@@ -0,0 +1,116 @@
+"""
+Test Employee Daily Workload Rollup
+
+Verifies:
+1. Per-employee totals (counts by type, days worked, minutes) match the schedules
+2. Schedule and event changes update the rollup on commit
+3. Workload consumers (API, AI tools) read the rollup
+"""
+
+from datetime import datetime, date, timedelta
+
+import pytest
+
+from app.services.workload_analytics import WorkloadAnalytics
+
+_MONDAY = date.today() + timedelta(days=14 - date.today().weekday())
+
+
+def _at(day, hour=10):
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=hour)
+
+
+@pytest.fixture
+def week(db_session, models):
+    """Two employees with schedules across the week of _MONDAY"""
+    Employee = models['Employee']
+    Event = models['Event']
+    Schedule = models['Schedule']
+
+    db_session.add(Employee(id='emp1', name='Alice'))
+    db_session.add(Employee(id='emp2', name='Bob'))
+    rows = [
+        # ref, type, estimated_time, employee, day offset
+        (710001, 'Core', None, 'emp1', 0),              # default 390
+        (710002, 'Supervisor', None, 'emp1', 0),        # default 5
+        (710003, 'Core', 300, 'emp1', 1),
+        (710004, 'Juicer Production', None, 'emp2', 0),  # default 540
+        (710005, 'Digital Setup', 20, 'emp2', 2),
+    ]
+    for ref_num, event_type, estimated, employee_id, offset in rows:
+        day = _MONDAY + timedelta(days=offset)
+        db_session.add(Event(
+            project_name=f'{ref_num}-Test', project_ref_num=ref_num, event_type=event_type,
+            estimated_time=estimated, start_datetime=_at(day - timedelta(days=2)),
+            due_datetime=_at(day + timedelta(days=2)), is_scheduled=True, condition='Scheduled'
+        ))
+        db_session.add(Schedule(event_ref_num=ref_num, employee_id=employee_id, schedule_datetime=_at(day)))
+    db_session.commit()
+    return models
+
+
+def _totals(db_session, models):
+    return WorkloadAnalytics(db_session, models).employee_totals(_MONDAY, _MONDAY + timedelta(days=6))
+
+
+def test_totals_match_schedules(db_session, week):
+    totals = _totals(db_session, week)
+
+    assert totals['emp1'] == {
+        'event_count': 3, 'days_worked': 2, 'minutes': 390 + 5 + 300,
+        'type_counts': {'Core': 2, 'Supervisor': 1},
+    }
+    assert totals['emp2']['days_worked'] == 2
+    assert totals['emp2']['minutes'] == 540 + 20
+    assert totals['emp2']['type_counts'] == {'Juicer Production': 1, 'Digital Setup': 1}
+
+    # One stats row per employee per working day
+    assert db_session.query(week['EmployeeDailyStats']).count() == 4
+
+
+def test_changes_update_rollup(db_session, week):
+    _totals(db_session, week)
+    Schedule = week['Schedule']
+    Event = week['Event']
+
+    # Reassign Alice's Tuesday Core to Bob and change an estimate
+    schedule = db_session.query(Schedule).filter_by(event_ref_num=710003).one()
+    schedule.employee_id = 'emp2'
+    db_session.query(Event).filter_by(project_ref_num=710005).one().estimated_time = 60
+    db_session.commit()
+
+    totals = _totals(db_session, week)
+    assert totals['emp1']['days_worked'] == 1
+    assert totals['emp1']['minutes'] == 395
+    assert totals['emp2']['event_count'] == 3
+    assert totals['emp2']['minutes'] == 540 + 300 + 60
+
+    db_session.delete(db_session.query(Schedule).filter_by(event_ref_num=710004).one())
+    db_session.commit()
+    assert _totals(db_session, week)['emp2']['type_counts'] == {'Core': 1, 'Digital Setup': 1}
+
+    # Bulk deletes invalidate the rollup; it is rebuilt on the next read
+    db_session.query(Schedule).filter(Schedule.employee_id == 'emp1').delete()
+    db_session.commit()
+    assert 'emp1' not in _totals(db_session, week)
+
+
+def test_consumers_read_rollup(client, db_session, week):
+    end = _MONDAY + timedelta(days=6)
+    response = client.get(f'/api/workload?start_date={_MONDAY}&end_date={end}')
+    assert response.status_code == 200
+    employees = response.get_json()['employees']
+    assert [e['id'] for e in employees] == ['emp1', 'emp2']
+    assert employees[0]['total_hours'] == round(695 / 60, 1)
+
+    from app.services.ai_tools import AITools
+    tools = AITools(db_session, week)
+    fairness = tools._tool_analyze_schedule_fairness({
+        'start_date': _MONDAY.isoformat(), 'end_date': end.isoformat()
+    })['data']
+    by_name = {e['name']: e for e in fairness['employees']}
+    assert by_name['Alice']['core'] == 2 and by_name['Alice']['other'] == 1
+    assert by_name['Bob']['juicer'] == 1 and by_name['Bob']['minutes'] == 560
+
+    overtime = tools._tool_check_overtime_risk({'week_of': _MONDAY.isoformat()})
+    assert overtime['data']['at_risk'] == []